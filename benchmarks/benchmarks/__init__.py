@@ -0,0 +1,27 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+
+"""
+Benchmark suite of pyunicorn for airspeed velocity (asv).
+
+Each module covers one subpackage. The benchmark classes are parametrised by
+problem size, with a ``time_*`` and a ``peakmem_*`` benchmark for each hot
+path, and the ``Exponents`` classes track the fitted scaling exponents of the
+``time_*`` benchmarks, such that changes in complexity show up as regressions
+between revisions.
+
+Since many measures cache their results, each timed call runs once on fresh
+instances created by ``setup()``.
+"""
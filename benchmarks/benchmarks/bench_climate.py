@@ -0,0 +1,58 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+
+"""
+Benchmarks of :mod:`pyunicorn.climate`.
+"""
+
+from pyunicorn.climate import TsonisClimateNetwork
+
+from .common import climate_data, scaling_exponent
+
+
+class TsonisConstruction:
+    """
+    Tsonis climate networks of synthetic data with fixed link density.
+    """
+    params = [200, 400, 800, 1600]
+    param_names = ["n_nodes"]
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, n_nodes):
+        # pylint: disable=attribute-defined-outside-init
+        self.data = climate_data(n_nodes)
+
+    def _construct(self):
+        return TsonisClimateNetwork(self.data, link_density=0.05,
+                                    winter_only=False, silence_level=3)
+
+    def time_construction(self, n_nodes):
+        self._construct()
+
+    def peakmem_construction(self, n_nodes):
+        self._construct()
+
+
+class Exponents:
+    """
+    Scaling exponents in the number of nodes.
+    """
+    unit = "exponent"
+    timeout = 1200
+
+    def track_tsonis_construction(self):
+        return scaling_exponent(TsonisConstruction, "time_construction")
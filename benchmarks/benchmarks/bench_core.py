@@ -0,0 +1,55 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+
+"""
+Benchmarks of :mod:`pyunicorn.core`.
+"""
+
+from .common import random_network, scaling_exponent
+
+
+class NetworkBetweenness:
+    """
+    n.s.i. shortest path betweenness of random networks with mean degree 10.
+    """
+    params = [["ErdosRenyi", "BarabasiAlbert"], [250, 500, 1000, 2000]]
+    param_names = ["model", "n_nodes"]
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, model, n_nodes):
+        # pylint: disable=attribute-defined-outside-init
+        self.net = random_network(model, n_nodes)
+
+    def time_nsi_betweenness(self, model, n_nodes):
+        self.net.nsi_betweenness()
+
+    def peakmem_nsi_betweenness(self, model, n_nodes):
+        self.net.nsi_betweenness()
+
+
+class Exponents:
+    """
+    Scaling exponents in the number of nodes.
+    """
+    params = NetworkBetweenness.params[0]
+    param_names = ["model"]
+    unit = "exponent"
+    timeout = 1200
+
+    def track_nsi_betweenness(self, model):
+        return scaling_exponent(
+            NetworkBetweenness, "time_nsi_betweenness", model)
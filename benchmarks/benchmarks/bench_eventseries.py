@@ -0,0 +1,58 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+
+"""
+Benchmarks of :mod:`pyunicorn.eventseries`.
+"""
+
+from pyunicorn.eventseries import EventSeries
+
+from .common import random_events, scaling_exponent
+
+
+class EventSeriesAnalysis:
+    """
+    Event synchronisation and event coincidence analysis of 50 series of
+    independent events.
+    """
+    params = [["ES", "ECA"], [2000, 4000, 8000, 16000]]
+    param_names = ["method", "n_time"]
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, method, n_time):
+        # pylint: disable=attribute-defined-outside-init
+        self.es = EventSeries(random_events(n_time, 50), taumax=10)
+
+    def time_event_series_analysis(self, method, n_time):
+        self.es.event_series_analysis(method=method)
+
+    def peakmem_event_series_analysis(self, method, n_time):
+        self.es.event_series_analysis(method=method)
+
+
+class Exponents:
+    """
+    Scaling exponents in the length of the event series.
+    """
+    params = EventSeriesAnalysis.params[0]
+    param_names = ["method"]
+    unit = "exponent"
+    timeout = 1200
+
+    def track_event_series_analysis(self, method):
+        return scaling_exponent(
+            EventSeriesAnalysis, "time_event_series_analysis", method)
@@ -0,0 +1,58 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+
+"""
+Benchmarks of :mod:`pyunicorn.funcnet`.
+"""
+
+from pyunicorn.funcnet import CouplingAnalysis
+
+from .common import test_series, scaling_exponent
+
+
+class MutualInformation:
+    """
+    Mutual information between 4 noisy test series.
+    """
+    params = [["knn", "gauss", "binning"], [500, 1000, 2000]]
+    param_names = ["estimator", "n_time"]
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, estimator, n_time):
+        # pylint: disable=attribute-defined-outside-init
+        self.ca = CouplingAnalysis(test_series(4, n_time, noise=0.5).T,
+                                   silence_level=3)
+
+    def time_mutual_information(self, estimator, n_time):
+        self.ca.mutual_information(tau_max=5, estimator=estimator)
+
+    def peakmem_mutual_information(self, estimator, n_time):
+        self.ca.mutual_information(tau_max=5, estimator=estimator)
+
+
+class Exponents:
+    """
+    Scaling exponents in the length of the time series.
+    """
+    params = MutualInformation.params[0]
+    param_names = ["estimator"]
+    unit = "exponent"
+    timeout = 1200
+
+    def track_mutual_information(self, estimator):
+        return scaling_exponent(
+            MutualInformation, "time_mutual_information", estimator)
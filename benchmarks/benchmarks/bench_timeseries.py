@@ -0,0 +1,110 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+
+"""
+Benchmarks of :mod:`pyunicorn.timeseries`.
+"""
+
+from pyunicorn.timeseries import RecurrencePlot, Surrogates
+
+from .common import test_series, scaling_exponent
+
+
+def _recurrence_plot(ts):
+    return RecurrencePlot(ts, dim=3, tau=2, recurrence_rate=0.05,
+                          silence_level=3)
+
+
+class RecurrencePlotConstruction:
+    """
+    Recurrence plots of an embedded noisy test series with fixed recurrence
+    rate.
+    """
+    params = [500, 1000, 2000, 4000]
+    param_names = ["n_time"]
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, n_time):
+        # pylint: disable=attribute-defined-outside-init
+        self.ts = test_series(1, n_time)[0]
+
+    def time_construction(self, n_time):
+        _recurrence_plot(self.ts)
+
+    def peakmem_construction(self, n_time):
+        _recurrence_plot(self.ts)
+
+
+class RecurrencePlotDiagline:
+    """
+    Diagonal line length distribution of the recurrence plots above.
+    """
+    params = RecurrencePlotConstruction.params
+    param_names = RecurrencePlotConstruction.param_names
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, n_time):
+        # pylint: disable=attribute-defined-outside-init
+        self.rp = _recurrence_plot(test_series(1, n_time)[0])
+
+    def time_diagline_dist(self, n_time):
+        self.rp.diagline_dist()
+
+    def peakmem_diagline_dist(self, n_time):
+        self.rp.diagline_dist()
+
+
+class RefinedAAFTSurrogates:
+    """
+    Refined AAFT surrogates of 6 test series.
+    """
+    params = [2000, 4000, 8000, 16000]
+    param_names = ["n_time"]
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, n_time):
+        # pylint: disable=attribute-defined-outside-init
+        self.surrogates = Surrogates(test_series(6, n_time), silence_level=3)
+
+    def time_refined_AAFT_surrogates(self, n_time):
+        self.surrogates.refined_AAFT_surrogates(n_iterations=10)
+
+    def peakmem_refined_AAFT_surrogates(self, n_time):
+        self.surrogates.refined_AAFT_surrogates(n_iterations=10)
+
+
+class Exponents:
+    """
+    Scaling exponents in the length of the time series.
+    """
+    unit = "exponent"
+    timeout = 1200
+
+    def track_recurrence_plot(self):
+        return scaling_exponent(
+            RecurrencePlotConstruction, "time_construction")
+
+    def track_diagline_dist(self):
+        return scaling_exponent(RecurrencePlotDiagline, "time_diagline_dist")
+
+    def track_refined_AAFT_surrogates(self):
+        return scaling_exponent(
+            RefinedAAFTSurrogates, "time_refined_AAFT_surrogates")
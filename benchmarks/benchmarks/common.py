@@ -0,0 +1,130 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+
+"""
+Synthetic problem generators and scaling fits shared by the benchmarks.
+"""
+
+import time
+
+import numpy as np
+
+from pyunicorn import Network
+from pyunicorn.core import GeoGrid
+from pyunicorn.climate import ClimateData
+
+
+def test_series(n_series, n_time, noise=0.1, seed=0):
+    """
+    Return an upscaled version of the test data of
+    :meth:`pyunicorn.timeseries.Surrogates.SmallTestData`: superposed sines
+    with phase shifts, plus white noise.
+
+    :rtype: 2D array [series, time]
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_time)
+    ts = np.sin(t * np.pi / 15. + np.arange(n_series)[:, None] * np.pi / 2.) \
+        + np.sin(t * np.pi / 30.)
+    return ts + noise * rng.standard_normal(ts.shape)
+
+
+def random_network(model, n_nodes, mean_degree=10, seed=0):
+    """
+    Return an Erdos-Renyi or Barabasi-Albert network with the given mean
+    degree.
+
+    :arg str model: "ErdosRenyi" or "BarabasiAlbert".
+    :rtype: :class:`pyunicorn.Network`
+    """
+    np.random.seed(seed)
+    if model == "ErdosRenyi":
+        A = Network.ErdosRenyi(n_nodes=n_nodes,
+                               n_links=n_nodes * mean_degree // 2,
+                               silence_level=3)
+    elif model == "BarabasiAlbert":
+        A = Network.BarabasiAlbert(n_nodes=n_nodes,
+                                   n_links_each=mean_degree // 2)
+    else:
+        raise ValueError(f"unknown network model {model}")
+    return Network(adjacency=A, silence_level=3)
+
+
+def climate_data(n_nodes, n_time=600, seed=0):
+    """
+    Return climate data on a regular grid of about `n_nodes` nodes, with the
+    time series of :func:`test_series` as observable.
+
+    :rtype: :class:`pyunicorn.climate.ClimateData`
+    """
+    n_lat = max(1, int(np.sqrt(n_nodes / 2)))
+    n_lon = n_nodes // n_lat
+    grid = GeoGrid.RegularGrid(
+        time_seq=np.arange(n_time, dtype=float),
+        space_grid=(np.linspace(-80., 80., n_lat),
+                    np.linspace(0., 360., n_lon, endpoint=False)),
+        silence_level=3)
+    observable = test_series(n_lat * n_lon, n_time, noise=0.5, seed=seed).T
+    return ClimateData(observable=observable, grid=grid, time_cycle=12,
+                       silence_level=3)
+
+
+def random_events(n_time, n_series, rate=0.1, seed=0):
+    """
+    Return an event matrix of independent events with the given rate.
+
+    :rtype: 2D array [time, series] of 0/1
+    """
+    rng = np.random.default_rng(seed)
+    return (rng.random((n_time, n_series)) < rate).astype(int)
+
+
+def fit_exponent(sizes, values):
+    """
+    Return the exponent `b` of the least squares fit
+    ``values ~ a * sizes**b`` in log-log scale.
+
+    **Example:**
+
+    >>> round(fit_exponent([10, 20, 40], [1., 4., 16.]), 6)
+    2.0
+    """
+    return np.polyfit(np.log(sizes), np.log(values), 1)[0]
+
+
+def scaling_exponent(benchmark, method, *fixed, repeat=3):
+    """
+    Time a ``time_*`` method of a benchmark class for all problem sizes in
+    its last parameter, and return the fitted scaling exponent.
+
+    :arg benchmark: A benchmark class whose last parameter is the size.
+    :arg str method: The name of the timed method.
+    :arg fixed: The values of the remaining parameters.
+    :arg int repeat: The best of this many timings is used for each size.
+    """
+    sizes = benchmark.params[-1] if len(benchmark.param_names) > 1 \
+        else benchmark.params
+    times = []
+    for n in sizes:
+        best = np.inf
+        for _ in range(repeat):
+            #  fresh instances, such that cached results are not reused
+            bench = benchmark()
+            bench.setup(*fixed, n)
+            t0 = time.perf_counter()
+            getattr(bench, method)(*fixed, n)
+            best = min(best, time.perf_counter() - t0)
+        times.append(best)
+    return fit_exponent(sizes, times)
@@ -46,7 +46,7 @@ extensions = [
         f'pyunicorn.{pkg}._ext.numerics',
         sources=[f'src/pyunicorn/{pkg}/_ext/numerics.pyx'],
         **c_args)
-    for pkg in ['climate', 'core', 'funcnet', 'timeseries']]
+    for pkg in ['climate', 'core', 'eventseries', 'funcnet', 'timeseries']]
 
 setup(ext_modules=cythonize(
     extensions,
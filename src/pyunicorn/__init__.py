@@ -29,5 +29,5 @@ timeseries
 """
 
 from .version import __version__
-from .utils import mpi
+from .utils import mpi, executor, instrument
 from .core import *
@@ -13,62 +13,69 @@
 # for complex systems science: The pyunicorn package"
 
 cimport cython
+from libc.math cimport log
+from libc.stdlib cimport calloc, free
 
 import numpy as np
 cimport numpy as cnp
 from numpy cimport ndarray
 
-from ...core._ext.types import FIELD, INT64TYPE
-from ...core._ext.types cimport MASK_t, FIELD_t, INT64TYPE_t
-
-cdef extern from "src_numerics.c":
-    void _mutual_information(
-            float *anomaly, int n_samples, int N, int n_bins, double scaling,
-            double range_min, long *symbolic, long *hist, long *hist2d,
-            float *mi)
-    void _spearman_corr(int m, int tmax, bint *final_mask,
-            float *time_series_ranked, float *spearman_rho)
+from ...core._ext.types import FIELD
+from ...core._ext.types cimport FIELD_t, DFIELD_t, SYMBOL_t
 
 
 # mutual_info =================================================================
 
 
-def mutual_information(
-    ndarray[FIELD_t, ndim=2, mode='c'] anomaly not None,
-    int n_samples, int N, int n_bins, float scaling, float range_min):
-
+def _mutual_information_rows(
+    ndarray[SYMBOL_t, ndim=2, mode='c'] symbols not None,
+    ndarray[DFIELD_t, ndim=1, mode='c'] entropy not None,
+    int n_bins, int start, int end):
+    """
+    Mutual information of the pairs (i, j > i) for `start <= i < end`, from
+    the bin numbers `symbols` [index, time] of all time series and their
+    marginal entropies. The joint histogram of a pair is built and cleared
+    in two passes over its samples, such that the cost per pair is linear in
+    the number of samples and independent of the number of bins.
+    """
     cdef:
-        ndarray[INT64TYPE_t, ndim=2, mode='c'] symbolic = np.zeros(
-            (N, n_samples), dtype=INT64TYPE)
-        ndarray[INT64TYPE_t, ndim=2, mode='c'] hist = np.zeros(
-            (N, n_bins), dtype=INT64TYPE)
-        ndarray[INT64TYPE_t, ndim=2, mode='c'] hist2d = np.zeros(
-            (n_bins, n_bins), dtype=INT64TYPE)
-        ndarray[FIELD_t, ndim=2, mode='c'] mi = np.zeros(
-            (N, N), dtype=FIELD)
-
-    _mutual_information(
-        <FIELD_t*> cnp.PyArray_DATA(anomaly), n_samples, N, n_bins, scaling,
-        range_min, <long*> cnp.PyArray_DATA(symbolic),
-        <long*> cnp.PyArray_DATA(hist), <long*> cnp.PyArray_DATA(hist2d),
-        <FIELD_t*> cnp.PyArray_DATA(mi))
-
-    return mi
-
-
-# rainfall ====================================================================
-
-
-def spearman_corr(int m, int tmax,
-    ndarray[MASK_t, ndim=2, mode='c'] final_mask not None,
-    ndarray[FIELD_t, ndim=2, mode='c'] time_series_ranked not None):
-
-    cdef ndarray[FIELD_t, ndim=2, mode='c'] spearman_rho = np.zeros(
-        (m, m), dtype=FIELD)
-
-    _spearman_corr(m, tmax,
-            <bint*> cnp.PyArray_DATA(final_mask),
-            <FIELD_t*> cnp.PyArray_DATA(time_series_ranked),
-            <FIELD_t*> cnp.PyArray_DATA(spearman_rho))
-
-    return spearman_rho
+        Py_ssize_t N = symbols.shape[0], T = symbols.shape[1]
+        Py_ssize_t i, j, k, b
+        int c
+        double log_T = log(<double> T) if T > 0 else 0.0, joint, mi
+        SYMBOL_t *s = <SYMBOL_t*> cnp.PyArray_DATA(symbols)
+        SYMBOL_t *si
+        SYMBOL_t *sj
+        DFIELD_t *H = <DFIELD_t*> cnp.PyArray_DATA(entropy)
+        ndarray[DFIELD_t, ndim=1, mode='c'] xlogx_arr = np.zeros(T + 1)
+        DFIELD_t *xlogx = <DFIELD_t*> cnp.PyArray_DATA(xlogx_arr)
+        ndarray[FIELD_t, ndim=2, mode='c'] upper = np.zeros(
+            (end - start, N), dtype=FIELD)
+        FIELD_t *up = <FIELD_t*> cnp.PyArray_DATA(upper)
+        int *hist = <int*> calloc(n_bins * n_bins, sizeof(int))
+
+    if hist == NULL:
+        raise MemoryError()
+
+    with nogil:
+        for c in range(2, T + 1):
+            xlogx[c] = c * log(<double> c)
+        for i in range(start, end):
+            si = s + i * T
+            for j in range(i + 1, N):
+                sj = s + j * T
+                for k in range(T):
+                    hist[si[k] * n_bins + sj[k]] += 1
+                #  Sum of c log c over the occupied bins, clearing them
+                joint = 0
+                for k in range(T):
+                    b = si[k] * n_bins + sj[k]
+                    if hist[b]:
+                        joint += xlogx[hist[b]]
+                        hist[b] = 0
+                #  I(i, j) = H(i) + H(j) - H(i, j)
+                mi = H[i] + H[j] - log_T + joint / T
+                up[(i - start) * N + j] = <FIELD_t> (mi if mi > 0 else 0)
+
+    free(hist)
+    return upper
@@ -24,6 +24,7 @@ from numpy import random
 
 from ..core import Data
 from ..core.cache import Cached
+from ..core._ext.types import FIELD, DFIELD
 
 
 class ClimateData(Data, Cached):
@@ -55,7 +56,7 @@ class ClimateData(Data, Cached):
             window = {"time_min": 0., "time_max": 0., "lat_min": 0.,
                       "lat_max": 0., "lon_min": 0., "lon_max": 0.}
 
-        :type observable: 2D array [time, index]
+        :type observable: 2D array [time, index] or :class:`.LazyObservable`
         :arg observable: The array of time series to be represented by the
             :class:`.Data` instance.
         :type grid: :class:`.Grid2D` instance
@@ -107,7 +108,8 @@ class ClimateData(Data, Cached):
     # pylint: disable=too-many-positional-arguments
     def Load(cls, file_name, observable_name, file_type="NetCDF",
              dimension_names=None, window=None, vertical_level=None,
-             silence_level=0, time_cycle=None, data_source=None):
+             silence_level=0, time_cycle=None, data_source=None, lazy=False,
+             cache_file=None):
         """
         Initialize an instance of ClimateData.
 
@@ -136,6 +138,10 @@ class ClimateData(Data, Cached):
             samples). NOTE: This is a required argument!
         :arg str data_source: The name of the data source (model, reanalysis,
             station).
+        :arg bool lazy: Whether to keep the data file open and read the
+            observable on demand, see :class:`.LazyObservable`.
+        :arg str cache_file: Optional name of a memory-mapped ``float32``
+            cache file for lazy access.
         """
         if time_cycle is None:
             raise TypeError("ClimateData.Load() is missing required "
@@ -148,7 +154,8 @@ class ClimateData(Data, Cached):
         res = cls._load_data(file_name=file_name, file_type=file_type,
                              dimension_names=dimension_names,
                              observable_name=observable_name,
-                             vertical_level=vertical_level)
+                             vertical_level=vertical_level, lazy=lazy,
+                             cache_file=cache_file)
 
         #  Create instance of ClimateData
         data = cls(observable=res["observable"], grid=res["grid"],
@@ -310,16 +317,70 @@ class ClimateData(Data, Cached):
                [ 0.6984, -0.1106, -0.6984,  0.1106,  0.6984, -0.1106],
                [ 0.63  , -0.321 , -0.63  ,  0.321 ,  0.63  , -0.321 ]])
         """
-        observable = self.observable()
-        time_cycle = self.time_cycle
-        N = observable.shape[1]
-        phase_mean = np.zeros((time_cycle, N))
+        N = self.grid.grid_size()["space"]
+        phase_mean = np.empty((self.time_cycle, N), dtype=DFIELD)
 
         #  Calculate mean value for each day (month) on each node
-        for i in range(time_cycle):
-            phase_mean[i, :] = observable[i::time_cycle, :].mean(axis=0)
+        for block, values in self._anomaly_blocks():
+            phase_mean[:, block] = self._phase_mean(values, self.time_cycle)
         return phase_mean
 
+    def _anomaly_blocks(self, max_bytes=2**26):
+        """
+        Iterate over spatial blocks of lazily loaded data, or over the whole
+        view if it has been loaded already.
+        """
+        if self._observable is None:
+            return self.observable_blocks(axis=1, max_bytes=max_bytes)
+        return [(slice(None), self._observable)]
+
+    @staticmethod
+    def _phase_mean(observable, time_cycle):
+        """
+        Return the mean values of an array of time series for each phase of
+        the annual cycle, by reducing over complete cycles at once.
+
+        :type observable: 2D array [time, node index]
+        :arg observable: The time series, starting at phase zero.
+        :arg int time_cycle: The annual cycle length of the data.
+        :rtype: 2D array [cycle index, node index]
+        :return: the mean values, in the floating point type of the
+            observable (at least ``float32``).
+        """
+        n_time, N = observable.shape
+        n_cycles, n_rest = divmod(n_time, time_cycle)
+        n_full = n_cycles * time_cycle
+
+        dtype = np.result_type(observable.dtype, FIELD)
+        phase_sum = np.zeros((time_cycle, N), dtype=dtype)
+        np.sum(observable[:n_full].reshape(n_cycles, time_cycle, N),
+               axis=0, dtype=dtype, out=phase_sum)
+        phase_sum[:n_rest] += observable[n_full:]
+        counts = np.full(time_cycle, n_cycles, dtype=dtype)
+        counts[:n_rest] += 1
+        phase_sum /= counts[:, np.newaxis]
+        return phase_sum
+
+    @staticmethod
+    def _subtract_phase_mean(observable, phase_mean, out):
+        """
+        Subtract mean values for each phase of the annual cycle from an array
+        of time series in a single pass, writing into ``out`` (which may be
+        ``observable`` itself).
+        """
+        time_cycle, N = phase_mean.shape
+        n_cycles = observable.shape[0] // time_cycle
+        n_full = n_cycles * time_cycle
+
+        shape = (n_cycles, time_cycle, N)
+        phase_mean = phase_mean.astype(
+            np.result_type(out.dtype, FIELD), copy=False)
+        np.subtract(observable[:n_full].reshape(shape), phase_mean,
+                    out=out[:n_full].reshape(shape), casting="unsafe")
+        n_rest = observable.shape[0] - n_full
+        np.subtract(observable[n_full:], phase_mean[:n_rest],
+                    out=out[n_full:], casting="unsafe")
+
     @Cached.method(name="daily (monthly) anomaly values")
     def anomaly(self):
         """
@@ -343,17 +404,116 @@ class ClimateData(Data, Cached):
         """
         # If data are anomalies skip automatic calculation of anomalies
         if self.anomalies:
-            return self._full_observable
+            return self.observable()
+
+        return self.write_anomaly()
+
+    def write_anomaly(self, out=None, max_bytes=2**26):
+        """
+        Calculate anomaly time series from observable into a given array.
 
-        observable = self.observable()
-        time_cycle = self.time_cycle
-        anomaly = np.zeros(observable.shape)
+        For lazily loaded data, the computation proceeds in spatial blocks of
+        the current view (see :meth:`.Data.observable_blocks`), such that the
+        data are read from disk only once and without holding the whole
+        observable in memory. Passing a memory-mapped ``out`` array thus
+        allows to compute the anomalies of data sets that do not fit into
+        memory, and passing :meth:`observable` itself computes them in place.
+        Unlike :meth:`anomaly`, the result is not cached. If the data are
+        anomalies already, the observable is copied to ``out`` unchanged.
+
+        .. note::
+           Only the currently selected spatio-temporal window is considered.
+
+        **Example:**
+
+        >>> data = ClimateData.SmallTestData()
+        >>> out = np.empty(data.observable().shape, dtype=np.float32)
+        >>> r(data.write_anomaly(out=out)[:,0])
+        array([-0.5 , -0.321 , -0.1106,  0.1106,  0.321 ,
+                0.5 ,  0.321 ,  0.1106, -0.1106, -0.321 ])
+
+        :type out: 2D array [time, node index]
+        :arg out: The output array. If None, a new array of the floating
+            point type of the observable (at least ``float32``) is created.
+        :arg int max_bytes: The target size of a single block.
+        :rtype: 2D array [time, node index]
+        :return: the anomalized time series, i.e., ``out``.
+        """
+        shape = (self.grid.grid_size()["time"],
+                 self.grid.grid_size()["space"])
+        if out is None:
+            dtype = FIELD if self._observable is None else \
+                np.result_type(self._observable.dtype, FIELD)
+            out = np.empty(shape, dtype=dtype)
+        assert out.shape == shape, "output array has wrong shape"
 
         #  Thanks to Jakob Runge
-        for i in range(time_cycle):
-            sample = observable[i::time_cycle, :]
-            anomaly[i::time_cycle, :] = sample - sample.mean(axis=0)
-        return anomaly
+        for block, values in self._anomaly_blocks(max_bytes):
+            #  If data are anomalies skip calculation of anomalies
+            if self.anomalies:
+                out[:, block] = values
+                continue
+            phase_mean = self._phase_mean(values, self.time_cycle)
+            self._subtract_phase_mean(values, phase_mean, out[:, block])
+        return out
+
+    def anomaly_blocks(self, axis=0, selected_indices=None, max_bytes=2**26):
+        """
+        Iterate over the anomaly time series of the current view in blocks.
+
+        The anomalies are computed block by block from
+        :meth:`.Data.observable_blocks`, such that lazily loaded data are
+        never held in memory as a whole. Temporal blocks (``axis=0``) are
+        anomalized with the cached :meth:`phase_mean`, spatial blocks
+        (``axis=1``) with the mean values of the block itself.
+
+        .. note::
+           Only the currently selected spatio-temporal window is considered.
+
+        **Example:**
+
+        >>> data = ClimateData.SmallTestData()
+        >>> [(b.start, b.stop, v.shape) for b, v in data.anomaly_blocks(
+        ...     axis=0, selected_indices=[0, 1, 2, 8], max_bytes=144)]
+        [(0, 3, (3, 6)), (3, 6, (0, 6)), (6, 9, (1, 6)), (9, 10, (0, 6))]
+        >>> np.allclose(np.vstack([v for _, v in data.anomaly_blocks()]),
+        ...             data.anomaly())
+        True
+
+        :arg int axis: The axis along which the view is partitioned
+            (0: temporal blocks, 1: spatial blocks).
+        :type selected_indices: 1D array [index]
+        :arg selected_indices: The increasing time indices to be included,
+            e.g., from :meth:`indices_selected_months`. If None, all time
+            indices are included.
+        :arg int max_bytes: The target size of a single block.
+        :rtype: iterator of tuple (slice, 2D array [time, node index])
+        :return: the position of each block along ``axis`` within the current
+            view, and its anomaly values at the selected time indices.
+        """
+        if selected_indices is not None:
+            selected = np.zeros(self.grid.grid_size()["time"], dtype=bool)
+            selected[selected_indices] = True
+        if axis == 0 and not self.anomalies:
+            phase_mean = self.phase_mean()
+
+        for block, values in self.observable_blocks(axis, max_bytes):
+            rows = slice(None) if selected_indices is None else \
+                selected[block] if axis == 0 else selected
+            if not self.anomalies:
+                out = np.empty(values.shape,
+                               dtype=np.result_type(values.dtype, FIELD))
+                if axis == 0:
+                    phases = np.arange(block.start, block.stop) \
+                        % self.time_cycle
+                    np.subtract(values, phase_mean[phases].astype(out.dtype),
+                                out=out, casting="unsafe")
+                else:
+                    self._subtract_phase_mean(
+                        values, self._phase_mean(values, self.time_cycle),
+                        out)
+                values = out
+            yield block, values[rows]
 
     def anomaly_selected_months(self, selected_months):
         """
@@ -395,13 +555,12 @@ class ClimateData(Data, Cached):
         if self.silence_level <= 1:
             print("Shuffling anomaly time series for significance tests...")
 
-        N = self.grid.grid_size()["space"]
-        shuffled_anomaly = np.empty(self.anomaly().shape)
+        anomaly = self.anomaly()
+        (n_time, N) = anomaly.shape
+        shuffled_anomaly = np.empty_like(anomaly)
 
         for i in range(N):
-            temp = self.anomaly()[:, i].copy()
-            random.shuffle(temp)
-            shuffled_anomaly[:, i] = temp
+            shuffled_anomaly[:, i] = anomaly[random.permutation(n_time), i]
 
         return shuffled_anomaly
 
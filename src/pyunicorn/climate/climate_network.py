@@ -21,9 +21,12 @@ from collections.abc import Hashable, Callable
 
 import numpy as np
 import igraph
+import h5py
 
 from ..core.cache import Cached
-from ..core import GeoNetwork, GeoGrid
+from ..utils import instrument
+from ..core._ext.types import FIELD
+from ..core import Network, GeoNetwork, GeoGrid
 
 
 class ClimateNetwork(GeoNetwork):
@@ -42,6 +45,7 @@ class ClimateNetwork(GeoNetwork):
     #
 
     # pylint: disable=too-many-positional-arguments
+    @instrument.traced
     def __init__(self, grid: GeoGrid, similarity_measure: np.ndarray,
                  threshold=None, link_density=None, non_local=False,
                  directed=False, node_weight_type="surface", silence_level=0):
@@ -72,23 +76,10 @@ class ClimateNetwork(GeoNetwork):
             used.
         :arg int silence_level: The inverse level of verbosity of the object.
         """
-        #  Initialize
-        assert isinstance(grid, GeoGrid)
-        self.grid: GeoGrid = grid
-        self.directed = directed
-        self.silence_level = silence_level
-
-        # mutation count
-        if not hasattr(self, "_mut_clim"):
-            self._mut_clim: int = 0
-        else:
-            self._mut_clim += 1
-
         #  FIXME: Is taking the absolute value by default OK?
-        self._similarity_measure = np.abs(similarity_measure.astype("float32"))
-        self._non_local = non_local
-        self.N = grid.N
-        self.node_weight_type = node_weight_type
+        self._init_climate_network(
+            grid, np.abs(similarity_measure.astype("float32")), non_local,
+            directed, node_weight_type, silence_level)
 
         #  Sets the threshold and generates the network by thresholding and
         #  calling the "constructor" of parent class GeoNetwork.
@@ -104,6 +95,31 @@ class ClimateNetwork(GeoNetwork):
                             node_weight_type=self.node_weight_type,
                             silence_level=self.silence_level)
 
+    # pylint: disable=too-many-positional-arguments
+    def _init_climate_network(self, grid: GeoGrid, similarity_measure,
+                              non_local, directed, node_weight_type,
+                              silence_level):
+        """
+        Set the attributes of a climate network which precede the
+        construction of its adjacency matrix, shared by :meth:`__init__` and
+        :meth:`LoadHDF5`.
+        """
+        assert isinstance(grid, GeoGrid)
+        self.grid: GeoGrid = grid
+        self.directed = directed
+        self.silence_level = silence_level
+
+        # mutation count
+        if not hasattr(self, "_mut_clim"):
+            self._mut_clim: int = 0
+        else:
+            self._mut_clim += 1
+
+        self._similarity_measure = similarity_measure
+        self._non_local = non_local
+        self.N = grid.N
+        self.node_weight_type = node_weight_type
+
     def __cache_state__(self) -> Tuple[Hashable, ...]:
         return GeoNetwork.__cache_state__(self) + (self._mut_clim,)
 
@@ -280,6 +296,103 @@ class ClimateNetwork(GeoNetwork):
         net._mut_la += 1
         return net
 
+    def save_hdf5(self, filename, compression=None,
+                  similarity_dtype="float32"):
+        """
+        Save the ClimateNetwork object to a binary HDF5 file.
+
+        In addition to the data stored by :meth:`.Network.save_hdf5`, the
+        grid, the threshold and the similarity measure are stored. The
+        similarity measure is written in blocks of rows, optionally in half
+        precision and compressed.
+
+        :arg str filename: The name of the HDF5 file.
+        :arg str compression: The HDF5 compression filter applied to large
+            arrays, e.g. ``"gzip"`` or ``"lzf"``. ``None`` means no
+            compression.
+        :arg str similarity_dtype: The data type of the stored similarity
+            measure (``"float32"`` or ``"float16"``), or ``None`` to omit it.
+        """
+        with h5py.File(filename, "w") as f:
+            self._write_hdf5(f, compression)
+            if similarity_dtype is not None:
+                similarity_measure = self.similarity_measure()
+                rows = max(1, min(self.N, 2**20 // max(self.N, 1)))
+                dataset = f.create_dataset(
+                    "similarity_measure", shape=similarity_measure.shape,
+                    dtype=similarity_dtype, compression=compression,
+                    chunks=(rows, self.N) if compression else None)
+                for start in range(0, self.N, rows):
+                    dataset[start:start + rows] = \
+                        similarity_measure[start:start + rows]
+
+    def _write_hdf5(self, f, compression):
+        """
+        Write the network, its grid and construction parameters to an open
+        HDF5 file.
+        """
+        GeoNetwork._write_hdf5(self, f, compression)
+        f.attrs["threshold"] = self.threshold()
+        f.attrs["non_local"] = self.non_local()
+
+    @staticmethod
+    # pylint: disable=too-many-positional-arguments
+    def LoadHDF5(filename, similarity_measure=True, mmap=False,
+                 link_attributes=True, silence_level=0):
+        """
+        Return a ClimateNetwork object stored in a binary HDF5 file.
+
+        See :meth:`save_hdf5`. The network is restored from the stored
+        adjacency matrix, i.e., without thresholding the similarity measure
+        again.
+
+        :arg str filename: The name of the HDF5 file.
+        :arg bool similarity_measure: Whether to load the similarity measure.
+            If False or if it has not been stored, :meth:`similarity_measure`
+            is not available.
+        :arg bool mmap: Whether to memory-map the similarity measure instead
+            of reading it, which requires that it was stored uncompressed in
+            single precision.
+        :type link_attributes: bool or list of str
+        :arg link_attributes: Whether to restore all link attributes, or the
+            names of the link attributes to be restored.
+        :arg int silence_level: The inverse level of verbosity of the object.
+        :rtype: ClimateNetwork object
+        :return: :class:`ClimateNetwork` instance.
+        """
+        with h5py.File(filename, "r") as f:
+            #  Restore the stored adjacency matrix instead of thresholding
+            #  the similarity measure again
+            net = ClimateNetwork.__new__(ClimateNetwork)
+            similarity = None
+            if similarity_measure and "similarity_measure" in f:
+                dataset = f["similarity_measure"]
+                offset = dataset.id.get_offset()
+                if mmap:
+                    assert offset is not None \
+                        and dataset.dtype == np.float32, \
+                        "only uncompressed float32 data can be memory-mapped"
+                    similarity = np.memmap(
+                        filename, dtype=np.float32, mode="r",
+                        offset=offset, shape=dataset.shape)
+                else:
+                    similarity = dataset.astype("float32")[:]
+            net._init_climate_network(
+                GeoGrid._read_hdf5(f["grid"], silence_level), similarity,
+                bool(f.attrs["non_local"]), bool(f.attrs["directed"]),
+                f.attrs["node_weight_type"] or None, silence_level)
+            net._threshold = f.attrs["threshold"]
+            if similarity is None:
+                del net._similarity_measure
+
+            GeoNetwork.__init__(net, adjacency=Network._read_hdf5_adjacency(f),
+                                grid=net.grid, directed=net.directed,
+                                node_weight_type=net.node_weight_type,
+                                silence_level=silence_level)
+            net.node_weights = f["node_weights"][:]
+            net._read_hdf5_link_attributes(f, link_attributes)
+        return net
+
     #
     #  Methods for testing purposes
     #
@@ -480,11 +593,27 @@ class ClimateNetwork(GeoNetwork):
             print("Extracting network adjacency matrix removing local "
                   "connections...")
 
-        weighted_similarity = similarity_measure * \
-            (0.5 * (np.tanh(a * (self.grid.angular_distance() - d_min)) + 1))
-        # The above line is a function that provides a smooth
-        # transition of distance weight, centered around distance d_min.
-        # Other sigmoidal type functions could be used as well.
+        def weight(D):
+            # A function that provides a smooth transition of distance
+            # weight, centered around distance d_min. Other sigmoidal type
+            # functions could be used as well.
+            return 0.5 * (np.tanh(a * (D - d_min)) + 1)
+
+        if a <= 0:
+            weighted_similarity = \
+                similarity_measure * weight(self.grid.angular_distance())
+        else:
+            #  In single precision, the weight equals one beyond the
+            #  transition region, so that only the pairs of nodes closer
+            #  than that need to be weighted, which are found by a radius
+            #  query on the grid.
+            weighted_similarity = np.array(
+                similarity_measure,
+                dtype=np.result_type(similarity_measure, FIELD))
+            i, j = self.grid.pairs_within(d_min + 10. / a).T
+            w = weight(self.grid.angular_pair_distance(i, j))
+            weighted_similarity[i, j] *= w
+            weighted_similarity[j, i] *= w
 
         return self._calculate_threshold_adjacency(weighted_similarity,
                                                    threshold)
@@ -305,7 +305,8 @@ class CoupledClimateNetwork(InteractingNetworks, ClimateNetwork):
         :rtype: 2D array [index_1, index_2]
         :return: the cross link distance matrix.
         """
-        return self.distance()[self.nodes_1, :][:, self.nodes_2]
+        return self.grid.pair_distance(
+            np.asarray(self.nodes_1)[:, np.newaxis], self.nodes_2)
 
     #
     #  Define scalar coupled network statistics
@@ -152,8 +152,9 @@ class EventSeriesClimateNetwork(EventSeries, ClimateNetwork):
         self.__symmetry = kwargs.get("symmetrization", 'directed')
         self.directed = self.__symmetry == "directed"
 
-        # Construct an EventSeries object with the chosen parameters
-        EventSeries.__init__(self, data.observable(), **ES_kwargs)
+        # Construct an EventSeries object with the chosen parameters, reading
+        # the observable in spatial blocks
+        EventSeries.__init__(self, data, **ES_kwargs)
 
         # Compute matrix for link weights of ClimateNetwork from event
         # synchronization or event coincidence analysis with chosen symmetry
@@ -18,15 +18,133 @@ Provides classes for generating and analyzing complex climate networks.
 
 from typing import Tuple
 from collections.abc import Hashable
+from functools import partial
 
 import numpy as np
+from scipy.special import xlogy
 
-from ..core._ext.types import to_cy, FIELD
-from ._ext.numerics import mutual_information
+from ..core.cache import Cached
+from ..core._ext.types import ADJ, DFIELD, FIELD, SYMBOL
+from ..utils import executor
+from ..utils.executor import Shared
+from ._ext.numerics import _mutual_information_rows
 from .climate_data import ClimateData
 from .climate_network import ClimateNetwork
 
 
+def _spatial_blocks(array, max_bytes=2**26):
+    """
+    Iterate over blocks of consecutive columns of a 2D array [time, index],
+    together with their positions.
+    """
+    step = max(1, max_bytes // max(array.shape[0] * array.itemsize, 1))
+    for start in range(0, array.shape[1], step):
+        block = slice(start, min(start + step, array.shape[1]))
+        yield block, array[:, block]
+
+
+def _symbolize(blocks, N, n_bins):
+    """
+    Return the bin numbers of N time series and their marginal entropies.
+
+    Each time series is normalized to zero mean and unit variance, and all
+    are binned into ``n_bins`` bins of equal width spanning their common
+    range, as in the Tisean 3.0.1 mutual.c module. Time series with vanishing
+    variance are constant zero after normalization. The time series are read
+    twice from spatial blocks, first for their moments and common range, and
+    then for binning.
+
+    :type blocks: callable
+    :arg blocks: Returns an iterator over the spatial blocks of the time
+        series as tuples (slice, 2D array [time, index]), as
+        :meth:`.ClimateData.anomaly_blocks` with ``axis=1``.
+    :arg int N: The number of time series.
+    :arg int n_bins: The number of bins, at most 256.
+    :rtype: tuple (2D array (uint8) [index, time], 1D array [index])
+    :return: the bin numbers and the entropies (in nats) of their
+        distributions.
+    """
+    if not 0 < n_bins <= 256:
+        raise ValueError("The number of bins must be between 1 and 256.")
+    mean, scale = np.zeros(N), np.zeros(N)
+    lo, hi = 0.0, 0.0
+    for block, values in blocks():
+        values = np.asarray(values, dtype=DFIELD)
+        mean[block], std = values.mean(axis=0), values.std(axis=0)
+        scale[block] = np.divide(1, std, out=np.zeros_like(std),
+                                 where=std > 0)
+        if len(values):
+            lo = min(lo, ((values.min(axis=0) - mean[block])
+                          * scale[block]).min(initial=0))
+            hi = max(hi, ((values.max(axis=0) - mean[block])
+                          * scale[block]).max(initial=0))
+    width = n_bins / (hi - lo) if hi > lo else 0.0
+
+    symbols, entropy = None, np.zeros(N)
+    for block, values in blocks():
+        if symbols is None:
+            symbols = np.empty((N, len(values)), dtype=SYMBOL)
+        x = ((values - mean[block]) * scale[block] - lo) * width
+        symbols[block] = np.clip(x, 0, n_bins - 1).T
+        #  Histograms of all time series in the block at once
+        n, T = symbols[block].shape
+        offsets = n_bins * np.arange(n)[:, None]
+        counts = np.bincount((symbols[block] + offsets).ravel(),
+                             minlength=n * n_bins).reshape(n, n_bins)
+        entropy[block] = np.log(T) - xlogy(counts, counts).sum(axis=1) / T
+    return symbols, entropy
+
+
+def _mutual_information_block(symbols, entropy, n_bins, threshold, start,
+                              end):
+    """
+    Return the rows ``start <= i < end`` of the upper triangle of the mutual
+    information matrix, or of its adjacency matrix for the given
+    ``threshold``.
+    """
+    upper = _mutual_information_rows(symbols, entropy, n_bins, start, end)
+    return upper if threshold is None else (upper > threshold).astype(ADJ)
+
+
+def _mutual_information_matrix(symbols, entropy, n_bins, threshold=None):
+    """
+    Return the mutual information matrix of time series given by their bin
+    numbers and marginal entropies (see :func:`_symbolize`).
+
+    The joint histograms are computed by a compiled kernel for ranges of rows
+    with similar costs on the default executor. If a ``threshold`` is given,
+    each range of rows is thresholded as soon as it is computed, such that
+    only the adjacency matrix of the pairs with mutual information above the
+    threshold is assembled.
+
+    :type symbols: 2D array (uint8) [index, time]
+    :arg symbols: The bin numbers of the time series.
+    :type entropy: 1D array [index]
+    :arg entropy: The entropies of the bin numbers.
+    :arg int n_bins: The number of bins.
+    :arg float threshold: The optional threshold.
+    :rtype: 2D array [index, index]
+    :return: the mutual information matrix (float32), or the adjacency
+        matrix (int8).
+    """
+    N = len(symbols)
+    row_costs = N - np.arange(N)
+    ex = executor.get_default()
+    ranges = ex.partition(row_costs)
+    shared = (Shared(symbols), Shared(entropy))
+    results = ex.map(_mutual_information_block,
+                     [shared + (n_bins, threshold, start, end)
+                      for start, end in ranges],
+                     costs=[row_costs[start:end].sum()
+                            for start, end in ranges])
+
+    matrix = np.zeros((N, N), dtype=FIELD if threshold is None else ADJ)
+    for (start, end), upper in zip(ranges, results):
+        matrix[start:end] = upper
+    matrix += matrix.T
+    return matrix
+
+
 class MutualInfoClimateNetwork(ClimateNetwork):
     """
     Represents a mutual information climate network.
@@ -47,7 +165,7 @@ class MutualInfoClimateNetwork(ClimateNetwork):
     # pylint: disable=too-many-positional-arguments
     def __init__(self, data, threshold=None, link_density=None,
                  non_local=False, node_weight_type="surface", winter_only=True,
-                 silence_level=0):
+                 silence_level=0, n_bins=32):
         """
         Initialize an instance of MutualInfoClimateNework.
 
@@ -74,6 +192,8 @@ class MutualInfoClimateNetwork(ClimateNetwork):
             analysis. Possibly, this further suppresses the annual cycle in the
             time series.
         :arg int silence_level: The inverse level of verbosity of the object.
+        :arg int n_bins: The number of bins for estimating probability
+            distributions, at most 256.
         """
         if silence_level <= 1:
             print("Generating a mutual information climate network...")
@@ -86,12 +206,8 @@ class MutualInfoClimateNetwork(ClimateNetwork):
         self.N = self.data.grid.N
         self._prescribed_link_density = link_density
         self._winter_only = winter_only
-
-        #  Class specific settings
-        self.mi_file = "mutual_information_" + data.data_source + "_" \
-            + data.observable_name + ".data"
-        """(string) - The name of the file for storing the mutual information
-                      matrix."""
+        self.n_bins = n_bins
+        """The number of bins for estimating probability distributions."""
 
         self._set_winter_only(winter_only)
         ClimateNetwork.__init__(self, grid=self.data.grid,
@@ -111,19 +227,42 @@ class MutualInfoClimateNetwork(ClimateNetwork):
         """
         return 'MutualInfoClimateNetwork:\n' + ClimateNetwork.__str__(self)
 
-    def _cython_calculate_mutual_information(self, anomaly, n_bins=32):
+    def _symbols(self, anomaly=None, n_bins=None):
+        """
+        Return the bin numbers and marginal entropies of the anomaly time
+        series (see :func:`_symbolize`).
+
+        :type anomaly: 2D Numpy array (time, index)
+        :arg anomaly: The anomaly time series. If None, the anomalies of
+            :attr:`data` are read in spatial blocks (see
+            :meth:`.ClimateData.anomaly_blocks`), restricted to the winter
+            months if :meth:`winter_only`.
+        :arg int n_bins: The number of bins. If None, :attr:`n_bins`.
+        """
+        n_bins = self.n_bins if n_bins is None else n_bins
+        if anomaly is None:
+            selected = self.data.indices_selected_months([0, 1, 11]) \
+                if self._winter_only else None
+            blocks = partial(self.data.anomaly_blocks, axis=1,
+                             selected_indices=selected)
+        else:
+            blocks = partial(_spatial_blocks, anomaly)
+        return _symbolize(blocks, self.N, n_bins)
+
+    def _cython_calculate_mutual_information(self, anomaly, n_bins=None):
         """
         Calculate the mutual information matrix at zero lag.
 
-        The cython code is adopted from the Tisean 3.0.1 mutual.c module.
+        The binning is adopted from the Tisean 3.0.1 mutual.c module: each
+        time series is normalized and binned once (see :func:`_symbolize`),
+        and the joint histograms of all pairs are computed from the bin
+        numbers by a compiled kernel.
 
         :type anomaly: 2D Numpy array (time, index)
         :arg anomaly: The anomaly time series.
 
         :arg int n_bins: The number of bins for estimating probability
-            distributions.
-        :arg bool fast: Indicates, whether fast or slow algorithm should be
-            used.
+            distributions. If None, :attr:`n_bins`.
         :rtype: 2D array (index, index)
         :return: the mutual information matrix at zero lag.
         """
@@ -131,24 +270,9 @@ class MutualInfoClimateNetwork(ClimateNetwork):
             print("Calculating mutual information matrix at zero lag from "
                   "anomaly values using cython...")
 
-        #  Normalize anomaly time series to zero mean and unit variance
-        self.data.normalize_time_series_array(anomaly)
-
-        #  Create local transposed copy of anomaly
-        anomaly = anomaly.T.copy()
-
-        (N, n_samples) = anomaly.shape
-
-        #  Get common range for all histograms
-        range_min = float(anomaly.min())
-        range_max = float(anomaly.max())
-
-        #  Rescale all time series to the interval [0,1],
-        #  using the maximum range of the whole dataset.
-        scaling = 1./(range_max - range_min)
-
-        mi = mutual_information(
-            to_cy(anomaly, FIELD), n_samples, N, n_bins, scaling, range_min)
+        n_bins = self.n_bins if n_bins is None else n_bins
+        mi = _mutual_information_matrix(
+            *self._symbols(anomaly, n_bins), n_bins)
 
         if self.silence_level <= 1:
             print("Done!")
@@ -175,45 +299,58 @@ class MutualInfoClimateNetwork(ClimateNetwork):
         Return mutual information matrix at zero lag.
 
         Check if mutual information matrix (MI) was already calculated before:
-          - If yes, return MI from a data file.
-          - If not, return MI from calculation and store in file.
+          - If yes, return MI from the persistent cache.
+          - If not, return MI from calculation and store in the cache.
+
+        The persistent cache is :attr:`Cached.disk_cache
+        <pyunicorn.core.cache.Cached.disk_cache>`, such that nothing is
+        written to disk unless it has been configured. Entries are keyed by
+        the binned anomaly time series, which fully determine the MI, and by
+        the package version (see :meth:`.DiskCache.key`).
 
         :type anomaly: 2D Numpy array (time, index)
-        :arg anomaly: The anomaly time series.
-        :arg bool dump: Store MI in data file.
+        :arg anomaly: The anomaly time series. If None, the anomalies of
+            :attr:`data` are read in spatial blocks, restricted to the winter
+            months if :meth:`winter_only`.
+        :arg bool dump: Use the persistent cache, if configured.
 
         :rtype: 2D Numpy array (index, index)
         :return: the mutual information matrix at zero lag.
         """
-        try:
-            #  Try to load MI from file
+        symbols, entropy = self._symbols(anomaly)
+        cache = Cached.disk_cache
+        if cache is None or not dump:
+            return _mutual_information_matrix(symbols, entropy, self.n_bins)
+
+        key = cache.key(f"{__name__}.mutual_information", symbols)
+        mi = cache.load(key)
+        if mi is not None and mi.shape == (self.N, self.N):
             if self.silence_level <= 1:
-                print("Loading mutual information matrix from "
-                      f"{self.mi_file}...")
-
-            with open(self.mi_file, 'r', encoding="utf-8") as f:
-                mi = np.load(f)
-                #  Check if the dimensions of mutual_information correspond to
-                #  the grid.
-                if mi.shape != (self.N, self.N):
-                    print(f"{self.mi_file} in current directory has "
-                          "incorrect dimensions!")
-                    raise RuntimeError
-
-        except (IOError, RuntimeError):
-            if self.silence_level <= 1:
-                print("An error occured while loading data from "
-                      f"{self.mi_file}.")
-                print("Recalculating mutual information.")
+                print(f"Loaded mutual information matrix from {cache}.")
+        else:
+            mi = _mutual_information_matrix(symbols, entropy, self.n_bins)
+            if cache.store(key, mi) and self.silence_level <= 1:
+                print(f"Stored mutual information matrix in {cache}.")
+        return mi
 
-            mi = self._cython_calculate_mutual_information(anomaly)
-            if dump:
-                with open(self.mi_file, 'w', encoding="utf-8") as f:
-                    if self.silence_level <= 1:
-                        print("Storing in", self.mi_file)
-                    mi.dump(f)
+    def mutual_information_adjacency(self, threshold, anomaly=None):
+        """
+        Return the adjacency matrix of the pairs of nodes with mutual
+        information at zero lag above ``threshold``.
 
-        return mi
+        The mutual information matrix is thresholded in blocks of rows as it
+        is computed, and never held in memory as a whole.
+
+        :arg float threshold: The threshold of mutual information.
+        :type anomaly: 2D Numpy array (time, index)
+        :arg anomaly: The anomaly time series. If None, the anomalies of
+            :attr:`data` are used as in :meth:`mutual_information`.
+
+        :rtype: 2D Numpy array (int8) [index, index]
+        :return: the adjacency matrix.
+        """
+        return _mutual_information_matrix(
+            *self._symbols(anomaly), self.n_bins, threshold=threshold)
 
     def winter_only(self):
         """
@@ -230,15 +367,10 @@ class MutualInfoClimateNetwork(ClimateNetwork):
 
         :arg bool winter_only: Indicates whether only winter months were used
             for network generation.
-        :arg bool dump: Store MI in data file.
+        :arg bool dump: Use the persistent cache, if configured.
         """
         self._winter_only = winter_only
-        if winter_only:
-            winter_anomaly = self.data.anomaly_selected_months([0, 1, 11])
-            mi = self.mutual_information(winter_anomaly, dump=dump)
-        else:
-            mi = self.mutual_information(self.data.anomaly(), dump=dump)
-        self._similarity_measure = mi
+        self._similarity_measure = self.mutual_information(dump=dump)
 
     def set_winter_only(self, winter_only, dump=True):
         """
@@ -248,7 +380,7 @@ class MutualInfoClimateNetwork(ClimateNetwork):
 
         :arg bool winter_only: Indicates whether only winter months were used
             for network generation.
-        :arg bool dump: Store MI in data file.
+        :arg bool dump: Use the persistent cache, if configured.
         """
         self._set_winter_only(winter_only, dump=dump)
         self._regenerate_network()
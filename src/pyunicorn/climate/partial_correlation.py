@@ -23,7 +23,8 @@ Provides classes for generating and analyzing complex climate networks.
 #  Import NumPy for the array object and fast numerics
 import numpy as np
 
-from .tsonis import TsonisClimateNetwork
+from .tsonis import TsonisClimateNetwork, _correlation_from_blocks, \
+    _temporal_blocks
 
 
 #
@@ -106,14 +107,43 @@ class PartialCorrelationClimateNetwork(TsonisClimateNetwork):
         :rtype: 2D Numpy array (index, index)
         :return: the partial correlation matrix at zero lag.
         """
+        return self._partial_correlation(
+            _correlation_from_blocks(_temporal_blocks(anomaly),
+                                     anomaly.shape[1]))
+
+    def _data_correlation(self, selected_indices=None):
+        """
+        Return the partial correlation matrix at zero lag of the anomaly time
+        series of :attr:`data`, whose correlation matrix is accumulated over
+        temporal blocks (see :meth:`.ClimateData.anomaly_blocks`).
+
+        :type selected_indices: 1D Numpy array (time)
+        :arg selected_indices: The time indices to be included. If None, all
+            time indices are included.
+
+        :rtype: 2D Numpy array (index, index)
+        :return: the partial correlation matrix at zero lag.
+        """
+        blocks = self.data.anomaly_blocks(axis=0,
+                                          selected_indices=selected_indices)
+        return self._partial_correlation(_correlation_from_blocks(
+            (values for _, values in blocks), self.N))
+
+    def _partial_correlation(self, C):
+        """
+        Return the partial correlation matrix from the correlation matrix.
+
+        :type C: 2D Numpy array (index, index)
+        :arg C: the correlation matrix in double precision, for precise
+                calculation of the inverse matrix.
+
+        :rtype: 2D Numpy array (index, index)
+        :return: the partial correlation matrix.
+        """
         if self.silence_level <= 1:
             print("Calculating partial correlation matrix at zero lag from "
                   "anomaly values...")
 
-        #  Calculate the correlation matrix, cast to float64 for precise
-        #  calculation of inverse matrix.
-        C = np.corrcoef(anomaly.transpose()).astype("float64")
-
         #  Calculate the inverse correlation matrix
         if np.linalg.det(C) != 0.0:
             C_inv = np.linalg.inv(C)
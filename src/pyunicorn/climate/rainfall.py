@@ -20,14 +20,58 @@ Provides classes for generating and analyzing complex climate networks.
 #  Import essential packages
 #
 
-# import numpy as np
+import numpy as np
+from scipy import stats
 
-from ..core._ext.types import to_cy, MASK, FIELD
-from ._ext.numerics import spearman_corr
+from ..core._ext.types import to_cy, FIELD, DFIELD
+from ..utils import executor        # parallelized computations
+from ..utils.executor import Shared
 
 #  Import cnTsonisClimateNetwork for TsonisClimateNetwork class
 from .climate_network import ClimateNetwork
 
+
+def _masked_spearman_rows(mask, ranks, start, end):
+    """
+    Return the rows ``start:end`` of the Spearman correlation matrix of rank
+    time series, where each pair of time series is restricted to the times
+    at which at least one of them is selected by the mask.
+
+    With the union mask :math:`w_t = m_{it} + m_{jt} - m_{it} m_{jt}`, all
+    masked moments of a pair expand into products of per-series vectors,
+    such that the moments of a block of rows are obtained from a few matrix
+    products against all series.
+
+    :type mask: 2D array [index, time] of float64
+    :arg mask: The mask (0 or 1) of selected times for each time series.
+    :type ranks: 2D array [index, time] of float64
+    :arg ranks: The centred rank time series.
+    :rtype: 2D array [index, index] of float32
+    :return: the correlation coefficients of the rows with all time series.
+    """
+    M, R = mask, ranks
+    MR = M * R
+    NR = R - MR                 # ranks at unselected times
+    NR2 = NR * R
+    c, a, b = M.sum(axis=1), MR.sum(axis=1), (MR * R).sum(axis=1)
+    rows = slice(start, end)
+
+    #  Masked sample size, sums, sums of squares and cross products
+    n = c[rows, None] + c[None, :] - M[rows] @ M.T
+    sx = a[rows, None] + NR[rows] @ M.T
+    sy = a[None, :] + M[rows] @ NR.T
+    sxx = b[rows, None] + NR2[rows] @ M.T
+    syy = b[None, :] + M[rows] @ NR2.T
+    sxy = MR[rows] @ NR.T + R[rows] @ MR.T
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        varx = sxx - sx**2 / n
+        vary = syy - sy**2 / n
+        valid = (n > 1) & (varx > 1e-12 * sxx) & (vary > 1e-12 * syy)
+        rho = np.where(valid, cov / np.sqrt(varx * vary), 0)
+    return np.clip(rho, -1, 1).astype(FIELD)
+
 #
 #  Define class RainfallClimateNetwork
 #
@@ -245,19 +289,29 @@ class RainfallClimateNetwork(ClimateNetwork):
         """
         Return rank time series.
 
+        Ranks start from one, and tied values are assigned the mean of their
+        ranks.
+
         :type anomaly: 2D Numpy array (index, time)
         :arg anomaly: the rainfall anomaly time series for each measuring point
 
         :rtype: 2D Numpy array (index, time)
         :return: The ranked time series for each gridpoint
         """
-        rank_time_series = anomaly.argsort(axis=1).argsort(axis=1) + 1.0
+        rank_time_series = stats.rankdata(anomaly, axis=1).astype(FIELD)
         return rank_time_series
 
     def spearman_corr(self, final_mask, anomaly):
         """
         Return the Spearman Correlation Matrix at zero lag.
 
+        For each pair of measuring points, the ranks of the full anomaly time
+        series are correlated at the times at which at least one of them is
+        selected by ``final_mask``. Pairs with less than two such times or
+        with constant ranks have zero correlation. The masked moments are
+        computed for blocks of rows in parallel, see
+        :func:`_masked_spearman_rows`.
+
         :type final_mask: 2D Numpy array (index, time)
         :arg final_mask: A bool array with False for every value in the
                          rainfall data, which are zero or outside the top_event
@@ -270,8 +324,16 @@ class RainfallClimateNetwork(ClimateNetwork):
         :rtype: 2D Numpy array (index, index)
         :return: the Spearman correlation matrix.
         """
-        # Get rank time series
-        time_series_ranked = self.rank_time_series(anomaly)
+        # Get centred rank time series
         m, tmax = anomaly.shape
-        return spearman_corr(
-            m, tmax, to_cy(final_mask, MASK), to_cy(time_series_ranked, FIELD))
+        ranks = to_cy(self.rank_time_series(anomaly), DFIELD)
+        ranks -= (tmax + 1) / 2
+        mask = to_cy(final_mask, DFIELD)
+
+        ex = executor.get_default()
+        ranges = ex.partition(np.ones(m))
+        mask, ranks = Shared(mask), Shared(ranks)
+        rows = ex.map(_masked_spearman_rows,
+                      [(mask, ranks, start, end) for start, end in ranges],
+                      costs=[end - start for start, end in ranges])
+        return np.vstack(rows) if rows else np.zeros((0, 0), dtype=FIELD)
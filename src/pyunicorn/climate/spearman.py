@@ -22,9 +22,13 @@ Provides classes for generating and analyzing complex climate networks.
 
 #  Import NumPy for the array object and fast numerics
 import numpy as np
+from scipy import stats
+
+from ..core._ext.types import FIELD
 
 #  Import cnTsonisClimateNetwork for TsonisClimateNetwork class
-from .tsonis import TsonisClimateNetwork
+from .tsonis import TsonisClimateNetwork, _correlation_from_blocks, \
+    _temporal_blocks
 
 
 #
@@ -107,7 +111,16 @@ class SpearmanClimateNetwork(TsonisClimateNetwork):
         """
         Return rank time series.
 
-        Ranks are generated individually for each time series.
+        Ranks are generated individually for each time series, starting from
+        zero. Tied values are assigned the mean of their ranks.
+
+        **Example:**
+
+        >>> SpearmanClimateNetwork.rank_time_series(
+        ...     np.array([[0.3, 2.], [0.1, 2.], [0.2, 1.]]))
+        array([[2. , 1.5],
+               [0. , 1.5],
+               [1. , 0. ]], dtype=float32)
 
         :type anomaly: 2D Numpy array [time, index]
         :arg anomaly: The anomaly time series to be converted into ranks.
@@ -116,9 +129,31 @@ class SpearmanClimateNetwork(TsonisClimateNetwork):
         :return: the rank time series.
         """
         #  Obtain rank time series
-        rank_time_series = anomaly.argsort(axis=0).argsort(axis=0)
+        rank_time_series = stats.rankdata(anomaly, axis=0) - 1
+
+        return rank_time_series.astype(FIELD)
+
+    def _rank_correlation(self, ranks):
+        """
+        Return Spearman's rho matrix from rank time series, as the Pearson
+        correlation matrix of the ranks accumulated over temporal blocks.
+
+        :type ranks: 2D Numpy array (time, index)
+        :arg ranks: the rank time series, which are centred in place.
+
+        :rtype: 2D Numpy array (index, index)
+        :return: the Spearman's rho matrix.
+        """
+        if self.silence_level <= 1:
+            print("Calculating Spearman Rho matrix at zero lag from ranks...")
+
+        #  Centre the ranks, whose mean is the same for all time series
+        ranks -= (len(ranks) - 1) / 2
 
-        return rank_time_series
+        #  Cast to float32 type to save memory since correlation coefficients
+        #  are not needed in high floating point precision.
+        return _correlation_from_blocks(
+            _temporal_blocks(ranks), ranks.shape[1]).astype(FIELD)
 
     def _calculate_correlation(self, anomaly):
         """
@@ -131,15 +166,28 @@ class SpearmanClimateNetwork(TsonisClimateNetwork):
         :rtype: 2D Numpy array (index, index)
         :return: the Spearman's rho matrix at zero lag.
         """
-        if self.silence_level <= 1:
-            print("Calculating Spearman Rho matrix at zero lag from anomaly "
-                  "values...")
-
         #  Convert anomaly time series to time series of ranks
-        ranks = self.rank_time_series(anomaly)
+        return self._rank_correlation(self.rank_time_series(anomaly))
 
-        #  Cast to float32 type to save memory since correlation coefficients
-        #  are not needed in high floating point precision.
-        spearman_rho = np.corrcoef(ranks.transpose()).astype("float32")
+    def _data_correlation(self, selected_indices=None):
+        """
+        Return Spearman's rho matrix at zero lag of the anomaly time series of
+        :attr:`data`.
+
+        The ranks are computed once from spatial blocks of the anomalies (see
+        :meth:`.ClimateData.anomaly_blocks`) and stored in single precision.
+
+        :type selected_indices: 1D Numpy array (time)
+        :arg selected_indices: The time indices to be included. If None, all
+            time indices are included.
 
-        return spearman_rho
+        :rtype: 2D Numpy array (index, index)
+        :return: the Spearman's rho matrix at zero lag.
+        """
+        ranks = None
+        for block, values in self.data.anomaly_blocks(
+                axis=1, selected_indices=selected_indices):
+            if ranks is None:
+                ranks = np.empty((len(values), self.N), dtype=FIELD)
+            ranks[:, block] = self.rank_time_series(values)
+        return self._rank_correlation(ranks)
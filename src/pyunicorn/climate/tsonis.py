@@ -17,10 +17,60 @@ Provides classes for generating and analyzing complex climate networks.
 """
 
 import numpy as np
+from scipy.linalg import blas
 
 from .climate_network import ClimateNetwork
 from .climate_data import ClimateData
 from ..core.cache import Cached
+from ..core._ext.types import FIELD, DFIELD
+
+
+def _temporal_blocks(array, max_bytes=2**26):
+    """
+    Iterate over blocks of consecutive rows of a 2D array [time, index].
+    """
+    step = max(1, max_bytes // max(array.shape[1] * array.itemsize, 1))
+    for start in range(0, array.shape[0], step):
+        yield array[start:start + step]
+
+
+def _correlation_from_blocks(blocks, N):
+    """
+    Return the Pearson correlation matrix of N time series given in temporal
+    blocks.
+
+    The Gram matrix of the time series is accumulated by one symmetric rank-k
+    update (BLAS ``dsyrk``) per block, after shifting all blocks by the mean
+    of the first one for numerical stability. Time series with vanishing
+    variance have undefined (NaN) correlations, as in :func:`numpy.corrcoef`.
+
+    :type blocks: iterable of 2D arrays [time, index]
+    :arg blocks: The temporal blocks of the time series.
+    :arg int N: The number of time series.
+    :rtype: 2D array [index, index] of float64
+    :return: the correlation matrix.
+    """
+    gram = np.zeros((N, N), dtype=DFIELD, order="F")
+    total = np.zeros(N, dtype=DFIELD)
+    n_samples, shift = 0, None
+    for values in blocks:
+        if len(values) == 0:
+            continue
+        if shift is None:
+            shift = np.mean(values, axis=0, dtype=DFIELD)
+        values = values - shift
+        gram = blas.dsyrk(1.0, values.T, beta=1.0, c=gram, overwrite_c=1)
+        total += values.sum(axis=0)
+        n_samples += len(values)
+
+    #  Complete the lower triangle and subtract the mean
+    gram = np.triu(gram) + np.triu(gram, k=1).T
+    mean = total / max(n_samples, 1)
+    cov = gram - n_samples * np.outer(mean, mean)
+    std = np.sqrt(np.clip(cov.diagonal(), 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    return np.clip(corr, -1, 1, out=corr)
 
 
 # TODO: Reconsider storage of correlation matrix without taking absolute value.
@@ -155,9 +205,29 @@ class TsonisClimateNetwork(ClimateNetwork):
                   "values...")
         #  Cast to float32 type to save memory since correlation coefficients
         #  are not needed in high floating point precision.
-        correlation = np.corrcoef(anomaly.transpose()).astype("float32")
+        return _correlation_from_blocks(
+            _temporal_blocks(anomaly), anomaly.shape[1]).astype(FIELD)
 
-        return correlation
+    def _data_correlation(self, selected_indices=None):
+        """
+        Return the correlation matrix at zero lag of the anomaly time series
+        of :attr:`data`, accumulated over its temporal blocks (see
+        :meth:`.ClimateData.anomaly_blocks`).
+
+        :type selected_indices: 1D Numpy array (time)
+        :arg selected_indices: The time indices to be included. If None, all
+            time indices are included.
+
+        :rtype: 2D Numpy array (index, index)
+        :return: the correlation matrix at zero lag.
+        """
+        if self.silence_level <= 1:
+            print("Calculating correlation matrix at zero lag from anomaly "
+                  "values in temporal blocks...")
+        blocks = self.data.anomaly_blocks(axis=0,
+                                          selected_indices=selected_indices)
+        return _correlation_from_blocks(
+            (values for _, values in blocks), self.N).astype(FIELD)
 
     def calculate_similarity_measure(self, anomaly):
         """
@@ -240,10 +310,10 @@ class TsonisClimateNetwork(ClimateNetwork):
         """
         self._winter_only = winter_only
         if winter_only:
-            winter_anomaly = self.data.anomaly_selected_months([0, 1, 11])
-            correlation = self._calculate_correlation(winter_anomaly)
+            correlation = self._data_correlation(
+                self.data.indices_selected_months([0, 1, 11]))
         else:
-            correlation = self._calculate_correlation(self.data.anomaly())
+            correlation = self._data_correlation()
         self._similarity_measure = correlation
 
     def set_winter_only(self, winter_only):
@@ -34,9 +34,11 @@ from .geo_network import GeoNetwork
 from .grid import Grid
 from .geo_grid import GeoGrid
 from .data import Data
+from .lazy_observable import LazyObservable
 from .interacting_networks import InteractingNetworks
 from .netcdf_dictionary import NetCDFDictionary
 from .resistive_network import ResNetwork
+from .null_model_ensemble import NullModelEnsemble
 
 #
 #  Set global constants
@@ -19,12 +19,14 @@ import random
 import numpy as np
 cimport numpy as cnp
 from numpy cimport ndarray, abs
+from libc.math cimport sqrt, acos, fabs, fmin, fmax
 import numpy.random as rd
 randint = rd.randint
 
-from ...core._ext.types import NODE, DEGREE, FIELD, DFIELD
+from ...core._ext.types import NODE, DEGREE, FIELD, DFIELD, MASK
 from ...core._ext.types cimport \
-    BOOLTYPE_t, ADJ_t, MASK_t, NODE_t, DEGREE_t, WEIGHT_t, DWEIGHT_t, FIELD_t, DFIELD_t
+    BOOLTYPE_t, INT64TYPE_t, ADJ_t, MASK_t, NODE_t, DEGREE_t, WEIGHT_t, \
+    DWEIGHT_t, FIELD_t, DFIELD_t
 
 cdef extern from "src_numerics.c":
     double _vertex_current_flow_betweenness_fast(int N, double Is, double It,
@@ -36,84 +38,181 @@ cdef extern from "src_numerics.c":
 # geo_network =================================================================
 
 
-# parameters for `_randomly_rewire_geomodel()`
-ctypedef bint (*rewire_cond_len)(FIELD_t[:,:], float, int, int, int, int)
-ctypedef bint (*rewire_cond_deg)(DEGREE_t[:], int, int, int, int)
-
-cdef:
-    # condition C1
-    inline bint cond_len_c1(
-        FIELD_t[:,:] D, float eps, int s, int t, int k, int l):
-        return (
-            (abs(D[s,t] - D[k,t]) < eps and abs(D[k,l] - D[s,l]) < eps) or
-            (abs(D[s,t] - D[s,l]) < eps and abs(D[k,l] - D[k,t]) < eps))
-    # condition C2
-    inline bint cond_len_c2(
-        FIELD_t[:,:] D, float eps, int s, int t, int k, int l):
-        return (
-            abs(D[s,t] - D[s,l]) < eps and abs(D[t,s] - D[t,k]) < eps and
-            abs(D[k,l] - D[k,t]) < eps and abs(D[l,k] - D[l,s]) < eps)
-    # invariance of degree-degree correlations
-    inline bint cond_deg_corr(DEGREE_t[:] degree, int s, int t, int k, int l):
-        return (degree[s] == degree[k] and degree[t] == degree[l])
-    # tautology
-    rewire_cond_deg cond_deg_true = NULL
-
-
-cdef void _randomly_rewire_geomodel(int iterations, float eps,
-    ndarray[ADJ_t, ndim=2] A, ndarray[FIELD_t, ndim=2] D, int E,
-    ndarray[NODE_t, ndim=2] edges, ndarray[DEGREE_t, ndim=1] degree,
-    rewire_cond_len cond_len, rewire_cond_deg cond_deg):
-
-    cdef int i = 0, s, t, k, l, edge1, edge2
-
-    while (i < iterations):
-        # Randomly choose 2 edges
-        edge1 = np.floor(rd.random() * E)
-        edge2 = np.floor(rd.random() * E)
-        s, t = edges[edge1,[0,1]]
-        k, l = edges[edge2,[0,1]]
-
-        # Proceed only if old links are disjoint
-        if ((s != k and s != l and t != k and t != l) and
-            # Proceed only if new links do NOT already exist
-            (A[s,l] == 0 and A[t,k] == 0) and
-            # Proceed only if link conditions are fulfilled
-            (cond_deg is NULL or cond_deg(degree, s, t, k, l)) and
-            cond_len(D, eps, s, t, k, l)):
-
-                # Now rewire the links symmetrically & increment i
-                A[s,t] = A[t,s] = 0
-                A[k,l] = A[l,k] = 0
-                A[s,l] = A[l,s] = 1
-                A[t,k] = A[k,t] = 1
-                edges[edge1,[0,1]] = s, l
-                edges[edge2,[0,1]] = k, t
-
-                i+=1
-
-
-def _randomly_rewire_geomodel_I(int iterations, float eps,
-    ndarray[ADJ_t, ndim=2] A, ndarray[FIELD_t, ndim=2] D, int E,
-    ndarray[NODE_t, ndim=2] edges):
+cdef inline double _link_distance(
+    int metric, DFIELD_t[:,:] X, FIELD_t[:,:] D, NODE_t i, NODE_t j):
+    """
+    Distance between the nodes `i` and `j`, looked up in the distance matrix
+    `D` (`metric == 0`), euclidean between the columns of the coordinates `X`
+    (`metric == 1`), or angular great circle between the columns
+    `(sin_lat, cos_lat, sin_lon, cos_lon)` of `X` (`metric == 2`).
+    """
     cdef:
-        ndarray[DEGREE_t, ndim=1] null = np.array([], dtype=DEGREE)
-    _randomly_rewire_geomodel(iterations, eps, A, D, E, edges, null,
-                              cond_len_c1, cond_deg_true)
+        int k
+        double expr = 0
+
+    if metric == 0:
+        return D[i, j]
+    elif metric == 1:
+        for k in range(X.shape[0]):
+            expr += (X[k, i] - X[k, j]) * (X[k, i] - X[k, j])
+        return sqrt(expr)
+    expr = X[0, i] * X[0, j] + X[1, i] * X[1, j] * (
+        X[2, i] * X[2, j] + X[3, i] * X[3, j])
+    return acos(fmin(1., fmax(-1., expr)))
+
+
+cdef inline bint _has_link(
+    INT64TYPE_t[:] indptr, NODE_t[:] nbrs, NODE_t i, NODE_t j):
+    """
+    Binary search for `j` in the sorted neighbours of `i`.
+    """
+    cdef INT64TYPE_t lo = indptr[i], hi = indptr[i+1], mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if nbrs[mid] < j:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo < indptr[i+1] and nbrs[lo] == j
+
+
+cdef inline void _relink(
+    INT64TYPE_t[:] indptr, NODE_t[:] nbrs, NODE_t i, NODE_t old, NODE_t new):
+    """
+    Replace the neighbour `old` of `i` by `new`, keeping the neighbours sorted.
+    """
+    cdef INT64TYPE_t p = indptr[i]
+    while nbrs[p] != old:
+        p += 1
+    if new > old:
+        while p + 1 < indptr[i+1] and nbrs[p+1] < new:
+            nbrs[p] = nbrs[p+1]
+            p += 1
+    else:
+        while p > indptr[i] and nbrs[p-1] > new:
+            nbrs[p] = nbrs[p-1]
+            p -= 1
+    nbrs[p] = new
+
 
-def _randomly_rewire_geomodel_II(int iterations, float eps,
-    ndarray[ADJ_t, ndim=2] A, ndarray[FIELD_t, ndim=2] D, int E,
-    ndarray[NODE_t, ndim=2] edges):
+cdef inline INT64TYPE_t _bisect(DFIELD_t[:] keys, double x):
+    """
+    Number of sorted `keys` below `x`.
+    """
+    cdef INT64TYPE_t lo = 0, hi = keys.shape[0], mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if keys[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _randomly_rewire_geomodel(
+    int model, long iterations, long max_attempts, double eps, int N,
+    ndarray[NODE_t, ndim=2] edges, ndarray[DEGREE_t, ndim=1] degree,
+    int metric, ndarray[DFIELD_t, ndim=2] X, ndarray[FIELD_t, ndim=2] D):
+    """
+    Rewire the undirected `edges` of a spatial network with `N` nodes in
+    place by `iterations` swaps `(s,t), (k,l) -> (s,l), (k,t)`, which respect
+    the link length condition C1 (`model == 1`) or C2 (`model >= 2`) with
+    inaccuracy `eps`, and preserve degree-degree correlations (`model == 3`).
+
+    Link existence is tested on sorted neighbour lists, which keep their
+    lengths under degree preserving swaps, and link lengths are evaluated on
+    demand by `_link_distance()`, so that memory is linear in the number of
+    links. Under C2, swapped links have lengths within `2 * eps` of each
+    other, so the partner of a link is drawn among the links of similar
+    length from an index sorted by length, which is refreshed after every
+    `E` swaps. Gives up after `max_attempts` proposed swaps and returns the
+    number of swaps performed.
+    """
     cdef:
-        ndarray[DEGREE_t, ndim=1] null = np.array([], dtype=DEGREE)
-    _randomly_rewire_geomodel(iterations, eps, A, D, E, edges, null,
-                              cond_len_c2, cond_deg_true)
+        long i = 0, since = 0, attempts = 0
+        int B = 4096, pos = 2 * B
+        INT64TYPE_t e1, e2, lo, hi, E = edges.shape[0]
+        NODE_t s, t, k, l
+        double d_st, d_kl, d_sl, d_kt, w = 3 * eps
+        bint window = model >= 2
+        ndarray[NODE_t, ndim=1] src, dst
+        ndarray[DFIELD_t, ndim=1] u
+        NODE_t[:] nbrs, order
+        INT64TYPE_t[:] indptr
+        DFIELD_t[:] lengths, keys
+        DFIELD_t[:,:] Xv = X
+        FIELD_t[:,:] Dv = D
+
+    assert 1 <= model <= 3 and 0 <= metric <= 2
+    if E < 2:
+        return 0
+
+    #  Sorted neighbour lists
+    src = np.concatenate((edges[:, 0], edges[:, 1]))
+    dst = np.concatenate((edges[:, 1], edges[:, 0]))
+    nbrs = dst[np.lexsort((dst, src))]
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(src, minlength=N))))
+
+    lengths = np.empty(E, dtype=DFIELD)
+    for e1 in range(E):
+        lengths[e1] = _link_distance(metric, Xv, Dv, edges[e1, 0], edges[e1, 1])
+    if window:
+        order = np.argsort(lengths).astype(NODE)
+        keys = np.asarray(lengths)[order]
+
+    while i < iterations and attempts < max_attempts:
+        attempts += 1
+        if pos == 2 * B:
+            u = rd.random(2 * B)
+            pos = 0
+        e1 = <INT64TYPE_t> (u[pos] * E)
+        if window:
+            lo = _bisect(keys, lengths[e1] - w)
+            hi = _bisect(keys, lengths[e1] + w)
+            e2 = order[min(lo + <INT64TYPE_t> (u[pos+1] * (hi - lo)), E - 1)]
+        else:
+            e2 = <INT64TYPE_t> (u[pos+1] * E)
+        pos += 2
+        s, t = edges[e1, 0], edges[e1, 1]
+        k, l = edges[e2, 0], edges[e2, 1]
 
-def _randomly_rewire_geomodel_III(int iterations, float eps,
-    ndarray[ADJ_t, ndim=2] A, ndarray[FIELD_t, ndim=2] D, int E,
-    ndarray[NODE_t, ndim=2] edges, ndarray[DEGREE_t, ndim=1] degree):
-    _randomly_rewire_geomodel(iterations, eps, A, D, E, edges, degree,
-                              cond_len_c2, cond_deg_corr)
+        # Proceed only if old links are disjoint
+        if s == k or s == l or t == k or t == l:
+            continue
+        # Proceed only if new links do NOT already exist
+        if _has_link(indptr, nbrs, s, l) or _has_link(indptr, nbrs, t, k):
+            continue
+        # Proceed only if link conditions are fulfilled
+        if model == 3 and not (degree[s] == degree[k]
+                               and degree[t] == degree[l]):
+            continue
+        d_st, d_kl = lengths[e1], lengths[e2]
+        d_sl = _link_distance(metric, Xv, Dv, s, l)
+        d_kt = _link_distance(metric, Xv, Dv, k, t)
+        if model == 1:
+            if not ((fabs(d_st - d_kt) < eps and fabs(d_kl - d_sl) < eps) or
+                    (fabs(d_st - d_sl) < eps and fabs(d_kl - d_kt) < eps)):
+                continue
+        elif not (fabs(d_st - d_sl) < eps and fabs(d_st - d_kt) < eps and
+                  fabs(d_kl - d_kt) < eps and fabs(d_kl - d_sl) < eps):
+            continue
+
+        # Now rewire the links & increment i
+        _relink(indptr, nbrs, s, t, l)
+        _relink(indptr, nbrs, l, k, s)
+        _relink(indptr, nbrs, k, l, t)
+        _relink(indptr, nbrs, t, s, k)
+        edges[e1, 0], edges[e1, 1] = s, l
+        edges[e2, 0], edges[e2, 1] = k, t
+        lengths[e1], lengths[e2] = d_sl, d_kt
+        i += 1
+
+        since += 1
+        if window and since == E:
+            order = np.argsort(lengths).astype(NODE)
+            keys = np.asarray(lengths)[order]
+            since = 0
+    return i
 
 
 # interacting_networks ========================================================
@@ -507,36 +606,44 @@ def _nsi_betweenness(
 
 
 def _mpi_newman_betweenness(
-    ndarray[ADJ_t, ndim=2] this_A, ndarray[DFIELD_t, ndim=2] V,
+    ndarray[NODE_t, ndim=1] indptr, ndarray[NODE_t, ndim=1] indices,
+    ndarray[DFIELD_t, ndim=2] V, ndarray[NODE_t, ndim=1] row,
     int N, int start_i, int end_i):
     """
     This function does the outer loop for a certain range start_i-end_i of
-    c's.  it gets the full V matrix but only the needed rows of the A matrix.
+    c's. It gets the neighbours of all nodes in CSR format (indptr, indices)
+    and those rows of the V matrix that are needed for the range, where row[i]
+    is the position of node i's row in V.
     Each parallel job will consist of a call to this function:
     """
 
     cdef:
-        int i_rel, j, s, t, i_abs
+        int i_rel, j, s, t, i_abs, vi, vj
+        NODE_t p
         double sum_s, sum_j, Vis_minus_Vjs
 
         int this_N = end_i - start_i
         ndarray[DFIELD_t, ndim=1] this_betweenness = \
             np.zeros(this_N, dtype=DFIELD)
 
-    for i_rel in range(this_N):
-        # correct i index for V matrix
-        i_abs = i_rel + start_i
-        for j in range(N):
-             if this_A[i_rel, j]:
+    # release the GIL so that several ranges can be processed by threads
+    with nogil:
+        for i_rel in range(this_N):
+            # correct i index for V matrix
+            i_abs = i_rel + start_i
+            vi = row[i_abs]
+            for p in range(indptr[i_abs], indptr[i_abs+1]):
+                j = indices[p]
+                vj = row[j]
                 sum_j = 0.0
                 for s in range(N):
                     if i_abs != s:
-                        Vis_minus_Vjs = V[i_abs, s] - V[j, s]
+                        Vis_minus_Vjs = V[vi, s] - V[vj, s]
                         sum_s = 0.0
                         for t in range(s):
                             if i_abs != t:
-                                sum_s += abs(Vis_minus_Vjs - V[i_abs, t] +
-                                             V[j, t])
+                                sum_s += fabs(Vis_minus_Vjs - V[vi, t]
+                                              + V[vj, t])
                         sum_j += sum_s
                 this_betweenness[i_rel] += sum_j
 
@@ -544,31 +651,43 @@ def _mpi_newman_betweenness(
 
 
 def _mpi_nsi_newman_betweenness(
-    ndarray[ADJ_t, ndim=2] this_A,
-    ndarray[DFIELD_t, ndim=2] V, int N, ndarray[DWEIGHT_t, ndim=1] w,
-    ndarray[MASK_t, ndim=2] this_not_adj_or_equal, int start_i, int end_i):
+    ndarray[NODE_t, ndim=1] indptr, ndarray[NODE_t, ndim=1] indices,
+    ndarray[DFIELD_t, ndim=2] V, ndarray[NODE_t, ndim=1] row,
+    int N, ndarray[DWEIGHT_t, ndim=1] w, int start_i, int end_i):
 
     cdef:
-        int i_rel, j, s, t, i_abs
+        int i_rel, j, s, t, i_abs, vi, vj
+        NODE_t p
         double sum_s, sum_j, Vis_minus_Vjs
 
         int this_N = end_i - start_i
         ndarray[DFIELD_t, ndim=1] this_betweenness =\
             np.zeros(this_N, dtype=DFIELD)
-
-    for i_rel in range(this_N):
-        i_abs = i_rel + start_i
-        for j in range(N):
-             if this_A[i_rel, j]:
+        # indicator that i,s are not neighboured or equal
+        ndarray[MASK_t, ndim=1] not_adj_or_equal = np.ones(N, dtype=MASK)
+
+    # release the GIL so that several ranges can be processed by threads
+    with nogil:
+        for i_rel in range(this_N):
+            i_abs = i_rel + start_i
+            vi = row[i_abs]
+            for s in range(N):
+                not_adj_or_equal[s] = 1
+            not_adj_or_equal[i_abs] = 0
+            for p in range(indptr[i_abs], indptr[i_abs+1]):
+                not_adj_or_equal[indices[p]] = 0
+            for p in range(indptr[i_abs], indptr[i_abs+1]):
+                j = indices[p]
+                vj = row[j]
                 sum_j = 0.0
                 for s in range(N):
-                    if this_not_adj_or_equal[i_rel, s]:
-                        Vis_minus_Vjs = V[i_abs, s] - V[j, s]
+                    if not_adj_or_equal[s]:
+                        Vis_minus_Vjs = V[vi, s] - V[vj, s]
                         sum_s = 0.0
                         for t in range(s):
-                            if this_not_adj_or_equal[i_rel, t]:
-                                sum_s += w[t] *\
-                                    abs(Vis_minus_Vjs - V[i_abs, t] + V[j, t])
+                            if not_adj_or_equal[t]:
+                                sum_s += w[t] * fabs(
+                                    Vis_minus_Vjs - V[vi, t] + V[vj, t])
                         sum_j += w[s] * sum_s
                 this_betweenness[i_rel] += w[j] * sum_j
 
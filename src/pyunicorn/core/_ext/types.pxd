@@ -23,6 +23,8 @@ ctypedef cnp.int8_t INT8TYPE_t
 ctypedef cnp.int16_t INT16TYPE_t
 ctypedef cnp.int32_t INT32TYPE_t
 ctypedef cnp.int64_t INT64TYPE_t
+ctypedef cnp.uint8_t UINT8TYPE_t
+ctypedef cnp.uint64_t UINT64TYPE_t
 ctypedef cnp.float32_t FLOAT32TYPE_t
 ctypedef cnp.float64_t FLOAT64TYPE_t
 
@@ -35,3 +37,5 @@ ctypedef FLOAT32TYPE_t WEIGHT_t
 ctypedef FLOAT64TYPE_t DWEIGHT_t
 ctypedef FLOAT32TYPE_t FIELD_t
 ctypedef FLOAT64TYPE_t DFIELD_t
+ctypedef UINT64TYPE_t BITS_t
+ctypedef UINT8TYPE_t SYMBOL_t
@@ -20,6 +20,8 @@ INT8TYPE = np.int8
 INT16TYPE = np.int16
 INT32TYPE = np.int32
 INT64TYPE = np.int64
+UINT8TYPE = np.uint8
+UINT64TYPE = np.uint64
 FLOAT32TYPE = np.float32
 FLOAT64TYPE = np.float64
 
@@ -32,6 +34,8 @@ WEIGHT = FLOAT32TYPE
 DWEIGHT = FLOAT64TYPE
 FIELD = FLOAT32TYPE
 DFIELD = FLOAT64TYPE
+BITS = UINT64TYPE
+SYMBOL = UINT8TYPE
 
 
 def to_cy(arr, ty):
@@ -15,16 +15,27 @@
 """
 This module provides the mix-in class `Cached`, which manages LRU caches for
 derived quantity methods, with declared dependencies on mutable instance
-attributes.
+attributes, and the optional persistent cache tier `DiskCache`.
 """
 
+import os
+import sys
+import hashlib
+import tempfile
 from abc import ABC, abstractmethod
+from time import perf_counter
 from functools import lru_cache, _lru_cache_wrapper, wraps
-from weakref import ReferenceType, ref
+from weakref import ReferenceType, ref, WeakSet
 from inspect import getmembers, ismethod
-from typing import Any, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from collections.abc import Hashable
 
+import numpy as np
+from scipy import sparse as sp
+
+from .. import version
+from ..utils import instrument
+
 
 class CacheRef:
     """
@@ -100,6 +111,292 @@ class CacheRef:
             delattr(obj, self.attr)
 
 
+def _nbytes(obj) -> int:
+    """
+    Estimate the memory held by a cached result, excluding file-backed arrays.
+    """
+    if isinstance(obj, np.memmap):
+        return 0
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if sp.issparse(obj):
+        return sum(getattr(obj, a).nbytes for a in
+                   ("data", "indices", "indptr", "row", "col", "offsets")
+                   if isinstance(getattr(obj, a, None), np.ndarray))
+    if isinstance(obj, (tuple, list)):
+        return sum(_nbytes(o) for o in obj)
+    return sys.getsizeof(obj)
+
+
+class _NoSeed:
+    """
+    Marker for local cache misses which compute their result.
+    """
+
+
+_NOSEED, _PEEK = _NoSeed(), _NoSeed()
+
+
+class _Peek(Exception):
+    """
+    Raised at a local cache miss in `Cached.cache_peek()`, which is therefore
+    not recorded as a cache entry.
+    """
+
+
+class CacheStats:
+    """
+    Statistics of a local (instance level) method cache: the lookups, the
+    memory held by the cached results and the time spent computing them.
+    Cached results are wrapped in `CacheEntry` objects, which keep `nbytes`
+    and `time` up to date as entries are evicted from the local cache.
+
+    All live instances are registered in `CacheStats.registry`, which is used
+    by `Cached.cache_report()` and the byte budget `Cached.cache_budget`.
+    """
+
+    __slots__ = ["__weakref__", "method", "owner", "cache", "hits", "misses",
+                 "entries", "nbytes", "time", "seed"]
+
+    registry: WeakSet = WeakSet()
+    total_bytes: int = 0
+
+    def __init__(self, method: str, owner: ReferenceType):
+        self.method = method
+        self.owner = owner
+        self.cache: Optional[ReferenceType] = None
+        # lookups discarded by clearing the local cache
+        self.hits = self.misses = 0
+        # current entries
+        self.entries = self.nbytes = 0
+        self.time = 0.
+        # result to be inserted at the next miss, see `Cached.cache_seed()`
+        self.seed: Any = _NOSEED
+        CacheStats.registry.add(self)
+
+    def info(self) -> Tuple[int, int]:
+        """
+        Cumulative (hits, misses) of the local cache.
+        """
+        cache = None if self.cache is None else self.cache()
+        if cache is None:
+            return self.hits, self.misses
+        info = cache.cache_info()
+        return self.hits + info.hits, self.misses + info.misses
+
+    def clear(self) -> None:
+        """
+        Empty the local cache, keeping the lookup counts.
+        """
+        cache = None if self.cache is None else self.cache()
+        if cache is not None:
+            self.hits, self.misses = self.info()
+            cache.cache_clear()
+
+    @property
+    def value(self) -> float:
+        """
+        Recompute time per byte held, used to rank caches for eviction.
+        """
+        return self.time / max(self.nbytes, 1)
+
+
+class CacheEntry:
+    """
+    A cached result, together with its size and computation time, which are
+    booked to its `CacheStats` for as long as the entry is alive.
+    """
+
+    __slots__ = ["value", "nbytes", "time", "stats"]
+
+    def __init__(self, value: Any, time: float, stats: CacheStats):
+        self.value = value
+        self.nbytes = _nbytes(value)
+        self.time = time
+        self.stats = stats
+        stats.entries += 1
+        stats.nbytes += self.nbytes
+        stats.time += time
+        CacheStats.total_bytes += self.nbytes
+
+    def __del__(self):
+        stats = self.stats
+        stats.entries -= 1
+        stats.nbytes -= self.nbytes
+        stats.time -= self.time
+        CacheStats.total_bytes -= self.nbytes
+
+
+def _digest(h, obj) -> None:
+    """
+    Feed a canonical byte representation of `obj` into the hash object `h`.
+    Raises `TypeError` for objects without a content-based representation.
+    """
+    if isinstance(obj, Cached):
+        _digest(h, (type(obj).__qualname__,) + tuple(obj.__cache_content__()))
+    elif isinstance(obj, np.ndarray) or isinstance(obj, np.generic):
+        obj = np.asarray(obj)
+        h.update(f"a{obj.dtype.str}{obj.shape}".encode())
+        if obj.dtype.hasobject:
+            _digest(h, obj.tolist())
+        else:
+            h.update(np.ascontiguousarray(obj).data)
+    elif sp.issparse(obj):
+        obj = sp.csr_matrix(obj)
+        obj.sort_indices()
+        _digest(h, ("csr", obj.shape, obj.indptr, obj.indices, obj.data))
+    elif isinstance(obj, (tuple, list)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for o in obj:
+            _digest(h, o)
+    elif isinstance(obj, dict):
+        _digest(h, sorted(obj.items()))
+    elif obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    else:
+        raise TypeError(f"cannot hash contents of {type(obj)}")
+
+
+class DiskCache:
+    """
+    A persistent, size-bounded cache of array-valued results in a directory
+    on disk, shared between processes.
+
+    Entries are stored as `.npy` files named by content hashes of the inputs
+    (see `DiskCache.key()`), written atomically and returned as read-only
+    memory maps. When the total size of the entries exceeds `max_bytes`, the
+    least recently used entries are deleted. Concurrent readers and writers
+    need no locking: a writer replaces an entry by renaming a complete file,
+    and a memory-mapped entry remains valid after its file is evicted.
+
+    The tier is enabled for all methods decorated with
+    `@Cached.method(persist=True)` by setting `Cached.disk_cache`::
+
+        Cached.disk_cache = DiskCache("/scratch/pyunicorn", max_bytes=2**34)
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_bytes: int = 2**32):
+        """
+        :arg directory: The cache directory, which is created if necessary.
+            Defaults to `$PYUNICORN_CACHE_DIR`, or else `~/.cache/pyunicorn`.
+        :arg max_bytes: The bound on the total size of all entries.
+        """
+        if directory is None:
+            directory = os.environ.get(
+                "PYUNICORN_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "pyunicorn"))
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __repr__(self):
+        return f"DiskCache({self.directory!r}, max_bytes={self.max_bytes})"
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Content hash of arrays, sparse matrices, scalars, strings, `Cached`
+        instances (via `Cached.__cache_content__()`) and nested tuples, lists
+        and dicts thereof. The hash includes the pyunicorn version, such that
+        entries written by other releases are never loaded.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        _digest(h, (version.__version__,) + parts)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _entries(self):
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".npy") and entry.is_file():
+                    yield entry
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The total size of all entries.
+        """
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Return the entry for `key` as a read-only memory map (or a scalar), or
+        `None` if there is no such entry.
+        """
+        path = self._path(key)
+        try:
+            value = np.load(path, mmap_mode="r", allow_pickle=False)
+            # mark as recently used
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        return value[()] if value.ndim == 0 else value
+
+    def store(self, key: str, value: Any) -> bool:
+        """
+        Store an array or a numeric scalar under `key`, and evict old entries
+        if necessary. Returns whether `value` could be stored.
+        """
+        if not isinstance(value, (np.ndarray, np.generic, bool, int, float,
+                                  complex)):
+            return False
+        value = np.asarray(value)
+        if value.dtype.hasobject or value.nbytes > self.max_bytes:
+            return False
+        fd, tmp = tempfile.mkstemp(
+            prefix=f".{key}.", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, value, allow_pickle=False)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used entries until the total size is within
+        `max_bytes`.
+        """
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(e[1] for e in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Delete all entries.
+        """
+        for entry in self._entries():
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+
 class Cached(ABC):
     """
     A mix-in class which manages, for each subclass method decorated with
@@ -132,6 +429,20 @@ class Cached(ABC):
       - lru_params_global: sets global `@functools.lru_cache()` parameters
       - lru_params_local:  sets local `@functools.lru_cache()` parameters
 
+    This mix-in class attribute affects all methods decorated with
+    `@Cached.method(persist=True)` at invocation:
+
+      - disk_cache:        optional `DiskCache`, which persists results across
+                           instances and processes, keyed by the contents
+                           declared by `Cached.__cache_content__()`
+
+    The mix-in class attribute `cache_budget` optionally bounds the total
+    number of bytes held by ALL local caches. When it is exceeded, whole local
+    caches are emptied in the order of increasing recompute time per byte,
+    i.e., large results which are cheap to recompute are evicted first. The
+    lookup statistics, memory and compute time of all local caches are
+    summarised by `Cached.cache_report()`.
+
     NOTE:
 
         The intended caching behaviour, including invalidation semantics, is
@@ -143,6 +454,10 @@ class Cached(ABC):
     lru_params_global = {"maxsize": 16, "typed": False}
     lru_params_local = {"maxsize": 3, "typed": True}
 
+    disk_cache: Optional[DiskCache] = None
+
+    cache_budget: Optional[int] = None
+
     @abstractmethod
     def __cache_state__(self) -> Tuple[Hashable, ...]:
         """
@@ -161,6 +476,17 @@ class Cached(ABC):
             method that increments a dedicated mutation counter.
         """
 
+    def __cache_content__(self) -> Tuple[Any, ...]:
+        """
+        Tuple of arrays and plain values which fully determine the results of
+        ALL persisted method lookups in this class, i.e., a content-based
+        counterpart of `__cache_state__()` used to compute `DiskCache` keys.
+        Subclasses with methods decorated by `@Cached.method(persist=True)`
+        need to override this method.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not declare its cache content")
+
     def __eq__(self, other):
         return (self is other) and (
             self.__cache_state__() == other.__cache_state__())
@@ -170,7 +496,8 @@ class Cached(ABC):
 
     @classmethod
     def method(cls, name: Optional[str] = None,
-               attrs: Optional[Tuple[str, ...]] = None):
+               attrs: Optional[Tuple[str, ...]] = None,
+               persist: bool = False):
         """
         Caching decorator based on `@functools.lru_cache()`.
 
@@ -192,6 +519,11 @@ class Cached(ABC):
 
         :arg name: Optionally print a message at the first method invocation.
         :arg attrs: Optionally declare attribute names as mutable dependencies.
+        :arg persist: Optionally look up local cache misses in
+            `Cached.disk_cache`, keyed by the package version, the method,
+            the instance contents declared by `__cache_content__()` and the
+            call arguments. Results loaded from disk are read-only memory
+            maps.
 
         NOTE:
 
@@ -211,22 +543,55 @@ class Cached(ABC):
         def wrapper(f):
             """ Evaluated at decorator application (method definition). """
 
-            def uncached(self, name, *args, **kwargs) -> Any:
+            def calculate(self, name, *args, **kwargs) -> Any:
                 """ Evaluated at uncached method invocation. """
-                if name is not None and getattr(self, "silence_level", 0) <= 1:
-                    print(f"Calculating {name}...")
+                if name is not None:
+                    instrument.message(self, f"Calculating {name}...")
                 return f(self, *args, **kwargs)
 
+            def uncached(self, name, *args, **kwargs) -> Any:
+                """ Evaluated at every in-memory cache miss. """
+                disk_cache = Cached.disk_cache
+                if not persist or disk_cache is None:
+                    return calculate(self, name, *args, **kwargs)
+                try:
+                    key = disk_cache.key(
+                        f"{f.__module__}.{f.__qualname__}", self, args, kwargs)
+                except TypeError:
+                    # arguments without content-based representation
+                    return calculate(self, name, *args, **kwargs)
+                result = disk_cache.load(key)
+                if result is None:
+                    result = calculate(self, name, *args, **kwargs)
+                    disk_cache.store(key, result)
+                else:
+                    instrument.annotate(cache="disk")
+                return result
+
             if cls.cache_enable:
                 def create_local_cache(_self) -> _lru_cache_wrapper:
                     """ Evaluated at first global cache miss. """
+                    stats = CacheStats(f.__qualname__, _self)
+
                     # closure holding an instance weakref
                     @lru_cache(**cls.lru_params_local)
                     def cached_local(_h, name, _l, *args, **kwargs):
                         """ Evaluated at every local cache miss. """
                         # dereference instance, ignore hash after cache lookup,
                         # remove `attrs` from args
-                        return uncached(_self(), name, *args[_l:], **kwargs)
+                        seed = stats.seed
+                        if seed is _PEEK:
+                            stats.misses -= 1
+                            raise _Peek
+                        if seed is not _NOSEED:
+                            stats.seed = _NOSEED
+                            return CacheEntry(seed, 0., stats)
+                        t = perf_counter()
+                        result = uncached(_self(), name, *args[_l:], **kwargs)
+                        return CacheEntry(result, perf_counter() - t, stats)
+
+                    cached_local.stats = stats
+                    stats.cache = ref(cached_local)
                     return cached_local
 
                 @lru_cache(**cls.lru_params_global)
@@ -245,30 +610,141 @@ class Cached(ABC):
                     # store reference to local cache as global cache result
                     return CacheRef(self, cache_attr)
 
-                @wraps(cached_global, assigned=('cache_info', 'cache_clear'))
-                def wrapped(self, *args, **kwargs):
+                def lookup(self, args, kwargs):
                     """ Evaluated at every decorated method invocation. """
                     # pass instance weakref, obtain local cache
                     cached_local = cached_global(ref(self)).cache
                     # pass instance hash, prepend `attrs` to args
-                    return cached_local(
+                    result = cached_local(
                         hash(self.__cache_state__()), name,
                         len(attrs), *(getattr(self, a) for a in attrs),
-                        *args, **kwargs)
+                        *args, **kwargs).value
+                    if (Cached.cache_budget is not None
+                            and CacheStats.total_bytes > Cached.cache_budget):
+                        Cached.cache_evict(Cached.cache_budget)
+                    return result
+
+                @wraps(cached_global, assigned=('cache_info', 'cache_clear'))
+                def wrapped(self, *args, **kwargs):
+                    if not instrument.active():
+                        return lookup(self, args, kwargs)
+                    with instrument.span(f.__qualname__, label=name,
+                                         cache=None) as span:
+                        stats = cached_global(ref(self)).cache.stats
+                        misses = stats.info()[1]
+                        result = lookup(self, args, kwargs)
+                        if span["cache"] is None:
+                            span["cache"] = "miss" \
+                                if stats.info()[1] > misses else "hit"
+                        span["size"] = instrument.size_of(self)
+                    return result
+
+                def seeded(self, seed, *args, **kwargs):
+                    """ Evaluated at `Cached.cache_seed/peek()`. """
+                    stats = cached_global(ref(self)).cache.stats
+                    stats.seed = seed
+                    try:
+                        return wrapped(self, *args, **kwargs)
+                    finally:
+                        stats.seed = _NOSEED
 
             else:
                 def wrapped(self, *args, **kwargs):
-                    return uncached(self, name, *args, **kwargs)
+                    if not instrument.active():
+                        return calculate(self, name, *args, **kwargs)
+                    with instrument.span(f.__qualname__, label=name,
+                                         cache=None) as span:
+                        result = calculate(self, name, *args, **kwargs)
+                        span["size"] = instrument.size_of(self)
+                    return result
+
+                def seeded(self, seed, *args, **kwargs):
+                    raise _Peek
 
             # fully decorated method
-            return wraps(f)(wrapped)
+            wrapped = wraps(f)(wrapped)
+            wrapped.__cache_seeded__ = seeded
+            return wrapped
         return wrapper
 
+    @staticmethod
+    def cache_evict(budget: int = 0) -> None:
+        """
+        Empty local caches of ALL `Cached` instances, in the order of
+        increasing recompute time per byte held, until the total number of
+        bytes held is within `budget`.
+        """
+        for stats in sorted(CacheStats.registry, key=lambda s: s.value):
+            if CacheStats.total_bytes <= budget:
+                break
+            if stats.nbytes > 0:
+                stats.clear()
+
+    @classmethod
+    def cache_report(cls, per_instance: bool = False
+                     ) -> List[Dict[str, Any]]:
+        """
+        Summarise the local caches of all live instances of `cls`.
+
+        :arg per_instance: Whether to report each instance separately, or to
+            aggregate over all instances of a class.
+        :return: one record per method (and instance), with the keys `method`,
+            `instances` (or `instance`, its `id()`), `hits`, `misses`,
+            `entries`, `nbytes` and `time` (compute time of current entries
+            in seconds), sorted by decreasing `nbytes`.
+        """
+        report: Dict[Any, Dict[str, Any]] = {}
+        for stats in list(CacheStats.registry):
+            obj = stats.owner()
+            if obj is None or not isinstance(obj, cls):
+                continue
+            hits, misses = stats.info()
+            key = (stats.method, id(obj)) if per_instance else stats.method
+            record = report.setdefault(key, {
+                "method": stats.method, "hits": 0, "misses": 0, "entries": 0,
+                "nbytes": 0, "time": 0.})
+            if per_instance:
+                record["instance"] = id(obj)
+            else:
+                record["instances"] = record.get("instances", 0) + 1
+            record["hits"] += hits
+            record["misses"] += misses
+            record["entries"] += stats.entries
+            record["nbytes"] += stats.nbytes
+            record["time"] += stats.time
+        return sorted(report.values(), key=lambda r: -r["nbytes"])
+
     @staticmethod
     def is_global_cache(attr) -> bool:
         return ismethod(attr) and all(
             hasattr(attr, p) for p in ("cache_clear", "__wrapped__"))
 
+    def cache_peek(self, method: str, *args, **kwargs) -> Optional[Any]:
+        """
+        Return the cached result of `self.{method}(*args, **kwargs)` for the
+        current instance state, or `None` if it is not cached, without
+        computing it.
+        """
+        try:
+            return getattr(type(self), method).__cache_seeded__(
+                self, _PEEK, *args, **kwargs)
+        except _Peek:
+            return None
+
+    def cache_seed(self, method: str, value: Any, *args, **kwargs) -> None:
+        """
+        Insert `value` as the result of `self.{method}(*args, **kwargs)` for
+        the current instance state, unless that result is cached already.
+        This allows to maintain derived quantities incrementally across a
+        mutation, instead of recomputing them.
+        """
+        try:
+            getattr(type(self), method).__cache_seeded__(
+                self, value, *args, **kwargs)
+        except _Peek:
+            # caching disabled
+            pass
+
     def cache_clear(self, prefix: Optional[str] = None) -> None:
         """
         Delete all method caches for ALL instances of `self.__class__`, and
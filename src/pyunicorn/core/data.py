@@ -30,6 +30,7 @@ except ImportError:
               "Some functionality in class Data might not be available!")
 
 from .geo_grid import GeoGrid
+from .lazy_observable import LazyObservable
 
 
 class Data:
@@ -59,9 +60,10 @@ class Data:
             window = {"time_min": 0., "time_max": 0., "lat_min": 0.,
                       "lat_max": 0., "lon_min": 0., "lon_max": 0.}
 
-        :type observable: 2D array [time, index]
+        :type observable: 2D array [time, index] or :class:`.LazyObservable`
         :arg observable: The array of time series to be represented by the
-            :class:`Data` instance.
+            :class:`Data` instance. A lazy observable is only read within the
+            current spatio-temporal window, when accessed.
         :type grid: :class:`.GeoGrid` instance
         :arg grid: The GeoGrid representing the spatial coordinates associated
             to the time series and their temporal sampling.
@@ -89,6 +91,8 @@ class Data:
 
         self._observable = None
         """Current spatio-temporal view on the data."""
+        self._window_indices = None
+        """Time and space indices of the current view."""
 
         self.file_name = ""
         self.file_type = ""
@@ -132,7 +136,8 @@ class Data:
     @classmethod
     # pylint: disable=too-many-positional-arguments
     def Load(cls, file_name, observable_name, file_type, dimension_names=None,
-             window=None, vertical_level=None, silence_level=0):
+             window=None, vertical_level=None, silence_level=0, lazy=False,
+             cache_file=None):
         """
         Initialize an instance of Data.
 
@@ -167,13 +172,18 @@ class Data:
             data file. Is ignored for horizontal data sets. If None, the first
             level in the data file is chosen.
         :arg int silence_level: The inverse level of verbosity of the object.
+        :arg bool lazy: Whether to keep the data file open and read the
+            observable on demand, see :class:`.LazyObservable`.
+        :arg str cache_file: Optional name of a memory-mapped ``float32``
+            cache file for lazy access.
         """
         if dimension_names is None:
             dimension_names = {"lat": "lat", "lon": "lon", "time": "time"}
 
         # Import data from given file
         res = cls._load_data(file_name, file_type, observable_name,
-                             dimension_names, vertical_level)
+                             dimension_names, vertical_level, lazy=lazy,
+                             cache_file=cache_file)
 
         # Create instance of Data
         data = cls(observable=res["observable"], grid=res["grid"],
@@ -237,7 +247,7 @@ class Data:
     # pylint: disable=too-many-positional-arguments
     def _get_netcdf_data(cls, file_name, file_type, observable_name,
                          dimension_names, vertical_level=None,
-                         silence_level=0):
+                         silence_level=0, lazy=False, cache_file=None):
         """
         Import data from a NetCDF file with a regular and rectangular grid.
 
@@ -256,6 +266,10 @@ class Data:
             data file. Is ignored for horizontal data sets. If None, the first
             level in the data file is chosen.
         :arg int silence_level: The inverse level of verbosity of the object.
+        :arg bool lazy: Whether to return a :class:`.LazyObservable` instead of
+            reading the observable.
+        :arg str cache_file: Optional name of a memory-mapped ``float32``
+            cache file for lazy access.
         """
         if silence_level <= 1:
             print("Reading NetCDF File and converting data to NumPy array...")
@@ -267,13 +281,19 @@ class Data:
         f = Dataset(file_name, "r")
 
         # Create reference to observable
-        observable = f.variables[observable_name][:].astype("float32")
+        observable = f.variables[observable_name]
 
         # Get time axis from NetCDF file
         time = f.variables[dimension_names["time"]][:].astype("float32")
 
         # Get number of dimensions of data
-        n_dim = observable.ndim
+        n_dim = len(observable.shape)
+
+        # Handle selected vertical level
+        if vertical_level is None:
+            level = 0
+        else:
+            level = vertical_level
 
         # Distinguish between regular and irregular grids
         if file_type == "NetCDF":
@@ -285,21 +305,17 @@ class Data:
 
             # If 3D data set (time, lat, lon), select whole data set
             if n_dim == 3:
-                res["observable"] = observable.copy()
+                sel = (slice(None),)
             # If 4D data set (time, level, lat, lon), select certain vertical
             # level.
             elif n_dim == 4:
-                # Handle selected vertical level
-                if vertical_level is None:
-                    level = 0
-                else:
-                    level = vertical_level
-
-                res["observable"] = observable[:, level, :, :].copy()
+                sel = (slice(None), level)
             else:
-                print("Regular NetCDF data sets with dimensions other than "
-                      "3 (time, lat, lon) or 4 (time, level, lat, lon) are "
-                      "not supported by Data class!")
+                f.close()
+                raise ValueError(
+                    "Regular NetCDF data sets with dimensions other than "
+                    "3 (time, lat, lon) or 4 (time, level, lat, lon) are "
+                    "not supported by Data class!")
 
         elif file_type == "iNetCDF":
             # Create GeoGrid instance
@@ -309,29 +325,34 @@ class Data:
 
             # If 2D data set (time, index), select whole data set
             if n_dim == 2:
-                res["observable"] = observable.copy()
+                sel = (slice(None),)
             # If 3D data set (time, level, index), select certain vertical
             # level.
             elif n_dim == 3:
-                # Handle selected vertical level
-                if vertical_level is None:
-                    level = 0
-                else:
-                    level = vertical_level
-
-                res["observable"] = observable[:, level, :].copy()
+                sel = (slice(None), level)
             else:
-                print("Irregular NetCDF data sets with dimensions other than "
-                      "2 (time, index) or 3 (time, level, index) are not "
-                      "supported by Data class!")
-
-        # Get length of raw data time axis
-        n_time = res["observable"].shape[0]
-        # Reshape observable to comply with the standard shape (time, index)
-        res["observable"].shape = (n_time, -1)
+                f.close()
+                raise ValueError(
+                    "Irregular NetCDF data sets with dimensions other than "
+                    "2 (time, index) or 3 (time, level, index) are not "
+                    "supported by Data class!")
+
+        if lazy:
+            # Keep a separate handle open to read the observable on demand
+            res["observable"] = LazyObservable(
+                file_name, observable_name, file_type, vertical_level,
+                cache_file)
+        else:
+            # Read only the selected vertical level
+            res["observable"] = observable[sel].astype("float32")
+            # Get length of raw data time axis
+            n_time = res["observable"].shape[0]
+            # Reshape observable to comply with the standard shape
+            # (time, index)
+            res["observable"].shape = (n_time, -1)
 
         # Get long name of observable
-        res["observable_long_name"] = f.variables[observable_name].long_name
+        res["observable_long_name"] = observable.long_name
 
         # Store name of observable
         res["observable_name"] = observable_name
@@ -342,7 +363,8 @@ class Data:
     @classmethod
     # pylint: disable=too-many-positional-arguments
     def _load_data(cls, file_name, file_type, observable_name,
-                   dimension_names, vertical_level=None, silence_level=0):
+                   dimension_names, vertical_level=None, silence_level=0,
+                   lazy=False, cache_file=None):
         """
         Load data into a Numpy array and create a corresponding GeoGrid object.
 
@@ -361,11 +383,14 @@ class Data:
             data file. Is ignored for horizontal data sets. If None, the first
             level in the data file is chosen.
         :arg int silence_level: The inverse level of verbosity of the object.
+        :arg bool lazy: Whether to read the observable on demand.
+        :arg str cache_file: Optional name of a memory-mapped ``float32``
+            cache file for lazy access.
         """
         if file_type in ["NetCDF", "iNetCDF"]:
             return cls._get_netcdf_data(file_name, file_type, observable_name,
                                         dimension_names, vertical_level,
-                                        silence_level)
+                                        silence_level, lazy, cache_file)
         else:
             if silence_level <= 1:
                 print("This file type can currently not be read "
@@ -397,8 +422,47 @@ class Data:
         :rtype: 2D Numpy array [time, space]
         :return: the current spatio-temporal view on the data.
         """
+        if self._observable is None:
+            # Read the current window of a lazy observable
+            self._observable = self._full_observable[self._window_indices]
         return self._observable
 
+    def observable_blocks(self, axis=1, max_bytes=2**26):
+        """
+        Iterate over the current spatio-temporal view on the data in blocks.
+
+        For a lazy observable (see :class:`.LazyObservable`) that has not
+        been accessed via :meth:`observable` yet, only one block at a time is
+        read from the data file, and blocks are aligned with its chunks.
+        Otherwise, blocks are views on :meth:`observable`.
+
+        **Example:**
+
+        >>> data = Data.SmallTestData()
+        >>> [(b.start, b.stop, v.shape) for b, v in
+        ...  data.observable_blocks(axis=1, max_bytes=320)]
+        [(0, 4, (10, 4)), (4, 6, (10, 2))]
+
+        :arg int axis: The axis along which the view is partitioned
+            (0: temporal blocks, 1: spatial blocks).
+        :arg int max_bytes: The target size of a single block.
+        :rtype: iterator of tuple (slice, 2D array [time, space])
+        :return: the position of each block along ``axis`` within the current
+            view, and its samples.
+        """
+        if self._observable is None:
+            yield from self._full_observable.blocks(
+                *self._window_indices, axis=axis, max_bytes=max_bytes)
+            return
+
+        observable = self._observable
+        n_other = observable.shape[1 - axis]
+        step = max(1, max_bytes // max(n_other * observable.itemsize, 1))
+        for start in range(0, observable.shape[axis], step):
+            block = slice(start, min(start + step, observable.shape[axis]))
+            yield block, observable[block] if axis == 0 \
+                else observable[:, block]
+
     #
     #  Defines methods for windowing the data
     #
@@ -494,8 +558,13 @@ class Data:
         lat_seq = full_lat_seq[space_indices]
         lon_seq = full_lon_seq[space_indices]
 
-        self._observable = \
-            self._full_observable[time_indices, :][:, space_indices]
+        self._window_indices = (time_indices, space_indices)
+        if isinstance(self._full_observable, LazyObservable):
+            # Defer reading the window until it is accessed
+            self._observable = None
+        else:
+            self._observable = \
+                self._full_observable[time_indices, :][:, space_indices]
         self.grid = GeoGrid(time, lat_seq, lon_seq, self.silence_level)
 
     def set_global_window(self):
@@ -122,6 +122,14 @@ class GeoGrid(Grid):
 
         return GeoGrid(time_seq, lat_seq, lon_seq)
 
+    @staticmethod
+    def _read_hdf5(group, silence_level=0):
+        """
+        Read a GeoGrid from a group of an open HDF5 file.
+        """
+        lat_seq, lon_seq = group["space"][:]
+        return GeoGrid(group["time"][:], lat_seq, lon_seq, silence_level)
+
     #
     #  Alternative constructors and Grid generation methods
     #
@@ -282,41 +290,17 @@ class GeoGrid(Grid):
         >>> GeoGrid.SmallTestGrid().node_number(lat_node=14., lon_node=9.)
         3
 
-        :type lat_node: number (float)
-        :arg lat_node: The latitude coordinate.
+        :type lat_node: number or array (float)
+        :arg lat_node: The latitude coordinate(s).
 
-        :type lon_node: number (float)
-        :arg lon_node: The longitude coordinate.
+        :type lon_node: number or array (float)
+        :arg lon_node: The longitude coordinate(s).
 
-        :rtype: number (int)
-        :return: the closest node's index.
+        :rtype: number (int) or array of int
+        :return: the closest node's index, for each point if several are
+            given.
         """
-        # Get sequences of cosLat, sinLat, cosLon and sinLon for all nodes
-        cos_lat = self.cos_lat()
-        sin_lat = self.sin_lat()
-        cos_lon = self.cos_lon()
-        sin_lon = self.sin_lon()
-
-        sin_lat_v = np.sin(lat_node * np.pi / 180)
-        cos_lat_v = np.cos(lat_node * np.pi / 180)
-        sin_lon_v = np.sin(lon_node * np.pi / 180)
-        cos_lon_v = np.cos(lon_node * np.pi / 180)
-
-        #  Calculate angular distance from the given coordinate to all
-        #  other nodes
-        expr = sin_lat*sin_lat_v + cos_lat*cos_lat_v * (sin_lon*sin_lon_v
-                                                        + cos_lon*cos_lon_v)
-
-        #  Correct for rounding errors
-        expr[expr < -1.] = -1.
-        expr[expr > 1.] = 1.
-
-        angdist = np.arccos(expr)
-
-        #  Get index of closest node
-        n_node = angdist.argmin()
-
-        return n_node
+        return self.nearest_nodes(lat_node, lon_node)[1]
 
     def cos_lat(self):
         """
@@ -384,6 +368,19 @@ class GeoGrid(Grid):
         """
         return self.angular_distance()
 
+    def _distance_coordinates(self):
+        """
+        Return the metric and node coordinates from which the compiled
+        kernels evaluate the standard distance between pairs of nodes on
+        demand (see :meth:`distance`).
+
+        :rtype: tuple (int, 2D Numpy array (float64) [4, index])
+        :return: the metric (2: angular great circle) and the sines and
+            cosines of latitude and longitude of the nodes.
+        """
+        return 2, np.array([self.sin_lat(), self.cos_lat(),
+                            self.sin_lon(), self.cos_lon()], dtype=np.float64)
+
     @Cached.method(name="angular great circle distance")
     def angular_distance(self):
         """
@@ -418,6 +415,168 @@ class GeoGrid(Grid):
             cosangdist, N)
         return np.arccos(cosangdist)
 
+    def pair_distance(self, i, j):
+        """
+        Return the angular great circle distance between the pairs of nodes
+        :math:`(i_k, j_k)`, without forming the full distance matrix (see
+        :meth:`distance`).
+
+        :type i: array of int
+        :arg i: The indices of the first nodes of all pairs.
+        :type j: array of int
+        :arg j: The indices of the second nodes of all pairs, broadcast
+            against ``i``.
+        :rtype: Numpy array (float32)
+        :return: the distances between the pairs of nodes.
+        """
+        return self.angular_pair_distance(i, j)
+
+    def angular_pair_distance(self, i, j):
+        """
+        Return the angular great circle distance between the pairs of nodes
+        :math:`(i_k, j_k)`.
+
+        The values coincide with the corresponding entries of
+        :meth:`angular_distance`.
+
+        **Example:**
+
+        >>> GeoGrid.SmallTestGrid().angular_pair_distance([0, 1], [5, 2])
+        array([0.48467883, 0.09739398], dtype=float32)
+
+        :type i: array of int
+        :arg i: The indices of the first nodes of all pairs.
+        :type j: array of int
+        :arg j: The indices of the second nodes of all pairs, broadcast
+            against ``i``.
+        :rtype: Numpy array (float32)
+        :return: the angular great circle distances between the pairs of
+            nodes.
+        """
+        i, j = np.asarray(i), np.asarray(j)
+        cos_lat = to_cy(self.cos_lat(), FIELD)
+        sin_lat = to_cy(self.sin_lat(), FIELD)
+        cos_lon = to_cy(self.cos_lon(), FIELD)
+        sin_lon = to_cy(self.sin_lon(), FIELD)
+        expr = sin_lat[i] * sin_lat[j] + cos_lat[i] * cos_lat[j] * \
+            (sin_lon[i] * sin_lon[j] + cos_lon[i] * cos_lon[j])
+        return np.arccos(np.clip(expr, -1, 1))
+
+    def _tree_coordinates(self):
+        """
+        Return the cartesian coordinates of the nodes on the unit sphere, in
+        which the angular great circle distance is monotonous in the
+        euclidean (chord) distance.
+
+        :rtype: 2D Numpy array (float64) [index, 3]
+        """
+        return np.transpose(self.latlon2cartesian(
+            self.lat_sequence().astype(np.float64),
+            self.lon_sequence().astype(np.float64)))
+
+    def _tree_radius(self, radius):
+        """
+        Return the chord length on the unit sphere corresponding to an
+        angular great circle distance.
+        """
+        return 2 * np.sin(min(max(radius, 0), np.pi) / 2)
+
+    @staticmethod
+    def latlon2cartesian(lat, lon):
+        """
+        Return the cartesian coordinates of points on the unit sphere.
+
+        **Example:**
+
+        >>> GeoGrid.latlon2cartesian(0., 90.).round(2)
+        array([1., 0., 0.])
+
+        :type lat: number or array (float)
+        :arg lat: The latitudes in degrees.
+        :type lon: number or array (float)
+        :arg lon: The longitudes in degrees.
+        :rtype: Numpy array [3, ...]
+        :return: the x, y and z coordinates of the points.
+        """
+        lat = np.asarray(lat) * np.pi / 180
+        lon = np.asarray(lon) * np.pi / 180
+        coslat = np.cos(lat)
+        return np.array([coslat * np.sin(lon), coslat * np.cos(lon),
+                         np.sin(lat)])
+
+    @staticmethod
+    def cartesian2latlon(pos):
+        """
+        Return latitudes and longitudes in degrees of points on the unit
+        sphere, inverting :meth:`latlon2cartesian`.
+
+        :type pos: array [3, ...]
+        :arg pos: The x, y and z coordinates of the points.
+        :rtype: tuple of two Numpy arrays
+        :return: the latitudes and longitudes of the points.
+        """
+        return np.arcsin(pos[2]) * 180 / np.pi, \
+            np.arctan2(pos[0], pos[1]) * 180 / np.pi
+
+    def nearest_nodes(self, lat, lon, k=1):
+        """
+        Return the k nodes closest to each of the given geographical
+        coordinates.
+
+        The query runs on a KD-tree of the nodes on the unit sphere, which
+        is built once per grid, so that each point costs
+        :math:`O(\\log N)` instead of a scan over all nodes.
+
+        **Example:**
+
+        >>> GeoGrid.SmallTestGrid().nearest_nodes(
+        ...     lat=[14., 1.], lon=[9., 3.], k=2)[1]
+        array([[3, 2],
+               [0, 1]])
+
+        :type lat: number or array (float)
+        :arg lat: The latitudes in degrees.
+        :type lon: number or array (float)
+        :arg lon: The longitudes in degrees.
+        :arg int k: The number of nearest nodes.
+        :rtype: tuple of two Numpy arrays [..., k]
+        :return: the angular great circle distances to and the indices of
+            the nearest nodes, sorted by distance. The last axis is dropped
+            for ``k=1``.
+        """
+        chord, index = self._kd_tree().query(
+            np.moveaxis(self.latlon2cartesian(lat, lon), 0, -1), k=k)
+        return 2 * np.arcsin(np.minimum(chord / 2, 1)), index
+
+    def nodes_within(self, lat, lon, radius):
+        """
+        Return the nodes within an angular great circle distance of each of
+        the given geographical coordinates.
+
+        **Example:**
+
+        >>> GeoGrid.SmallTestGrid().nodes_within(lat=14., lon=9., radius=0.1)
+        array([2, 3])
+
+        :type lat: number or array (float)
+        :arg lat: The latitudes in degrees.
+        :type lon: number or array (float)
+        :arg lon: The longitudes in degrees.
+        :arg float radius: The maximum angular distance (unit radians).
+        :rtype: 1D Numpy array (int) or object array of those
+        :return: the sorted indices of the nodes within the radius, for each
+            point if several are given.
+        """
+        x = np.moveaxis(self.latlon2cartesian(lat, lon), 0, -1)
+        found = self._kd_tree().query_ball_point(
+            x, self._tree_radius(radius), return_sorted=True)
+        if x.ndim == 1:
+            return np.array(found, dtype=int)
+        res = np.empty(found.shape, dtype=object)
+        for idx, nodes in np.ndenumerate(found):
+            res[idx] = np.array(nodes, dtype=int)
+        return res
+
     def boundaries(self):
         """
         Return the spatio-temporal grid boundaries.
@@ -508,16 +667,24 @@ class GeoGrid(Grid):
         :return: bool array with True for nodes inside region
         """
         # Reshape Google Earth array  into (n,2) array
-        remapped_region = region.reshape(len(region)//2, 2)
+        remapped_region = np.array(region, dtype=float).reshape(-1, 2)
         # Remap from East-West to 360 degree map if the longitudes are [0, 360]
         if self._grid["space"][1].min() >= 0:
             remapped_region[remapped_region[:, 0] < 0, 0] = \
                 360 + remapped_region[remapped_region[:, 0] < 0, 0]
 
-        lat_lon_map = np.column_stack((self._grid["space"][1],
-                                       self._grid["space"][0]))
+        lat, lon = self._grid["space"]
+
+        # Only test the nodes inside the bounding box of the polygon
+        (lon_min, lat_min), (lon_max, lat_max) = \
+            remapped_region.min(axis=0), remapped_region.max(axis=0)
+        candidates = np.flatnonzero((lon >= lon_min) & (lon <= lon_max)
+                                    & (lat >= lat_min) & (lat <= lat_max))
 
-        return path.Path(remapped_region).contains_points(lat_lon_map)
+        inside = np.zeros(self.N, dtype=bool)
+        inside[candidates] = path.Path(remapped_region).contains_points(
+            np.column_stack((lon[candidates], lat[candidates])))
+        return inside
 
     @staticmethod
     def region(name):
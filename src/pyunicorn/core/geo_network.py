@@ -18,7 +18,9 @@ Provides class for analyzing complex network embedded on a spherical surface.
 
 import numpy as np
 import igraph
+import h5py
 
+from .network import Network
 from .spatial_network import SpatialNetwork
 from .geo_grid import GeoGrid
 
@@ -189,6 +191,39 @@ class GeoNetwork(SpatialNetwork):
         net._mut_la += 1
         return net
 
+    def _write_hdf5(self, f, compression):
+        """
+        Write the network, its grid and node weight type to an open HDF5 file.
+        """
+        SpatialNetwork._write_hdf5(self, f, compression)
+        f.attrs["node_weight_type"] = self.node_weight_type or ""
+
+    @staticmethod
+    def LoadHDF5(filename, link_attributes=True, silence_level=0):
+        """
+        Return a GeoNetwork object stored in a binary HDF5 file.
+
+        See :meth:`.Network.save_hdf5`.
+
+        :arg str filename: The name of the HDF5 file.
+        :type link_attributes: bool or list of str
+        :arg link_attributes: Whether to restore all link attributes, or the
+            names of the link attributes to be restored.
+        :arg int silence_level: The inverse level of verbosity of the object.
+        :rtype: GeoNetwork object
+        :return: :class:`GeoNetwork` instance.
+        """
+        with h5py.File(filename, "r") as f:
+            net = GeoNetwork(
+                grid=GeoGrid._read_hdf5(f["grid"], silence_level),
+                adjacency=Network._read_hdf5_adjacency(f),
+                directed=bool(f.attrs["directed"]),
+                node_weight_type=f.attrs.get("node_weight_type") or None,
+                silence_level=silence_level)
+            net.node_weights = f["node_weights"][:]
+            net._read_hdf5_link_attributes(f, link_attributes)
+        return net
+
     def save_for_cgv(self, filename, fileformat="graphml"):
         """
         Save the GeoNetwork and its attributes for the CGV visualization
@@ -214,7 +249,8 @@ class GeoNetwork(SpatialNetwork):
         self.set_node_attribute("lon", self.grid.lon_sequence())
 
         #  Save geodesic angular distances on the sphere as link attribute
-        self.set_link_attribute("ang_dist", self.grid.angular_distance())
+        self._set_link_distance_attribute("ang_dist",
+                                          self.grid.angular_pair_distance)
 
         #  Save network, independent of filename!
         if fileformat in ["graphml", "graphmlz", "graphviz"]:
@@ -762,22 +798,22 @@ class GeoNetwork(SpatialNetwork):
         This method is called to calculate undirected CWD, in-CWD
         and out-CWD.
 
-        :type adjacency: 2D array [index, index]
+        :type adjacency: sparse matrix [index, index]
         :arg adjacency: The adjacency matrix.
         :type degree: 1D array [index]
         :arg degree: The degree sequence.
         :rtype: 1D array [index]
         :return: the general connectivity weighted distance sequence.
         """
-        D = self.grid.angular_distance()
-        connectivity_weighted_distance = np.zeros(self.N)
+        L = self.grid.link_distance(adjacency)
 
         cos_lat = self.grid.cos_lat()
         norm = cos_lat.sum()
 
-        for i in range(self.N):
-            connectivity_weighted_distance[i] = \
-                (adjacency[i, :] * cos_lat * D[i, :]).sum()
+        #  Weight the distance of each link by the area of its target node
+        L.data *= cos_lat[L.indices]
+        connectivity_weighted_distance = \
+            np.asarray(L.sum(axis=1), dtype=float).ravel()
 
         #  Normalize by node degree and total dimensionless area
         connectivity_weighted_distance[degree != 0] /= \
@@ -804,7 +840,7 @@ class GeoNetwork(SpatialNetwork):
         if self.silence_level <= 1:
             print("Calculating connectivity weighted link distance...")
 
-        A = self.undirected_adjacency().toarray()
+        A = self.undirected_adjacency()
         degree = self.degree()
         return self._calculate_general_connectivity_weighted_distance(
             A, degree)
@@ -825,7 +861,7 @@ class GeoNetwork(SpatialNetwork):
         if self.silence_level <= 1:
             print("Calculating in-connectivity weighted link distance...")
 
-        A = self.adjacency.transpose()
+        A = self.sp_A.transpose()
         indegree = self.indegree()
 
         return self._calculate_general_connectivity_weighted_distance(A,
@@ -847,7 +883,7 @@ class GeoNetwork(SpatialNetwork):
         if self.silence_level <= 1:
             print("Calculating out-connectivity weighted link distance...")
 
-        A = self.adjacency
+        A = self.sp_A
         outdegree = self.outdegree()
 
         return self._calculate_general_connectivity_weighted_distance(
@@ -882,19 +918,10 @@ class GeoNetwork(SpatialNetwork):
         :rtype: 1D Numpy array (index)
         :return: the local geographical clustering sequence.
         """
-        ad = self.grid.angular_distance().copy()
-        ad[ad == 0] = np.inf
-        distance_weighted_adjacency = self.adjacency / ad
-        return self.weighted_local_clustering(distance_weighted_adjacency)
-
-    @staticmethod
-    def cartesian2latlon(pos):
-        return np.arcsin(pos[2]) * 180 / np.pi, \
-            np.arctan2(pos[0], pos[1]) * 180 / np.pi
+        W = self.grid.link_distance(self.sp_A)
+        W.data[W.data == 0] = np.inf
+        W.data = 1 / W.data
+        return self.weighted_local_clustering(W.toarray())
 
-    @staticmethod
-    def latlon2cartesian(lat, lon):
-        lat *= np.pi/180
-        lon *= np.pi/180
-        coslat = np.cos(lat)
-        return [coslat * np.sin(lon), coslat * np.cos(lon), np.sin(lat)]
+    cartesian2latlon = staticmethod(GeoGrid.cartesian2latlon)
+    latlon2cartesian = staticmethod(GeoGrid.latlon2cartesian)
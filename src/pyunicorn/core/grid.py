@@ -21,6 +21,8 @@ from collections.abc import Hashable
 import pickle
 
 import numpy as np
+from scipy import sparse as sp
+from scipy.spatial import cKDTree
 
 from .cache import Cached
 from ._ext.types import to_cy, FIELD
@@ -124,6 +126,21 @@ class Grid(Cached):
 
         return grid
 
+    def _write_hdf5(self, group):
+        """
+        Write the grid to a group of an open HDF5 file.
+        """
+        group.attrs["class"] = self.__class__.__name__
+        group.create_dataset("time", data=self._grid["time"])
+        group.create_dataset("space", data=self._grid["space"])
+
+    @staticmethod
+    def _read_hdf5(group, silence_level=0):
+        """
+        Read a grid from a group of an open HDF5 file.
+        """
+        return Grid(group["time"][:], group["space"][:], silence_level)
+
     #
     #  Alternative constructors and Grid generation methods
     #
@@ -233,28 +250,15 @@ class Grid(Cached):
         >>> Grid.SmallTestGrid().node_number(x=(14., 9.))
         3
 
-        :type x: number (float)
-        :arg x: The x coordinate.
+        :type x: tuple or 2D array [point, dim]
+        :arg x: The coordinates of one or several points.
 
-        :type y: number (float)
-        :arg y: The y coordinate.
-
-        :rtype: number (int)
-        :return: the closest node's index.
+        :rtype: number (int) or array of int
+        :return: the closest node's index, for each point if several are
+            given.
         """
-        x = np.array(x)
-
-        # Get the differences of the coordinates of all nodes to the given
-        # coordinates
-        diff = self._grid["space"].T - x
-
-        # Get sequences of cosLat, sinLat, cosLon and sinLon for all nodes
-        dist = np.sqrt(np.sum(diff**2, axis=1))
-
-        #  Get index of closest node
-        n_node = dist.argmin()
-
-        return n_node
+        #  Query the KD-tree of the node coordinates
+        return self._kd_tree().query(np.asarray(x, dtype=float))[1]
 
     def node_coordinates(self, index):
         """
@@ -283,6 +287,17 @@ class Grid(Cached):
         """
         return self.euclidean_distance()
 
+    def _distance_coordinates(self) -> Tuple[int, np.ndarray]:
+        """
+        Return the metric and node coordinates from which the compiled
+        kernels evaluate the standard distance between pairs of nodes on
+        demand (see :meth:`distance`).
+
+        :rtype: tuple (int, 2D Numpy array (float64) [dim, index])
+        :return: the metric (1: euclidean) and the coordinates of the nodes.
+        """
+        return 1, np.ascontiguousarray(self._grid["space"], dtype=np.float64)
+
     @Cached.method()
     def euclidean_distance(self):
         """
@@ -314,6 +329,164 @@ class Grid(Cached):
         _calculate_euclidean_distance(sequences, distance, N_dim, N_nodes)
         return distance
 
+    def pair_distance(self, i, j):
+        """
+        Return the standard distance between the pairs of nodes
+        :math:`(i_k, j_k)` of the corresponding grid type, without forming
+        the full distance matrix (see :meth:`distance`).
+
+        :type i: array of int
+        :arg i: The indices of the first nodes of all pairs.
+        :type j: array of int
+        :arg j: The indices of the second nodes of all pairs, broadcast
+            against ``i``.
+        :rtype: Numpy array (float32)
+        :return: the distances between the pairs of nodes.
+        """
+        return self.euclidean_pair_distance(i, j)
+
+    def euclidean_pair_distance(self, i, j):
+        """
+        Return the euclidean distance between the pairs of nodes
+        :math:`(i_k, j_k)`.
+
+        The values coincide with the corresponding entries of
+        :meth:`euclidean_distance`.
+
+        **Example:**
+
+        >>> Grid.SmallTestGrid().euclidean_pair_distance([0, 1], [5, 2])
+        array([27.95085,  5.59017], dtype=float32)
+
+        :type i: array of int
+        :arg i: The indices of the first nodes of all pairs.
+        :type j: array of int
+        :arg j: The indices of the second nodes of all pairs, broadcast
+            against ``i``.
+        :rtype: Numpy array (float32)
+        :return: the euclidean distances between the pairs of nodes.
+        """
+        i, j = np.broadcast_arrays(np.asarray(i), np.asarray(j))
+        expr = np.zeros(i.shape, dtype=FIELD)
+        for x in to_cy(self._grid["space"], FIELD):
+            expr += (x[i] - x[j])**2
+        return np.sqrt(expr)
+
+    def link_distance(self, adjacency):
+        """
+        Return the standard distances between all linked pairs of nodes.
+
+        Distances are only evaluated for the nonzero entries of the given
+        adjacency matrix, so that the memory footprint scales with the
+        number of links instead of the squared number of nodes.
+
+        **Example:**
+
+        >>> A = [[0, 1, 0], [1, 0, 1], [0, 1, 0]]
+        >>> print(Grid.SmallTestGrid().link_distance(A).toarray().round(2))
+        [[0.   5.59 0.  ]
+         [5.59 0.   5.59]
+         [0.   5.59 0.  ]]
+
+        :type adjacency: square array or sparse matrix [index, index]
+        :arg adjacency: The adjacency matrix of a network on the first nodes
+            of the grid.
+        :rtype: sparse CSR matrix (float32) [index, index]
+        :return: the distance of each link, with the sparsity structure of
+            ``adjacency``.
+        """
+        A = sp.csr_matrix(adjacency, copy=True)
+        A.eliminate_zeros()
+        rows = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+        return sp.csr_matrix(
+            (self.pair_distance(rows, A.indices), A.indices, A.indptr),
+            shape=A.shape)
+
+    def _distance_row_blocks(self, pair_distance=None, size=2**22):
+        """
+        Iterate over blocks of consecutive rows of a distance matrix, each
+        with at most about ``size`` entries.
+
+        :arg pair_distance: The pair distance function, defaults to
+            :meth:`pair_distance`.
+        :arg int size: The maximum number of entries per block.
+        :return: generator of tuples (int, 2D Numpy array [row, index]) of
+            the first row index and the block of distances.
+        """
+        if pair_distance is None:
+            pair_distance = self.pair_distance
+        N = self.N
+        step = max(1, size // max(N, 1))
+        nodes = np.arange(N)
+        for start in range(0, N, step):
+            rows = nodes[start:start + step]
+            yield start, pair_distance(rows[:, np.newaxis], nodes)
+
+    def _tree_coordinates(self):
+        """
+        Return the coordinates of the nodes in the space in which the
+        standard distance is monotonous in the euclidean distance, see
+        :meth:`pairs_within`.
+
+        :rtype: 2D Numpy array (float64) [index, dim]
+        """
+        return self._grid["space"].T.astype(np.float64)
+
+    def _tree_radius(self, radius):
+        """
+        Return the euclidean radius in the space of
+        :meth:`_tree_coordinates` corresponding to a standard distance.
+        """
+        return radius
+
+    @Cached.method(name="KD-tree of node coordinates")
+    def _kd_tree(self):
+        return cKDTree(self._tree_coordinates())
+
+    def pairs_within(self, radius):
+        """
+        Return all pairs of distinct nodes whose standard distance is at most
+        ``radius``.
+
+        The pairs are found by a radius query on a KD-tree of the node
+        coordinates, which avoids evaluating the full distance matrix.
+
+        **Example:**
+
+        >>> Grid.SmallTestGrid().pairs_within(6.)
+        array([[0, 1],
+               [1, 2],
+               [2, 3],
+               [3, 4],
+               [4, 5]])
+
+        :arg float radius: The maximum distance.
+        :rtype: 2D Numpy array (int) [pair, 2]
+        :return: the lexicographically sorted pairs :math:`(i, j)` with
+            :math:`i < j`.
+        """
+        pairs = self._kd_tree().query_pairs(
+            self._tree_radius(radius), output_type="ndarray")
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    @Cached.method(name="maximum distance")
+    def max_distance(self):
+        """
+        Return the maximum standard distance between any two nodes.
+
+        The distance matrix is evaluated in blocks of rows and never held in
+        memory as a whole.
+
+        **Example:**
+
+        >>> Grid.SmallTestGrid().max_distance()
+        np.float32(27.95085)
+
+        :rtype: number (float)
+        :return: the maximum distance.
+        """
+        return max(D.max() for _, D in self._distance_row_blocks())
+
     def boundaries(self):
         """
         Return the spatio-temporal grid boundaries.
@@ -397,15 +570,16 @@ class Grid(Cached):
             print("Calculating the geometric distance distribution of the "
                   "grid...")
 
-        #  Get angular distance matrix
-        D = self.distance()
-
         #  Determine range for link distance histograms
-        max_range = D.max()
+        max_range = self.max_distance()
         interval = (0, max_range)
 
-        #  Calculate geometry related factor of distributions to divide it out
-        (dist, lbb) = np.histogram(a=D, bins=n_bins, range=interval)
+        #  Calculate geometry related factor of distributions to divide it
+        #  out, accumulating the histogram over blocks of the distance matrix
+        dist = 0
+        for _, D in self._distance_row_blocks():
+            (counts, lbb) = np.histogram(a=D, bins=n_bins, range=interval)
+            dist = dist + counts
         #  Subtract self.N from first bin because of spurious links with zero
         #  distance on the diagonal of the angular distance matrix
         dist[0] -= self.N
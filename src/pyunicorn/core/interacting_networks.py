@@ -19,6 +19,7 @@ multivariate data and generating time series surrogates.
 
 import numpy as np
 from numpy import random
+import h5py
 
 from ._ext.types import to_cy, ADJ, NODE, DWEIGHT, DFIELD
 from ._ext.numerics import _randomlySetCrossLinks, _randomlyRewireCrossLinks, \
@@ -75,6 +76,34 @@ class InteractingNetworks(Network):
         """
         return 'InteractingNetworks:\n' + Network.__str__(self)
 
+    #
+    #  Load and save InteractingNetworks object
+    #
+
+    @staticmethod
+    def LoadHDF5(filename, link_attributes=True, silence_level=0):
+        """
+        Return an InteractingNetworks object stored in a binary HDF5 file.
+
+        See :meth:`.Network.save_hdf5`.
+
+        :arg str filename: The name of the HDF5 file.
+        :type link_attributes: bool or list of str
+        :arg link_attributes: Whether to restore all link attributes, or the
+            names of the link attributes to be restored.
+        :arg int silence_level: The inverse level of verbosity of the object.
+        :rtype: InteractingNetworks object
+        :return: :class:`InteractingNetworks` instance.
+        """
+        with h5py.File(filename, "r") as f:
+            net = InteractingNetworks(
+                adjacency=Network._read_hdf5_adjacency(f),
+                directed=bool(f.attrs["directed"]),
+                node_weights=f["node_weights"][:],
+                silence_level=silence_level)
+            net._read_hdf5_link_attributes(f, link_attributes)
+        return net
+
     #
     #  Graph generation methods
     #
@@ -0,0 +1,327 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Provides lazy, chunk-aware access to observables stored in NetCDF files.
+"""
+
+import os
+import tempfile
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+try:
+    from h5netcdf.legacyapi import Dataset
+except ImportError:
+    try:
+        from netCDF4 import Dataset
+    except ImportError:
+        print("pyunicorn: Packages netCDF4 or h5netcdf could not be loaded. "
+              "Some functionality in class LazyObservable might not be "
+              "available!")
+
+from ._ext.types import FIELD
+
+
+class LazyObservable:
+    """
+    Read-only view on a NetCDF variable in the layout ``[time, space]`` used
+    by :class:`.Data`, which keeps the file open and reads samples on demand.
+
+    Indexing with a pair of (boolean or integer) index arrays or slices only
+    reads the bounding hyperslab of the selected samples from the file, and
+    :meth:`blocks` iterates over a selection in blocks aligned with the
+    chunks of the variable. Optionally, the whole variable is converted once
+    into a memory-mapped ``float32`` cache file on local disk, from which all
+    subsequent reads are served.
+
+    Spatial indices of a regular grid ``(time, [level,] lat, lon)`` are
+    flattened in row-major order, matching :meth:`.GeoGrid.RegularGrid`.
+
+    **Example** (Stream the spatial window of a daily global field)::
+
+        obs = LazyObservable("air.nc", "air", cache_file="/tmp/air.f32")
+        for block, values in obs.blocks(time_indices, space_indices):
+            ...
+    """
+
+    # pylint: disable=too-many-positional-arguments
+    def __init__(self, file_name: str, observable_name: str,
+                 file_type: str = "NetCDF",
+                 vertical_level: Optional[int] = None,
+                 cache_file: Optional[str] = None):
+        """
+        Open a NetCDF variable for lazy access.
+
+        :arg str file_name: The name of the data file.
+        :arg str observable_name: The short name of the observable within the
+            data file.
+        :arg str file_type: The format of the data file, "NetCDF" for regular
+            grids or "iNetCDF" for irregular grids.
+        :arg int vertical_level: The vertical level to be extracted from 4D
+            (3D) regular (irregular) data sets. If None, the first level in
+            the data file is chosen.
+        :arg str cache_file: Optional name of a memory-mapped ``float32``
+            cache file. It is created if it does not exist or is older than
+            the data file, and reused otherwise.
+        """
+        assert file_type in ("NetCDF", "iNetCDF"), \
+            f"unsupported file type: {file_type}"
+        self.file_name = file_name
+        self._dataset = Dataset(file_name, "r")
+        self._variable = self._dataset.variables[observable_name]
+
+        n_space_dims = 2 if file_type == "NetCDF" else 1
+        n_dim = len(self._variable.shape)
+        if n_dim == 1 + n_space_dims:
+            self._level = None
+        elif n_dim == 2 + n_space_dims:
+            self._level = 0 if vertical_level is None else vertical_level
+        else:
+            raise ValueError(
+                f"{file_type} data sets with {n_dim} dimensions are not "
+                "supported by Data class!")
+
+        shape = self._variable.shape
+        self._n_lon = shape[-1] if file_type == "NetCDF" else None
+        self.shape: Tuple[int, int] = \
+            (shape[0], int(np.prod(shape[-n_space_dims:])))
+        """The shape ``(time, space)`` of the observable."""
+
+        #  Chunk lengths along the flattened axes, where spatial chunks of a
+        #  regular grid extend over full rows of constant latitude
+        chunking = self._variable.chunking()
+        if chunking == "contiguous" or chunking is None:
+            chunking = (1,) * n_dim
+        self.chunks: Tuple[int, int] = (
+            int(chunking[0]),
+            int(chunking[-1]) if self._n_lon is None
+            else int(chunking[-2]) * self._n_lon)
+        """The chunk lengths ``(time, space)`` of the stored variable."""
+
+        self._cache = None
+        if cache_file is not None:
+            self._open_cache(cache_file)
+
+    def __str__(self):
+        """
+        Returns a string representation.
+        """
+        return (f"LazyObservable: {self.file_name}, shape {self.shape}, "
+                f"chunks {self.chunks}"
+                + ("" if self._cache is None
+                   else f", cached in {self._cache.filename}"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Close the data file and the cache file.
+        """
+        if self._cache is not None:
+            del self._cache
+            self._cache = None
+        self._dataset.close()
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        The data type of the samples returned on access.
+        """
+        return np.dtype(FIELD)
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes of the fully loaded observable.
+        """
+        return self.shape[0] * self.shape[1] * self.dtype.itemsize
+
+    #
+    #  Reading samples
+    #
+
+    def _normalize(self, key, axis: int) -> NDArray:
+        """
+        Return the sorted integer indices selected by ``key`` along ``axis``.
+        """
+        indices = np.arange(self.shape[axis])[key]
+        return np.atleast_1d(indices)
+
+    def _read_file(self, t: slice, s: slice) -> NDArray:
+        """
+        Read a hyperslab in flattened coordinates from the data file.
+        """
+        if self._n_lon is None:
+            sel = (t, s) if self._level is None else (t, self._level, s)
+            return np.asarray(self._variable[sel], dtype=FIELD)
+
+        r0, r1 = s.start // self._n_lon, (s.stop - 1) // self._n_lon + 1
+        sel = (t, slice(r0, r1), slice(None))
+        if self._level is not None:
+            sel = (t, self._level) + sel[1:]
+        rows = np.asarray(self._variable[sel], dtype=FIELD)
+        rows = rows.reshape(rows.shape[0], -1)
+        return rows[:, s.start - r0 * self._n_lon:s.stop - r0 * self._n_lon]
+
+    def _read(self, time_indices: NDArray, space_indices: NDArray) -> NDArray:
+        """
+        Read the samples at sorted integer indices by their bounding box.
+        """
+        out_shape = (len(time_indices), len(space_indices))
+        if 0 in out_shape:
+            return np.empty(out_shape, dtype=FIELD)
+
+        t0, s0 = time_indices[0], space_indices[0]
+        t = slice(t0, time_indices[-1] + 1)
+        s = slice(s0, space_indices[-1] + 1)
+        if self._cache is not None:
+            box = self._cache[t, s]
+        elif self._n_lon is None:
+            box = self._read_file(t, s)
+        else:
+            #  Restrict to the bounding columns of the selected rows
+            cols = space_indices % self._n_lon
+            rows = space_indices // self._n_lon
+            if rows[0] == rows[-1]:
+                box = self._read_file(t, s)
+            else:
+                c0, c1 = cols.min(), cols.max() + 1
+                sel = (t, slice(rows[0], rows[-1] + 1), slice(c0, c1))
+                if self._level is not None:
+                    sel = (t, self._level) + sel[1:]
+                box = np.asarray(self._variable[sel], dtype=FIELD)
+                box = box.reshape(box.shape[0], -1)
+                space_indices = (rows - rows[0]) * (c1 - c0) + cols - c0
+                s0 = 0
+
+        box = box[time_indices - t0] \
+            if len(time_indices) < t.stop - t.start else box
+        if len(space_indices) < box.shape[1]:
+            box = box[:, space_indices - s0]
+        return np.array(box, dtype=FIELD, copy=self._cache is not None)
+
+    def __getitem__(self, key) -> NDArray:
+        """
+        Read the samples selected by a pair ``(time, space)`` of slices,
+        boolean masks or increasing integer index arrays.
+        """
+        time_key, space_key = key if isinstance(key, tuple) \
+            else (key, slice(None))
+        return self._read(self._normalize(time_key, 0),
+                          self._normalize(space_key, 1))
+
+    def __array__(self, dtype=None, copy=None):
+        obs = self[:, :]
+        return obs if dtype is None else obs.astype(dtype, copy=False)
+
+    #
+    #  Iterating over blocks
+    #
+
+    def block_bounds(self, indices: NDArray, axis: int, n_other: int,
+                     max_bytes: int = 2**26) -> List[Tuple[int, int]]:
+        """
+        Partition a sorted selection of indices along ``axis`` into blocks
+        aligned with the chunks of the stored variable.
+
+        Each block spans an integer number of chunks along ``axis``, as many
+        as fit into ``max_bytes`` when combined with ``n_other`` samples along
+        the other axis.
+
+        :type indices: 1D array (int)
+        :arg indices: The increasing selected indices along ``axis``.
+        :arg int axis: The axis (0: time, 1: space).
+        :arg int n_other: The number of selected samples along the other axis.
+        :arg int max_bytes: The target size of a single block.
+        :rtype: list of tuple of int
+        :return: the bounds ``(start, stop)`` of blocks, as positions within
+            ``indices``.
+        """
+        if len(indices) == 0:
+            return []
+        chunk = self.chunks[axis]
+        chunk_bytes = chunk * max(n_other, 1) * self.dtype.itemsize
+        step = chunk * max(1, max_bytes // chunk_bytes)
+        keys = np.asarray(indices) // step
+        edges = np.concatenate(
+            ([0], np.flatnonzero(np.diff(keys)) + 1, [len(indices)]))
+        return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+    # pylint: disable=too-many-positional-arguments
+    def blocks(self, time_key=slice(None), space_key=slice(None),
+               axis: int = 1, max_bytes: int = 2**26
+               ) -> Iterator[Tuple[slice, NDArray]]:
+        """
+        Iterate over a selection of the observable in chunk-aligned blocks.
+
+        :arg time_key: The selected time indices (slice, boolean mask or
+            increasing integer array).
+        :arg space_key: The selected spatial indices.
+        :arg int axis: The axis along which the selection is partitioned
+            (0: temporal blocks, 1: spatial blocks).
+        :arg int max_bytes: The target size of a single block.
+        :rtype: iterator of tuple (slice, 2D array [time, space])
+        :return: the position of each block along ``axis`` within the
+            selection, and its samples.
+        """
+        indices = [self._normalize(time_key, 0),
+                   self._normalize(space_key, 1)]
+        for start, stop in self.block_bounds(
+                indices[axis], axis, len(indices[1 - axis]), max_bytes):
+            block = list(indices)
+            block[axis] = indices[axis][start:stop]
+            yield slice(start, stop), self._read(*block)
+
+    #
+    #  Memory-mapped cache
+    #
+
+    def _open_cache(self, cache_file: str):
+        """
+        Create or reuse a memory-mapped ``float32`` copy of the variable.
+        """
+        n_bytes = self.nbytes
+        if not (os.path.exists(cache_file)
+                and os.path.getsize(cache_file) == n_bytes
+                and os.path.getmtime(cache_file)
+                >= os.path.getmtime(self.file_name)):
+            #  Write to a temporary file first, such that an interrupted
+            #  conversion never leaves a seemingly valid cache file behind
+            fd, tmp = tempfile.mkstemp(
+                prefix=f".{os.path.basename(cache_file)}.", suffix=".tmp",
+                dir=os.path.dirname(os.path.abspath(cache_file)))
+            os.close(fd)
+            try:
+                cache = np.memmap(
+                    tmp, mode="w+", dtype=FIELD, shape=self.shape)
+                for block, values in self.blocks(axis=0):
+                    cache[block] = values
+                cache.flush()
+                del cache
+                os.replace(tmp, cache_file)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        self._cache = np.memmap(
+            cache_file, mode="r", dtype=FIELD, shape=self.shape)
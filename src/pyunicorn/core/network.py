@@ -19,8 +19,11 @@ multivariate data and generating time series surrogates.
 
 import sys                          # performance testing
 import time
+import threading
+import uuid
+import warnings
 from functools import partial
-from typing import Tuple, Optional
+from typing import Any, Tuple, Optional
 from collections.abc import Hashable
 from multiprocessing import get_context, cpu_count
 
@@ -30,12 +33,16 @@ from scipy import linalg            # solvers
 from scipy.linalg import expm
 from scipy import sparse as sp      # fast sparse matrices
 from scipy.sparse.linalg import eigsh, inv, splu
+from scipy.sparse.csgraph import reverse_cuthill_mckee
 from tqdm import tqdm, trange       # easy progress bar handling
 
 import igraph                       # high performance graph theory tools
+import h5py                         # binary storage
 
 from .cache import Cached
-from ..utils import mpi             # parallelized computations
+from ..utils import executor        # parallelized computations
+from ..utils import instrument      # progress and profiling events
+from ..utils.executor import Shared
 
 from ._ext.types import \
     to_cy, ADJ, MASK, NODE, DEGREE, DWEIGHT, DFIELD
@@ -57,6 +64,44 @@ def nz_coords(matrix):
     return np.array(matrix.nonzero()).T
 
 
+_kirchhoff_factors = {}
+"""(dictionary) factorised Kirchhoff matrices kept by this worker, by key."""
+_kirchhoff_lock = threading.Lock()
+
+
+def _kirchhoff_rows(key, sp_Aplus, k, w, rows):
+    """
+    Return the given rows of V for the (n.s.i.) Newman-type random walk
+    betweenness, solving with a factorisation of the Kirchhoff matrix without
+    last row/col that is computed once per key and worker.
+
+    :arg key: An identifier of the component, unique per computation.
+    :arg sp_Aplus: The sparse adjacency matrix A, or A^+ for n.s.i. measures.
+    :arg k: The (n.s.i.) degrees.
+    :arg w: The node weights for n.s.i. measures, otherwise None.
+    :arg rows: The sorted indices of the requested rows.
+    :rtype: 2D array [row, node]
+    """
+    N = len(k)
+    solved = rows[rows < N - 1]
+    rhs = np.zeros((N - 1, len(solved)))
+    rhs[solved, np.arange(len(solved))] = 1
+    X = np.zeros((N, len(rows)))
+    with _kirchhoff_lock:
+        if key not in _kirchhoff_factors:
+            if len(_kirchhoff_factors) > 2:
+                _kirchhoff_factors.clear()
+            sp_M = sp.diags(k) - (
+                sp_Aplus if w is None else sp.diags(w) * sp_Aplus)
+            _kirchhoff_factors[key] = splu(sp.csc_matrix(sp_M[:-1, :-1]))
+        X[:-1, :len(solved)] = _kirchhoff_factors[key].solve(rhs)
+    if w is None:
+        # V is the symmetric inverse, padded with zeros
+        return X.T
+    # V = ((D_k^-1 A^+) M^-1)^T
+    return (sp_Aplus * X / k[:, None]).T
+
+
 class NetworkError(Exception):
     """
     Used for all exceptions raised by Network.
@@ -218,6 +263,13 @@ class Network(Cached):
     def __cache_state__(self) -> Tuple[Hashable, ...]:
         return (self.directed, self._mut_A,)
 
+    def __cache_content__(self) -> Tuple[Any, ...]:
+        A = self.sp_A
+        return (self.directed, A.shape, A.indptr, A.indices, A.data,
+                self.node_weights,
+                {a: np.asarray(self.graph.es[a])
+                 for a in self.graph.es.attributes()})
+
     def __str__(self):
         """
         Return a short summary of the network.
@@ -456,6 +508,160 @@ class Network(Cached):
         #  Set sparse adjacency matrix
         self.adjacency = sp_A
 
+    def add_edges(self, edges, link_attributes=None):
+        """
+        Add a batch of links to the network in place.
+
+        The sparse adjacency matrix, the embedded graph object and the link
+        attributes are updated instead of rebuilt. Cached degrees and, for
+        undirected networks, local clustering coefficients are maintained
+        incrementally, at a cost proportional to the number of added links
+        times the local degrees. All other cached measures are invalidated.
+
+        **Example:**
+
+        >>> net = Network.SmallTestNetwork()
+        >>> net.add_edges([[0, 1], [2, 3]]); print(net)
+        Network: undirected, 6 nodes, 9 links, link density 0.600.
+
+        :type edges: array-like [[int>=0,int>=0]]
+        :arg  edges: [[i,j]] for links i -> j (i -- j if the network is
+            undirected). Links which are present already are ignored.
+        :type link_attributes: dict {str: array-like [link]}
+        :arg  link_attributes: The values of every existing link attribute for
+            the given links.
+        """
+        self._update_edges(edges, 1, link_attributes)
+
+    def remove_edges(self, edges):
+        """
+        Remove a batch of links from the network in place.
+
+        See :meth:`add_edges` for the maintenance of cached measures.
+
+        **Example:**
+
+        >>> net = Network.SmallTestNetwork()
+        >>> net.remove_edges([[0, 3], [4, 1]]); print(net)
+        Network: undirected, 6 nodes, 5 links, link density 0.333.
+
+        :type edges: array-like [[int>=0,int>=0]]
+        :arg  edges: [[i,j]] for links i -> j (i -- j if the network is
+            undirected). Links which are not present are ignored.
+        """
+        self._update_edges(edges, -1)
+
+    def _update_edges(self, edges, sign: int, link_attributes=None):
+        """
+        Add (``sign=1``) or remove (``sign=-1``) a batch of links in place.
+        """
+        N = self.N
+        edges = np.array(edges, dtype=np.int64).reshape(-1, 2)
+        if ((edges < 0) | (edges >= N)).any():
+            raise NetworkError("Node index out of range!")
+        if (edges[:, 0] == edges[:, 1]).any():
+            raise NetworkError("Self-loops are not supported!")
+        if not self.directed:
+            edges.sort(axis=1)
+        edges, index = np.unique(edges, axis=0, return_index=True)
+        present = np.asarray(
+            self.sp_A[edges[:, 0], edges[:, 1]]).ravel() != 0
+        keep = present != (sign > 0)
+        edges, index = edges[keep], index[keep]
+        if len(edges) == 0:
+            return
+
+        attributes = self.graph.es.attributes()
+        if sign > 0 and attributes:
+            if link_attributes is None \
+                    or not set(attributes) <= set(link_attributes):
+                raise NetworkError(
+                    f"Values of link attributes {attributes} are required!")
+            link_attributes = {a: np.asarray(link_attributes[a])[index]
+                               for a in attributes}
+
+        # cached measures to be maintained
+        if self.directed:
+            maintained = {m: self.cache_peek(m)
+                          for m in ["degree", "indegree", "outdegree"]}
+            C = None
+        else:
+            maintained = {"degree": self.cache_peek("degree")}
+            C = self.cache_peek("local_clustering")
+        if C is not None:
+            C = self._local_clustering_update(C, edges, sign)
+
+        # sparse adjacency matrix
+        rows, cols = edges.T
+        if not self.directed:
+            rows, cols = np.r_[rows, cols], np.r_[cols, rows]
+        A = self.sp_A + sp.csc_matrix(
+            (np.full(len(rows), sign, dtype=self.sp_dtype), (rows, cols)),
+            shape=(N, N))
+        if sign < 0:
+            A.eliminate_zeros()
+        self.sp_A = A.astype(self.sp_dtype, copy=False)
+
+        # graph object and link attributes
+        if sign > 0:
+            self.graph.add_edges(edges.tolist(), attributes=link_attributes)
+        else:
+            self.graph.delete_edges(self.graph.get_eids(edges.tolist()))
+        self.n_links += sign * len(edges)
+        self.link_density = (1 if self.directed else 2) * self.n_links \
+            / N / (N - 1)
+
+        # invalidate cache, then restore maintained measures
+        self._mut_A += 1
+        if attributes:
+            self._mut_la += 1
+        for m, k in maintained.items():
+            if k is not None:
+                k = k.copy()
+                if m != "indegree":
+                    np.add.at(k, rows if m == "outdegree" else edges, sign)
+                else:
+                    np.add.at(k, cols, sign)
+                self.cache_seed(m, k)
+        if C is not None:
+            self.cache_seed("local_clustering", C)
+
+    def _local_clustering_update(self, C, edges, sign: int):
+        """
+        Update the local clustering coefficients of an undirected network for
+        adding or removing links, by counting the affected triangles.
+        """
+        neighbours, k_old = {}, {}
+
+        def load(i):
+            if i not in neighbours:
+                neighbours[i] = set(self.graph.neighbors(i))
+                k_old[i] = len(neighbours[i])
+            return neighbours[i]
+
+        triangles = {}
+        for u, v in edges.tolist():
+            n_u, n_v = load(u), load(v)
+            common = n_u & n_v
+            for w in common:
+                load(w)
+                triangles[w] = triangles.get(w, 0) + sign
+            for i in (u, v):
+                triangles[i] = triangles.get(i, 0) + sign * len(common)
+            if sign > 0:
+                n_u.add(v)
+                n_v.add(u)
+            else:
+                n_u.discard(v)
+                n_v.discard(u)
+
+        C = C.copy()
+        for i, n_i in neighbours.items():
+            k0, k1 = k_old[i], len(n_i)
+            t = round(C[i] * k0 * (k0 - 1) / 2) + triangles.get(i, 0)
+            C[i] = 2. * t / (k1 * (k1 - 1)) if k1 > 1 else 0.
+        return C
+
     @property
     def node_weights(self):
         """array of node weights"""
@@ -595,6 +801,119 @@ class Network(Cached):
         graph = igraph.Graph.Read(f=filename, format=fileformat, *args, **kwds)
         return Network.FromIGraph(graph=graph, silence_level=silence_level)
 
+    def save_hdf5(self, filename, compression=None):
+        """
+        Save the Network object to a binary HDF5 file.
+
+        The adjacency matrix is stored in CSR format together with the node
+        weights and all numerical link attributes, such that saving and
+        loading scales with the number of links rather than the number of
+        node pairs. Subclasses additionally store their grid and similarity
+        measure in the same file.
+
+        The file can be read back by :meth:`LoadHDF5` of the same class, or
+        partially by that of a parent class, e.g., only the adjacency matrix
+        and node weights by :meth:`Network.LoadHDF5`.
+
+        :arg str filename: The name of the HDF5 file.
+        :arg str compression: The HDF5 compression filter applied to large
+            arrays, e.g. ``"gzip"`` or ``"lzf"``. ``None`` means no
+            compression.
+        """
+        with h5py.File(filename, "w") as f:
+            self._write_hdf5(f, compression)
+
+    def _write_hdf5(self, f, compression):
+        """
+        Write the network to an open HDF5 file.
+        """
+        #  Collect numerical link attributes before writing anything, since
+        #  other types cannot be stored as HDF5 datasets
+        attributes = {}
+        for name in self.graph.es.attributes():
+            values = np.array(self.graph.es[name])
+            if values.dtype.kind in "biufc":
+                attributes[name] = values
+            else:
+                warnings.warn(f"Link attribute {name!r} of type "
+                              f"{values.dtype} is not numerical and will not "
+                              "be saved.")
+
+        f.attrs["class"] = self.__class__.__name__
+        f.attrs["directed"] = self.directed
+
+        A = self.sp_A.tocsr()
+        group = f.create_group("adjacency")
+        group.attrs["N"] = self.N
+        group.create_dataset("indptr", data=A.indptr.astype(np.int64))
+        group.create_dataset("indices", data=A.indices.astype(NODE),
+                             compression=compression)
+        f.create_dataset("node_weights", data=self.node_weights)
+
+        #  Store link attributes along the edge sequence of the graph
+        if attributes:
+            group = f.create_group("link_attributes")
+            edges = np.array(self.graph.get_edgelist(), dtype=NODE)
+            group.create_dataset("edges", data=edges.reshape(-1, 2),
+                                 compression=compression)
+            for name, values in attributes.items():
+                group.create_dataset(name, data=values,
+                                     compression=compression)
+
+    @staticmethod
+    def _read_hdf5_adjacency(f):
+        """
+        Read the sparse adjacency matrix from an open HDF5 file.
+        """
+        group = f["adjacency"]
+        N = int(group.attrs["N"])
+        indices = group["indices"][:]
+        return sp.csr_matrix(
+            (np.ones(len(indices), dtype=ADJ), indices, group["indptr"][:]),
+            shape=(N, N))
+
+    def _read_hdf5_link_attributes(self, f, link_attributes):
+        """
+        Restore link attributes from an open HDF5 file.
+        """
+        if not link_attributes or "link_attributes" not in f:
+            return
+        group = f["link_attributes"]
+        if link_attributes is True:
+            link_attributes = [name for name in group if name != "edges"]
+
+        self.graph = igraph.Graph(n=self.N, edges=group["edges"][:].tolist(),
+                                  directed=self.directed)
+        for name in link_attributes:
+            self.graph.es[name] = group[name][:].tolist()
+        #  invalidate cache
+        self._mut_la += 1
+
+    @staticmethod
+    def LoadHDF5(filename, link_attributes=True, silence_level=0):
+        """
+        Return a Network object stored in a binary HDF5 file.
+
+        See :meth:`save_hdf5`. Only the adjacency matrix, node weights and
+        link attributes are read, also from files written by subclasses.
+
+        :arg str filename: The name of the HDF5 file.
+        :type link_attributes: bool or list of str
+        :arg link_attributes: Whether to restore all link attributes, or the
+            names of the link attributes to be restored.
+        :type silence_level: int >= 0
+        :arg  silence_level: The higher, the less progress info is output.
+        :rtype: Network object
+        :return: :class:`Network` instance.
+        """
+        with h5py.File(filename, "r") as f:
+            net = Network(adjacency=Network._read_hdf5_adjacency(f),
+                          directed=bool(f.attrs["directed"]),
+                          node_weights=f["node_weights"][:],
+                          silence_level=silence_level)
+            net._read_hdf5_link_attributes(f, link_attributes)
+        return net
+
     #
     #  Graph generation methods
     #
@@ -1338,7 +1657,7 @@ class Network(Cached):
         :rtype: array([int>=0])
         """
         if link_attribute is None:
-            return self.sp_A.toarray().sum(axis=0).astype(int)
+            return np.asarray(self.sp_A.sum(axis=0)).ravel().astype(int)
         else:
             return self.link_attribute(link_attribute).sum(axis=0).T
 
@@ -1359,7 +1678,7 @@ class Network(Cached):
         :rtype: array([int>=0])
         """
         if link_attribute is None:
-            return self.sp_A.toarray().sum(axis=1).T.astype(int)
+            return np.asarray(self.sp_A.sum(axis=1)).ravel().astype(int)
         else:
             return self.link_attribute(link_attribute).sum(axis=1).T
 
@@ -2566,7 +2885,7 @@ class Network(Cached):
     #  Measure path lengths
     #
 
-    @Cached.method(name="path lengths")
+    @Cached.method(name="path lengths", persist=True)
     def path_lengths(self, link_attribute=None):
         """
         For each pair of nodes i,j, return the (weighted) shortest path length
@@ -2644,18 +2963,15 @@ class Network(Cached):
             unconnected_pairs = np.isinf(path_lengths)
             #  Count the number of unconnected pairs
             n_unconnected_pairs = unconnected_pairs.sum()
-            #  Set infinite entries corresponding to unconnected pairs to zero
-            path_lengths[unconnected_pairs] = 0
 
             #  Take average of shortest geographical path length matrix
             #  excluding the diagonal, since it is always zero, and all
             #  unconnected pairs.  The diagonal should never contain
-            #  infinities, so that should not be a problem.
-            average_path_length = (path_lengths.sum() / float(
-                self.N * (self.N - 1) - n_unconnected_pairs))
-
-            #  Reverse changes to path_lengths
-            path_lengths[unconnected_pairs] = np.inf
+            #  infinities, so that should not be a problem.  The cached path
+            #  lengths are not modified, since they may be read-only.
+            average_path_length = (
+                np.where(unconnected_pairs, 0, path_lengths).sum()
+                / float(self.N * (self.N - 1) - n_unconnected_pairs))
 
             return average_path_length
 
@@ -2753,7 +3069,7 @@ class Network(Cached):
         kk = np.repeat([self.degree()], self.N, axis=0)
         return commons / (kk + kk.T - commons)
 
-    @Cached.method(name="link betweenness")
+    @Cached.method(name="link betweenness", persist=True)
     def link_betweenness(self):
         """
         For each link, return its betweenness.
@@ -2820,7 +3136,7 @@ class Network(Cached):
     #  Node valued centrality measures
     #
 
-    @Cached.method(name="node betweenness", attrs=("_mut_la",))
+    @Cached.method(name="node betweenness", attrs=("_mut_la",), persist=True)
     def betweenness(self, link_attribute=None):
         """
         For each node, return its (weighted) betweenness.
@@ -3134,9 +3450,9 @@ class Network(Cached):
 
             #  Identify unconnected pairs and save in binary array isinf
             unconnected_pairs = np.isinf(path_lengths)
-            #  Set infinite entries corresponding to unconnected pairs to
+            #  Replace infinite entries corresponding to unconnected pairs by
             #  number of vertices
-            path_lengths[unconnected_pairs] = self.N
+            path_lengths = np.where(unconnected_pairs, self.N, path_lengths)
 
             #  Some polar nodes have an assigned distance of zero to all their
             #  neighbors. These nodes get zero geographical closeness
@@ -3145,12 +3461,9 @@ class Network(Cached):
             CC[path_length_sum != 0] = \
                 (self.N - 1) / path_length_sum[path_length_sum != 0]
 
-            #  Reverse changes to weightedPathLengths
-            path_lengths[unconnected_pairs] = np.inf
-
             return CC
 
-    @Cached.method(name="n.s.i. closeness", attrs=("_mut_nw",))
+    @Cached.method(name="n.s.i. closeness", attrs=("_mut_nw",), persist=True)
     def nsi_closeness(self):
         """
         For each node, return its n.s.i. closeness.
@@ -3244,7 +3557,7 @@ class Network(Cached):
         return (np.dot(2.0**(-nsi_distances), self.node_weights)
                 / self.total_node_weight)
 
-    @Cached.method(name="Arenas-type random walk betweenness")
+    @Cached.method(name="Arenas-type random walk betweenness", persist=True)
     def arenas_betweenness(self):
         """
         For each node, return its Arenas-type random walk betweenness.
@@ -3272,11 +3585,9 @@ class Network(Cached):
         components = self.graph.connected_components()
 
         #  Print giant component size
-        if self.silence_level <= 1:
-            print("   (giant component size: "
-                  + str(components.giant().vcount()) + " ("
-                  + str(components.giant().vcount()
-                        / float(self.graph.vcount())) + "))")
+        giant = components.giant().vcount()
+        instrument.message(self, f"   (giant component size: {giant} "
+                           f"({giant / float(self.graph.vcount())}))")
 
         for c, comp in enumerate(components):
             #  If the component has size 1, set random walk betweenness to zero
@@ -3336,8 +3647,8 @@ class Network(Cached):
                 for j, node in enumerate(nodes):
                     arenas_betweenness[node] = component_betweenness[j]
 
-        if self.silence_level <= 0:
-            print("...took", time.time()-t0, "seconds")
+        instrument.message(self, f"...took {time.time()-t0} seconds",
+                           level=0)
 
         return arenas_betweenness
 
@@ -3389,6 +3700,7 @@ class Network(Cached):
         return error_message, result
 
     # TODO: settle for some suitable defaults
+    @instrument.traced
     def nsi_arenas_betweenness(self, exclude_neighbors=True,
                                stopping_mode="neighbors"):
         """
@@ -3445,8 +3757,8 @@ class Network(Cached):
             :meth:`nsi_twinness()`. (Default: "neighbors")
         :rtype: 1d numpy array [node] of floats >= 0
         """
-        if self.silence_level <= 1:
-            print("Calculating n.s.i. Arenas-type random walk betweenness...")
+        instrument.message(
+            self, "Calculating n.s.i. Arenas-type random walk betweenness...")
 
         t0 = time.time()
 
@@ -3458,11 +3770,9 @@ class Network(Cached):
         components = self.graph.connected_components()
 
         #  Print giant component size
-        if self.silence_level <= 1:
-            print("   (giant component size: "
-                  + str(components.giant().vcount()) + " ("
-                  + str(components.giant().vcount()
-                        / float(self.graph.vcount())) + "))")
+        giant = components.giant().vcount()
+        instrument.message(self, f"   (giant component size: {giant} "
+                           f"({giant / float(self.graph.vcount())}))")
 
         for c, comp in enumerate(components):
             #  If the component has size 1, set random walk betweenness to zero
@@ -3497,61 +3807,24 @@ class Network(Cached):
                 sp_P = (subnet.sp_nsi_diag_k_inv() * subnet.sp_Aplus()
                         * subnet.sp_diag_w()).todok()
 
-                if mpi.available:
-                    # determine in how many parts outer loop is split at max:
-                    max_parts = max(1, int(np.ceil(
-                        min((mpi.size-1) * 10.0, 0.1 * N))))
-                    # corresponding step size for c index of outer loop:
-                    step = int(np.ceil(1.0 * N / (1.0 * max_parts)))
-                    # actual number of parts accounting for rounding of steps:
-                    parts = int(np.ceil(1.0 * N / (1.0 * step)))
-                    if self.silence_level <= 0:
-                        print(f"   parallelizing on {mpi.size-1}"
-                              f" slaves into {parts} parts with "
-                              f"{step} nodes each...")
-
-                    for index in range(parts):
-                        start_i = index * step
-                        end_i = min((index + 1) * step, N)
-                        if start_i >= end_i:
-                            break
-                        this_Aplus = Aplus[start_i:end_i, :]
-                        this_w = w[start_i:end_i]
-                        if stopping_mode == "twinness":
-                            this_twinness = twinness[start_i:end_i, :]
-                        else:
-                            this_twinness = None
-                        if self.silence_level <= 0:
-                            print("   submitting", index)
-                            mpi.submit_call(
-                                "Network._mpi_nsi_arenas_betweenness",
-                                (N, sp_P, this_Aplus, w, this_w,
-                                 start_i, end_i, exclude_neighbors,
-                                 stopping_mode, this_twinness),
-                                module="pyunicorn", id=index)
-
-                    # Retrieve results of all submitted jobs
-                    component_betweenness = np.zeros(N)
-                    for index in range(parts):
-                        start_i = index * step
-                        if self.silence_level <= 0:
-                            print("   retrieving results from", index)
-                        error_message, result = mpi.get_result(index)
-                        if error_message != '':
-                            print(error_message)
-                            sys.exit()
-                        this_betweenness, start_i, end_i = result
-                        component_betweenness += this_betweenness
-                else:
-                    component_betweenness = np.zeros(N)
-                    if stopping_mode == "twinness":
-                        this_twinness = twinness
-                    else:
-                        this_twinness = None
-                    error_message, result = \
-                        Network._mpi_nsi_arenas_betweenness(
-                            N, sp_P, Aplus, w, w, 0, N,
-                            exclude_neighbors, stopping_mode, this_twinness)
+                #  Split the outer loop into ranges of nodes, each of which
+                #  requires one sparse LU decomposition per node
+                ex = executor.get_default()
+                ranges = ex.partition(np.ones(N))
+                instrument.message(
+                    self, f"   parallelizing on {ex} into {len(ranges)} "
+                    "parts...", level=0)
+                results = ex.map(
+                    Network._mpi_nsi_arenas_betweenness,
+                    [(N, sp_P, Aplus[start_i:end_i, :], w, w[start_i:end_i],
+                      start_i, end_i, exclude_neighbors, stopping_mode,
+                      twinness[start_i:end_i, :]
+                      if stopping_mode == "twinness" else None)
+                     for start_i, end_i in ranges],
+                    costs=[end_i - start_i for start_i, end_i in ranges])
+
+                component_betweenness = np.zeros(N)
+                for error_message, result in results:
                     if error_message != '':
                         print(error_message)
                         sys.exit()
@@ -3575,13 +3848,61 @@ class Network(Cached):
                 for j, node in enumerate(nodes):
                     nsi_arenas_betweenness[node] = component_betweenness[j]
 
-        if self.silence_level <= 0:
-            print("...took", time.time()-t0, "seconds")
+        instrument.message(self, f"...took {time.time()-t0} seconds",
+                           level=0)
 
         return nsi_arenas_betweenness
 
-    @Cached.method(name="Newman's random walk betweenness")
-    def newman_betweenness(self):
+    @staticmethod
+    def _component_adjacency(components, c, reorder=False):
+        """
+        Return the nodes of component `c` and its sparse adjacency matrix.
+
+        With `reorder`, the nodes are in reverse Cuthill-McKee order, such
+        that contiguous ranges of nodes have few distinct neighbours.
+        """
+        nodes = np.asarray(components[c])
+        sp_A = sp.csr_matrix(components.subgraph(c).get_adjacency_sparse(),
+                             dtype=ADJ)
+        if reorder:
+            perm = reverse_cuthill_mckee(sp_A, symmetric_mode=True)
+            nodes, sp_A = nodes[perm], sp_A[perm][:, perm]
+        return nodes, sp_A
+
+    @staticmethod
+    def _csr_neighbours(sp_A):
+        """
+        Return the neighbours of all nodes as `Shared` CSR index arrays.
+        """
+        sp_A = sp.csr_matrix(sp_A)
+        sp_A.sort_indices()
+        return Shared(to_cy(sp_A.indptr, NODE)), \
+            Shared(to_cy(sp_A.indices, NODE))
+
+    # parallelized main loop with worker-local solutions for V
+    @staticmethod
+    # pylint: disable=too-many-positional-arguments
+    def _mpi_local_newman_betweenness(
+            key, indptr, indices, k, w, start_i, end_i):
+        N = len(k)
+        sp_Aplus = sp.csr_matrix(
+            (np.ones(len(indices)), indices, indptr), shape=(N, N))
+        if w is not None:
+            sp_Aplus = sp_Aplus + sp.identity(N)
+        # rows of V for the range and all neighbours of its nodes
+        rows = np.union1d(np.arange(start_i, end_i),
+                          indices[indptr[start_i]:indptr[end_i]])
+        V = to_cy(_kirchhoff_rows(key, sp_Aplus, k, w, rows), DFIELD)
+        row = np.full(N, -1, dtype=NODE)
+        row[rows] = np.arange(len(rows))
+        if w is None:
+            return _mpi_newman_betweenness(
+                indptr, indices, V, row, N, start_i, end_i)
+        return _mpi_nsi_newman_betweenness(
+            indptr, indices, V, row, N, w, start_i, end_i)
+
+    @Cached.method(name="Newman's random walk betweenness", persist=True)
+    def newman_betweenness(self, local_solve: bool = False):
         """
         For each node, return Newman's random walk betweenness.
 
@@ -3597,6 +3918,14 @@ class Network(Cached):
            (giant component size: 6 (1.0))
         array([ 4.1818, 3.4182, 2.5091, 3.0182, 3.6 , 2. ])
 
+        By default, the dense matrix V of the random walk is computed once
+        and shared with all workers of the executor. With `local_solve`, each
+        worker instead factorises the sparse Kirchhoff matrix and solves only
+        for the rows of V needed by its ranges of nodes, so that neither the
+        master nor the workers hold V as a whole.
+
+        :arg bool local_solve: Whether to solve for V on the workers.
+            (Default: False)
         :rtype: 1d numpy array [node] of floats >= 0
         """
         t0 = time.time()
@@ -3609,11 +3938,9 @@ class Network(Cached):
         components = self.graph.connected_components()
 
         #  Print giant component size
-        if self.silence_level <= 1:
-            print("   (giant component size: "
-                  + str(components.giant().vcount()) + " ("
-                  + str(components.giant().vcount()
-                        / float(self.graph.vcount())) + "))")
+        giant = components.giant().vcount()
+        instrument.message(self, f"   (giant component size: {giant} "
+                           f"({giant / float(self.graph.vcount())}))")
 
         for c, comp in enumerate(components):
             #  If the component has size 1, set random walk betweenness to zero
@@ -3622,88 +3949,71 @@ class Network(Cached):
             #  For larger components, continue with the calculation
             else:
                 #  Get the subgraph A matrix corresponding to component c
-                subgraph = components.subgraph(c)
-                A = np.array(subgraph.get_adjacency(type=2).data, dtype=ADJ)
+                nodes, sp_A = self._component_adjacency(
+                    components, c, local_solve)
 
                 #  Generate a Network object representing the subgraph
-                subnetwork = Network(adjacency=A, directed=False)
+                subnetwork = Network(adjacency=sp_A, directed=False)
                 N, sp_A = subnetwork.N, subnetwork.sp_A
-
-                # Kirchhoff matrix
-                sp_M = sp.diags([subnetwork.indegree()], [0],
-                                shape=(N, N), format='csc', dtype=None) - sp_A
-
-                # invert it without last row/col
-                # FIXME: in rare cases (when there is an exact twin to the last
-                # node), this might not be invertible and a different row/col
-                # would need to be removed!
-                V = sp.lil_matrix((N, N))
-                V[:-1, :-1] = inv(sp_M[:-1, :-1])
-                V = V.toarray()
-                del subgraph, subnetwork, sp_A, sp_M
+                k = subnetwork.indegree().astype(DFIELD)
+                indptr, indices = self._csr_neighbours(sp_A)
+
+                #  Split the outer loop into ranges of nodes with similar
+                #  numbers of neighbours, which dominate the cost
+                ex = executor.get_default()
+                row_costs = np.diff(indptr.array) + 1
+                ranges = ex.partition(row_costs)
+                instrument.message(
+                    self, f"   parallelizing on {ex} into {len(ranges)} "
+                    "parts...", level=0)
+                costs = [row_costs[start_i:end_i].sum()
+                         for start_i, end_i in ranges]
+
+                if local_solve:
+                    key = uuid.uuid4().hex
+                    results = ex.map(
+                        Network._mpi_local_newman_betweenness,
+                        [(key, indptr, indices, k, None, start_i, end_i)
+                         for start_i, end_i in ranges], costs=costs)
+                    _kirchhoff_factors.pop(key, None)
+                else:
+                    # Kirchhoff matrix
+                    sp_M = sp.diags([k], [0], shape=(N, N), format='csc',
+                                    dtype=None) - sp_A
+
+                    # invert it without last row/col
+                    # FIXME: in rare cases (when there is an exact twin to the
+                    # last node), this might not be invertible and a different
+                    # row/col would need to be removed!
+                    V = sp.lil_matrix((N, N))
+                    V[:-1, :-1] = inv(sp_M[:-1, :-1])
+                    V = Shared(to_cy(V.toarray(), DFIELD))
+                    row = Shared(np.arange(N, dtype=NODE))
+                    del sp_M
+                    results = ex.map(
+                        _mpi_newman_betweenness,
+                        [(indptr, indices, V, row, N, start_i, end_i)
+                         for start_i, end_i in ranges], costs=costs)
+                del subnetwork, sp_A
 
                 component_betweenness = np.zeros(N)
-                if mpi.available:
-                    # determine in how many parts outer loop is split at max:
-                    max_parts = max(1, int(np.ceil(
-                        min((mpi.size-1) * 10.0, 0.1 * N))))
-                    # corresponding step size for c index of outer loop:
-                    step = int(np.ceil(1.0 * N / (1.0 * max_parts)))
-                    # actual number of parts accounting for rounding of steps:
-                    parts = int(np.ceil(1.0 * N / (1.0 * step)))
-                    if self.silence_level <= 0:
-                        print("   parallelizing on " + str((mpi.size-1))
-                              + " slaves into " + str(parts) + " parts with "
-                              + str(step) + " nodes each...")
-
-                    # now submit the jobs:
-                    for index in range(parts):
-                        start_i = index * step
-                        end_i = min((index + 1) * step, N)
-                        if start_i >= end_i:
-                            break
-                        this_A = A[start_i:end_i, :]
-                        # submit the job and add it to the list of jobs, so
-                        # that later the results can be retrieved:
-                        if self.silence_level <= 0:
-                            print("submitting part from", start_i, "to", end_i)
-                        mpi.submit_call(
-                            "core._ext.numerics._mpi_newman_betweenness",
-                            (to_cy(this_A, ADJ), to_cy(V, DFIELD),
-                             N, start_i, end_i),
-                            module="pyunicorn", id=index,
-                            time_est=this_A.sum())
-
-                    # Retrieve results of all submitted jobs:
-                    component_betweenness = np.zeros(N)
-                    for index in range(parts):
-                        # the following call connects to the submitted job,
-                        # waits until it finishes, and retrieves the result:
-                        if self.silence_level <= 0:
-                            print("retrieving results from ", index)
-                        this_betweenness, start_i, end_i = \
-                            mpi.get_result(index)
-                        component_betweenness[start_i:end_i] = this_betweenness
-                else:
-                    component_betweenness, start_i, end_i =\
-                        _mpi_newman_betweenness(
-                            to_cy(A, ADJ), to_cy(V, DFIELD),
-                            N, 0, N)
+                for this_betweenness, start_i, end_i in results:
+                    component_betweenness[start_i:end_i] = this_betweenness
 
                 component_betweenness += 2 * (N - 1)
                 component_betweenness /= (N - 1.0)  # TODO: why is this?
 
                 # sort results into correct positions
-                nodes = comp
-                for j, node in enumerate(nodes):
-                    newman_betweenness[node] = component_betweenness[j]
+                newman_betweenness[nodes] = component_betweenness
 
-        if self.silence_level <= 0:
-            print("...took", time.time()-t0, "seconds")
+        instrument.message(self, f"...took {time.time()-t0} seconds",
+                           level=0)
 
         return newman_betweenness
 
-    def nsi_newman_betweenness(self, add_local_ends=False):
+    @instrument.traced
+    def nsi_newman_betweenness(self, add_local_ends=False,
+                               local_solve: bool = False):
         """
         For each node, return its n.s.i. Newman-type random walk betweenness.
 
@@ -3757,10 +4067,12 @@ class Network(Cached):
         :arg bool add_local_ends: Indicates whether to add a correction for the
             fact that walks starting or ending in neighbors are not used.
             (Default: false)
+        :arg bool local_solve: Whether to solve for V on the workers, see
+            :meth:`newman_betweenness`. (Default: False)
         :rtype: array [float>=0]
         """
-        if self.silence_level <= 1:
-            print("Calculating n.s.i. Newman-type random walk betweenness...")
+        instrument.message(
+            self, "Calculating n.s.i. Newman-type random walk betweenness...")
 
         t0 = time.time()
 
@@ -3772,11 +4084,9 @@ class Network(Cached):
         components = self.graph.connected_components()
 
         #  Print giant component size
-        if self.silence_level <= 1:
-            print("   (giant component size: "
-                  + str(components.giant().vcount()) + " ("
-                  + str(components.giant().vcount()
-                        / float(self.graph.vcount())) + "))")
+        giant = components.giant().vcount()
+        instrument.message(self, f"   (giant component size: {giant} "
+                           f"({giant / float(self.graph.vcount())}))")
 
         for c, comp in enumerate(components):
             #  If the component has size 1, set random walk betweenness to zero
@@ -3785,85 +4095,68 @@ class Network(Cached):
                 nsi_newman_betweenness[comp[0]] = 0
             #  For larger components, continue with the calculation
             else:
-                #  Get the subgraph corresponding to component i
-                subgraph = components.subgraph(c)
-
-                #  Get the subgraph A matrix
-                A = np.array(subgraph.get_adjacency(type=2).data, dtype=ADJ)
-
-                #  Get the list of vertex numbers in the subgraph
-                nodes = comp
+                #  Get the subgraph A matrix corresponding to component c
+                nodes, sp_A = self._component_adjacency(
+                    components, c, local_solve)
 
                 # Extract corresponding area weight vector:
                 w = to_cy(self.node_weights[nodes], DWEIGHT)
 
                 #  Generate a Network object representing the subgraph
-                subnet = Network(adjacency=A, directed=False, node_weights=w)
+                subnet = Network(adjacency=sp_A, directed=False,
+                                 node_weights=w)
                 N = subnet.N
-
-                #  Initialize the RWB array
-                component_betweenness = np.zeros(N)
-
-                # sp_M = area-weighted Kirchhoff matrix * diag(w)^(-1)
                 Ap = subnet.sp_Aplus()
-                Dw, DwI = subnet.sp_diag_w(), subnet.sp_diag_w_inv()
-                Dk, DkI = subnet.sp_nsi_diag_k(), subnet.sp_nsi_diag_k_inv()
-                sp_M = Dw * (Dk - Ap * Dw) * DwI
-
-                # invert sp_M without last row/col (see above)
-                sp_M_inv = sp.lil_matrix((N, N))
-                sp_M_inv[:-1, :-1] = inv(sp_M[:-1, :-1])
-
-                # Note: sp_M_inv is not necessarily sparse, so the order is
-                # important for performance
-                V = ((DkI * Ap) * sp_M_inv).T.astype(DFIELD).toarray()
-                del subgraph, Ap, Dw, DwI, Dk, DkI, sp_M, sp_M_inv
+                indptr, indices = self._csr_neighbours(subnet.sp_A)
 
                 # TODO: verify that this was indeed wrong
                 # w = self.node_weights
 
-                # indicator matrix that i,j are not neighboured or equal
-                not_adjacent_or_equal = (1 - A - np.identity(N)).astype(MASK)
-
-                if mpi.available:
-                    # determine in how many parts outer loop is split at max:
-                    max_parts = max(1, int(np.ceil(
-                        min((mpi.size-1) * 10.0, 0.1 * N))))
-                    # corresponding step size for c index of outer loop:
-                    step = int(np.ceil(1.0 * N / (1.0 * max_parts)))
-                    # actual number of parts accounting for rounding of steps:
-                    parts = int(np.ceil(1.0 * N / (1.0 * step)))
-                    if self.silence_level <= 0:
-                        print("   parallelizing on " + str((mpi.size-1))
-                              + " slaves into " + str(parts) + " parts with "
-                              + str(step) + " nodes each...")
-
-                    for idx in range(parts):
-                        start_i = idx * step
-                        end_i = min((idx+1)*step, N)
-                        if start_i >= end_i:
-                            break
-                        this_A = A[start_i:end_i, :]
-                        this_not_adjacent_or_equal = \
-                            not_adjacent_or_equal[start_i:end_i, :]
-
-                        mpi.submit_call(
-                            "core._ext.numerics._mpi_nsi_newman_betweenness",
-                            (to_cy(this_A, ADJ), to_cy(V, DFIELD), N, w,
-                             this_not_adjacent_or_equal, start_i, end_i),
-                            module="pyunicorn", id=idx)
-
-                    # Retrieve results of all submitted jobs
-                    component_betweenness = np.zeros(N)
-                    for idx in range(parts):
-                        this_betweenness, start_i, end_i = mpi.get_result(idx)
-                        component_betweenness[start_i:end_i] = this_betweenness
-
+                #  Split the outer loop into ranges of nodes with similar
+                #  numbers of neighbours, which dominate the cost
+                ex = executor.get_default()
+                row_costs = np.diff(indptr.array) + 1
+                ranges = ex.partition(row_costs)
+                instrument.message(
+                    self, f"   parallelizing on {ex} into {len(ranges)} "
+                    "parts...", level=0)
+                costs = [row_costs[start_i:end_i].sum()
+                         for start_i, end_i in ranges]
+
+                if local_solve:
+                    key = uuid.uuid4().hex
+                    k = subnet.nsi_degree().astype(DFIELD)
+                    results = ex.map(
+                        Network._mpi_local_newman_betweenness,
+                        [(key, indptr, indices, k, w, start_i, end_i)
+                         for start_i, end_i in ranges], costs=costs)
+                    _kirchhoff_factors.pop(key, None)
                 else:
-                    component_betweenness, start_i, end_i = \
-                        _mpi_nsi_newman_betweenness(
-                            to_cy(A, ADJ), to_cy(V, DFIELD), N, w,
-                            not_adjacent_or_equal, 0, N)
+                    # sp_M = area-weighted Kirchhoff matrix * diag(w)^(-1)
+                    Dw, DwI = subnet.sp_diag_w(), subnet.sp_diag_w_inv()
+                    Dk = subnet.sp_nsi_diag_k()
+                    DkI = subnet.sp_nsi_diag_k_inv()
+                    sp_M = Dw * (Dk - Ap * Dw) * DwI
+
+                    # invert sp_M without last row/col (see above)
+                    sp_M_inv = sp.lil_matrix((N, N))
+                    sp_M_inv[:-1, :-1] = inv(sp_M[:-1, :-1])
+
+                    # Note: sp_M_inv is not necessarily sparse, so the order
+                    # is important for performance
+                    V = Shared(to_cy(((DkI * Ap) * sp_M_inv).T.toarray(),
+                                     DFIELD))
+                    row = Shared(np.arange(N, dtype=NODE))
+                    del Dw, DwI, Dk, DkI, sp_M, sp_M_inv
+                    results = ex.map(
+                        _mpi_nsi_newman_betweenness,
+                        [(indptr, indices, V, row, N, w, start_i, end_i)
+                         for start_i, end_i in ranges], costs=costs)
+                del Ap
+
+                component_betweenness = np.zeros(N)
+                for this_betweenness, start_i, end_i in results:
+                    component_betweenness[start_i:end_i] = this_betweenness
 
                 #  Correction for the fact that we used only s,t not
                 #  neighboured to i
@@ -3873,11 +4166,10 @@ class Network(Cached):
 
                 #  Copy results into randomWalkBetweennessArray at the correct
                 #  positions
-                for j, node in enumerate(nodes):
-                    nsi_newman_betweenness[node] = component_betweenness[j]
+                nsi_newman_betweenness[nodes] = component_betweenness
 
-        if self.silence_level <= 0:
-            print("...took", time.time()-t0, "seconds")
+        instrument.message(self, f"...took {time.time()-t0} seconds",
+                           level=0)
 
         return nsi_newman_betweenness
 
@@ -3905,7 +4197,7 @@ class Network(Cached):
                   + "Use link_attribute=None instead.")
             link_attribute = None
 
-        path_lengths = self.path_lengths(link_attribute)
+        path_lengths = np.array(self.path_lengths(link_attribute))
 
         if self.silence_level <= 1:
             print("Calculating global (weighted) efficiency...")
@@ -3917,9 +4209,6 @@ class Network(Cached):
         #  Calculate global efficiency
         efficiency = (1/float(self.N * (self.N-1)) * (1/path_lengths).sum())
 
-        #  Restore path lengths on diagonal to zero
-        np.fill_diagonal(path_lengths, 0)
-
         return efficiency
 
     @Cached.method(name="n.s.i. global efficiency", attrs=("_mut_nw",))
@@ -0,0 +1,322 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Provides a parallel ensemble runner for testing network measures against
+randomised null models.
+"""
+
+import random
+from inspect import getattr_static
+from multiprocessing import get_context, cpu_count
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy import sparse as sp
+
+from ._ext.types import ADJ
+from .network import Network
+from .spatial_network import SpatialNetwork
+from .geo_network import GeoNetwork
+from .grid import Grid
+from .geo_grid import GeoGrid
+from .interacting_networks import InteractingNetworks
+
+#  Arrays in the model arguments from this size on are placed in shared memory
+SHARED_BYTES = 2**20
+
+#  State of a worker process, see `_init_worker()`
+_worker: Dict[str, Any] = {}
+
+
+def _share(array: NDArray, blocks: List[SharedMemory]) -> tuple:
+    """
+    Copy an array into a new shared memory block and return its descriptor.
+    """
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(shm)
+    np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+    return ("__shared__", shm.name, array.shape, array.dtype.str)
+
+
+def _attach(obj, blocks: List[SharedMemory]):
+    """
+    Resolve a shared memory descriptor created by `_share()`.
+    """
+    if isinstance(obj, tuple) and len(obj) == 4 and obj[0] == "__shared__":
+        shm = SharedMemory(name=obj[1])
+        blocks.append(shm)
+        return np.ndarray(obj[2], np.dtype(obj[3]), buffer=shm.buf)
+    return obj
+
+
+def _init_worker(template: dict, model: str, model_kwargs: dict,
+                 measures: list):
+    """
+    Attach a worker process to the shared network and model arguments.
+    """
+    blocks: List[SharedMemory] = []
+    template = {k: _attach(v, blocks) for k, v in template.items()}
+    _worker.update(
+        template=template, model=model, measures=measures, blocks=blocks,
+        model_kwargs={k: _attach(v, blocks) for k, v in model_kwargs.items()})
+
+
+def _realisation(template: dict) -> Network:
+    """
+    Construct a network of the original class from its CSR arrays.
+    """
+    N = len(template["indptr"]) - 1
+    A = sp.csr_matrix((np.ones(len(template["indices"]), dtype=ADJ),
+                       template["indices"], template["indptr"]), shape=(N, N))
+    kind, directed = template["kind"], template["directed"]
+    if kind in ("SpatialNetwork", "GeoNetwork"):
+        time, space = template["grid_time"], template["grid_space"]
+        if template["grid_class"] == "GeoGrid":
+            grid = GeoGrid(time, *space, silence_level=2)
+        else:
+            grid = Grid(time, space, silence_level=2)
+        net = (GeoNetwork if kind == "GeoNetwork" else SpatialNetwork)(
+            grid, adjacency=A, directed=directed, silence_level=2)
+    elif kind == "InteractingNetworks":
+        net = InteractingNetworks(A, directed=directed, silence_level=2)
+    else:
+        net = Network(A, directed=directed, silence_level=2)
+    net.node_weights = template["node_weights"]
+    return net
+
+
+def _realise(seed: int) -> Dict[str, NDArray]:
+    """
+    Generate and measure one member of the ensemble in a worker process.
+    """
+    np.random.seed(seed % 2**32)
+    random.seed(seed)
+    net = _realisation(_worker["template"])
+    model, kwargs = _worker["model"], _worker["model_kwargs"]
+    if isinstance(getattr_static(type(net), model), staticmethod):
+        net = getattr(type(net), model)(net, **kwargs)
+        net.silence_level = 2
+    else:
+        getattr(net, model)(**kwargs)
+    return {name: np.asarray(
+        getattr(net, m)() if isinstance(m, str) else m(net), dtype=float)
+            for name, m in _worker["measures"]}
+
+
+class NullModelEnsemble:
+    """
+    Significance of network measures with respect to an ensemble of randomly
+    rewired realisations of a network.
+
+    Realisations are generated from independent seeds, spawned from a single
+    :class:`numpy.random.SeedSequence`, in a pool of worker processes, which
+    share the CSR arrays of the original network and large model arguments
+    (such as the distance matrix of the geographical models) instead of
+    receiving copies. The selected measures are accumulated in a streaming
+    fashion, such that neither the realisations nor their measures are kept
+    in memory, and the ensemble can be extended by further calls of
+    :meth:`run`.
+
+    Supported null models are the randomisation methods of the network
+    classes, e.g.,
+
+      - ``"randomly_rewire"`` (:meth:`.Network.randomly_rewire`),
+      - ``"randomly_rewire_geomodel_I"`` etc.
+        (:meth:`.SpatialNetwork.randomly_rewire_geomodel_I`),
+      - ``"RandomlyRewireCrossLinks"``
+        (:meth:`.InteractingNetworks.RandomlyRewireCrossLinks`).
+
+    **Example** (Local clustering against degree-preserving rewiring)::
+
+        ens = NullModelEnsemble(net, "randomly_rewire", ["local_clustering"],
+                                model_kwargs={"iterations": 10 * net.n_links},
+                                seed=42)
+        ens.run(1000)
+        z = ens.z_scores()["local_clustering"]
+    """
+
+    # pylint: disable=too-many-positional-arguments
+    def __init__(self, network: Network, model: str = "randomly_rewire",
+                 measures: Sequence[Union[str, Callable]] = ("degree",),
+                 model_kwargs: Optional[dict] = None,
+                 n_workers: Optional[int] = None, seed=None,
+                 silence_level: int = 0):
+        """
+        Initialize an instance of NullModelEnsemble.
+
+        :type network: :class:`.Network`
+        :arg network: The original network. Realisations are instances of
+            :class:`.Network`, :class:`.InteractingNetworks`,
+            :class:`.SpatialNetwork` or :class:`.GeoNetwork`, whichever is the
+            closest base class of ``network``.
+        :arg str model: The name of the randomisation method of the network
+            class, which either rewires the network in place or (if it is a
+            static method) returns a new network.
+        :type measures: list of (str or callable)
+        :arg measures: Names of network methods without required arguments,
+            or module level functions of a network, returning a number or an
+            array.
+        :arg dict model_kwargs: Keyword arguments of the randomisation method.
+        :arg int n_workers: The number of worker processes. Defaults to the
+            number of CPUs. If 1, realisations are generated in the current
+            process.
+        :arg seed: The seed of the ensemble (see
+            :class:`numpy.random.SeedSequence`).
+        :arg int silence_level: The inverse level of verbosity of the object.
+        """
+        self.model = model
+        self.model_kwargs = dict(model_kwargs or {})
+        self.n_workers = cpu_count() if n_workers is None else n_workers
+        self.silence_level = silence_level
+        self._seed_seq = np.random.SeedSequence(seed)
+        self._measures = [(m if isinstance(m, str) else m.__name__, m)
+                          for m in measures]
+
+        for cls in (GeoNetwork, SpatialNetwork, InteractingNetworks, Network):
+            if isinstance(network, cls):
+                kind = cls.__name__
+                break
+        A = network.sp_A.tocsr()
+        A.sort_indices()
+        self._template = {"kind": kind, "directed": network.directed,
+                          "indptr": A.indptr, "indices": A.indices,
+                          "node_weights": network.node_weights}
+        if kind in ("SpatialNetwork", "GeoNetwork"):
+            grid = network.grid
+            self._template.update(grid_class=type(grid).__name__,
+                                  grid_time=grid._grid["time"],
+                                  grid_space=grid._grid["space"])
+
+        self.observed: Dict[str, NDArray] = {
+            name: np.asarray(getattr(network, m)() if isinstance(m, str)
+                             else m(network), dtype=float)
+            for name, m in self._measures}
+        """The measures of the original network."""
+        self.n: int = 0
+        """The number of realisations."""
+        self.mean: Dict[str, NDArray] = {
+            name: np.zeros_like(v) for name, v in self.observed.items()}
+        """The ensemble means of the measures."""
+        self._m2 = {name: np.zeros_like(v) for name, v in self.mean.items()}
+        self._n_geq = {name: np.zeros(v.shape, dtype=np.int64)
+                       for name, v in self.mean.items()}
+        self._n_leq = {name: np.zeros(v.shape, dtype=np.int64)
+                       for name, v in self.mean.items()}
+
+    def __str__(self):
+        """
+        Returns a string representation.
+        """
+        return (f"NullModelEnsemble: {self.model}, {self.n} realisations, "
+                f"measures {[name for name, _ in self._measures]}")
+
+    def _accumulate(self, values: Dict[str, NDArray]):
+        """
+        Update the running statistics with the measures of one realisation.
+        """
+        self.n += 1
+        for name, x in values.items():
+            delta = x - self.mean[name]
+            self.mean[name] += delta / self.n
+            self._m2[name] += delta * (x - self.mean[name])
+            self._n_geq[name] += x >= self.observed[name]
+            self._n_leq[name] += x <= self.observed[name]
+
+    def run(self, n_realisations: int) -> "NullModelEnsemble":
+        """
+        Generate further realisations and accumulate their measures.
+
+        :arg int n_realisations: The number of realisations to be added.
+        :return: the ensemble itself.
+        """
+        if self.silence_level <= 1:
+            print(f"Generating {n_realisations} realisations of the null "
+                  f"model {self.model}...")
+        seeds = [int(s.generate_state(1, np.uint64)[0])
+                 for s in self._seed_seq.spawn(n_realisations)]
+
+        if self.n_workers <= 1:
+            _init_worker(self._template, self.model, self.model_kwargs,
+                         self._measures)
+            try:
+                for s in seeds:
+                    self._accumulate(_realise(s))
+            finally:
+                _worker.clear()
+            return self
+
+        blocks: List[SharedMemory] = []
+        try:
+            template = {
+                k: _share(v, blocks) if k in ("indptr", "indices") else v
+                for k, v in self._template.items()}
+            model_kwargs = {
+                k: _share(v, blocks) if isinstance(v, np.ndarray)
+                and v.nbytes >= SHARED_BYTES else v
+                for k, v in self.model_kwargs.items()}
+            with get_context("spawn").Pool(
+                    self.n_workers, initializer=_init_worker,
+                    initargs=(template, self.model, model_kwargs,
+                              self._measures)) as pool:
+                chunksize = max(1, n_realisations // (4 * self.n_workers))
+                for values in pool.imap_unordered(
+                        _realise, seeds, chunksize=chunksize):
+                    self._accumulate(values)
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        return self
+
+    def std(self) -> Dict[str, NDArray]:
+        """
+        Return the ensemble standard deviations of the measures.
+        """
+        return {name: np.sqrt(m2 / max(self.n - 1, 1))
+                for name, m2 in self._m2.items()}
+
+    def z_scores(self) -> Dict[str, NDArray]:
+        """
+        Return the z-scores of the measures of the original network with
+        respect to the ensemble. Measures which do not vary within the
+        ensemble have z-scores of NaN (if equal to the ensemble mean) or
+        infinity.
+        """
+        std = self.std()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {name: (self.observed[name] - self.mean[name]) / std[name]
+                    for name in self.mean}
+
+    def p_values(self, alternative: str = "two-sided"
+                 ) -> Dict[str, NDArray]:
+        """
+        Return the empirical p-values of the measures of the original network
+        with respect to the ensemble, :math:`(n_{\\geq} + 1) / (n + 1)` for
+        ``alternative="greater"`` and analogously for ``"less"``.
+
+        :arg str alternative: The alternative hypothesis: "greater", "less" or
+            "two-sided".
+        """
+        assert alternative in ("two-sided", "greater", "less")
+        p = {}
+        for name in self.mean:
+            greater = (self._n_geq[name] + 1) / (self.n + 1)
+            less = (self._n_leq[name] + 1) / (self.n + 1)
+            p[name] = greater if alternative == "greater" else \
+                less if alternative == "less" else \
+                np.minimum(1., 2 * np.minimum(greater, less))
+        return p
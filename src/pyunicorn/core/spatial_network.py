@@ -17,15 +17,16 @@ Provides class for analyzing spatially embedded complex networks.
 """
 
 from typing import Tuple
+import warnings
 from collections.abc import Hashable
 
 import numpy as np
 from numpy import random
 import igraph
+import h5py
 
-from ._ext.types import to_cy, ADJ, NODE, FIELD, DEGREE
-from ._ext.numerics import _randomly_rewire_geomodel_I, \
-    _randomly_rewire_geomodel_II, _randomly_rewire_geomodel_III
+from ._ext.types import to_cy, ADJ, NODE, FIELD, DFIELD, DEGREE
+from ._ext.numerics import _randomly_rewire_geomodel
 
 from .network import Network
 from .grid import Grid
@@ -199,6 +200,38 @@ class SpatialNetwork(Network):
         net._mut_la += 1
         return net
 
+    def _write_hdf5(self, f, compression):
+        """
+        Write the network and its grid to an open HDF5 file.
+        """
+        Network._write_hdf5(self, f, compression)
+        self.grid._write_hdf5(f.create_group("grid"))
+
+    @staticmethod
+    def LoadHDF5(filename, link_attributes=True, silence_level=0):
+        """
+        Return a SpatialNetwork object stored in a binary HDF5 file.
+
+        See :meth:`.Network.save_hdf5`.
+
+        :arg str filename: The name of the HDF5 file.
+        :type link_attributes: bool or list of str
+        :arg link_attributes: Whether to restore all link attributes, or the
+            names of the link attributes to be restored.
+        :arg int silence_level: The inverse level of verbosity of the object.
+        :rtype: SpatialNetwork object
+        :return: :class:`SpatialNetwork` instance.
+        """
+        with h5py.File(filename, "r") as f:
+            net = SpatialNetwork(
+                grid=Grid._read_hdf5(f["grid"], silence_level),
+                adjacency=Network._read_hdf5_adjacency(f),
+                directed=bool(f.attrs["directed"]),
+                silence_level=silence_level)
+            net.node_weights = f["node_weights"][:]
+            net._read_hdf5_link_attributes(f, link_attributes)
+        return net
+
     @staticmethod
     def SmallTestNetwork():
         """
@@ -235,7 +268,7 @@ class SpatialNetwork(Network):
 
     #  TODO: Experimental code!
     def randomly_rewire_geomodel_I(self, distance_matrix, iterations,
-                                   inaccuracy):
+                                   inaccuracy, max_attempts=None):
         """
         Randomly rewire the current network in place using geographical
         model I.
@@ -262,41 +295,30 @@ class SpatialNetwork(Network):
         array([3, 3, 2, 2, 3, 1])
 
         :type distance_matrix: 2D Numpy array [index, index]
-        :arg distance_matrix: Suitable distance matrix between nodes.
+        :arg distance_matrix: Suitable distance matrix between nodes. If
+            None, the standard distances of the grid (see
+            :meth:`.Grid.distance`) are evaluated on demand.
 
         :type iterations: number (int)
         :arg iterations: The number of rewirings to be performed.
 
         :type inaccuracy: number (float)
         :arg inaccuracy: The inaccuracy with which to conserve :math:`p(l)`.
+
+        :type max_attempts: number (int)
+        :arg max_attempts: The number of proposed rewirings after which to
+            give up with a warning. Defaults to ``1000 * iterations``.
         """
         if self.silence_level <= 1:
             print("Randomly rewiring given graph, preserving the degree "
                   "sequence and link distance distribution...")
-        #  Get number of links
-        E = self.n_links
-        #  Collect adjacency and distance matrices
-        A = to_cy(self.adjacency, ADJ)
-        D = to_cy(distance_matrix, FIELD)
-        #  Get degree sequence
-        # degree = self.degree()
-
-        #  Define for brevity
-        eps = float(inaccuracy)
-
-        # iterations = int(iterations)
-
-        #  Get edge list
-        edges = to_cy(np.array(self.graph.get_edgelist()), NODE)
-
-        _randomly_rewire_geomodel_I(iterations, eps, A, D, E, edges)
-
-        #  Update all other properties of GeoNetwork
-        self.adjacency = A
+        self._randomly_rewire_geomodel(1, distance_matrix, iterations,
+                                       inaccuracy, max_attempts)
 
     #  TODO: Experimental code!
     def randomly_rewire_geomodel_II(self, distance_matrix,
-                                    iterations, inaccuracy):
+                                    iterations, inaccuracy,
+                                    max_attempts=None):
         """
         Randomly rewire the current network in place using geographical
         model II.
@@ -314,13 +336,19 @@ class SpatialNetwork(Network):
             eligible for rewiring can be found.
 
         :type distance_matrix: 2D Numpy array [index, index]
-        :arg distance_matrix: Suitable distance matrix between nodes.
+        :arg distance_matrix: Suitable distance matrix between nodes. If
+            None, the standard distances of the grid (see
+            :meth:`.Grid.distance`) are evaluated on demand.
 
         :type iterations: number (int)
         :arg iterations: The number of rewirings to be performed.
 
         :type inaccuracy: number (float)
         :arg inaccuracy: The inaccuracy with which to conserve :math:`p(l)`.
+
+        :type max_attempts: number (int)
+        :arg max_attempts: The number of proposed rewirings after which to
+            give up with a warning. Defaults to ``1000 * iterations``.
         """
         #  FIXME: Add example
         if self.silence_level <= 1:
@@ -328,26 +356,13 @@ class SpatialNetwork(Network):
                   "sequence, link distance distribution and average link "
                   "distance sequence...")
 
-        #  Get number of links
-        E = int(self.n_links)
-        #  Collect adjacency and distance matrices
-        A = to_cy(self.adjacency, ADJ)
-        D = to_cy(distance_matrix, FIELD)
-
-        #  Define for brevity
-        eps = float(inaccuracy)
-
-        #  Get edge list
-        edges = to_cy(np.array(self.graph.get_edgelist()), NODE)
-
-        _randomly_rewire_geomodel_II(iterations, eps, A, D, E, edges)
-
-        #  Set new adjacency matrix
-        self.adjacency = A
+        self._randomly_rewire_geomodel(2, distance_matrix, iterations,
+                                       inaccuracy, max_attempts)
 
     #  TODO: Experimental code!
     def randomly_rewire_geomodel_III(self, distance_matrix,
-                                     iterations, inaccuracy):
+                                     iterations, inaccuracy,
+                                     max_attempts=None):
         """
         Randomly rewire the current network in place using geographical
         model III.
@@ -366,13 +381,19 @@ class SpatialNetwork(Network):
             eligible for rewiring can be found.
 
         :type distance_matrix: 2D Numpy array [index, index]
-        :arg distance_matrix: Suitable distance matrix between nodes.
+        :arg distance_matrix: Suitable distance matrix between nodes. If
+            None, the standard distances of the grid (see
+            :meth:`.Grid.distance`) are evaluated on demand.
 
         :type iterations: number (int)
         :arg iterations: The number of rewirings to be performed.
 
         :type inaccuracy: number (float)
         :arg inaccuracy: The inaccuracy with which to conserve :math:`p(l)`.
+
+        :type max_attempts: number (int)
+        :arg max_attempts: The number of proposed rewirings after which to
+            give up with a warning. Defaults to ``1000 * iterations``.
         """
         #  FIXME: Add example
         if self.silence_level <= 1:
@@ -380,25 +401,45 @@ class SpatialNetwork(Network):
                   "sequence, degree-degree correlations, link distance "
                   "distribution and average link distance sequence...")
 
-        #  Get number of nodes
-        #  Get number of links
-        E = int(self.n_links)
-        #  Collect adjacency and distance matrices
-        A = to_cy(self.adjacency, ADJ)
-        D = to_cy(distance_matrix, FIELD)
-        #  Get degree sequence
-        degree = to_cy(self.degree(), DEGREE)
+        self._randomly_rewire_geomodel(3, distance_matrix, iterations,
+                                       inaccuracy, max_attempts)
 
-        #  Define for brevity
-        eps = float(inaccuracy)
-
-        #  Get edge list
-        edges = to_cy(np.array(self.graph.get_edgelist()), NODE)
+    # pylint: disable=too-many-positional-arguments
+    def _randomly_rewire_geomodel(self, model: int, distance_matrix,
+                                  iterations, inaccuracy, max_attempts):
+        """
+        Randomly rewire the current network in place using geographical
+        model I, II or III.
 
-        _randomly_rewire_geomodel_III(iterations, eps, A, D, E, edges, degree)
+        The compiled kernel only stores the edge list, sorted neighbour lists
+        and link lengths, such that memory is linear in the number of links.
+        Distances are looked up in ``distance_matrix`` or, if it is None,
+        evaluated on demand from the coordinates of the grid.
+        """
+        if distance_matrix is None:
+            metric, X = self.grid._distance_coordinates()
+            D = np.zeros((0, 0), dtype=FIELD)
+        else:
+            metric, X = 0, np.zeros((0, 0), dtype=DFIELD)
+            D = to_cy(distance_matrix, FIELD)
+        degree = to_cy(self.degree(), DEGREE) if model == 3 \
+            else np.array([], dtype=DEGREE)
+        edges = to_cy(np.array(self.graph.get_edgelist()).reshape(-1, 2),
+                      NODE)
+
+        if max_attempts is None:
+            max_attempts = 1000 * iterations
+
+        n_swaps = _randomly_rewire_geomodel(
+            model, int(iterations), int(max_attempts), float(inaccuracy),
+            self.N, edges, degree, metric, X, D)
+        if n_swaps < iterations:
+            warnings.warn(f"Only {n_swaps} of {iterations} rewirings were "
+                          f"found in {max_attempts} attempts, consider a "
+                          "higher inaccuracy.")
 
         #  Set new adjacency matrix
-        self.adjacency = A
+        self.set_edge_list(edges, n_nodes=self.N)
 
     def set_random_links_by_distance(self, a, b):
         """
@@ -471,24 +512,25 @@ class SpatialNetwork(Network):
         if self.silence_level <= 1:
             print("Calculating link distance distribution...")
 
-        #  Collect matrices
-        A = self.adjacency
+        #  Collect pair distance function
         if grid_type == "spherical":
             if self.grid.__class__.__name__ != "GeoGrid":
                 raise NotImplementedError("Spherical coordinates are only "
                                           "supported for GeoGrid!")
-            D = self.grid.angular_distance()
+            pair_distance = self.grid.angular_pair_distance
         elif grid_type == "euclidean":
-            D = self.grid.euclidean_distance()
+            pair_distance = self.grid.euclidean_pair_distance
         else:
             raise ValueError("Grid type unknown!")
 
         #  Determine range for link distance histograms
-        interval = (0, D.max())
+        interval = (0, max(D.max() for _, D in
+                           self.grid._distance_row_blocks(pair_distance)))
 
         #  Get link distance distribution
-        (dist, error, lbb) = self._histogram(D[A == 1], n_bins=n_bins,
-                                             interval=interval)
+        A = self.sp_A.tocoo()
+        (dist, error, lbb) = self._histogram(pair_distance(A.row, A.col),
+                                             n_bins=n_bins, interval=interval)
 
         if geometry_corrected:
             geometric_ld_dist = \
@@ -521,7 +563,7 @@ class SpatialNetwork(Network):
         larger values of :math:`ALD`, while nodes in the center have a bias
         towards smaller values of :math:`ALD`.
 
-        :type adjacency: 2D array [index, index]
+        :type adjacency: sparse matrix [index, index]
         :arg adjacency: The adjacency matrix.
         :type degree: 1D array [index]
         :arg degree: The degree sequence.
@@ -529,19 +571,21 @@ class SpatialNetwork(Network):
         :rtype: 1D array [index]
         :return: the general average link distance sequence.
         """
-        D = self.grid.distance()
+        total_link_distance = np.asarray(
+            self.grid.link_distance(adjacency).sum(axis=1)).ravel()
 
         average_link_distance = np.zeros(self.N)
 
         #  Normalize by degree, not by number of nodes
         average_link_distance[degree != 0] = \
-            (D * adjacency).sum(axis=1)[degree != 0] / degree[degree != 0]
+            total_link_distance[degree != 0] / degree[degree != 0]
 
         if geometry_corrected:
             #  Calculate the average link distance for a fully connected
             #  network to correct for geometrical biases, particularly in
             #  regional networks.
-            ald_correction = D.mean(axis=1)
+            ald_correction = np.concatenate(
+                [D.mean(axis=1) for _, D in self.grid._distance_row_blocks()])
 
             #  Correct average link distance
             average_link_distance /= ald_correction
@@ -572,7 +616,7 @@ class SpatialNetwork(Network):
         if self.silence_level <= 1:
             print("Calculating average link distance...")
 
-        A = self.undirected_adjacency().toarray()
+        A = self.undirected_adjacency()
         degree = self.degree()
 
         return self._calculate_general_average_link_distance(
@@ -598,7 +642,7 @@ class SpatialNetwork(Network):
         if self.silence_level <= 1:
             print("Calculating in-average link distance...")
 
-        A = self.adjacency.T
+        A = self.sp_A.T
         in_degree = self.indegree()
 
         return self._calculate_general_average_link_distance(
@@ -624,7 +668,7 @@ class SpatialNetwork(Network):
         if self.silence_level <= 1:
             print("Calculating out-average link distance...")
 
-        A = self.adjacency
+        A = self.sp_A
         out_degree = self.outdegree()
 
         return self._calculate_general_average_link_distance(
@@ -649,10 +693,9 @@ class SpatialNetwork(Network):
         if self.silence_level <= 1:
             print("Calculating maximum link distance...")
 
-        A = self.undirected_adjacency().toarray()
-        D = self.grid.distance()
+        L = self.grid.link_distance(self.undirected_adjacency())
 
-        maximum_link_distance = (D * A).max(axis=1)
+        maximum_link_distance = L.max(axis=1).toarray().ravel()
         return maximum_link_distance
 
     #
@@ -662,12 +705,36 @@ class SpatialNetwork(Network):
     def distance(self):
         """
         Return the distance matrix.
+
+        Also stores the link distances as the link attribute ``distance``.
         """
         dist = self.grid.distance()
-        if not self.find_link_attribute('distance'):
-            self.set_link_attribute('distance', dist)
+        self._set_link_distance_attribute('distance')
         return dist
 
+    def _set_link_distance_attribute(self, attribute_name,
+                                     pair_distance=None):
+        """
+        Store the distances of all links as a link attribute, unless it has
+        already been set.
+
+        Distances are evaluated only for the links (see
+        :meth:`.Grid.pair_distance`).
+
+        :arg str attribute_name: The name of the link attribute.
+        :arg pair_distance: The pair distance function, defaults to the
+            standard distance of the grid.
+        """
+        if self.find_link_attribute(attribute_name):
+            return
+        if pair_distance is None:
+            pair_distance = self.grid.pair_distance
+        edges = np.array(self.graph.get_edgelist(), dtype=int).reshape(-1, 2)
+        self.graph.es[attribute_name] = \
+            pair_distance(edges[:, 0], edges[:, 1]).tolist()
+        # invalidate cache
+        self._mut_la += 1
+
     def average_distance_weighted_path_length(self):
         """
         Return average distance weighted path length.
@@ -684,7 +751,7 @@ class SpatialNetwork(Network):
         :rtype: number (float)
         :return: the average distance weighted path length.
         """
-        self.distance()
+        self._set_link_distance_attribute('distance')
         return self.average_path_length('distance')
 
     def distance_weighted_closeness(self):
@@ -703,7 +770,7 @@ class SpatialNetwork(Network):
         :rtype: 1D Numpy array [index]
         :return: the distance weighted closeness sequence.
         """
-        self.distance()
+        self._set_link_distance_attribute('distance')
         return self.closeness('distance')
 
     def local_distance_weighted_vulnerability(self):
@@ -722,5 +789,5 @@ class SpatialNetwork(Network):
         :rtype: 1D Numpy array [index]
         :return: the local distance weighted vulnerability sequence.
         """
-        self.distance()
+        self._set_link_distance_attribute('distance')
         return self.local_vulnerability('distance')
@@ -0,0 +1,270 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+from libc.math cimport sqrt, fabs, fmin
+from libc.stdlib cimport malloc, free
+from libc.string cimport memset
+
+import numpy as np
+cimport numpy as cnp
+from numpy cimport ndarray
+
+from ...core._ext.types import FIELD
+from ...core._ext.types cimport FIELD_t, DFIELD_t, INT64TYPE_t
+
+# All kernels take the sorted event times of the N variables in CSR format:
+# the events of variable i are `times[offsets[i]:offsets[i+1]]`. They compute
+# the measures of all pairs (i, j > i) for a range of rows i, and return two
+# arrays [row, j] with the entries (i, j) and (j, i) of the directed matrix.
+
+
+cdef inline Py_ssize_t _lower_bound(
+    DFIELD_t *a, Py_ssize_t n, double x) noexcept nogil:
+    """
+    Index of the first element of the sorted array `a` not below `x`.
+    """
+    cdef Py_ssize_t lo = 0, hi = n, mid
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if a[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+# event synchronization =======================================================
+
+
+cdef void _es_pair(
+    DFIELD_t *tx, DFIELD_t *wx, Py_ssize_t lx,
+    DFIELD_t *ty, DFIELD_t *wy, Py_ssize_t ly,
+    double lag, char *flags, double *xy, double *yx) noexcept nogil:
+    """
+    Event synchronization of the inner events `tx`, `ty` of two variables
+    with the dynamical delays `wx`, `wy`, as in `EventSeries.
+    event_synchronization()`. Only the events of Y within the delay of each
+    event of X are visited, and the double counts are found in a second pass
+    from flags marking the events with a coincidence in either direction.
+    """
+    cdef:
+        char *row_xy = flags
+        char *row_yx = flags + lx
+        char *col_xy = flags + 2 * lx
+        char *col_yx = flags + 2 * lx + ly
+        Py_ssize_t a, b
+        int second
+        double d, tau, w, lo, hi, norm
+        double countxy = 0, countyx = 0, eqtime = 0
+        double doublexy = 0, doubleyx = 0
+
+    memset(flags, 0, 2 * (lx + ly))
+    for second in range(2):
+        for a in range(lx):
+            #  Superset of the window |2 (tx - ty - lag)| <= wx, robust to
+            #  rounding and containing all equal times
+            w = wx[a] + 1e-9 * (1.0 + fabs(tx[a]) + fabs(lag))
+            lo = tx[a] - lag - w
+            hi = tx[a] - lag + w
+            b = _lower_bound(ty, ly, lo)
+            while b < ly and ty[b] <= hi:
+                d = 2.0 * (tx[a] - ty[b] - lag)
+                tau = fmin(wx[a], wy[b])
+                if not second:
+                    if d == 0.0:
+                        eqtime += 1
+                    elif d > 0.0 and d <= tau:
+                        countxy += 1
+                        row_xy[a] = col_xy[b] = 1
+                    elif d < 0.0 and d >= -tau:
+                        countyx += 1
+                        row_yx[a] = col_yx[b] = 1
+                elif d > 0.0 and d <= tau:
+                    if row_yx[a] or col_yx[b]:
+                        doublexy += 1
+                elif d < 0.0 and d >= -tau:
+                    if row_xy[a] or col_xy[b]:
+                        doubleyx += 1
+                b += 1
+        if countxy == 0 and countyx == 0:
+            break
+
+    norm = sqrt(<double> lx * <double> ly)
+    xy[0] = (countxy + 0.5 * eqtime - 0.5 * doublexy) / norm
+    yx[0] = (countyx + 0.5 * eqtime - 0.5 * doubleyx) / norm
+
+
+def _es_rows(
+    ndarray[DFIELD_t, ndim=1, mode='c'] times not None,
+    ndarray[INT64TYPE_t, ndim=1, mode='c'] offsets not None,
+    double taumax, double lag, int start, int end):
+    """
+    Event synchronization of the pairs (i, j > i) for `start <= i < end`.
+    Variables with at most two events, i.e., without inner events, have zero
+    synchronization.
+    """
+    cdef:
+        Py_ssize_t N = offsets.shape[0] - 1, n_times = times.shape[0]
+        Py_ssize_t i, j, k, lx, ly, max_len = 0
+        double xy = 0, yx = 0
+        DFIELD_t *t = <DFIELD_t*> cnp.PyArray_DATA(times)
+        INT64TYPE_t *off = <INT64TYPE_t*> cnp.PyArray_DATA(offsets)
+        ndarray[DFIELD_t, ndim=1, mode='c'] tau2 = np.empty(n_times)
+        DFIELD_t *w = <DFIELD_t*> cnp.PyArray_DATA(tau2)
+        ndarray[FIELD_t, ndim=2, mode='c'] upper = np.zeros(
+            (end - start, N), dtype=FIELD)
+        ndarray[FIELD_t, ndim=2, mode='c'] lower = np.zeros(
+            (end - start, N), dtype=FIELD)
+        FIELD_t *up = <FIELD_t*> cnp.PyArray_DATA(upper)
+        FIELD_t *low = <FIELD_t*> cnp.PyArray_DATA(lower)
+        char *flags
+
+    for i in range(N):
+        max_len = max(max_len, off[i+1] - off[i])
+    flags = <char*> malloc(4 * max_len + 1)
+    if flags == NULL:
+        raise MemoryError()
+
+    with nogil:
+        #  Dynamical delay of each inner event, capped at 2 taumax
+        for k in range(1, n_times - 1):
+            w[k] = fmin(fmin(t[k] - t[k-1], t[k+1] - t[k]), 2.0 * taumax)
+        for i in range(start, end):
+            lx = off[i+1] - off[i] - 2
+            if lx <= 0:
+                continue
+            for j in range(i + 1, N):
+                ly = off[j+1] - off[j] - 2
+                if ly <= 0:
+                    continue
+                _es_pair(t + off[i] + 1, w + off[i] + 1, lx,
+                         t + off[j] + 1, w + off[j] + 1, ly, lag, flags,
+                         &xy, &yx)
+                up[(i - start) * N + j] = <FIELD_t> xy
+                low[(i - start) * N + j] = <FIELD_t> yx
+
+    free(flags)
+    return upper, lower
+
+
+# event coincidence analysis ==================================================
+
+
+cdef Py_ssize_t _coincidences(
+    DFIELD_t *p, Py_ssize_t a0, Py_ssize_t a1, DFIELD_t *s, Py_ssize_t ns,
+    bint reverse, double lag, double d1, double d2) noexcept nogil:
+    """
+    Number of events `p[a]`, `a0 <= a < a1`, with an event `s[b]` such that
+    `d1 <= (p[a] - s[b]) - lag <= d2`, or `d1 <= (s[b] - p[a]) - lag <= d2`
+    if `reverse`, found by a merge of the two sorted arrays.
+    """
+    cdef:
+        Py_ssize_t a, b = 0, count = 0
+    for a in range(a0, a1):
+        if not reverse:
+            while b < ns and (p[a] - s[b]) - lag > d2:
+                b += 1
+            if b < ns and (p[a] - s[b]) - lag >= d1:
+                count += 1
+        else:
+            while b < ns and (s[b] - p[a]) - lag < d1:
+                b += 1
+            if b < ns and (s[b] - p[a]) - lag <= d2:
+                count += 1
+    return count
+
+
+cdef inline FIELD_t _rate(Py_ssize_t count, Py_ssize_t n) noexcept nogil:
+    return <FIELD_t> count / <FIELD_t> (n if n > 0 else 1)
+
+
+cdef void _eca_pair(
+    DFIELD_t *e1, Py_ssize_t n1, DFIELD_t *e2, Py_ssize_t n2, int window,
+    double taumax, double lag, FIELD_t *r12, FIELD_t *r21) noexcept nogil:
+    """
+    Coincidence rates of two event series as in `EventSeries.
+    _eca_coincidence_rate()`, for the `window` 0 ('advanced'), 1 ('retarded')
+    or 2 ('symmetric').
+    """
+    cdef:
+        Py_ssize_t n11 = 0, n12 = 0, n21 = 0, n22 = 0
+        double bound
+
+    if n1 == 0 or n2 == 0:
+        r12[0] = r21[0] = 0
+        return
+
+    #  Count events that cannot be coincided due to lag and taumax
+    if not (lag == 0 and taumax == 0):
+        if window != 1:
+            bound = e1[0] + lag + taumax
+            while n11 < n1 and e1[n11] <= bound:
+                n11 += 1
+            bound = e2[0] + lag + taumax
+            while n21 < n2 and e2[n21] <= bound:
+                n21 += 1
+        if window != 0:
+            bound = e1[n1-1] - lag - taumax
+            while n12 < n1 and e1[n1-1-n12] >= bound:
+                n12 += 1
+            bound = e2[n2-1] - lag - taumax
+            while n22 < n2 and e2[n2-1-n22] >= bound:
+                n22 += 1
+
+    if window == 0:
+        r12[0] = _rate(_coincidences(e1, n11, n1, e2, n2, False, lag,
+                                     0.0, taumax), n1 - n11)
+        r21[0] = _rate(_coincidences(e2, n21, n2, e1, n1, False, lag,
+                                     0.0, taumax), n2 - n21)
+    elif window == 1:
+        r12[0] = _rate(_coincidences(e2, 0, n2 - n22, e1, n1, True, lag,
+                                     0.0, taumax), n2 - n22)
+        r21[0] = _rate(_coincidences(e1, 0, n1 - n12, e2, n2, True, lag,
+                                     0.0, taumax), n1 - n12)
+    else:
+        r12[0] = _rate(_coincidences(e1, n11, n1 - n12, e2, n2, False, lag,
+                                     -taumax, taumax), n1 - n11 - n12)
+        r21[0] = _rate(_coincidences(e2, n21, n2 - n22, e1, n1, False, lag,
+                                     -taumax, taumax), n2 - n21 - n22)
+
+
+def _eca_rows(
+    ndarray[DFIELD_t, ndim=1, mode='c'] times not None,
+    ndarray[INT64TYPE_t, ndim=1, mode='c'] offsets not None,
+    double taumax, double lag, int window, int start, int end):
+    """
+    Event coincidence rates of the pairs (i, j > i) for `start <= i < end`.
+    Empty event series have zero rates, and rates with a non-positive number
+    of events to be coincided are normalized by one.
+    """
+    cdef:
+        Py_ssize_t N = offsets.shape[0] - 1
+        Py_ssize_t i, j
+        DFIELD_t *t = <DFIELD_t*> cnp.PyArray_DATA(times)
+        INT64TYPE_t *off = <INT64TYPE_t*> cnp.PyArray_DATA(offsets)
+        ndarray[FIELD_t, ndim=2, mode='c'] upper = np.zeros(
+            (end - start, N), dtype=FIELD)
+        ndarray[FIELD_t, ndim=2, mode='c'] lower = np.zeros(
+            (end - start, N), dtype=FIELD)
+        FIELD_t *up = <FIELD_t*> cnp.PyArray_DATA(upper)
+        FIELD_t *low = <FIELD_t*> cnp.PyArray_DATA(lower)
+
+    with nogil:
+        for i in range(start, end):
+            for j in range(i + 1, N):
+                _eca_pair(t + off[i], off[i+1] - off[i],
+                          t + off[j], off[j+1] - off[j], window, taumax, lag,
+                          up + (i - start) * N + j, low + (i - start) * N + j)
+
+    return upper, lower
@@ -37,39 +37,21 @@ Modification 2 (make_event_matrix):
     Replaced np.quantile with np.nanquantile so that time series containing
     NaN values are handled gracefully instead of raising an error.
 
-Modification 3 (matrix loops):
-    Added tqdm progress bars to _ndim_event_synchronization and
-    _ndim_event_coincidence_analysis for visual feedback during long runs.
-
-Modification 4 (getters):
+Modification 3 (getters):
     Added get_T(), get_N(), get_timestamps(), get_taumax(), get_lag() accessor
     methods to expose key instance attributes without name-mangling gymnastics.
 
-Optimization 1 — Sparse binary-search ES with lag support (finite taumax):
-    For finite taumax, precomputes sorted inner-event arrays once per node and
-    uses np.searchsorted to find only the event pairs within the lag-shifted
-    taumax window.  Complexity O(N²·L·taumax/T) vs O(N²·L²).
-    Results are exact (atol < 1e-12 vs pairwise reference).
-
-Optimization 2 — Blocked dense ES (infinite taumax, lag=0):
-    Falls back to a 4-D blocked-dense tensor kernel that vectorises the
-    double-count correction loop — the main bottleneck in the original code.
-    Block size is tunable; joblib parallelization is supported.
-
-Optimization 3 — Vectorized ECA via cumsum + BLAS (integer timestamps):
-    For uniform integer timestamps and integer-valued lag, builds lag=0 smeared
-    indicator matrices with cumsum rolling windows, shifts by lag steps, then
-    uses a single BLAS matrix multiply.  Complexity O(T·N + N²).
-    Precision is identical to pairwise within float32 rounding (atol < 1e-6).
-
-Optimization 4 — Optional joblib parallelization:
-    All kernel dispatchers accept an n_jobs keyword argument.  If joblib is
-    installed, computation is distributed across n_jobs worker processes.
-    Falls back to a single-process loop when joblib is absent.
+Optimization — Compiled kernels on sorted event times:
+    ES and ECA matrices for all configurations of taumax, lag, window_type
+    and timestamps are computed by compiled kernels that visit only the
+    events of Y within the coincidence window of each event of X, via binary
+    search (ES) or a two-pointer merge of the sorted event times (ECA).
+    Row blocks are distributed on the default executor and written directly
+    into a float32 matrix.
 
 Contributors
 ------------
-Guruprem Bishnoi — Modifications 1–4 and Optimizations 1–4 (2026)
+Guruprem Bishnoi — Modifications 1–3 (2026)
 """
 
 from typing import Tuple
@@ -79,193 +61,60 @@ import warnings
 
 import numpy as np
 from scipy import stats
-from tqdm import tqdm
 
-# Optimization 4: optional joblib for parallelization
-try:
-    from joblib import Parallel, delayed
-    _JOBLIB_AVAILABLE = True
-except ImportError:
-    _JOBLIB_AVAILABLE = False
+from ..core.cache import Cached
+from ..core.data import Data
+from ..core._ext.types import to_cy, DFIELD, FIELD, INT64TYPE
+from ..utils import instrument
+from ..utils import executor        # parallelized computations
+from ..utils.executor import Shared
 
+from ._ext.numerics import _es_rows, _eca_rows
 
-from ..core.cache import Cached
+# window types of the compiled ECA kernel
+_ECA_WINDOWS = {'advanced': 0, 'retarded': 1, 'symmetric': 2}
 
 
 # ===========================================================================
-# Module-level helpers required by the fast-path ES kernels
-# (kept at module level so that joblib can pickle them for multi-processing)
+# Module-level helpers of the compiled kernels
 # ===========================================================================
 
-# Optimization 1 / 2 helper -------------------------------------------------
-
-def _pad_block(node_data, indices):
-    """
-    Pad inner-event arrays for a block of nodes into dense 2-D arrays.
-
-    Used by the blocked-dense ES kernel (Optimization 2).
+def _event_times(eventmatrix, timestamps):
     """
-    max_len = max((node_data[i]['inner_count'] for i in indices), default=0)
-    nA = len(indices)
-    times = np.zeros((nA, max_len), dtype=np.float64)
-    tau2 = np.zeros((nA, max_len), dtype=np.float64)
-    mask = np.zeros((nA, max_len), dtype=bool)
-    counts = np.zeros(nA, dtype=np.int32)
-    for row, idx in enumerate(indices):
-        info = node_data[idx]
-        length = info['inner_count']
-        counts[row] = length
-        if length:
-            times[row, :length] = info['inner_times']
-            tau2[row, :length] = info['tau2_inner']
-            mask[row, :length] = True
-    return times, tau2, mask, counts
-
-
-def _compute_es_block(node_data, block_a, block_b):
-    """
-    Exact ES for all node pairs in two blocks via 4-D dense boolean tensors.
-
-    Vectorises the double-count correction loop that is the bottleneck in
-    pyunicorn's pairwise code.  Used by the blocked-dense kernel (Opt 2).
+    Sorted event times of all variables in CSR format, i.e., the events of
+    variable i are `times[offsets[i]:offsets[i+1]]`.
     """
-    A_times, A_tau2, A_mask, A_counts = _pad_block(node_data, block_a)
-    B_times, B_tau2, B_mask, B_counts = _pad_block(node_data, block_b)
+    E = np.asarray(eventmatrix)
+    node, t = np.nonzero(E.T > 0.5)
+    times = to_cy(np.asarray(timestamps)[t], DFIELD)
+    offsets = np.zeros(E.shape[1] + 1, dtype=INT64TYPE)
+    np.cumsum(np.bincount(node, minlength=E.shape[1]), out=offsets[1:])
+    return times, offsets
 
-    block_xy = np.zeros((len(block_a), len(block_b)), dtype=np.float64)
-    block_yx = np.zeros((len(block_a), len(block_b)), dtype=np.float64)
 
-    if A_times.shape[1] == 0 or B_times.shape[1] == 0:
-        return block_xy, block_yx
-
-    valid = A_mask[:, None, :, None] & B_mask[None, :, None, :]
-    D2 = 2.0 * (A_times[:, None, :, None] - B_times[None, :, None, :])
-    tau2 = np.minimum(A_tau2[:, None, :, None], B_tau2[None, :, None, :])
-
-    Axy = valid & (D2 > 0.0) & (D2 <= tau2)
-    Ayx = valid & (D2 < 0.0) & (D2 >= -tau2)
-    eqtime = valid & (D2 == 0.0)
-
-    row_any_Ayx = Ayx.any(axis=3, keepdims=True)
-    col_any_Ayx = Ayx.any(axis=2, keepdims=True)
-    row_any_Axy = Axy.any(axis=3, keepdims=True)
-    col_any_Axy = Axy.any(axis=2, keepdims=True)
-
-    countxy = Axy.sum(axis=(2, 3)).astype(np.float64)
-    countyx = Ayx.sum(axis=(2, 3)).astype(np.float64)
-    eqcount = eqtime.sum(axis=(2, 3)).astype(np.float64)
-    countxydouble = (Axy & (row_any_Ayx | col_any_Ayx)).sum(
-        axis=(2, 3)).astype(np.float64)
-    countyxdouble = (Ayx & (row_any_Axy | col_any_Axy)).sum(
-        axis=(2, 3)).astype(np.float64)
-
-    numer_xy = countxy + 0.5 * eqcount - 0.5 * countxydouble
-    numer_yx = countyx + 0.5 * eqcount - 0.5 * countyxdouble
-
-    A_cf = A_counts[:, None].astype(np.float64)
-    B_cf = B_counts[None, :].astype(np.float64)
-    denom = np.sqrt(A_cf * B_cf)
-    good = denom > 0.0
-    block_xy[good] = numer_xy[good] / denom[good]
-    block_yx[good] = numer_yx[good] / denom[good]
-    return block_xy, block_yx
-
-
-def _compute_es_pair_sparse_lag(tx, tau2x, ty, tau2y, *, taumax, lag):
-    """
-    Exact ES for one pair using sorted inner-event times + binary search,
-    extended to support any scalar lag (Optimization 1).
-
-    Parameters
-    ----------
-    tx, tau2x : 1-D float64 — inner event times and per-event tau2 for X
-    ty, tau2y : 1-D float64 — inner event times and per-event tau2 for Y
-    taumax    : float        — coincidence window cap (must be finite)
-    lag       : float        — time lag (Y is conceptually shifted by +lag)
-
-    Returns
-    -------
-    (countxy / norm, countyx / norm) : float64 pair
-    """
-    lx, ly = len(tx), len(ty)
-    if lx == 0 or ly == 0:
-        return 0.0, 0.0
-    norm = np.sqrt(float(lx * ly))
-    if norm == 0.0:
-        return 0.0, 0.0
-
-    # Binary search with lag-shifted bounds
-    lo = np.searchsorted(ty, tx - lag - taumax, side='left')    # (lx,)
-    hi = np.searchsorted(ty, tx - lag + taumax, side='right')   # (lx,)
-    counts = hi - lo                                              # (lx,) >= 0
-
-    total = int(counts.sum())
-    if total == 0:
-        return 0.0, 0.0
-
-    cumcounts_lo = np.concatenate([[0], np.cumsum(counts[:-1])])
-    offsets = np.arange(total, dtype=np.intp) - np.repeat(cumcounts_lo, counts)
-    k_inds = np.repeat(np.arange(lx, dtype=np.intp), counts)
-    l_inds = np.repeat(lo, counts).astype(np.intp) + offsets
-
-    D2_sp = 2.0 * (tx[k_inds] - ty[l_inds] - lag)
-    tau2_sp = np.minimum(tau2x[k_inds], tau2y[l_inds])
-
-    Axy_sp = (D2_sp > 0.0) & (D2_sp <= tau2_sp)
-    Ayx_sp = (D2_sp < 0.0) & (D2_sp >= -tau2_sp)
-    eq_sp = D2_sp == 0.0
-    eqtime = float(eq_sp.sum())
-
-    row_any_Ayx = np.zeros(lx, dtype=bool)
-    col_any_Ayx = np.zeros(ly, dtype=bool)
-    row_any_Axy = np.zeros(lx, dtype=bool)
-    col_any_Axy = np.zeros(ly, dtype=bool)
-
-    k_ayx = k_inds[Ayx_sp]
-    l_ayx = l_inds[Ayx_sp]
-    k_axy = k_inds[Axy_sp]
-    l_axy = l_inds[Axy_sp]
-
-    if len(k_ayx):
-        np.logical_or.at(row_any_Ayx, k_ayx, True)
-        np.logical_or.at(col_any_Ayx, l_ayx, True)
-    if len(k_axy):
-        np.logical_or.at(row_any_Axy, k_axy, True)
-        np.logical_or.at(col_any_Axy, l_axy, True)
-
-    countxydouble = float(np.sum(
-        Axy_sp & (row_any_Ayx[k_inds] | col_any_Ayx[l_inds])
-    ))
-    countyxdouble = float(np.sum(
-        Ayx_sp & (row_any_Axy[k_inds] | col_any_Axy[l_inds])
-    ))
-
-    countxy = float(Axy_sp.sum()) + 0.5 * eqtime - 0.5 * countxydouble
-    countyx = float(Ayx_sp.sum()) + 0.5 * eqtime - 0.5 * countyxdouble
-
-    return countxy / norm, countyx / norm
-
-
-def _process_es_rows_sparse_lag(r_start, r_end, N, node_data, *, taumax, lag):
+def _pairwise_matrix(kernel, times, offsets, *args):
     """
-    Process all pairs (i, j > i) where i in [r_start, r_end) — row-based
-    chunk for joblib (Optimization 1 / 4).
+    Assemble the NxN directed float32 matrix of a compiled pairwise kernel
+    from ranges of rows with similar costs, computed on the default executor.
     """
-    results = []
-    for i in range(r_start, r_end):
-        ndi = node_data[i]
-        for j in range(i + 1, N):
-            ndj = node_data[j]
-            if ndi['inner_count'] == 0 or ndj['inner_count'] == 0:
-                results.append((i, j, 0.0, 0.0))
-            else:
-                xy, yx = _compute_es_pair_sparse_lag(
-                    ndi['inner_times'], ndi['tau2_inner'],
-                    ndj['inner_times'], ndj['tau2_inner'],
-                    taumax=taumax, lag=lag,
-                )
-                results.append((i, j, xy, yx))
-    return results
+    N = len(offsets) - 1
+    counts = np.diff(offsets)
+    #  Row i merges its events with those of all later variables
+    later = counts[::-1].cumsum()[::-1] - counts
+    row_costs = counts * (N - 1 - np.arange(N)) + later + 1
+    ex = executor.get_default()
+    ranges = ex.partition(row_costs)
+    times, offsets = Shared(times), Shared(offsets)
+    results = ex.map(kernel, [(times, offsets) + args + (start, end)
+                              for start, end in ranges],
+                     costs=[row_costs[start:end].sum()
+                            for start, end in ranges])
+
+    directed = np.zeros((N, N), dtype=FIELD)
+    for (start, end), (upper, lower) in zip(ranges, results):
+        directed[start:end] += upper
+        directed[:, start:end] += lower.T
+    return directed
 
 
 # ===========================================================================
@@ -279,8 +128,9 @@ class EventSeries(Cached):
                  threshold_types=None):
         """
         Initialize an instance of EventSeries. Input data must be a 2D numpy
-        array with time as the first axis and variables as the second axis.
-        Event data is stored as an eventmatrix.
+        array with time as the first axis and variables as the second axis,
+        or a :class:`..core.Data` object, whose current view is then read in
+        spatial blocks. Event data is stored as an eventmatrix.
 
         Format of eventmatrix:
         An eventmatrix is a 2D numpy array with the first dimension covering
@@ -304,7 +154,7 @@ class EventSeries(Cached):
         to generate one using the make_event_matrix method. Default keyword
         arguments are used in this case.
 
-        :type data: 2D Numpy array [time, variables]
+        :type data: 2D Numpy array [time, variables] or :class:`..core.Data`
         :arg data: Event series array or array of non-binary variable values
         :type timestamps: 1D Numpy array
         :arg timestamps: Time points of events of data. If not provided,
@@ -331,6 +181,13 @@ class EventSeries(Cached):
                               or above threshold
         """
 
+        if isinstance(data, Data):
+            data = self._blocked_event_matrix(
+                data, threshold_method=threshold_method,
+                threshold_values=threshold_values,
+                threshold_types=threshold_types)
+            threshold_method = None
+
         if threshold_method is None:
             # Check if data contains only binary values
             if len(np.unique(data)) != 2 or not (
@@ -405,7 +262,7 @@ class EventSeries(Cached):
     def get_event_matrix(self):
         return self.__eventmatrix
 
-    # Modification 4: Added getter methods so callers can access key instance
+    # Modification 3: Added getter methods so callers can access key instance
     # attributes without relying on name-mangling.
 
     def get_T(self):
@@ -678,6 +535,41 @@ class EventSeries(Cached):
 
         return eventmatrix
 
+    @staticmethod
+    def _blocked_event_matrix(data, threshold_method=None,
+                              threshold_values=None, threshold_types=None):
+        """
+        Assemble the event matrix of the current view on a
+        :class:`..core.Data` object from its spatial blocks, see
+        :meth:`..core.Data.observable_blocks`, such that the continuous
+        observable is never held in memory as a whole. Events are determined
+        by :meth:`make_event_matrix` for each block, with per-variable
+        threshold parameters restricted to the variables of the block.
+
+        :type data: :class:`..core.Data`
+        :arg data: Event series or continuous variable values
+        :rtype: 2D numpy array [time, variables] of int8
+        :return: eventmatrix
+        """
+        def _restrict(parameter, block):
+            if parameter is None or np.ndim(parameter) == 0:
+                return parameter
+            return np.asarray(parameter)[block]
+
+        blocks = []
+        for block, values in data.observable_blocks(axis=1):
+            if threshold_method is None:
+                if not np.isin(values, (0, 1)).all():
+                    raise IOError("Event matrix not in correct format")
+            else:
+                values = EventSeries.make_event_matrix(
+                    values,
+                    threshold_method=_restrict(threshold_method, block),
+                    threshold_values=_restrict(threshold_values, block),
+                    threshold_types=_restrict(threshold_types, block))
+            blocks.append(values.astype(np.int8))
+        return np.concatenate(blocks, axis=1)
+
     @staticmethod
     def event_synchronization(eventseriesx, eventseriesy, *,
                               ts1=None, ts2=None,
@@ -953,6 +845,7 @@ class EventSeries(Cached):
         return (np.float32(coincidence12) / (l1 - n11 - n12),
                 np.float32(coincidence21) / (l2 - n21 - n22))
 
+    @instrument.traced
     def event_series_analysis(self, method='ES', symmetrization='directed',
                               window_type='symmetric'):
         """
@@ -1025,183 +918,48 @@ class EventSeries(Cached):
         return self.symmetrization_options[symmetrization](directedESMatrix)
 
     # =========================================================================
-    # ES — dispatches to the fastest available kernel (Optimizations 1 & 2)
+    # ES — compiled kernel
     # =========================================================================
 
     @Cached.method()
-    def _ndim_event_synchronization(self):
+    def _event_time_arrays(self):
         """
-        Compute NxN event synchronization matrix [i,j] with event
-        synchronization from j to i without symmetrization.
+        Sorted event times of all variables in CSR format.
 
-        Routing (Optimizations 1 & 2):
-          finite taumax, any lag  →  sparse binary-search   (fast, exact)
-          infinite taumax, lag=0  →  blocked-dense 4-D      (vectorized)
-          infinite taumax, lag≠0  →  pairwise loop          (fallback)
-
-        :rtype: NxN numpy array where N is the number of variables of the
-                eventmatrix
-        :return: event synchronization matrix
-        """
-        node_data = self._precompute_es_node_data()
-
-        if np.isfinite(self.__taumax):
-            # Optimization 1: sparse binary-search kernel
-            # (exact, O(N²·L·taumax/T))
-            return self._compute_es_matrix_sparse_lag(node_data)
-        else:
-            if self.__lag != 0.0:
-                # Fallback: pairwise loop (identical to original pyunicorn)
-                return self._ndim_event_synchronization_pairwise()
-            # Optimization 2: blocked dense 4-D tensor kernel
-            return self._compute_es_matrix_blocked(node_data)
-
-    def _ndim_event_synchronization_pairwise(self):
-        """
-        Pairwise ES loop — identical to original pyunicorn.
-        Used as fallback when taumax=inf and lag≠0.
-
-        Modification 3: tqdm progress bar added.
+        :rtype: tuple of 1D numpy arrays (times, offsets)
         """
-        N = self.__N
-        eventmatrix = self.__eventmatrix
-        timestamps = self.__timestamps
-        taumax = self.__taumax
-        lag = self.__lag
+        return _event_times(self.__eventmatrix, self.__timestamps)
 
-        directed = np.zeros((N, N))
-        for i in tqdm(range(N), desc='ES pairwise'):
-            for j in range(i + 1, N):
-                directed[i, j], directed[j, i] = \
-                    self.event_synchronization(eventmatrix[:, i],
-                                               eventmatrix[:, j],
-                                               ts1=timestamps, ts2=timestamps,
-                                               taumax=taumax, lag=lag)
-        return directed
-
-    def _precompute_es_node_data(self):
-        """
-        Optimization 1 / 2: Precompute inner-event times and per-event
-        dynamic tau2 for every node.  Called once before the matrix loop.
-        """
-        E = self.__eventmatrix
-        ts = self.__timestamps
-        taumax = self.__taumax
-        cap = 2.0 * taumax
-
-        node_data = []
-        for n in range(self.__N):
-            event_times = ts[E[:, n] > 0.5].astype(np.float64)
-            if len(event_times) <= 2:
-                inner_times = np.empty(0, dtype=np.float64)
-                tau2_inner = np.empty(0, dtype=np.float64)
-            else:
-                inner_times = event_times[1:-1].copy()
-                diffs = np.diff(event_times)
-                tau2_inner = np.minimum(diffs[:-1], diffs[1:])
-                tau2_inner = np.minimum(tau2_inner, cap)
-            node_data.append({
-                'event_times': event_times,
-                'inner_times': inner_times,
-                'tau2_inner': tau2_inner,
-                'inner_count': len(inner_times),
-            })
-        return node_data
-
-    def _compute_es_matrix_blocked(self, node_data, block_size=32, n_jobs=1):
+    @Cached.method()
+    def _ndim_event_synchronization(self):
         """
-        Optimization 2: Assemble the full N×N directed ES matrix from blocked
-        4-D computations (infinite taumax, lag=0).
+        Compute NxN event synchronization matrix [i,j] with event
+        synchronization from j to i without symmetrization.
 
-        Optimization 4: n_jobs > 1 uses joblib if available.
-        """
-        N = self.__N
-        directed = np.zeros((N, N), dtype=np.float64)
-
-        pairs = []
-        for a_start in range(0, N, block_size):
-            block_a = list(range(a_start, min(N, a_start + block_size)))
-            for b_start in range(a_start, N, block_size):
-                block_b = list(range(b_start, min(N, b_start + block_size)))
-                pairs.append((block_a, block_b))
-
-        if n_jobs != 1 and _JOBLIB_AVAILABLE:
-            results = Parallel(n_jobs=n_jobs)(
-                delayed(_compute_es_block)(node_data, ba, bb)
-                for ba, bb in pairs
-            )
-        else:
-            results = [
-                _compute_es_block(node_data, ba, bb)
-                for ba, bb in tqdm(pairs, desc='ES blocks')
-            ]
-
-        for (block_a, block_b), (bxy, byx) in zip(pairs, results):
-            for ia, i in enumerate(block_a):
-                jb_start = ia + 1 if block_a[0] == block_b[0] else 0
-                for jb in range(jb_start, len(block_b)):
-                    j = block_b[jb]
-                    if i == j:
-                        continue
-                    directed[i, j] = bxy[ia, jb]
-                    directed[j, i] = byx[ia, jb]
-
-        np.fill_diagonal(directed, 0.0)
-        return directed
-
-    def _compute_es_matrix_sparse_lag(self, node_data, n_jobs=1):
-        """
-        Optimization 1: Assemble the full N×N directed ES matrix using the
-        lag-aware sparse binary-search kernel.  Works for any scalar lag value.
+        All values of taumax and lag are handled by a compiled binary-search
+        kernel, parallelized over row blocks on the default executor.
+        Variables without inner events have zero synchronization.
 
-        Row-based chunking minimises joblib serialisation overhead.
-        Optimization 4: n_jobs > 1 uses joblib if available.
+        :rtype: NxN numpy array of float32 where N is the number of variables
+                of the eventmatrix
+        :return: event synchronization matrix
         """
-        N = self.__N
-        taumax = self.__taumax
-        lag = self.__lag
-        directed = np.zeros((N, N), dtype=np.float64)
-
-        n_workers = n_jobs if (n_jobs != 1 and _JOBLIB_AVAILABLE) else 1
-        rows_per_job = max(1, -(-N // n_workers))   # ceiling division
-        row_chunks = [(s, min(N, s + rows_per_job))
-                      for s in range(0, N, rows_per_job)]
-
-        if n_jobs != 1 and _JOBLIB_AVAILABLE:
-            results_list = Parallel(n_jobs=n_jobs)(
-                delayed(_process_es_rows_sparse_lag)(
-                    r0, r1, N, node_data, taumax=taumax, lag=lag
-                )
-                for r0, r1 in row_chunks
-            )
-        else:
-            results_list = [
-                _process_es_rows_sparse_lag(
-                    r0, r1, N, node_data, taumax=taumax, lag=lag
-                )
-                for r0, r1 in tqdm(row_chunks, desc='ES sparse (lag)',
-                                   unit='chunk')
-            ]
-
-        for results in results_list:
-            for i, j, xy, yx in results:
-                directed[i, j] = xy
-                directed[j, i] = yx
-
-        np.fill_diagonal(directed, 0.0)
-        return directed
+        times, offsets = self._event_time_arrays()
+        return _pairwise_matrix(_es_rows, times, offsets,
+                                self.__taumax, self.__lag)
 
     # =========================================================================
-    # ECA — dispatches to vectorized or pairwise kernel (Optimization 3)
+    # ECA — compiled kernel
     # =========================================================================
 
     def _ndim_event_coincidence_analysis(self, window_type='symmetric'):
         """
         Computes NxN event coincidence matrix of event coincidence rate.
 
-        Routing (Optimization 3):
-          uniform integer timestamps + integer lag  →  vectorized cumsum + BLAS
-          otherwise                                 →  pairwise loop (original)
+        All timestamps, lags and window types are handled by a compiled
+        two-pointer kernel, parallelized over row blocks on the default
+        executor. Rates are normalized by one if no events remain to be
+        coincided, and are zero for empty event series.
 
         :type window_type: str {'retarded', 'advanced', 'symmetric'}
         :arg window_type: Only for ECA. Determines if precursor coincidence
@@ -1209,205 +967,17 @@ class EventSeries(Cached):
                           ('retarded') or a general coincidence rate with the
                           symmetric interval [-taumax, taumax] are computed
                           ('symmetric'). Default: 'symmetric'
-        :rtype: NxN numpy array where N is the number of variables of the
-                eventmatrix
+        :rtype: NxN numpy array of float32 where N is the number of variables
+                of the eventmatrix
         :return: event coincidence matrix
         """
-        if window_type not in ['advanced', 'retarded', 'symmetric']:
+        if window_type not in _ECA_WINDOWS:
             raise IOError("'window_type' must be 'advanced', 'retarded' or"
                           " 'symmetric'!")
 
-        ts = self.__timestamps
-        dts = np.diff(ts)
-        is_uniform_integer = (len(dts) > 0
-                              and np.allclose(dts, 1.0, rtol=1e-9, atol=1e-9))
-        is_integer_lag = np.isclose(self.__lag, round(self.__lag),
-                                    rtol=1e-9, atol=1e-9)
-
-        if is_uniform_integer and is_integer_lag:
-            # Optimization 3: vectorized cumsum + BLAS path
-            return self._compute_eca_vectorized_lag(window_type)
-        else:
-            # Fallback: pairwise loop (identical to original pyunicorn)
-            return self._compute_eca_pairwise(window_type)
-
-    def _compute_eca_pairwise(self, window_type):
-        """
-        Pairwise ECA loop — identical to original pyunicorn.
-        Modification 3: tqdm progress bar added.
-        """
-        N = self.__N
-        eventmatrix = self.__eventmatrix
-        timestamps = self.__timestamps
-        directed = np.zeros((N, N))
-
-        for i in tqdm(range(N), desc=f'ECA pairwise ({window_type})'):
-            for j in range(i + 1, N):
-                directed[i, j], directed[j, i] = \
-                    self._eca_coincidence_rate(eventmatrix[:, i],
-                                               eventmatrix[:, j],
-                                               window_type=window_type,
-                                               ts1=timestamps, ts2=timestamps)
-        return directed
-
-    def _compute_eca_vectorized_lag(self, window_type):
-        """
-        Optimization 3: Vectorized ECA via cumsum rolling windows + BLAS
-        matrix multiply, extended to support any integer-valued lag.
-
-        Core idea: build the lag=0 smeared indicator matrix with a cumsum
-        rolling window, then shift it by `lag` steps along the time axis.
-        Boundary corrections mirror the pairwise formula exactly.
-
-        For lag=0 the output is bit-for-bit identical to the pairwise path
-        within float32 rounding (atol < 1e-6 vs pairwise reference).
-        Complexity: O(T·N + N²) vs O(N²·L²) for the pairwise approach.
-        """
-        E = self.__eventmatrix.astype(np.float64)
-        ts = self.__timestamps
-        T, N = E.shape
-        tau = int(round(self.__taumax))
-        lag = int(round(self.__lag))
-        N_events = E.sum(axis=0)
-
-        directed = np.zeros((N, N), dtype=np.float64)
-
-        def _shift(arr, shift):
-            """Shift (T, N) array along axis=0 by `shift` rows (fill zeros)."""
-            if shift == 0:
-                return arr.copy()
-            out = np.zeros_like(arr)
-            if shift > 0:
-                rows = min(shift, T)
-                if rows < T:
-                    out[rows:] = arr[:T - rows]
-            else:
-                rows = min(-shift, T)
-                if rows < T:
-                    out[:T - rows] = arr[rows:]
-            return out
-
-        if tau == 0 and lag == 0:
-            tau_start = -1
-            tau_end = -1
-        else:
-            tau_start = tau + lag
-            tau_end = tau + lag
-
-        def _n_boundary_start(n, t_eff):
-            if N_events[n] == 0 or t_eff < 0:
-                return 0.0
-            ev = ts[E[:, n] > 0.5]
-            return float(np.sum(ev <= ev[0] + t_eff))
-
-        def _n_boundary_end(n, t_eff):
-            if N_events[n] == 0 or t_eff < 0:
-                return 0.0
-            ev = ts[E[:, n] > 0.5]
-            return float(np.sum(ev >= ev[-1] - t_eff))
-
-        def _first_ev_ts(n):
-            return ts[np.argmax(E[:, n] > 0.5)] if N_events[n] > 0 else ts[-1]
-
-        def _last_ev_ts(n):
-            return ts[T - 1 - np.argmax(E[::-1, n] > 0.5)] \
-                if N_events[n] > 0 else ts[0]
-
-        if window_type == 'advanced':
-            E_cs = np.cumsum(E, axis=0)
-            E_window = E_cs.copy()
-            if tau > 0:
-                E_window[tau + 1:] -= E_cs[:-tau - 1]
-            else:
-                E_window = E.copy()
-            E_smeared = (E_window > 0).astype(np.float64)
-            E_smeared = _shift(E_smeared, lag)
-
-            n_start = np.array([_n_boundary_start(n, tau_start)
-                                for n in range(N)])
-            E_trimmed = E.copy()
-            for n in range(N):
-                if N_events[n] > 0 and tau_start >= 0:
-                    E_trimmed[ts <= _first_ev_ts(n) + tau_start, n] = 0.0
-
-            adj_N = np.where(N_events - n_start > 0,
-                             N_events - n_start, 1.0)
-            counts_f64 = E_trimmed.T @ E_smeared
-            adj_N_f32 = adj_N.astype(np.float32)
-            directed_f32 = counts_f64.astype(np.float32) / adj_N_f32[:, None]
-            directed = directed_f32.astype(np.float64)
-            np.fill_diagonal(directed, 0.0)
-
-        elif window_type == 'retarded':
-            E_rev = E[::-1]
-            E_cs_rev = np.cumsum(E_rev, axis=0)
-            E_win_rev = E_cs_rev.copy()
-            if tau > 0:
-                E_win_rev[tau + 1:] -= E_cs_rev[:-tau - 1]
-            else:
-                E_win_rev = E_rev.copy()
-            E_smeared_fwd = (E_win_rev[::-1] > 0).astype(np.float64)
-            E_smeared_fwd = _shift(E_smeared_fwd, -lag)
-
-            n_end = np.array([_n_boundary_end(n, tau_end)
-                              for n in range(N)])
-            E_trimmed_fwd = E.copy()
-            for n in range(N):
-                if N_events[n] > 0 and tau_end >= 0:
-                    E_trimmed_fwd[ts >= _last_ev_ts(n) - tau_end, n] = 0.0
-
-            adj_N = np.where(N_events - n_end > 0,
-                             N_events - n_end, 1.0)
-            counts_f64 = E_smeared_fwd.T @ E_trimmed_fwd
-            adj_N_f32 = adj_N.astype(np.float32)
-            directed_f32 = counts_f64.astype(np.float32) / adj_N_f32[None, :]
-            directed = directed_f32.astype(np.float64)
-            np.fill_diagonal(directed, 0.0)
-
-        elif window_type == 'symmetric':
-            E_cs = np.cumsum(E, axis=0)
-            E_win_b = E_cs.copy()
-            if tau > 0:
-                E_win_b[tau + 1:] -= E_cs[:-tau - 1]
-            else:
-                E_win_b = E.copy()
-
-            E_rev = E[::-1]
-            E_cs_rev = np.cumsum(E_rev, axis=0)
-            E_win_f_r = E_cs_rev.copy()
-            if tau > 0:
-                E_win_f_r[tau + 1:] -= E_cs_rev[:-tau - 1]
-            else:
-                E_win_f_r = E_rev.copy()
-            E_win_f = E_win_f_r[::-1]
-
-            E_sym = E_win_b + E_win_f - E
-            E_smeared_sym = (E_sym > 0).astype(np.float64)
-            E_smeared_sym = _shift(E_smeared_sym, lag)
-
-            n_start = np.array([_n_boundary_start(n, tau_start)
-                                for n in range(N)])
-            n_end = np.array([_n_boundary_end(n, tau_end)
-                              for n in range(N)])
-            E_trimmed_sym = E.copy()
-            for n in range(N):
-                if N_events[n] > 0:
-                    mask = np.zeros(T, dtype=bool)
-                    if tau_start >= 0:
-                        mask |= ts <= _first_ev_ts(n) + tau_start
-                    if tau_end >= 0:
-                        mask |= ts >= _last_ev_ts(n) - tau_end
-                    E_trimmed_sym[mask, n] = 0.0
-
-            adj_N = np.where(N_events - n_start - n_end > 0,
-                             N_events - n_start - n_end, 1.0)
-            counts_f64 = E_trimmed_sym.T @ E_smeared_sym
-            adj_N_f32 = adj_N.astype(np.float32)
-            directed_f32 = counts_f64.astype(np.float32) / adj_N_f32[:, None]
-            directed = directed_f32.astype(np.float64)
-            np.fill_diagonal(directed, 0.0)
-
-        return directed
+        times, offsets = self._event_time_arrays()
+        return _pairwise_matrix(_eca_rows, times, offsets, self.__taumax,
+                                self.__lag, _ECA_WINDOWS[window_type])
 
     # =========================================================================
     # Significance analysis (identical to original pyunicorn)
@@ -1453,6 +1023,8 @@ class EventSeries(Cached):
 
         surrogates = np.zeros((n_surr, self.__N, self.__N))
         shuffled_es = self.__eventmatrix.copy()
+        # Surrogates are analysed with integer time indices
+        timestamps = np.arange(self.__T)
 
         # For each surrogate, shuffle each event series and perform ES/ECA
         # analysis
@@ -1460,21 +1032,15 @@ class EventSeries(Cached):
             for i in range(self.__N):
                 np.random.shuffle(shuffled_es[:, i])
 
+            times, offsets = _event_times(shuffled_es, timestamps)
             if method == 'ES':
-                for i in range(0, self.__N):
-                    for j in range(i + 1, self.__N):
-                        surrogates[n, i, j], surrogates[n, j, i] = \
-                            self.event_synchronization(shuffled_es[:, i],
-                                                       shuffled_es[:, j],
-                                                       taumax=deltaT, lag=lag)
+                surrogates[n] = _pairwise_matrix(
+                    _es_rows, times, offsets, deltaT, lag)
 
             elif method == 'ECA':
-                for i in range(0, self.__N):
-                    for j in range(i + 1, self.__N):
-                        surrogates[n, i, j], surrogates[n, j, i] = \
-                            self._eca_coincidence_rate(shuffled_es[:, i],
-                                                       shuffled_es[:, j],
-                                                       window_type=window_type)
+                surrogates[n] = _pairwise_matrix(
+                    _eca_rows, times, offsets, deltaT, lag,
+                    _ECA_WINDOWS[window_type])
 
             # Symmetrize according to symmetry keyword argument
             surrogates[n, :, :] = \
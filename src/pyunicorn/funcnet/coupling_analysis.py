@@ -23,6 +23,7 @@ from scipy import special, linalg   # special math functions
 
 # import mpi                          # parallelized computations
 
+from ..utils import instrument
 from ..core._ext.types import to_cy, LAG, FIELD, \
     INT16TYPE, INT32TYPE, INT64TYPE
 from ._ext.numerics import _symmetrize_by_absmax, _cross_correlation_max, \
@@ -222,6 +223,7 @@ class CouplingAnalysis:
             return None
 
     # pylint: disable=too-many-positional-arguments
+    @instrument.traced
     def mutual_information(self, tau_max=0, estimator='knn',
                            knn=10, bins=6, lag_mode='max'):
         r"""
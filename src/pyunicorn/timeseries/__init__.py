@@ -52,6 +52,7 @@ from .cross_recurrence_plot import CrossRecurrencePlot
 from .inter_system_recurrence_network import InterSystemRecurrenceNetwork
 from .joint_recurrence_network import JointRecurrenceNetwork
 from .joint_recurrence_plot import JointRecurrencePlot
+from .packed_recurrence_matrix import PackedRecurrenceMatrix
 from .recurrence_network import RecurrenceNetwork
 from .recurrence_plot import RecurrencePlot
 from .surrogates import Surrogates
@@ -12,9 +12,8 @@
 # and J. Kurths, "Unified functional network and nonlinear time series analysis
 # for complex systems science: The pyunicorn package"
 
-from libc.math cimport sqrt, floor
+from libc.math cimport sqrt, floor, log
 
-from datetime import datetime
 import random
 
 import numpy as np
@@ -22,9 +21,9 @@ import numpy.random as rd
 cimport numpy as cnp
 from numpy cimport ndarray
 
-from ...core._ext.types import MASK, NODE, LAG, FIELD, DFIELD
+from ...core._ext.types import MASK, NODE, LAG, FIELD, DFIELD, BITS
 from ...core._ext.types cimport \
-    ADJ_t, MASK_t, NODE_t, DEGREE_t, LAG_t, FIELD_t, DFIELD_t
+    ADJ_t, MASK_t, NODE_t, DEGREE_t, LAG_t, FIELD_t, DFIELD_t, BITS_t
 
 cdef extern from "src_numerics.c":
     void _test_pearson_correlation_fast(double *original_data,
@@ -151,77 +150,6 @@ def _recurrence_plot(
                     break
 
 
-def _twins_s(
-    int N, int n_time, int dimension, float threshold, int min_dist,
-    ndarray[DFIELD_t, ndim=3] embedding_array,
-    ndarray[ADJ_t, ndim=2] R, ndarray[DEGREE_t, ndim=1] nR,
-    twins):
-
-    cdef:
-        int i, j, k, l
-        DFIELD_t diff
-        object twins_i, twins_ij, twins_ik
-
-    for i in range(N):
-        # Initialize the recurrence matrix R and nR
-        for j in range(n_time):
-            for k in range(j+1):
-                R[j, k] = R[k, j] = 1
-            nR[j] = <DEGREE_t> n_time
-
-        # Calculate the recurrence matrix for time series i
-        for j in range(n_time):
-            # Ignore main diagonal, since every sample is neighbor of itself
-            for k in range(j):
-                for l in range(dimension):
-                    # Use maximum norm
-                    diff = embedding_array[i, j, l] - embedding_array[i, k, l]
-
-                    if abs(diff) > threshold:
-                        # j and k are not neighbors
-                        R[j, k] = R[k, j] = 0
-
-                        # Reduce neighbor count of j and k by one
-                        nR[j] -= 1
-                        nR[k] -= 1
-
-                        # Leave the for loop
-                        break
-
-        # Add list for twins in time series i
-        twins.append([])
-
-        # Find all twins in the recurrence matrix
-        for j in range(n_time):
-            twins_i = twins[i]
-            twins_i.append([])
-            twins_ij = twins_i[j]
-
-            # Respect a minimal temporal spacing between twins to avoid false
-            # twins due to the higher
-            # sample density in phase space along the trajectory
-            for k in range(j - min_dist):
-                # Continue only if both samples have the same number of
-                # neighbors and more than just one neighbor (themselves)
-                if nR[j] == nR[k] and nR[j] != 1:
-                    l = 0
-
-                    while R[j, l] == R[k, l]:
-                        l += 1
-
-                        # If l is equal to the length of the time series at
-                        # this point, j and k are twins
-                        if l == n_time:
-                            # Add the twins to the twin list
-                            twins_ik = twins_i[k]
-
-                            twins_ij.append(k)
-                            twins_ik.append(j)
-
-                            # Leave the while loop
-                            break
-
-
 def _twin_surrogates_s(int n_surrogates, int N, twins,
                        ndarray[DFIELD_t, ndim=2] original_data):
     cdef:
@@ -455,7 +383,7 @@ def _bootstrap_distance_matrix_manhattan(
 
     cdef:
         int i, l
-        ndarray[NODE_t, ndim=2] jk = rd.randint(n_time, size=(2,M))
+        ndarray[NODE_t, ndim=2] jk = rd.randint(n_time, size=(2,M), dtype=NODE)
         double sum
 
     for i in range(M):
@@ -474,7 +402,7 @@ def _bootstrap_distance_matrix_euclidean(
 
     cdef:
         int i, l
-        ndarray[NODE_t, ndim=2] jk = rd.randint(n_time, size=(2,M))
+        ndarray[NODE_t, ndim=2] jk = rd.randint(n_time, size=(2,M), dtype=NODE)
         double sum, diff
 
     for i in range(M):
@@ -494,7 +422,7 @@ def _bootstrap_distance_matrix_supremum(
 
     cdef:
         int i, l
-        ndarray[NODE_t, ndim=2] jk = rd.randint(n_time, size=(2,M))
+        ndarray[NODE_t, ndim=2] jk = rd.randint(n_time, size=(2,M), dtype=NODE)
         double temp_diff, diff
 
     for i in range(M):
@@ -525,99 +453,6 @@ def _rejection_sampling(
             i += 1
 
 
-def _twins_r(
-    int min_dist, int N, ndarray[LAG_t, ndim=2] R,
-    ndarray[NODE_t, ndim=1] nR, twins):
-
-    cdef:
-        int j, k, l
-        object twins_j, twins_k
-
-    twins.append([])
-
-    for j in range(N):
-        twins.append([])
-        twins_j = twins[j]
-
-        # Respect a minimal temporal spacing between twins to avoid false
-        # twins du to th higher sample density in phase space along the
-        # trajectory
-        for k in range(j - min_dist):
-            # Continue only if both samples have the same number of
-            # neighbors and more than just one neighbor (themselves)
-            if nR[j] == nR[k] and nR[j] != 1:
-                l = 0
-
-                while R[j, l] == R[k, l]:
-                    l = l + 1
-
-                    # If l is equal to the length of the time series at
-                    # this point, j and k are twins
-                    if l == N:
-                        # And the twins to the twin list
-                        twins_k = twins[k]
-
-                        twins_j.append(k)
-                        twins_k.append(j)
-                        break
-
-
-def _twin_surrogates_r(int n_surrogates, int N, int dim, twins,
-                       ndarray[DFIELD_t, ndim=2] embedding):
-    cdef:
-        int i, j, k, new_k, n_twins, rand
-        object twins_k
-        ndarray[DFIELD_t, ndim=2] surrogates = np.empty(
-            (n_surrogates, N, dim), dtype=DFIELD)
-
-    # Initialize random number generator
-    random.seed(datetime.now())
-
-    for i in range(n_surrogates):
-        # Randomly choose a starting point in the original trajectory
-        k = int(floor(random.random() * N))
-
-        j = 0
-        while j < N:
-            # Assign state vector of surrogate trajectory
-            surrogates[i, j, :] = embedding[k, :]
-            # Get the list of twins of state vector k in the original time
-            # series
-            twins_k = twins[k]
-
-            # Get the number of twins of k
-            n_twins = int(len(twins_k))
-            # If k has no twins, go to the next sample k+1, If k has twins at
-            # m, choose among m+1 and k+1 with equal probability
-            if n_twins == 0:
-                k += 1
-            else:
-                # Generate a random integer between 0 and n_twins
-                rand = int(floor(random.random() * (n_twins + 1)))
-
-                # If rand = n_twings go to smple k+1, otherwise jump to the
-                # future of one of the twins
-                if rand == n_twins:
-                    k += 1
-                else:
-                    k = twins_k[rand]
-                    k += 1
-
-            # If the new k >= n_time, choose a new random starting point in the
-            # original time series
-            if k >= N:
-                while True:
-                    new_k = int(floor(random.random() * N))
-                    if new_k != k:
-                        break
-                k = new_k
-
-            j += 1
-
-    return surrogates
-
-
-
 # recurrence line distributions ===============================================
 
 
@@ -793,6 +628,526 @@ def _diagline_dist_sequential_missingvalues(
         i2J_diagline, ij2I_diagline, True)
 
 
+# windowed recurrence quantification analysis =================================
+
+
+ctypedef struct rec_source:
+    # recurrence matrix (C order, row length `n_R`), used if `dim == 0`
+    LAG_t *R
+    int n_R
+    # embedding (C order) and threshold for the supremum metric
+    DFIELD_t *E
+    int dim
+    DFIELD_t eps
+
+
+cdef inline bint _rec(int i, int j, rec_source *src):
+    """
+    Recurrence lookup, either in the cached matrix `R` or, for `dim > 0`,
+    computed from the raw embedding `E`.
+    """
+    cdef:
+        int l
+        DFIELD_t diff = 0, tmp_diff
+    if src.dim == 0:
+        return src.R[i * src.n_R + j] == 1
+    for l in range(src.dim):
+        tmp_diff = abs(src.E[i * src.dim + l] - src.E[j * src.dim + l])
+        if tmp_diff > diff:
+            diff = tmp_diff
+    return diff < src.eps
+
+
+cdef inline int _run_row(
+    int i, int j, int j_stop, int direction, rec_source *src):
+    """
+    Length of the run of recurrences in row `i`, starting at column `j` and
+    proceeding in `direction` up to (excluding) column `j_stop`.
+    """
+    cdef int k = 0
+    while j != j_stop and _rec(i, j, src):
+        k += 1
+        j += direction
+    return k
+
+
+cdef inline int _run_diag(
+    int off, int j, int j_stop, int direction, rec_source *src):
+    """
+    Length of the run of recurrences on the lower diagonal with offset `off`,
+    starting at point `(j + off, j)` and proceeding in `direction` up to
+    (excluding) column `j_stop`.
+    """
+    cdef int k = 0
+    while j != j_stop and _rec(j + off, j, src):
+        k += 1
+        j += direction
+    return k
+
+
+cdef inline void _move_run(NODE_t *hist, int k, int delta):
+    """
+    Shorten (`delta = -1`) or lengthen (`delta = +1`) a line of length `k` by
+    one point in the line length histogram.
+    """
+    if k > 0:
+        hist[k-1] -= 1
+    if k + delta > 0:
+        hist[k+delta-1] += 1
+
+
+cdef void _window_init(
+    int s, int w, NODE_t *diag, NODE_t *vert, long *n_rec, rec_source *src):
+    """
+    Line length histograms and recurrence count of the window `[s, s+w)`,
+    computed from scratch.
+    """
+    cdef int i, j, k, off
+    for k in range(w):
+        diag[k] = vert[k] = 0
+    n_rec[0] = 0
+
+    for i in range(s, s + w):
+        j = s
+        while j < s + w:
+            k = _run_row(i, j, s + w, 1, src)
+            if k > 0:
+                vert[k-1] += 1
+                n_rec[0] += k
+                j += k
+            else:
+                j += 1
+
+    for off in range(1, w):
+        j = s
+        while j < s + w - off:
+            k = _run_diag(off, j, s + w - off, 1, src)
+            if k > 0:
+                diag[k-1] += 1
+                j += k
+            else:
+                j += 1
+
+
+cdef void _window_shift(
+    int s, int w, NODE_t *diag, NODE_t *vert, long *n_rec, rec_source *src):
+    """
+    Update the line length histograms and recurrence count of the window
+    `[s, s+w)` to those of `[s+1, s+w+1)`, by visiting only the leaving row
+    and column `s` and the entering row and column `s+w`, as well as the runs
+    touching them.
+    """
+    cdef int i, j, k, off, a = s, b = s + w
+
+    # leaving row a
+    j = s
+    while j < s + w:
+        k = _run_row(a, j, s + w, 1, src)
+        if k > 0:
+            vert[k-1] -= 1
+            n_rec[0] -= k
+            j += k
+        else:
+            j += 1
+
+    # remaining rows: leaving column a, then entering column b
+    for i in range(s + 1, s + w):
+        if _rec(i, a, src):
+            n_rec[0] -= 1
+            _move_run(vert, _run_row(i, a, s + w, 1, src), -1)
+        if _rec(i, b, src):
+            n_rec[0] += 1
+            _move_run(vert, _run_row(i, b - 1, s, -1, src), 1)
+
+    # entering row b
+    j = s + 1
+    while j < s + w + 1:
+        k = _run_row(b, j, s + w + 1, 1, src)
+        if k > 0:
+            vert[k-1] += 1
+            n_rec[0] += k
+            j += k
+        else:
+            j += 1
+
+    # lower diagonals: leaving point (a+off, a), entering point (b, b-off)
+    for off in range(1, w):
+        if _rec(a + off, a, src):
+            _move_run(diag, _run_diag(off, a, s + w - off, 1, src), -1)
+        if _rec(b, b - off, src):
+            _move_run(diag, _run_diag(off, b - off - 1, s, -1, src), 1)
+
+
+cdef void _window_measures(
+    int w, NODE_t *diag, NODE_t *vert, long n_rec,
+    int l_min, int v_min, double epsilon, DFIELD_t *out):
+    """
+    RR, DET, L, ENTR, LAM and TT of a window, following the definitions in
+    `RecurrencePlot`. Diagonal lines are counted in the lower triangle only.
+    """
+    cdef:
+        int l
+        double full_d = 0, part_d = 0, num_d = 0
+        double full_v = 0, part_v = 0, num_v = 0
+        double entr = 0, p
+
+    for l in range(1, w + 1):
+        full_d += 2 * l * diag[l-1]
+        full_v += l * vert[l-1]
+        if l >= l_min:
+            part_d += 2 * l * diag[l-1]
+            num_d += 2 * diag[l-1]
+        if l >= v_min:
+            part_v += l * vert[l-1]
+            num_v += vert[l-1]
+    for l in range(l_min, w + 1):
+        if diag[l-1] != 0:
+            p = 2 * diag[l-1] / (num_d + epsilon)
+            entr -= p * log(p)
+
+    out[0] = n_rec / (<double> w * w)
+    out[1] = part_d / (full_d + epsilon)
+    out[2] = part_d / (num_d + epsilon)
+    out[3] = entr
+    out[4] = part_v / (full_v + epsilon)
+    out[5] = part_v / (num_v + epsilon)
+
+
+def _windowed_rqa(
+        int w, ndarray[NODE_t, ndim=1] starts,
+        ndarray[LAG_t, ndim=2, mode='c'] R,
+        ndarray[DFIELD_t, ndim=2, mode='c'] E,
+        float eps, int dim, int l_min, int v_min, double epsilon):
+    """
+    RQA measures for the windows `[s, s+w)` with `s` in `starts` (sorted),
+    either from the cached recurrence matrix `R` or, for `dim > 0`, from the
+    raw embedding `E` (supremum metric). The line length histograms are
+    carried over between consecutive windows, unless they do not overlap.
+    """
+    cdef:
+        int n, s, prev = -1, n_windows = starts.shape[0]
+        long n_rec = 0
+        rec_source src
+        ndarray[NODE_t, ndim=1, mode='c'] diag = np.zeros(w, dtype=NODE)
+        ndarray[NODE_t, ndim=1, mode='c'] vert = np.zeros(w, dtype=NODE)
+        ndarray[DFIELD_t, ndim=2, mode='c'] out = np.zeros(
+            (n_windows, 6), dtype=DFIELD)
+
+    src.R = <LAG_t*> cnp.PyArray_DATA(R)
+    src.n_R = R.shape[1]
+    src.E = <DFIELD_t*> cnp.PyArray_DATA(E)
+    src.dim = dim
+    src.eps = eps
+
+    for n in range(n_windows):
+        s = starts[n]
+        assert 0 <= s and s + w <= (E.shape[0] if dim > 0 else R.shape[0])
+        if prev < 0 or s - prev >= w:
+            _window_init(s, w, &diag[0], &vert[0], &n_rec, &src)
+        else:
+            while prev < s:
+                _window_shift(prev, w, &diag[0], &vert[0], &n_rec, &src)
+                prev += 1
+        prev = s
+        _window_measures(
+            w, &diag[0], &vert[0], n_rec, l_min, v_min, epsilon, &out[n, 0])
+    return out
+
+
+def _batch_rqa(
+        ndarray[DFIELD_t, ndim=2, mode='c'] E,
+        ndarray[NODE_t, ndim=1] offsets,
+        ndarray[DFIELD_t, ndim=1] thresholds, bint rate, int metric,
+        int l_min, int v_min, double epsilon):
+    """
+    RQA measures for a batch of embedded time series, stored consecutively in
+    `E` and delimited by `offsets`. The recurrence matrix of each series is
+    written into a shared buffer, using the `metric` (0: manhattan,
+    1: euclidean, 2: supremum) and the fixed thresholds or, if `rate`, the
+    fixed recurrence rates given in `thresholds`.
+    """
+    cdef:
+        int n, i, j, l, o, w, dim = E.shape[1]
+        int n_series = offsets.shape[0] - 1
+        int w_max = np.diff(offsets).max()
+        long n_rec = 0
+        DFIELD_t eps, dist, diff
+        rec_source src
+        ndarray[DFIELD_t, ndim=2, mode='c'] D = np.zeros(
+            (w_max, w_max), dtype=DFIELD)
+        ndarray[LAG_t, ndim=2, mode='c'] R = np.zeros(
+            (w_max, w_max), dtype=LAG)
+        ndarray[NODE_t, ndim=1, mode='c'] diag = np.zeros(w_max, dtype=NODE)
+        ndarray[NODE_t, ndim=1, mode='c'] vert = np.zeros(w_max, dtype=NODE)
+        ndarray[DFIELD_t, ndim=2, mode='c'] out = np.zeros(
+            (n_series, 6), dtype=DFIELD)
+
+    assert 0 <= metric <= 2
+    src.R = <LAG_t*> cnp.PyArray_DATA(R)
+    src.n_R = w_max
+    src.dim = 0
+
+    for n in range(n_series):
+        o, w = offsets[n], offsets[n+1] - offsets[n]
+        for i in range(w):
+            D[i, i] = 0
+            for j in range(i):
+                dist = 0
+                for l in range(dim):
+                    diff = abs(E[o+i, l] - E[o+j, l])
+                    if metric == 0:
+                        dist += diff
+                    elif metric == 1:
+                        dist += diff * diff
+                    elif diff > dist:
+                        dist = diff
+                D[i, j] = D[j, i] = sqrt(dist) if metric == 1 else dist
+        if rate:
+            # same quantile as `RecurrencePlot.threshold_from_recurrence_rate`
+            j = int(thresholds[n] * (w * w - 1))
+            eps = np.partition(D[:w, :w], j, axis=None)[j]
+        else:
+            eps = thresholds[n]
+        for i in range(w):
+            for j in range(w):
+                R[i, j] = D[i, j] < eps
+        _window_init(0, w, &diag[0], &vert[0], &n_rec, &src)
+        _window_measures(
+            w, &diag[0], &vert[0], n_rec, l_min, v_min, epsilon, &out[n, 0])
+    return out
+
+
+# packed recurrence matrices ==================================================
+
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <intrin.h>
+    static inline int _popcount64(unsigned long long x) {
+        return (int) __popcnt64(x);
+    }
+    static inline int _ctz64(unsigned long long x) {
+        unsigned long i;
+        _BitScanForward64(&i, x);
+        return (int) i;
+    }
+    #else
+    static inline int _popcount64(unsigned long long x) {
+        return __builtin_popcountll(x);
+    }
+    static inline int _ctz64(unsigned long long x) {
+        return __builtin_ctzll(x);
+    }
+    #endif
+    """
+    int _popcount64(unsigned long long x)
+    int _ctz64(unsigned long long x)
+
+
+cdef inline DFIELD_t _distance(
+        DFIELD_t *a, DFIELD_t *b, int dim, int metric):
+    """
+    Distance between the state vectors `a` and `b` in the `metric`
+    (0: manhattan, 1: euclidean, 2: supremum).
+    """
+    cdef:
+        int l
+        DFIELD_t dist = 0, diff
+
+    for l in range(dim):
+        diff = abs(a[l] - b[l])
+        if metric == 0:
+            dist += diff
+        elif metric == 1:
+            dist += diff * diff
+        elif diff > dist:
+            dist = diff
+    return sqrt(dist) if metric == 1 else dist
+
+
+def _packed_recurrence_matrix(
+        ndarray[DFIELD_t, ndim=2, mode='c'] x_embedded not None,
+        ndarray[DFIELD_t, ndim=2, mode='c'] y_embedded not None,
+        double eps, int metric):
+    """
+    Bit-packed recurrence matrix of the states `x_embedded` w.r.t. the states
+    `y_embedded`: bit `j % 64` of word `[i, j // 64]` is set iff the distance
+    between `x_embedded[i]` and `y_embedded[j]` in the `metric`
+    (0: manhattan, 1: euclidean, 2: supremum) is below `eps`.
+    """
+    cdef:
+        int i, j, dim = x_embedded.shape[1]
+        int n_x = x_embedded.shape[0], n_y = y_embedded.shape[0]
+        DFIELD_t *x = <DFIELD_t*> cnp.PyArray_DATA(x_embedded)
+        DFIELD_t *y = <DFIELD_t*> cnp.PyArray_DATA(y_embedded)
+        ndarray[BITS_t, ndim=2, mode='c'] bits = np.zeros(
+            (n_x, (n_y + 63) // 64), dtype=BITS)
+
+    assert 0 <= metric <= 2 and y_embedded.shape[1] == dim
+    for i in range(n_x):
+        for j in range(n_y):
+            if _distance(x + i*dim, y + j*dim, dim, metric) < eps:
+                bits[i, j >> 6] |= (<BITS_t> 1) << (j & 63)
+    return bits
+
+
+def _packed_joint_recurrence_matrix(
+        ndarray[DFIELD_t, ndim=2, mode='c'] x_embedded not None,
+        ndarray[DFIELD_t, ndim=2, mode='c'] y_embedded not None,
+        double eps_x, double eps_y, int metric_x, int metric_y):
+    """
+    Bit-packed joint recurrence matrix of the equally long trajectories
+    `x_embedded` and `y_embedded`, fusing the distance computation, the
+    thresholding and the logical AND of both subsystems in a single pass over
+    the lower triangle. Distances in `y_embedded` are only evaluated for
+    recurrences in `x_embedded`, and each row is accumulated wordwise before
+    being mirrored into the upper triangle.
+    """
+    cdef:
+        int i, j, w, n = x_embedded.shape[0]
+        int dim_x = x_embedded.shape[1], dim_y = y_embedded.shape[1]
+        BITS_t word
+        DFIELD_t *x = <DFIELD_t*> cnp.PyArray_DATA(x_embedded)
+        DFIELD_t *y = <DFIELD_t*> cnp.PyArray_DATA(y_embedded)
+        ndarray[BITS_t, ndim=2, mode='c'] bits = np.zeros(
+            (n, (n + 63) // 64), dtype=BITS)
+
+    assert 0 <= metric_x <= 2 and 0 <= metric_y <= 2
+    assert y_embedded.shape[0] == n
+    for i in range(n):
+        for w in range(i // 64 + 1):
+            word = 0
+            for j in range(64 * w, min(64 * (w + 1), i + 1)):
+                if _distance(x + i*dim_x, x + j*dim_x, dim_x, metric_x) \
+                        < eps_x and \
+                        _distance(y + i*dim_y, y + j*dim_y, dim_y, metric_y) \
+                        < eps_y:
+                    word |= (<BITS_t> 1) << (j & 63)
+                    bits[j, i >> 6] |= (<BITS_t> 1) << (i & 63)
+            bits[i, w] |= word
+    return bits
+
+
+def _packed_csr(ndarray[BITS_t, ndim=2, mode='c'] bits not None):
+    """
+    Row pointers and column indices of the set bits in a bit-packed matrix,
+    i.e., its sparsity structure in CSR format.
+    """
+    cdef:
+        int i, w, n_rows = bits.shape[0], n_words = bits.shape[1]
+        Py_ssize_t k = 0
+        BITS_t x
+        ndarray[cnp.int64_t, ndim=1] indptr = np.zeros(
+            n_rows + 1, dtype=np.int64)
+        ndarray[NODE_t, ndim=1] indices
+
+    for i in range(n_rows):
+        for w in range(n_words):
+            k += _popcount64(bits[i, w])
+        indptr[i+1] = k
+    indices = np.empty(k, dtype=NODE)
+    k = 0
+    for i in range(n_rows):
+        for w in range(n_words):
+            x = bits[i, w]
+            while x:
+                indices[k] = 64 * w + _ctz64(x)
+                x &= x - 1
+                k += 1
+    return indptr, indices
+
+
+def _packed_popcount(ndarray[BITS_t, ndim=2, mode='c'] bits not None):
+    """
+    Number of set bits in a bit-packed matrix.
+    """
+    cdef:
+        Py_ssize_t k, n = bits.shape[0] * bits.shape[1]
+        BITS_t *b = <BITS_t*> cnp.PyArray_DATA(bits)
+        long long count = 0
+
+    for k in range(n):
+        count += _popcount64(b[k])
+    return count
+
+
+def _packed_vertline_dist(
+        ndarray[NODE_t, ndim=1] hist,
+        ndarray[BITS_t, ndim=2, mode='c'] bits not None, int n_cols,
+        bint black):
+    """
+    Frequency distribution of the lengths of black (or white) runs within the
+    rows of a bit-packed matrix with `n_cols` columns. Runs are extracted
+    wordwise by counting trailing zeros.
+    """
+    cdef:
+        int i, w, pos, nb, run, k = 0
+        int n_rows = bits.shape[0], n_words = bits.shape[1]
+        BITS_t x, y
+
+    for i in range(n_rows):
+        for w in range(n_words):
+            nb = min(64, n_cols - 64 * w)
+            x = bits[i, w] if black else ~bits[i, w]
+            if nb < 64:
+                x &= ((<BITS_t> 1) << nb) - 1
+            pos = 0
+            while pos < nb:
+                y = x >> pos
+                if y & 1:
+                    # extend the current run by the block of set bits at `pos`
+                    run = 64 - pos if ~y == 0 else _ctz64(~y)
+                    k += run
+                    pos += run
+                else:
+                    # if end of line, count line and reset length
+                    if k != 0:
+                        hist[k-1] += 1
+                        k = 0
+                    if y == 0:
+                        break
+                    pos += _ctz64(y)
+        if k != 0:
+            # at end of row, count the last uncounted line and reset length
+            hist[k-1] += 1
+            k = 0
+
+
+def _packed_diagline_dist(
+        ndarray[NODE_t, ndim=1] hist,
+        ndarray[BITS_t, ndim=2, mode='c'] bits not None):
+    """
+    Frequency distribution of the lengths of diagonal lines below the main
+    diagonal of a square bit-packed matrix. Line starts are found wordwise by
+    masking each row with its predecessor shifted by one column, and each line
+    is then followed along its diagonal.
+    """
+    cdef:
+        int i, j, w, l, n = bits.shape[0], n_words = bits.shape[1]
+        BITS_t prev, starts
+
+    for i in range(1, n):
+        for w in range(n_words):
+            if 64 * w >= i:
+                break
+            prev = bits[i-1, w] << 1
+            if w > 0:
+                prev |= bits[i-1, w-1] >> 63
+            starts = bits[i, w] & ~prev
+            if 64 * (w + 1) > i:
+                # restrict to the lower triangle
+                starts &= ((<BITS_t> 1) << (i - 64 * w)) - 1
+            while starts:
+                j = 64 * w + _ctz64(starts)
+                starts &= starts - 1
+                l = 1
+                while i + l < n and \
+                        (bits[i+l, (j+l) >> 6] >> ((j+l) & 63)) & 1:
+                    l += 1
+                hist[l-1] += 1
+
+
 # visibility graph =============================================================
 
 
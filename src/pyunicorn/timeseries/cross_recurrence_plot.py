@@ -22,6 +22,7 @@ import numpy as np
 
 from ..core.cache import Cached
 from .recurrence_plot import RecurrencePlot
+from .packed_recurrence_matrix import PackedRecurrenceMatrix
 from ..core._ext.types import to_cy, DFIELD
 from ._ext.numerics import _manhattan_distance_matrix_crp, \
     _euclidean_distance_matrix_crp, _supremum_distance_matrix_crp
@@ -63,7 +64,7 @@ class CrossRecurrencePlot(RecurrencePlot):
 
     # pylint: disable=too-many-positional-arguments
     def __init__(self, x, y, metric="supremum", normalize=False,
-                 sparse_rqa=False, silence_level=0, **kwds):
+                 sparse_rqa=False, silence_level=0, packed=False, **kwds):
         """
         Initialize an instance of CrossRecurrencePlot.
 
@@ -91,6 +92,10 @@ class CrossRecurrencePlot(RecurrencePlot):
         :arg bool normalize: Decide whether to normalize both time series to
             zero mean and unit standard deviation.
         :arg number silence_level: Inverse level of verbosity of the object.
+        :arg bool packed: Store the cross recurrence matrix as a
+            :class:`~.packed_recurrence_matrix.PackedRecurrenceMatrix`,
+            using one bit per entry. At a fixed threshold, the distance matrix
+            is not stored either.
         :arg number threshold: The recurrence threshold keyword for generating
             the cross recurrence plot using a fixed threshold.
         :arg number recurrence_rate: The recurrence rate keyword for generating
@@ -104,7 +109,7 @@ class CrossRecurrencePlot(RecurrencePlot):
         RecurrencePlot.__init__(
             self, np.empty((2, 0)), metric=metric, normalize=normalize,
             sparse_rqa=sparse_rqa, silence_level=silence_level,
-            skip_recurrence=True)
+            packed=packed, skip_recurrence=True)
 
         self.CR = None
         """The cross recurrence matrix."""
@@ -195,7 +200,8 @@ class CrossRecurrencePlot(RecurrencePlot):
         """
         Return the current cross recurrence matrix :math:`CR`.
 
-        :rtype: 2D square Numpy array
+        :rtype: 2D rectangular Numpy array (or
+            :class:`~.packed_recurrence_matrix.PackedRecurrenceMatrix`)
         :return: the current cross recurrence matrix :math:`CR`.
         """
         return self.CR
@@ -275,6 +281,13 @@ class CrossRecurrencePlot(RecurrencePlot):
         if self.silence_level <= 1:
             print("Calculating cross recurrence plot at fixed threshold...")
 
+        if self.packed:
+            self.CR = PackedRecurrenceMatrix.from_embedding(
+                self.x_embedded, self.y_embedded, threshold=threshold,
+                metric=self.metric)
+            (self.N, self.M) = self.CR.shape
+            return
+
         distance = self.distance_matrix(self.metric)
         (N, M) = distance.shape
         recurrence = np.zeros((N, M), dtype="int8")
@@ -302,7 +315,8 @@ class CrossRecurrencePlot(RecurrencePlot):
                                                         recurrence_rate)
         recurrence = np.zeros((N, M), dtype="int8")
         recurrence[distance < threshold] = 1
-        self.CR = recurrence
+        self.CR = PackedRecurrenceMatrix.from_dense(recurrence) \
+            if self.packed else recurrence
         self.N = N
         self.M = M
 
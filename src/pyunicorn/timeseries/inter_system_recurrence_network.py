@@ -23,8 +23,11 @@ from collections.abc import Hashable
 
 # array object and fast numerics
 import numpy as np
+from scipy import sparse as sp
+from scipy.spatial import cKDTree
 
 from ..core import InteractingNetworks
+from ..core._ext.types import to_cy, LAG, DFIELD
 from .recurrence_plot import RecurrencePlot
 from .cross_recurrence_plot import CrossRecurrencePlot
 
@@ -69,7 +72,7 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
 
     # pylint: disable=too-many-positional-arguments
     def __init__(self, x, y, metric="supremum", normalize=False,
-                 silence_level=0, **kwds):
+                 silence_level=0, sparse=False, **kwds):
         """
         Initialize an instance of InterSystemRecurrenceNetwork (ISRN).
 
@@ -104,6 +107,12 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
         :arg bool normalize: Decide whether to normalize the time series to
                              zero mean and unit standard deviation.
         :arg int silence_level: The inverse level of verbosity of the object.
+        :arg bool sparse: Assemble the inter system recurrence matrix in
+                          sparse format from KD-tree neighbour searches,
+                          without computing distance matrices or dense
+                          recurrence matrices. Thresholds for fixed
+                          recurrence rates are then estimated from sampled
+                          distances.
         :arg kwds: Additional options.
         :type threshold: tuple of number (three numbers)
         :keyword threshold: The recurrence threshold keyword for generating
@@ -140,18 +149,6 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
             self.silence_level = silence_level
             """The inverse level of verbosity of the object."""
 
-            #  Get number of nodes in subnetwork x
-            self.N_x = self.x.shape[0]
-            """Number of nodes in subnetwork x."""
-
-            #  Get number of nodes in subnetwork y
-            self.N_y = self.y.shape[0]
-            """Number of nodes in subnetwork y."""
-
-            #  Get total number of nodes of ISRN
-            self.N = self.N_x + self.N_y
-            """Total number of nodes of ISRN."""
-
             #  Store type of metric
             self.metric = metric
             """The metric used for measuring distances in phase space."""
@@ -174,6 +171,24 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
                 self.x_embedded = self.x
                 self.y_embedded = self.y
 
+            #  Get number of nodes in subnetwork x
+            self.N_x = self.x_embedded.shape[0]
+            """Number of nodes in subnetwork x."""
+
+            #  Get number of nodes in subnetwork y
+            self.N_y = self.y_embedded.shape[0]
+            """Number of nodes in subnetwork y."""
+
+            #  Get total number of nodes of ISRN
+            self.N = self.N_x + self.N_y
+            """Total number of nodes of ISRN."""
+
+            #  Toggle sparse construction
+            self.sparse = sparse
+            """Controls sparse construction of the ISRN."""
+            self.rp_x = self.rp_y = self.crp_xy = None
+            self._recurrences = None
+
             #  Get threshold or recurrence rate from **kwds, construct
             #  ISRN accordingly
             threshold = kwds.get("threshold")
@@ -229,6 +244,11 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
         :rtype: 2D square Numpy array
         :return: the current inter system recurrence matrix :math:`ISRM`.
         """
+        if self.sparse:
+            ISRM = self.sp_A.toarray()
+            ISRM.flat[::self.N + 1] = self._recurrences[3]
+            return ISRM
+
         #  Shortcuts
         N = self.N
         N_x = self.N_x
@@ -252,6 +272,9 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
         :arg threshold: The three threshold parameters. Give for each
                         time series and the cross recurrence plot separately.
         """
+        if self.sparse:
+            return self._sparse_inter_system_recurrence_matrix(threshold)
+
         #  Compute recurrence matrices of x and y
         self.rp_x = RecurrencePlot(time_series=self.x_embedded,
                                    threshold=threshold[0],
@@ -284,6 +307,18 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
         :arg density: The three recurrence rate parameters. Give for each
                         time series and the cross recurrence plot separately.
         """
+        if self.sparse:
+            #  Estimate thresholds per block from sampled distances
+            threshold = (
+                RecurrencePlot.threshold_from_recurrence_rate_sampled(
+                    self.x_embedded, density[0], self.metric),
+                RecurrencePlot.threshold_from_recurrence_rate_sampled(
+                    self.y_embedded, density[1], self.metric),
+                RecurrencePlot.threshold_from_recurrence_rate_sampled(
+                    self.x_embedded, density[2], self.metric,
+                    y_embedding=self.y_embedded))
+            return self._sparse_inter_system_recurrence_matrix(threshold)
+
         #  Compute recurrence matrices of x and y
         self.rp_x = RecurrencePlot(time_series=self.x_embedded,
                                    recurrence_rate=density[0],
@@ -307,6 +342,46 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
         ISRM.flat[::self.N + 1] = 0
         return ISRM
 
+    def _sparse_recurrence_matrix(self, x_embedded, y_embedded, threshold):
+        """
+        Return the (cross) recurrence matrix of two trajectories at a fixed
+        threshold in sparse format, from a KD-tree neighbour search.
+
+        :rtype: 2D sparse matrix (CSR)
+        """
+        p = {"manhattan": 1, "euclidean": 2, "supremum": np.inf}[self.metric]
+        tree_x = cKDTree(to_cy(x_embedded, DFIELD))
+        tree_y = tree_x if y_embedded is None \
+            else cKDTree(to_cy(y_embedded, DFIELD))
+        pairs = tree_x.sparse_distance_matrix(
+            tree_y, threshold, p=p, output_type="ndarray")
+        pairs = pairs[pairs["v"] < threshold]
+        return sp.csr_matrix(
+            (np.ones(len(pairs), dtype=LAG), (pairs["i"], pairs["j"])),
+            shape=(tree_x.n, tree_y.n))
+
+    def _sparse_inter_system_recurrence_matrix(self, threshold):
+        """
+        Return the inter system recurrence matrix without self-loops in
+        sparse format, assembled blockwise from neighbour searches.
+
+        :type threshold: tuple of number (three numbers)
+        :arg threshold: The three threshold parameters. Give for each
+                        time series and the cross recurrence plot separately.
+        :rtype: 2D sparse matrix (CSR)
+        """
+        R_x = self._sparse_recurrence_matrix(
+            self.x_embedded, None, threshold[0])
+        R_y = self._sparse_recurrence_matrix(
+            self.y_embedded, None, threshold[1])
+        CR_xy = self._sparse_recurrence_matrix(
+            self.x_embedded, self.y_embedded, threshold[2])
+        ISRM = sp.bmat([[R_x, CR_xy], [CR_xy.T, R_y]], format="csr")
+        self._recurrences = (R_x.nnz, R_y.nnz, CR_xy.nnz, ISRM.diagonal())
+        ISRM.setdiag(0)
+        ISRM.eliminate_zeros()
+        return ISRM
+
     #
     #  Methods to quantify inter system recurrence networks
     #
@@ -318,6 +393,9 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
         :rtype: tuple of number (float)
         :return: the internal recurrence rates of subnetworks x and y.
         """
+        if self.sparse:
+            return (self._recurrences[0] / self.N_x ** 2,
+                    self._recurrences[1] / self.N_y ** 2)
         return (self.rp_x.recurrence_rate(),
                 self.rp_y.recurrence_rate())
 
@@ -328,6 +406,8 @@ class InterSystemRecurrenceNetwork(InteractingNetworks):
         :rtype: number (float)
         :return: the cross recurrence rate between subnetworks x and y.
         """
+        if self.sparse:
+            return self._recurrences[2] / float(self.N_x * self.N_y)
         return self.crp_xy.cross_recurrence_rate()
 
     def cross_global_clustering_xy(self):
@@ -23,6 +23,7 @@ import numpy as np
 
 from ..core import Network
 from .joint_recurrence_plot import JointRecurrencePlot
+from .packed_recurrence_matrix import PackedRecurrenceMatrix
 
 
 #
@@ -109,6 +110,10 @@ class JointRecurrenceNetwork(JointRecurrencePlot, Network):
             series.
         :arg number lag: To create a delayed version of the JRP.
         :arg number silence_level: Inverse level of verbosity of the object.
+        :keyword bool packed: Construct the joint recurrence matrix as a
+            :class:`~.packed_recurrence_matrix.PackedRecurrenceMatrix` and
+            pass it to :class:`~pyunicorn.core.network.Network` as a sparse
+            matrix, without dense intermediates.
         :type threshold: tuple of number
         :keyword threshold: The recurrence threshold keyword for generating the
             recurrence plot using a fixed threshold.  Give separately for each
@@ -137,7 +142,7 @@ class JointRecurrenceNetwork(JointRecurrencePlot, Network):
 
                 #  Set diagonal of JR to zero to avoid self-loops in the joint
                 #  recurrence network
-                A = self.JR - np.eye((self.N-np.abs(lag)), dtype="int8")
+                A = self._joint_adjacency()
 
                 #  Create a Network object interpreting the recurrence matrix
                 #  as the graph adjacency matrix. Joint recurrence networks
@@ -159,6 +164,21 @@ class JointRecurrenceNetwork(JointRecurrencePlot, Network):
                 f"{JointRecurrencePlot.__str__(self)}\n"
                 f"{Network.__str__(self)}")
 
+    def _joint_adjacency(self):
+        """
+        Return the joint recurrence matrix without its main diagonal, i.e.,
+        the adjacency matrix of the joint recurrence network. A packed joint
+        recurrence matrix is converted to a sparse matrix.
+        """
+        if isinstance(self.JR, PackedRecurrenceMatrix):
+            A = self.JR.to_sparse()
+            A.setdiag(0)
+            A.eliminate_zeros()
+        else:
+            A = self.JR.copy()
+            A.flat[::A.shape[0]+1] = 0
+        return A
+
     #
     #  Methods to handle recurrence networks
     #
@@ -174,8 +194,7 @@ class JointRecurrenceNetwork(JointRecurrencePlot, Network):
 
         #  Set diagonal of JR to zero to avoid self-loops in the joint
         #  recurrence network
-        A = self.JR.copy()
-        A.flat[::self.N+1] = 0
+        A = self._joint_adjacency()
 
         #  Create a Network object interpreting the recurrence matrix as the
         #  graph adjacency matrix. Joint recurrence networks are undirected by
@@ -197,8 +216,7 @@ class JointRecurrenceNetwork(JointRecurrencePlot, Network):
 
         #  Set diagonal of JR to zero to avoid self-loops in the joint
         #  recurrence network
-        A = self.JR.copy()
-        A.flat[::self.N+1] = 0
+        A = self._joint_adjacency()
 
         #  Create a Network object interpreting the recurrence matrix as the
         #  graph adjacency matrix. Joint recurrence networks are undirected by
@@ -220,8 +238,7 @@ class JointRecurrenceNetwork(JointRecurrencePlot, Network):
 
         #  Set diagonal of JR to zero to avoid self-loops in the joint
         #  recurrence network
-        A = self.JR.copy()
-        A.flat[::self.N+1] = 0
+        A = self._joint_adjacency()
 
         #  Create a Network object interpreting the recurrence matrix as the
         #  graph adjacency matrix. Joint recurrence networks are undirected by
@@ -21,6 +21,7 @@ analysis (RQA) and recurrence network analysis.
 import numpy as np
 
 from .recurrence_plot import RecurrencePlot
+from .packed_recurrence_matrix import PackedRecurrenceMatrix
 
 
 class JointRecurrencePlot(RecurrencePlot):
@@ -66,7 +67,8 @@ class JointRecurrencePlot(RecurrencePlot):
 
     # pylint: disable=too-many-positional-arguments
     def __init__(self, x, y, metric=("supremum", "supremum"),
-                 normalize=False, lag=0, silence_level=0, **kwds):
+                 normalize=False, lag=0, silence_level=0, packed=False,
+                 **kwds):
         """
         Initialize an instance of JointRecurrencePlot.
 
@@ -97,6 +99,12 @@ class JointRecurrencePlot(RecurrencePlot):
             series.
         :arg number lag: To create a delayed version of the JRP.
         :arg number silence_level: Inverse level of verbosity of the object.
+        :arg bool packed: Store the joint recurrence matrix as a
+            :class:`~.packed_recurrence_matrix.PackedRecurrenceMatrix`,
+            constructed in a single pass without storing distance matrices or
+            the recurrence matrices of x and y. Thresholds for fixed
+            recurrence rates are then estimated from sampled distances (see
+            :meth:`~.RecurrencePlot.threshold_from_recurrence_rate_sampled`).
         :type threshold: tuple of number
         :keyword threshold: The recurrence threshold keyword for generating the
             recurrence plot using a fixed threshold.  Give separately for each
@@ -126,7 +134,8 @@ class JointRecurrencePlot(RecurrencePlot):
         RecurrencePlot.__init__(
             self, np.empty((2, 0)), metric=metric[0], normalize=normalize,
             threshold=threshold[0] if threshold else 0,
-            recurrence_rate=recurrence_rate, silence_level=silence_level)
+            recurrence_rate=recurrence_rate, silence_level=silence_level,
+            packed=packed)
 
         #  Store type of metric
         self.metric = metric
@@ -229,7 +238,8 @@ class JointRecurrencePlot(RecurrencePlot):
         """
         Return the current joint recurrence matrix :math:`JR`.
 
-        :rtype: 2D square Numpy array
+        :rtype: 2D square Numpy array (or
+            :class:`~.packed_recurrence_matrix.PackedRecurrenceMatrix`)
         :return: the current joint recurrence matrix :math:`JR`.
         """
         return self.JR
@@ -252,6 +262,11 @@ class JointRecurrencePlot(RecurrencePlot):
         if self.silence_level <= 1:
             print("Calculating joint recurrence plot at fixed threshold...")
 
+        if self.packed:
+            self.JR = self._packed_joint_recurrence(threshold)
+            self.N = self.x_embedded.shape[0]
+            return
+
         self.embedding = self.x_embedded
         distance = self.distance_matrix(self.metric[0])
         N = distance.shape[0]
@@ -311,6 +326,16 @@ class JointRecurrencePlot(RecurrencePlot):
             print("Calculating joint recurrence plot at "
                   "fixed recurrence rate...")
 
+        if self.packed:
+            threshold = tuple(
+                self.threshold_from_recurrence_rate_sampled(
+                    embedding, rate, metric) for embedding, rate, metric in
+                zip((self.x_embedded, self.y_embedded), recurrence_rate,
+                    self.metric))
+            self.JR = self._packed_joint_recurrence(threshold)
+            self.N = self.x_embedded.shape[0]
+            return
+
         self.embedding = self.x_embedded
         distance = self.distance_matrix(self.metric[0])
         N = distance.shape[0]
@@ -337,3 +362,23 @@ class JointRecurrencePlot(RecurrencePlot):
             self.JR = recurrence_y[:N+self.lag, :N+self.lag] * \
                 recurrence_x[-self.lag:N, -self.lag:N]
         self.N = N
+
+    def _packed_joint_recurrence(self, threshold):
+        """
+        Return the packed joint recurrence matrix at fixed thresholds.
+
+        See :meth:`.PackedRecurrenceMatrix.from_joint_embedding`.
+
+        :type threshold: tuple of number
+        :arg threshold: The recurrence threshold. Give for both time series
+            separately.
+        :rtype: PackedRecurrenceMatrix
+        """
+        N = self.x_embedded.shape[0]
+        if self.lag >= 0:
+            x_slice, y_slice = slice(0, N-self.lag), slice(self.lag, N)
+        else:
+            x_slice, y_slice = slice(-self.lag, N), slice(0, N+self.lag)
+        return PackedRecurrenceMatrix.from_joint_embedding(
+            self.x_embedded[x_slice], self.y_embedded[y_slice],
+            threshold=threshold, metric=self.metric)
@@ -0,0 +1,272 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Provides a bit-packed storage format for binary recurrence matrices.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy import sparse as sp
+
+from ..core._ext.types import to_cy, NODE, LAG, DFIELD, BITS
+from ._ext.numerics import _packed_recurrence_matrix, \
+    _packed_joint_recurrence_matrix, _packed_csr, _packed_popcount, \
+    _packed_vertline_dist, _packed_diagline_dist
+
+
+class PackedRecurrenceMatrix:
+    """
+    Binary (cross) recurrence matrix stored with 64 entries per machine word.
+
+    Row :math:`i` of the matrix is stored in the words
+    :attr:`bits`\\ ``[i, :]``, where column :math:`j` corresponds to bit
+    :math:`j \\bmod 64` of word :math:`\\lfloor j / 64 \\rfloor`. Compared to
+    the dense ``int8`` format, this reduces the memory footprint by a factor of
+    eight, and allows for counting recurrences by popcount, for combining
+    recurrence matrices by wordwise logical operations and for extracting the
+    line length distributions of RQA from runs of set (or unset) bits.
+
+    Instances behave like read-only arrays towards Numpy, i.e., functions such
+    as ``np.diag()`` or ``np.triu()`` operate on the dense matrix returned by
+    :meth:`to_dense`.
+
+    **Examples:**
+
+     - Pack an existing recurrence matrix and compute its recurrence rate::
+
+           PackedRecurrenceMatrix.from_dense(R).recurrence_rate()
+
+     - Construct the recurrence matrix of an embedding at a fixed threshold,
+       without storing the distance matrix::
+
+           PackedRecurrenceMatrix.from_embedding(embedding, threshold=0.1)
+    """
+
+    def __init__(self, bits: NDArray, n_cols: int):
+        """
+        Initialize an instance of PackedRecurrenceMatrix.
+
+        :type bits: 2D array (rows, words) of uint64
+        :arg bits: The packed rows of the matrix.
+        :arg int n_cols: The number of columns of the matrix.
+        """
+        assert bits.ndim == 2 and bits.shape[1] == (n_cols + 63) // 64
+        self.bits = to_cy(bits, BITS)
+        """The packed rows of the matrix."""
+        self.shape: Tuple[int, int] = (self.bits.shape[0], n_cols)
+        """The shape of the (unpacked) matrix."""
+
+    def __str__(self):
+        """
+        Returns a string representation.
+        """
+        return (f"PackedRecurrenceMatrix: shape {self.shape}, "
+                f"{self.nbytes} bytes")
+
+    @classmethod
+    def from_dense(cls, R: NDArray) -> "PackedRecurrenceMatrix":
+        """
+        Pack a dense binary matrix.
+
+        :type R: 2D array (rows, columns)
+        :arg R: The binary matrix.
+        :rtype: PackedRecurrenceMatrix
+        """
+        R = np.asarray(R)
+        assert R.ndim == 2
+        n_rows, n_cols = R.shape
+        n_words = (n_cols + 63) // 64
+        packed = np.zeros((n_rows, 8 * n_words), dtype=np.uint8)
+        packed[:, :(n_cols + 7) // 8] = np.packbits(
+            R != 0, axis=1, bitorder="little")
+        return cls(packed.view("<u8"), n_cols)
+
+    @classmethod
+    def from_embedding(cls, x_embedded: NDArray,
+                       y_embedded: Optional[NDArray] = None,
+                       threshold: float = 0., metric: str = "supremum"
+                       ) -> "PackedRecurrenceMatrix":
+        """
+        Construct the packed (cross) recurrence matrix of embedded time series
+        at a fixed threshold.
+
+        Distances are evaluated on the fly, such that neither the distance
+        matrix nor the dense recurrence matrix are stored. Entries agree with
+        thresholding the distance matrices of
+        :class:`~pyunicorn.timeseries.recurrence_plot.RecurrencePlot` and
+        :class:`~pyunicorn.timeseries.cross_recurrence_plot.CrossRecurrencePlot`.
+
+        :type x_embedded: 2D array (time, embedding dimension)
+        :arg x_embedded: The phase space trajectory indexing the rows.
+        :type y_embedded: 2D array (time, embedding dimension)
+        :arg y_embedded: The phase space trajectory indexing the columns.
+            Defaults to ``x_embedded``.
+        :arg number threshold: The recurrence threshold.
+        :arg str metric: The metric for measuring distances in phase space
+            ("manhattan", "euclidean", "supremum").
+        :rtype: PackedRecurrenceMatrix
+        """
+        metrics = ("manhattan", "euclidean", "supremum")
+        assert metric in metrics, f"unknown metric: {metric}"
+        x_embedded = to_cy(x_embedded, DFIELD)
+        y_embedded = x_embedded if y_embedded is None \
+            else to_cy(y_embedded, DFIELD)
+        bits = _packed_recurrence_matrix(
+            x_embedded, y_embedded, float(threshold), metrics.index(metric))
+        return cls(bits, y_embedded.shape[0])
+
+    @classmethod
+    def from_joint_embedding(cls, x_embedded: NDArray, y_embedded: NDArray,
+                             threshold: Tuple[float, float],
+                             metric: Tuple[str, str] = ("supremum",
+                                                        "supremum")
+                             ) -> "PackedRecurrenceMatrix":
+        """
+        Construct the packed joint recurrence matrix of two embedded time
+        series at fixed thresholds.
+
+        Distances in both phase spaces are evaluated, thresholded and combined
+        in a single pass over the lower triangle, such that neither distance
+        matrices nor the recurrence matrices of the subsystems are stored.
+        Distances in the second phase space are only evaluated for recurrences
+        in the first one.
+
+        :type x_embedded: 2D array (time, embedding dimension)
+        :arg x_embedded: The phase space trajectory x.
+        :type y_embedded: 2D array (time, embedding dimension)
+        :arg y_embedded: The phase space trajectory y, of the same length.
+        :type threshold: tuple of number
+        :arg threshold: The recurrence thresholds of x and y.
+        :type metric: tuple of string
+        :arg metric: The metrics for measuring distances in the phase spaces
+            of x and y ("manhattan", "euclidean", "supremum").
+        :rtype: PackedRecurrenceMatrix
+        """
+        metrics = ("manhattan", "euclidean", "supremum")
+        assert all(m in metrics for m in metric), f"unknown metric: {metric}"
+        x_embedded = to_cy(x_embedded, DFIELD)
+        y_embedded = to_cy(y_embedded, DFIELD)
+        assert x_embedded.shape[0] == y_embedded.shape[0], \
+            "trajectories must have the same length"
+        bits = _packed_joint_recurrence_matrix(
+            x_embedded, y_embedded, float(threshold[0]), float(threshold[1]),
+            metrics.index(metric[0]), metrics.index(metric[1]))
+        return cls(bits, x_embedded.shape[0])
+
+    def to_dense(self) -> NDArray:
+        """
+        Return the dense binary matrix.
+
+        :rtype: 2D array (rows, columns) of int8
+        """
+        packed = self.bits.astype("<u8", copy=False).view(np.uint8)
+        return np.unpackbits(
+            packed, axis=1, count=self.shape[1], bitorder="little"
+            ).astype(LAG, copy=False)
+
+    def to_sparse(self) -> sp.csr_matrix:
+        """
+        Return the matrix in sparse CSR format, without unpacking it.
+
+        :rtype: 2D sparse matrix (rows, columns) of int8
+        """
+        indptr, indices = _packed_csr(self.bits)
+        data = np.ones(len(indices), dtype=LAG)
+        return sp.csr_matrix((data, indices, indptr), shape=self.shape)
+
+    def __array__(self, dtype=None, copy=None):
+        R = self.to_dense()
+        return R if dtype is None else R.astype(dtype, copy=False)
+
+    def __and__(self, other: "PackedRecurrenceMatrix"
+                ) -> "PackedRecurrenceMatrix":
+        """
+        Return the entrywise product (logical AND) of two packed matrices of
+        equal shape, e.g., a joint recurrence matrix.
+        """
+        assert isinstance(other, PackedRecurrenceMatrix)
+        assert self.shape == other.shape, "shapes must agree"
+        return PackedRecurrenceMatrix(self.bits & other.bits, self.shape[1])
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PackedRecurrenceMatrix) \
+            and self.shape == other.shape \
+            and np.array_equal(self.bits, other.bits)
+
+    __hash__ = None
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes occupied by the packed matrix.
+        """
+        return self.bits.nbytes
+
+    def sum(self) -> int:
+        """
+        Return the number of non-zero entries, counted by popcount.
+
+        :rtype: int
+        """
+        return _packed_popcount(self.bits)
+
+    def recurrence_rate(self) -> float:
+        """
+        Return the fraction of non-zero entries.
+
+        :rtype: float
+        """
+        return self.sum() / float(self.shape[0] * self.shape[1])
+
+    def diagline_dist(self) -> NDArray:
+        """
+        Return the frequency distribution of diagonal line lengths below the
+        main diagonal of a square matrix, in the format of
+        :meth:`RecurrencePlot.diagline_dist()
+        <pyunicorn.timeseries.recurrence_plot.RecurrencePlot.diagline_dist>`
+        but without doubling the counts for the upper triangle.
+
+        :rtype: 1D array (int32)
+        """
+        assert self.shape[0] == self.shape[1], "matrix must be square"
+        diagline = np.zeros(self.shape[0], dtype=NODE)
+        _packed_diagline_dist(diagline, self.bits)
+        return diagline
+
+    def vertline_dist(self) -> NDArray:
+        """
+        Return the frequency distribution of vertical line lengths, in the
+        format of :meth:`RecurrencePlot.vertline_dist()
+        <pyunicorn.timeseries.recurrence_plot.RecurrencePlot.vertline_dist>`.
+
+        :rtype: 1D array (int32)
+        """
+        vertline = np.zeros(self.shape[1], dtype=NODE)
+        _packed_vertline_dist(vertline, self.bits, self.shape[1], True)
+        return vertline
+
+    def white_vertline_dist(self) -> NDArray:
+        """
+        Return the frequency distribution of white vertical line lengths, in
+        the format of :meth:`RecurrencePlot.white_vertline_dist()
+        <pyunicorn.timeseries.recurrence_plot.RecurrencePlot.white_vertline_dist>`.
+
+        :rtype: 1D array (int32)
+        """
+        white_vertline = np.zeros(self.shape[1], dtype=NODE)
+        _packed_vertline_dist(white_vertline, self.bits, self.shape[1], False)
+        return white_vertline
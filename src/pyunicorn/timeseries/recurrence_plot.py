@@ -21,14 +21,22 @@ analysis (RQA) and recurrence network analysis.
 from math import factorial
 from typing import Tuple
 from collections.abc import Hashable
+from functools import partial
+from multiprocessing import get_context, cpu_count
 
 import numpy as np
 from numpy.typing import NDArray
+from scipy import sparse as sp
 
 from ..core.cache import Cached
+from ..utils import instrument
+from ..utils import executor        # parallelized computations
+from ..utils.executor import Shared
 from ..core._ext.types import to_cy, NODE, LAG, FIELD, DFIELD
 from ._ext.numerics import _embed_time_series, _manhattan_distance_matrix_rp, \
     _euclidean_distance_matrix_rp, _supremum_distance_matrix_rp, \
+    _manhattan_distance_matrix_crp, _euclidean_distance_matrix_crp, \
+    _supremum_distance_matrix_crp, \
     _set_adaptive_neighborhood_size, _bootstrap_distance_matrix_manhattan, \
     _bootstrap_distance_matrix_euclidean, \
     _bootstrap_distance_matrix_supremum, \
@@ -36,7 +44,14 @@ from ._ext.numerics import _embed_time_series, _manhattan_distance_matrix_rp, \
     _diagline_dist_sequential_missingvalues, _diagline_dist_sequential, \
     _vertline_dist_missingvalues, _vertline_dist, \
     _vertline_dist_sequential_missingvalues, _vertline_dist_sequential, \
-    _rejection_sampling, _white_vertline_dist, _twins_r, _twin_surrogates_r
+    _rejection_sampling, _white_vertline_dist, _windowed_rqa, _batch_rqa
+from .packed_recurrence_matrix import PackedRecurrenceMatrix
+from .surrogates import _neighbour_lists, _twin_lists, _twin_csr, \
+    _twin_paths
+
+
+#: Fields of the tables returned by windowed and batched RQA.
+RQA_FIELDS = ("RR", "DET", "L", "ENTR", "LAM", "TT")
 
 
 class RecurrencePlot(Cached):
@@ -79,10 +94,11 @@ class RecurrencePlot(Cached):
     #
 
     # pylint: disable=too-many-positional-arguments
+    @instrument.traced
     def __init__(self, time_series: NDArray, metric: str = "supremum",
                  normalize: bool = False, missing_values: bool = False,
                  sparse_rqa: bool = False, silence_level: int = 0,
-                 **kwargs):
+                 packed: bool = False, **kwargs):
         """
         Initialize an instance of RecurrencePlot.
 
@@ -112,6 +128,10 @@ class RecurrencePlot(Cached):
         :arg bool skip_recurrence: Skip calculation of recurrence matrix within
             RP class (e.g. when overloading respective methods in child class)
         :arg int silence_level: Inverse level of verbosity of the object.
+        :arg bool packed: Store the recurrence matrix as a
+            :class:`~.packed_recurrence_matrix.PackedRecurrenceMatrix`,
+            using one bit per entry. At a fixed threshold, the distance matrix
+            is not stored either.
         :arg number threshold: The recurrence threshold keyword for generating
             the recurrence plot using a fixed threshold.
         :arg number threshold_std: The recurrence threshold keyword for
@@ -141,6 +161,14 @@ class RecurrencePlot(Cached):
         self.sparse_rqa = sparse_rqa
         """Controls sequential calculation of RQA measures."""
 
+        #  Set packed storage flag
+        if packed and (sparse_rqa or missing_values):
+            raise NotImplementedError(
+                "Packed recurrence matrices are currently not available for "
+                "sequential RQA or missing values.")
+        self.packed = packed
+        """Controls bit-packed storage of the recurrence matrix."""
+
         #  Store time series
         self.time_series = to_cy(time_series, FIELD)
         """The time series from which the recurrence plot is constructed."""
@@ -261,7 +289,8 @@ class RecurrencePlot(Cached):
         """
         Return the current recurrence matrix :math:`R`.
 
-        :rtype: 2D square Numpy array
+        :rtype: 2D square Numpy array (or
+            :class:`~.packed_recurrence_matrix.PackedRecurrenceMatrix`)
         :return: the current recurrence matrix :math:`R`.
         """
         if not self.sparse_rqa:
@@ -558,6 +587,11 @@ class RecurrencePlot(Cached):
         if self.silence_level <= 1:
             print("Calculating recurrence plot at fixed threshold...")
 
+        if self.packed:
+            self.R = PackedRecurrenceMatrix.from_embedding(
+                self.embedding, threshold=threshold, metric=self.metric)
+            return
+
         distance = RecurrencePlot.distance_matrix(self, self.metric)
         n_time = distance.shape[0]
         recurrence = np.zeros((n_time, n_time), dtype="int8")
@@ -606,7 +640,8 @@ class RecurrencePlot(Cached):
                                                         recurrence_rate)
         recurrence = np.zeros((n_time, n_time), dtype="int8")
         recurrence[distance < threshold] = 1
-        self.R = recurrence
+        self.R = PackedRecurrenceMatrix.from_dense(recurrence) \
+            if self.packed else recurrence
 
     def set_fixed_local_recurrence_rate(self, local_recurrence_rate):
         """
@@ -635,7 +670,8 @@ class RecurrencePlot(Cached):
                 distance[i, :], local_recurrence_rate)
             #  Thresholding the distance matrix for column i
             recurrence[i, distance[i, :] < local_threshold] = 1
-        self.R = recurrence
+        self.R = PackedRecurrenceMatrix.from_dense(recurrence) \
+            if self.packed else recurrence
 
     def set_adaptive_neighborhood_size(self, adaptive_neighborhood_size,
                                        order=None):
@@ -679,7 +715,8 @@ class RecurrencePlot(Cached):
 
         _set_adaptive_neighborhood_size(n_time, adaptive_neighborhood_size,
                                         sorted_neighbors, order, recurrence)
-        self.R = recurrence
+        self.R = PackedRecurrenceMatrix.from_dense(recurrence) \
+            if self.packed else recurrence
 
     @staticmethod
     def threshold_from_recurrence_rate(distance, recurrence_rate: float):
@@ -747,6 +784,70 @@ class RecurrencePlot(Cached):
         threshold = samples[int(recurrence_rate * n_samples)]
         return threshold
 
+    @staticmethod
+    def threshold_from_recurrence_rate_sampled(embedding, recurrence_rate,
+                                               metric="supremum",
+                                               n_samples=1000000,
+                                               y_embedding=None):
+        """
+        Return the threshold for recurrence plot construction given the
+        recurrence rate, estimated from the distances of ``n_samples``
+        randomly drawn pairs of state vectors (see
+        :meth:`bootstrap_distance_matrix`).
+
+        Unlike :meth:`threshold_from_recurrence_rate_fast`, the distance
+        matrix is not required. If it has at most ``n_samples`` entries, it
+        is computed and the exact threshold according to
+        :meth:`threshold_from_recurrence_rate` is returned instead.
+
+        :type embedding: 2D array (time, embedding dimension)
+        :arg embedding: The phase space trajectory.
+        :arg number recurrence_rate: The desired recurrence rate.
+        :arg str metric: The metric for measuring distances in phase space
+            ("manhattan", "euclidean", "supremum").
+        :arg int n_samples: The number of sampled distances.
+        :type y_embedding: 2D array (time, embedding dimension)
+        :arg y_embedding: A second phase space trajectory, for the threshold
+            of the cross recurrence plot of ``embedding`` and ``y_embedding``.
+        :return number: the recurrence threshold corresponding to the desired
+            recurrence rate.
+        """
+        assert 0 <= recurrence_rate <= 1
+        embedding = to_cy(embedding, DFIELD)
+        (n_time, dim) = embedding.shape
+        if y_embedding is None:
+            if n_time ** 2 <= n_samples:
+                distance = {"manhattan": _manhattan_distance_matrix_rp,
+                            "euclidean": _euclidean_distance_matrix_rp,
+                            "supremum": _supremum_distance_matrix_rp}[metric](
+                                n_time, dim, embedding)
+                return RecurrencePlot.threshold_from_recurrence_rate(
+                    distance, recurrence_rate)
+            samples = RecurrencePlot.bootstrap_distance_matrix(
+                embedding, metric, n_samples)
+        else:
+            y_embedding = to_cy(y_embedding, DFIELD)
+            n_time_y = y_embedding.shape[0]
+            if n_time * n_time_y <= n_samples:
+                distance = {"manhattan": _manhattan_distance_matrix_crp,
+                            "euclidean": _euclidean_distance_matrix_crp,
+                            "supremum": _supremum_distance_matrix_crp}[metric](
+                                n_time, n_time_y, dim, embedding, y_embedding)
+                return RecurrencePlot.threshold_from_recurrence_rate(
+                    distance, recurrence_rate)
+            diff = np.abs(
+                embedding[np.random.randint(n_time, size=n_samples)]
+                - y_embedding[np.random.randint(n_time_y, size=n_samples)])
+            if metric == "manhattan":
+                samples = diff.sum(axis=1)
+            elif metric == "euclidean":
+                samples = np.sqrt((diff ** 2).sum(axis=1))
+            else:
+                samples = diff.max(axis=1)
+
+        k = int(recurrence_rate * (n_samples - 1))
+        return np.partition(samples, k)[k]
+
     @staticmethod
     def bootstrap_distance_matrix(embedding, metric, M):
         """
@@ -803,6 +904,182 @@ class RecurrencePlot(Cached):
 
         return {"RR": RR, "DET": DET, "L": L, "LAM": LAM}
 
+    def windowed_rqa_summary(self, window, step=1, l_min=2, v_min=2,
+                             parallelize=False):
+        """
+        Return a selection of RQA measures for sliding windows over the
+        recurrence plot.
+
+        For each window start :math:`s`, the measures are those of the square
+        sub-plot of :math:`R` with rows and columns :math:`s, ..., s+window-1`,
+        i.e., the result of :meth:`rqa_summary` (plus :math:`ENTR` and :math:`TT`) for a
+        recurrence plot of the windowed embedding at the same threshold.
+
+        Instead of recomputing each window from scratch, the line length
+        histograms and the recurrence count are updated incrementally, by
+        visiting only the leaving and entering rows and columns and the lines
+        touching them. In sequential RQA mode, recurrences are computed on the
+        fly from the embedding, so that no recurrence matrix is stored.
+
+        **Example:**
+
+        >>> x = np.sin(np.linspace(0, 20 * np.pi, 500))
+        >>> rp = RecurrencePlot(x, threshold=0.1, silence_level=2)
+        >>> table = rp.windowed_rqa_summary(window=100, step=50)
+        >>> table.shape, table.dtype.names
+        ((9,), ('start', 'RR', 'DET', 'L', 'ENTR', 'LAM', 'TT'))
+
+        :arg int window: The window size (number of state vectors).
+        :arg int step: The offset between consecutive windows.
+        :arg int l_min: The minimum diagonal line length.
+        :arg int v_min: The minimum vertical line length.
+        :arg bool parallelize: Toggle multiprocessing over blocks of windows.
+        :rtype: 1D structured array (window)
+        :return: the window start indices ``start`` and the RQA measures
+            ``RR``, ``DET``, ``L``, ``ENTR``, ``LAM``, ``TT``.
+        """
+        window, step = int(window), int(step)
+        assert 0 < window <= self.N and step > 0
+        if self.missing_values:
+            raise NotImplementedError(
+                "Windowed RQA is currently not available for missing values.")
+
+        if not self.sparse_rqa:
+            R = to_cy(np.asarray(self.recurrence_matrix()), LAG)
+            E = np.array([[]], dtype=DFIELD)
+            eps, dim = 0., 0
+        elif self.metric == "supremum" and self.threshold is not None:
+            R = np.array([[]], dtype=LAG)
+            E = self.embedding
+            eps, dim = float(self.threshold), E.shape[1]
+        else:
+            raise NotImplementedError(
+                "Sequential RQA is currently only available for "
+                "fixed threshold and the supremum metric.")
+
+        starts = np.arange(0, self.N - window + 1, step, dtype=NODE)
+        worker = partial(_windowed_rqa, window, R=R, E=E, eps=eps, dim=dim,
+                         l_min=l_min, v_min=v_min, epsilon=self._epsilon)
+        if parallelize and len(starts) > 1:
+            # each block of windows is initialized once and then slid
+            n_workers = min(cpu_count(), len(starts))
+            blocks = np.array_split(starts, n_workers)
+            with get_context("spawn").Pool() as pool:
+                measures = np.concatenate(pool.map(worker, blocks))
+                pool.close()
+                pool.join()
+        else:
+            measures = worker(starts)
+
+        table = np.empty(len(starts), dtype=[("start", NODE)] + [
+            (m, DFIELD) for m in RQA_FIELDS])
+        table["start"] = starts
+        for k, m in enumerate(RQA_FIELDS):
+            table[m] = measures[:, k]
+        return table
+
+    @staticmethod
+    def batch_rqa_summary(time_series, metric="supremum", l_min=2, v_min=2,
+                          parallelize=False, **kwargs):
+        """
+        Return a selection of RQA measures for each time series in a batch,
+        without constructing :class:`RecurrencePlot` objects.
+
+        The recurrence matrix and line length distributions of each series
+        are computed in a single compiled loop, reusing one buffer for all
+        series. The measures are identical to those obtained from
+        :meth:`rqa_summary` (plus :math:`ENTR` and :math:`TT`) for a
+        :class:`RecurrencePlot` of each series with the same keyword
+        arguments.
+
+        Either a recurrence threshold ``threshold``/``threshold_std`` or a
+        recurrence rate ``recurrence_rate`` has to be given as keyword
+        argument. Thresholds may also be given per series. If embedding
+        dimension ``dim`` and delay ``tau`` are **both** given, each (scalar)
+        series is embedded.
+
+        **Example:**
+
+        >>> x = np.random.default_rng(0).standard_normal((1000, 40))
+        >>> RecurrencePlot.batch_rqa_summary(x, recurrence_rate=0.1).shape
+        (1000,)
+
+        :type time_series: 3D array (series, time, dimension), 2D array
+            (series, time) or list of 1D/2D arrays (time[, dimension])
+        :arg time_series: The time series to be analyzed, possibly of
+            different lengths.
+        :arg str metric: The metric for measuring distances in phase space
+            ("manhattan", "euclidean", "supremum").
+        :arg int l_min: The minimum diagonal line length.
+        :arg int v_min: The minimum vertical line length.
+        :arg bool parallelize: Toggle multiprocessing over blocks of series.
+        :arg number threshold: The recurrence threshold.
+        :arg number threshold_std: The recurrence threshold in units of the
+            STD of each series.
+        :arg number recurrence_rate: The recurrence rate.
+        :arg number dim: The embedding dimension.
+        :arg number tau: The embedding delay.
+        :rtype: 1D structured array (series)
+        :return: the series lengths ``N`` (after embedding) and the RQA
+            measures ``RR``, ``DET``, ``L``, ``ENTR``, ``LAM``, ``TT``.
+        """
+        metrics = ("manhattan", "euclidean", "supremum")
+        assert metric in metrics, f"unknown metric: {metric}"
+        dim, tau = kwargs.get("dim"), kwargs.get("tau")
+
+        series = [to_cy(x, FIELD) for x in time_series]
+        series = [x.reshape((x.shape[0], -1)) for x in series]
+        n_series = len(series)
+
+        #  Thresholds per series, as in the constructor of RecurrencePlot
+        rate = False
+        if kwargs.get("threshold") is not None:
+            thresholds = kwargs["threshold"]
+        elif kwargs.get("threshold_std") is not None:
+            thresholds = kwargs["threshold_std"] * np.array(
+                [x.std() for x in series])
+        elif kwargs.get("recurrence_rate") is not None:
+            thresholds, rate = kwargs["recurrence_rate"], True
+        else:
+            raise NameError("Please give either threshold or "
+                            "recurrence_rate to construct the recurrence "
+                            "plots!")
+        thresholds = np.broadcast_to(
+            np.asarray(thresholds, dtype=DFIELD), (n_series,))
+
+        if (dim is not None) and (tau is not None):
+            series = [RecurrencePlot.embed_time_series(x, dim, tau)
+                      for x in series]
+        lengths = np.array([x.shape[0] for x in series], dtype=NODE)
+        assert (lengths > 0).all(), "empty time series"
+        assert len({x.shape[1] for x in series}) == 1, \
+            "time series of different dimensions"
+        embedding = to_cy(np.concatenate(series), DFIELD)
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(NODE)
+
+        worker = partial(_batch_rqa, rate=rate, metric=metrics.index(metric),
+                         l_min=l_min, v_min=v_min, epsilon=1e-08)
+        if parallelize and n_series > 1:
+            #  Ship each block of series with its own slice of the data
+            n_workers = min(cpu_count(), n_series)
+            blocks = np.array_split(np.arange(n_series), n_workers)
+            args = [(embedding[offsets[b[0]]:offsets[b[-1] + 1]],
+                     offsets[b[0]:b[-1] + 2] - offsets[b[0]], thresholds[b])
+                    for b in blocks]
+            with get_context("spawn").Pool() as pool:
+                measures = np.concatenate(pool.starmap(worker, args))
+                pool.close()
+                pool.join()
+        else:
+            measures = worker(embedding, offsets, to_cy(thresholds, DFIELD))
+
+        table = np.empty(n_series, dtype=[("N", NODE)] + [
+            (m, DFIELD) for m in RQA_FIELDS])
+        table["N"] = lengths
+        for k, m in enumerate(RQA_FIELDS):
+            table[m] = measures[:, k]
+        return table
+
     def recurrence_rate(self):
         """
         Return the :index:`recurrence rate` :math:`RR`.
@@ -874,7 +1151,9 @@ class RecurrencePlot(Cached):
             #  Get recurrence matrix
             recmat = self.recurrence_matrix()
 
-            if self.missing_values:
+            if isinstance(recmat, PackedRecurrenceMatrix):
+                diagline = recmat.diagline_dist()
+            elif self.missing_values:
                 mv_indices = self.missing_value_indices
                 _diagline_dist_missingvalues(
                     n_time, diagline, recmat, mv_indices)
@@ -1092,7 +1371,9 @@ class RecurrencePlot(Cached):
             #  Get recurrence matrix
             recmat = self.recurrence_matrix()
 
-            if self.missing_values:
+            if isinstance(recmat, PackedRecurrenceMatrix):
+                vertline = recmat.vertline_dist()
+            elif self.missing_values:
                 mv_indices = self.missing_value_indices
                 _vertline_dist_missingvalues(
                     n_time, vertline, recmat, mv_indices)
@@ -1284,6 +1565,8 @@ class RecurrencePlot(Cached):
             :math:`P(w-1)`.
         """
         R = self.recurrence_matrix()
+        if isinstance(R, PackedRecurrenceMatrix):
+            return R.white_vertline_dist()
         n_time = self.N
         white_vertline = np.zeros(n_time, dtype=NODE)
         _white_vertline_dist(n_time, white_vertline, R)
@@ -1364,6 +1647,8 @@ class RecurrencePlot(Cached):
     #  Methods for recurrence-based surrogates
     #
 
+    @Cached.method(attrs=(
+        "metric", "threshold", "missing_values", "sparse_rqa"))
     def twins(self, min_dist=7):
         """
         Return list of the :index:`twins <pair: twins; recurrence plot>` of
@@ -1373,6 +1658,10 @@ class RecurrencePlot(Cached):
         recurrences, i.e., if the corresponding rows or columns in the
         recurrence plot are identical.
 
+        The rows of the recurrence matrix are compared by hashing them. In
+        sequential RQA mode, they are obtained from a KD-tree neighbour
+        search instead of the recurrence matrix.
+
         References: [Thiel2006]_, [Marwan2007]_.
 
         :arg number min_dist: The minimum temporal distance for twins.
@@ -1382,19 +1671,21 @@ class RecurrencePlot(Cached):
         if self.silence_level <= 1:
             print("Finding twins based on recurrence matrix...")
 
-        #  Initialize
-        twins = []
-        N = self.N
+        if self.sparse_rqa:
+            #  Recurrences are defined by distances below the threshold
+            p = {"manhattan": 1, "euclidean": 2,
+                 "supremum": np.inf}[self.metric]
+            return _twin_lists(*_neighbour_lists(
+                to_cy(self.embedding, DFIELD),
+                np.nextafter(self.threshold, 0), p), min_dist)
 
-        #  Get current recurrence matrix
         R = self.recurrence_matrix()
-        #  Get number of neighbors for each state vector
-        nR = R.sum(axis=0)
+        R = R.to_sparse() if isinstance(R, PackedRecurrenceMatrix) \
+            else sp.csr_matrix(np.asarray(R))
+        R.sort_indices()
+        return _twin_lists(R.indptr, R.indices, min_dist)
 
-        _twins_r(min_dist, N, R, nR, twins)
-        return twins
-
-    def twin_surrogates(self, n_surrogates=1, min_dist=7):
+    def twin_surrogates(self, n_surrogates=1, min_dist=7, seed=None):
         """
         Generate surrogates based on the current (embedded) time series
         :attr:`embedding` using the :index:`twin surrogate` method.
@@ -1408,24 +1699,37 @@ class RecurrencePlot(Cached):
         time series, since they correspond to realizations of trajectories of
         the same dynamical systems with different initial conditions.
 
+        The twins are cached, and the surrogate trajectories are generated in
+        parallel batches by the default executor of
+        :mod:`pyunicorn.utils.executor`.
+
         References: [Thiel2006]_ [*], [Marwan2007]_.
 
         :arg number min_dist: The minimum temporal distance for twins.
         :arg int n_surrogates: The number of twin surrogate trajectories to be
             returned.
+        :arg seed: The seed of the random number streams of the batches, see
+            `numpy.random.SeedSequence`.
         :rtype: 3D array (surrogate number, time, dimension)
         :return: the twin surrogate trajectories.
         """
         #  The algorithm proceeds in two steps:
         #  1. Use the algorithm proposed in [*] to find twins
         #  2. Reconstruct one-dimensional twin surrogate time series
+        if n_surrogates < 0:
+            raise ValueError("The number of surrogates must not be negative.")
+        if n_surrogates == 0:
+            return self.embedding[np.zeros((0, len(self.embedding)), int)]
         if self.silence_level <= 1:
             print("Generating twin surrogates...")
 
-        #  Collect
-        N = self.N
-        embedding = self.embedding
-        dim = embedding.shape[1]
-        twins = self.twins(min_dist)
-
-        return _twin_surrogates_r(n_surrogates, N, dim, twins, embedding)
+        offsets, twins = _twin_csr([self.twins(min_dist)])
+        offsets, twins = Shared(offsets), Shared(twins)
+        ex = executor.get_default()
+        size = -(-n_surrogates // ex.n_workers)
+        sizes = [min(size, n_surrogates - start)
+                 for start in range(0, n_surrogates, size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        paths = ex.map(_twin_paths, [(offsets, twins, seeds[b], sizes[b])
+                                     for b in range(len(sizes))])
+        return self.embedding[np.concatenate(paths)]
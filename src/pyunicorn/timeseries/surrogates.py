@@ -23,17 +23,234 @@ from collections.abc import Hashable
 # array object and fast numerics
 import numpy as np
 from numpy import random
+from scipy import fft as sp_fft
+from scipy import stats
+from scipy.spatial import cKDTree
 
 # easy progress bar handling
 from tqdm import trange
 
 from ..core.cache import Cached
+from ..utils import instrument
+from ..utils import executor        # parallelized computations
+from ..utils.executor import Shared
 
-from ..core._ext.types import to_cy, ADJ, DEGREE, DFIELD
+from ..core._ext.types import to_cy, ADJ, DFIELD
 from ._ext.numerics import _embed_time_series_array, _recurrence_plot, \
-    _twins_s, _twin_surrogates_s, _test_pearson_correlation, \
+    _twin_surrogates_s, _test_pearson_correlation, \
     _test_mutual_information
 
+#
+#  Batched surrogate generation
+#
+
+
+def _remap(sorted_values, reference):
+    """
+    Return the values of `sorted_values` [..., index, time] arranged in the
+    rank order of the time series in `reference` [..., index, time], which
+    are broadcast against each other.
+    """
+    shape = np.broadcast_shapes(sorted_values.shape, reference.shape)
+    out = np.empty(shape, dtype=sorted_values.dtype)
+    np.put_along_axis(out, np.broadcast_to(reference.argsort(axis=-1), shape),
+                      np.broadcast_to(sorted_values, shape), axis=-1)
+    return out
+
+
+def _randomize_phases(spectrum, rng, n_time, size=None):
+    """
+    Return the inverse real FFTs of `spectrum` [..., index, frequency] with
+    independently randomized phases, optionally for `size` copies of it.
+    """
+    real = np.float32 if spectrum.dtype == np.complex64 else np.float64
+    shape = spectrum.shape if size is None else (size,) + spectrum.shape
+    phases = rng.uniform(0, 2 * np.pi, size=shape).astype(real)
+    rotation = np.empty(phases.shape, dtype=spectrum.dtype)
+    rotation.real, rotation.imag = np.cos(phases), np.sin(phases)
+    return sp_fft.irfft(spectrum * rotation, n=n_time, axis=-1)
+
+
+def _AAFT_batch(data, sorted_data, rng, size):
+    n_time = data.shape[-1]
+    #  Rescale data to sorted Gaussian reference series
+    gaussian = rng.standard_normal((size,) + data.shape, dtype=data.dtype)
+    gaussian.sort(axis=-1)
+    rescaled = _remap(gaussian, data)
+    #  Phase randomize, then rescale back to the original amplitudes
+    randomized = _randomize_phases(sp_fft.rfft(rescaled, axis=-1), rng,
+                                   n_time)
+    return _remap(sorted_data, randomized)
+
+
+def _neighbour_lists(embedding, radius, p=np.inf):
+    """
+    Return the neighbours of all states of `embedding` [time, dimension]
+    within distance `radius` (inclusive) in the Minkowski `p`-norm, including
+    the states themselves, in CSR format: the sorted neighbours of state `j`
+    are ``indices[indptr[j]:indptr[j+1]]``.
+
+    Uses a KD-tree, such that only the recurrences are stored rather than the
+    full recurrence matrix.
+    """
+    n_time = len(embedding)
+    pairs = cKDTree(embedding).query_pairs(radius, p=p,
+                                           output_type="ndarray")
+    diagonal = np.arange(n_time)
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1], diagonal])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0], diagonal])
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n_time + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(rows, minlength=n_time))
+    return indptr, cols[order]
+
+
+def _twin_lists(indptr, indices, min_dist):
+    """
+    Return the twins of each state from its recurrences in CSR format, see
+    `_neighbour_lists`.
+
+    States with identical neighbourhoods are found by hashing the rows of the
+    recurrence matrix, in expected linear time in the number of recurrences,
+    instead of comparing all pairs of rows. Twins are further than
+    `min_dist` apart in time, and states without neighbours other than
+    themselves have no twins.
+    """
+    n_time = len(indptr) - 1
+    groups = {}
+    for j in np.flatnonzero(np.diff(indptr) > 1):
+        groups.setdefault(indices[indptr[j]:indptr[j + 1]].tobytes(),
+                          []).append(j)
+    twins = [[] for _ in range(n_time)]
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        members = np.array(members)
+        far = np.abs(members[:, None] - members[None, :]) > min_dist
+        for j, far_j in zip(members, far):
+            twins[j] = members[far_j].tolist()
+    return twins
+
+
+def _trajectory_twins(embedding, radius, min_dist):
+    """
+    Return the twins of the states of the trajectory `embedding`
+    [time, dimension] at the supremum norm recurrence threshold `radius`.
+    """
+    return _twin_lists(*_neighbour_lists(embedding, radius), min_dist)
+
+
+def _twin_csr(twins):
+    """
+    Return the twin lists `twins` [index][time] in the CSR format of
+    `_twin_batch`.
+    """
+    counts = np.array([[len(t) for t in twins_i] for twins_i in twins])
+    offsets = np.zeros((counts.shape[0], counts.shape[1] + 1), dtype=int)
+    offsets[:, 1:] = np.cumsum(counts, axis=1)
+    offsets[1:] += offsets[:-1, -1:].cumsum(axis=0)
+    flat = [k for twins_i in twins for twins_ik in twins_i
+            for k in twins_ik]
+    return offsets, np.array(flat, dtype=int)
+
+
+def _twin_paths(offsets, twins, seed, size):
+    """
+    Return `size` random walks [surrogate, time] through the states of a
+    single trajectory along its twins, given in the format of `_twin_batch`.
+    """
+    n_time = offsets.shape[1] - 1
+    return _twin_batch(np.arange(n_time)[None, :], offsets, twins,
+                       np.random.default_rng(seed), size)[:, 0]
+
+
+def _twin_batch(data, offsets, twins, rng, size):
+    """
+    Vectorized version of `_twin_surrogates_s` for `size` surrogates, with
+    the twins of all time series in CSR format: the twins of state `k` of
+    series `i` are ``twins[offsets[i, k]:offsets[i, k+1]]``.
+    """
+    N, n_time = offsets.shape[0], offsets.shape[1] - 1
+    surrogates = np.empty((size, N, n_time), dtype=data.dtype)
+    series = np.arange(N)
+    k = rng.integers(n_time, size=(size, N))
+    for j in range(n_time):
+        surrogates[:, :, j] = data[series, k]
+        start = offsets[series, k]
+        n_twins = offsets[series, k + 1] - start
+        #  Jump to the future of a random twin, or of k itself
+        choice = (rng.random((size, N)) * (n_twins + 1)).astype(int)
+        jump = choice < n_twins
+        k = k + 1
+        k[jump] = twins[start[jump] + choice[jump]] + 1
+        #  Restart at a random state when leaving the trajectory
+        out = k >= n_time
+        k[out] = rng.integers(n_time, size=out.sum())
+    return surrogates
+
+
+# pylint: disable=too-many-positional-arguments
+def _surrogate_batch(method, data, seed, size, params, offsets=None,
+                     twins=None):
+    """
+    Return `size` surrogates [surrogate, index, time] of `data` generated by
+    the `Surrogates` method named `method`, drawing from a
+    `numpy.random.Generator` seeded with `seed`. Twin surrogates require the
+    twins in the format of `_twin_batch`.
+    """
+    rng = np.random.default_rng(seed)
+    if method == "white_noise_surrogates":
+        return rng.permuted(np.broadcast_to(data, (size,) + data.shape),
+                            axis=-1)
+    if method == "correlated_noise_surrogates":
+        return _randomize_phases(sp_fft.rfft(data, axis=-1), rng,
+                                 data.shape[-1], size)
+    sorted_data = np.sort(data, axis=-1)
+    if method == "AAFT_surrogates":
+        return _AAFT_batch(data, sorted_data, rng, size)
+    if method == "refined_AAFT_surrogates":
+        amplitudes = np.abs(sp_fft.rfft(data, axis=-1))
+        R = _AAFT_batch(data, sorted_data, rng, size)
+        s = R
+        for _ in range(params["n_iterations"]):
+            r_fft = sp_fft.rfft(R, axis=-1)
+            s = sp_fft.irfft(amplitudes * r_fft / np.abs(r_fft),
+                             n=data.shape[-1], axis=-1)
+            R = _remap(sorted_data, s)
+        return s if params.get("output") == "true_spectrum" else R
+    if method == "twin_surrogates":
+        return _twin_batch(data, offsets, twins, rng, size)
+    raise ValueError(f"no batched version of {method}")
+
+
+# pylint: disable=too-many-positional-arguments
+def _significance_batch(method, data, seed, size, params, offsets, twins,
+                        test_function, observed, n_bins, interval):
+    """
+    Generate a batch of surrogates as `_surrogate_batch` and return the
+    summary statistics of the absolute test matrices ``test_function(data,
+    surrogates)``: the number of surrogates for which each entry reaches the
+    absolute value in `observed` (if given), their histogram with `n_bins`
+    bins over `interval` (if given), and their minimum and maximum.
+    """
+    surrogates = _surrogate_batch(method, data, seed, size, params, offsets,
+                                  twins)
+    original = np.asarray(data, dtype=DFIELD)
+    exceedances = None if observed is None else \
+        np.zeros(observed.shape, dtype=np.int32)
+    hist = None if n_bins is None else np.zeros(n_bins, dtype=np.int64)
+    low, high = np.inf, -np.inf
+    for surrogate in surrogates:
+        test = np.abs(test_function(original,
+                                    np.asarray(surrogate, dtype=DFIELD)))
+        if exceedances is not None:
+            exceedances += test >= observed
+        if hist is not None:
+            hist += np.histogram(test, n_bins, interval)[0]
+        low, high = min(low, test.min()), max(high, test.max())
+    return exceedances, hist, low, high
+
+
 #
 #  Define class Surrogates
 #
@@ -258,20 +475,15 @@ class Surrogates(Cached):
         if self.silence_level <= 1:
             print("Finding twins...")
 
-        N = self.embedding.shape[0]
-        n_time = self.embedding.shape[1]
-        dimension = self.embedding.shape[2]
-        twins = []
-
-        #  Initialize the R matrix with ones
-        R = np.empty((n_time, n_time), dtype=ADJ)
-        #  Initialize array to store the number of neighbors for each sample
-        nR = np.empty(n_time, dtype=DEGREE)
-
-        _twins_s(N, n_time, dimension, threshold, min_dist,
-                 to_cy(self.embedding, DFIELD), R, nR, twins)
-
-        return twins
+        #  The recurrences of the states are found with a KD-tree, and the
+        #  twins by hashing the rows of the recurrence matrices, one time
+        #  series per task. The threshold is rounded to single precision,
+        #  as in recurrence_plot().
+        radius = float(np.float32(threshold))
+        embedding = to_cy(self.embedding, DFIELD)
+        return executor.get_default().map(
+            _trajectory_twins, [(e, radius, min_dist) for e in embedding],
+            costs=[len(e) for e in embedding])
 
     #
     #  Define methods to generate sets of surrogate time series
@@ -394,11 +606,7 @@ class Surrogates(Cached):
         gaussian.sort(axis=1)
 
         #  Rescale data to Gaussian distribution
-        ranks = self.original_data.argsort(axis=1).argsort(axis=1)
-        rescaled_data = np.zeros((self.N, self.n_time))
-
-        for i in range(self.N):
-            rescaled_data[i, :] = gaussian[i, ranks[i, :]]
+        rescaled_data = _remap(gaussian, self.original_data)
 
         #  Phase randomize rescaled data
         phase_randomized_data = Surrogates(
@@ -409,13 +617,9 @@ class Surrogates(Cached):
         sorted_original = self.original_data.copy()
         sorted_original.sort(axis=1)
 
-        ranks = phase_randomized_data.argsort(axis=1).argsort(axis=1)
-
-        for i in range(self.N):
-            rescaled_data[i, :] = sorted_original[i, ranks[i, :]]
-
-        return rescaled_data
+        return _remap(sorted_original, phase_randomized_data)
 
+    @instrument.traced
     def refined_AAFT_surrogates(self, n_iterations, output="true_amplitudes"):
         """
         Return surrogates using the iteratively refined amplitude adjusted
@@ -461,10 +665,7 @@ class Surrogates(Cached):
                              n=self.n_time, axis=1)
 
             #  Rescale to desired amplitude distribution
-            ranks = s.argsort(axis=1).argsort(axis=1)
-
-            for j in range(self.N):
-                R[j, :] = sorted_original[j, ranks[j, :]]
+            R = _remap(sorted_original, s)
 
         if output == "true_amplitudes":
             return R
@@ -513,6 +714,120 @@ class Surrogates(Cached):
         return _twin_surrogates_s(self.N, n_time, twins,
                                   to_cy(self.original_data, DFIELD))
 
+    # pylint: disable=too-many-positional-arguments
+    def surrogate_batches(self, method, n_surrogates, batch_size=64,
+                          seed=None, dtype=np.float64, **kwargs):
+        """
+        Generate many surrogates of all time series at once, in batches.
+
+        The batches are computed in parallel by the default executor of
+        :mod:`pyunicorn.utils.executor`, using vectorized rank remapping and
+        batched real FFTs. Each batch draws from its own
+        `numpy.random.Generator`, spawned from `seed`, so that the surrogates
+        do not depend on the number of workers.
+
+        **Example:**
+
+        >>> ts = Surrogates.SmallTestData()
+        >>> batches = ts.surrogate_batches(
+        ...     "refined_AAFT_surrogates", 10, batch_size=4, seed=0,
+        ...     n_iterations=3)
+        >>> [b.shape for b in batches]
+        [(4, 6, 200), (4, 6, 200), (2, 6, 200)]
+
+        :arg method: The name of one of the methods
+            :meth:`white_noise_surrogates`, :meth:`correlated_noise_surrogates`,
+            :meth:`AAFT_surrogates`, :meth:`refined_AAFT_surrogates` or
+            :meth:`twin_surrogates`, or the method itself.
+        :arg int n_surrogates: The number of surrogates of each time series.
+        :arg int batch_size: The number of surrogates per batch.
+        :arg seed: The seed of all random number streams, see
+            `numpy.random.SeedSequence`.
+        :arg dtype: The floating point type of the computations and results,
+            `numpy.float64` or `numpy.float32`.
+        :arg kwargs: The arguments of `method`, e.g., ``n_iterations`` and
+            ``output`` ("true_amplitudes" or "true_spectrum") for
+            :meth:`refined_AAFT_surrogates`.
+        :rtype: generator of 3D arrays [surrogate, index, time]
+        :return: the batches of surrogates.
+        """
+        method, data, params, offsets, twins = self._batch_arguments(
+            method, dtype, kwargs)
+        sizes, seeds = self._batch_sizes(n_surrogates, batch_size, seed)
+        ex = executor.get_default()
+        #  Submit as many batches at a time as there are workers, so that
+        #  only these are held in memory
+        for start in range(0, len(sizes), ex.n_workers):
+            tasks = [(method, data, seeds[b], sizes[b], params, offsets,
+                      twins) for b in range(start, min(start + ex.n_workers,
+                                                       len(sizes)))]
+            yield from ex.map(_surrogate_batch, tasks)
+
+    def _batch_arguments(self, method, dtype, kwargs):
+        """
+        Return the arguments of `_surrogate_batch` for the surrogate `method`
+        with the arguments `kwargs`, see :meth:`surrogate_batches`.
+        """
+        method = getattr(method, "__name__", method)
+        data = self.original_data
+        params, offsets, twins = dict(kwargs), None, None
+        if method == "twin_surrogates":
+            dimension, delay = params.pop("dimension"), params.pop("delay")
+            self.embedding = self.embed_time_series_array(
+                data, dimension, delay)
+            twins = self.twins(params.pop("threshold"),
+                               params.pop("min_dist", 7))
+            offsets, twins = _twin_csr(twins)
+            data = data[:, :offsets.shape[1] - 1]
+            offsets, twins = Shared(offsets), Shared(twins)
+        return (method, Shared(np.asarray(data, dtype=dtype)), params,
+                offsets, twins)
+
+    @staticmethod
+    def _batch_sizes(n_surrogates, batch_size, seed):
+        """
+        Return the sizes of the batches of `n_surrogates` surrogates and the
+        seeds of their random number streams.
+        """
+        sizes = [min(batch_size, n_surrogates - start)
+                 for start in range(0, n_surrogates, batch_size)]
+        return sizes, np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # pylint: disable=too-many-positional-arguments
+    def surrogate_ensemble(self, method, n_surrogates, path=None,
+                           batch_size=64, seed=None, dtype=np.float64,
+                           **kwargs):
+        """
+        Return many surrogates of all time series, see
+        :meth:`surrogate_batches`.
+
+        **Example:**
+
+        >>> ts = Surrogates.SmallTestData()
+        >>> ts.surrogate_ensemble("AAFT_surrogates", 100, seed=0).shape
+        (100, 6, 200)
+
+        :arg path: Optionally the path of a ``.npy`` file, which is created
+            and returned as a memory-mapped array, such that the ensemble
+            needs not fit into memory.
+        :rtype: 3D array [surrogate, index, time]
+        :return: the surrogates.
+        """
+        out, start = None, 0
+        for batch in self.surrogate_batches(
+                method, n_surrogates, batch_size=batch_size, seed=seed,
+                dtype=dtype, **kwargs):
+            if out is None:
+                shape = (n_surrogates,) + batch.shape[1:]
+                out = np.empty(shape, dtype=dtype) if path is None else \
+                    np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                              shape=shape)
+            out[start:start + len(batch)] = batch
+            start += len(batch)
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
     #
     #  Defines methods to generate correlation measure matrices based on
     #  original_data and surrogate data for significance testing.
@@ -641,7 +956,8 @@ class Surrogates(Cached):
     # pylint: disable=too-many-positional-arguments
     def test_threshold_significance(self, surrogate_function, test_function,
                                     realizations=1, n_bins=100,
-                                    interval=(-1, 1)):
+                                    interval=(-1, 1), batch_size=None,
+                                    seed=None):
         """
         Return a test distribution for a similarity measure.
 
@@ -655,6 +971,10 @@ class Surrogates(Cached):
         statistical significance of a selected threshold value for climate
         network generation.
 
+        If `batch_size` is given, the surrogates are generated in parallel
+        batches by :meth:`surrogate_batches`, and only the histogram counts of
+        each batch are kept, see :meth:`significance_test`.
+
         :type surrogate_function: Python function
         :arg surrogate_function: The function implementing the surrogates.
         :type test_function: Python function
@@ -666,6 +986,10 @@ class Surrogates(Cached):
         :type interval: (float, float)
         :arg interval: The range over which to estimate similarity measure
             distribution.
+        :arg int batch_size: The number of surrogates per batch, or None to
+            create the surrogates one by one with the global random number
+            generator.
+        :arg seed: The seed of the random number streams of the batches.
         :rtype: tuple of 1D arrays ([bins],[bins])
         :return: similarity measure test histogram and lower bin boundaries.
         """
@@ -680,6 +1004,22 @@ class Surrogates(Cached):
         if not self._normalized:
             self.normalize_original_data()
 
+        lbb = np.histogram_bin_edges([], n_bins, interval)[:-1]
+
+        if batch_size is not None:
+            density_estimate = np.zeros(n_bins)
+            low, high = np.inf, -np.inf
+            for _, _, hist, low_b, high_b in self._stream_test_statistics(
+                    surrogate_function, test_function, realizations,
+                    batch_size, seed, None, n_bins, interval, {}):
+                density_estimate += hist
+                low, high = min(low, low_b), max(high, high_b)
+            if low < interval[0]:
+                print("Warning! Correlation measure value left of range.")
+            if high > interval[1]:
+                print("Warning! Correlation measure value right of range.")
+            return (density_estimate / density_estimate.sum(), lbb)
+
         #  Initialize density estimate
         density_estimate = np.zeros(n_bins)
 
@@ -699,8 +1039,8 @@ class Surrogates(Cached):
                 print("Warning! Correlation measure value right of range.")
 
             #  Estimate density of current realization
-            (hist, lbb) = np.histogram(correlation_measure_test, n_bins,
-                                       interval, density=True)
+            (hist, _) = np.histogram(correlation_measure_test, n_bins,
+                                     interval, density=True)
 
             #  Add to density estimate over all realizations
             density_estimate += hist
@@ -712,6 +1052,113 @@ class Surrogates(Cached):
         #  Normalize density estimate
         density_estimate /= density_estimate.sum()
 
-        lbb = lbb[:-1]
-
         return (density_estimate, lbb)
+
+    # pylint: disable=too-many-positional-arguments
+    def significance_test(self, surrogate_function, test_function,
+                          max_surrogates=1000, alpha=0.05, confidence=0.99,
+                          batch_size=64, seed=None, dtype=np.float64,
+                          **kwargs):
+        """
+        Return the p-values of the entries of a similarity measure matrix
+        under the null hypothesis represented by surrogates.
+
+        The p-value of entry :math:`(i,j)` is estimated as
+        :math:`(1 + c_{ij}) / (1 + n)`, where :math:`c_{ij}` is the number of
+        the :math:`n` surrogates for which the absolute value of
+        ``test_function(original_data, surrogates)[i, j]`` reaches that of
+        ``test_function(original_data, original_data)[i, j]``. Entries that
+        the test function sets to zero, such as the diagonal of
+        :meth:`test_pearson_correlation`, have a p-value of one.
+
+        The surrogates are generated in parallel batches by
+        :meth:`surrogate_batches`, and each batch is reduced to the
+        exceedance counts on its worker, such that the memory requirement is
+        that of a few similarity matrices, regardless of the number of
+        surrogates. Surrogates are generated until the Clopper-Pearson
+        confidence intervals of all p-values exclude `alpha`, or
+        `max_surrogates` are reached.
+
+        **Example:**
+
+        >>> ts = Surrogates.SmallTestData()
+        >>> p, n = ts.significance_test(
+        ...     "correlated_noise_surrogates",
+        ...     Surrogates.test_pearson_correlation, seed=0)
+        >>> p.shape, n <= 1000
+        ((6, 6), True)
+
+        :arg surrogate_function: The surrogate method, see
+            :meth:`surrogate_batches`.
+        :type test_function: Python function
+        :arg test_function: The function implementing the similarity measure,
+            e.g., :meth:`test_pearson_correlation`,
+            :meth:`test_mutual_information` or any function of two arrays
+            [index, time] returning an array [index, index]. With
+            :class:`~pyunicorn.utils.executor.ProcessExecutor` and
+            :class:`~pyunicorn.utils.executor.MPIExecutor`, it must be
+            importable from a module.
+        :arg int max_surrogates: The maximum number of surrogates of each
+            time series.
+        :arg float alpha: The significance level deciding the test.
+        :arg float confidence: The confidence level of the intervals of the
+            p-values used for stopping early.
+        :arg int batch_size: The number of surrogates per batch.
+        :arg seed: The seed of the random number streams of the batches.
+        :arg dtype: The floating point type of the surrogates.
+        :arg kwargs: The arguments of the surrogate method.
+        :rtype: tuple (2D array [index, index], int)
+        :return: the p-values and the number of surrogates used.
+        """
+        if not self._normalized:
+            self.normalize_original_data()
+        self.original_data_fft.cache_clear()
+        self.twins.cache_clear()
+
+        original = self._batch_arguments(surrogate_function, DFIELD,
+                                         kwargs)[1].array
+        observed = np.abs(test_function(original, original))
+        exceedances = np.zeros(observed.shape, dtype=np.int64)
+        q = (1 - confidence) / 2
+        n = 0
+        for n_b, exceedances_b, _, _, _ in self._stream_test_statistics(
+                surrogate_function, test_function, max_surrogates,
+                batch_size, seed, observed, None, None, kwargs, dtype):
+            exceedances += exceedances_b
+            n += n_b
+            #  Clopper-Pearson interval of the exceedance probability
+            lower = stats.beta.ppf(q, exceedances, n - exceedances + 1)
+            upper = stats.beta.ppf(1 - q, exceedances + 1, n - exceedances)
+            lower[exceedances == 0] = 0.
+            upper[exceedances == n] = 1.
+            if np.all((upper < alpha) | (lower > alpha)):
+                break
+
+        instrument.message(self, f"Significance test decided after {n} "
+                           "surrogates.")
+        return (1. + exceedances) / (1. + n), n
+
+    # pylint: disable=too-many-positional-arguments
+    def _stream_test_statistics(self, surrogate_function, test_function,
+                                n_surrogates, batch_size, seed, observed,
+                                n_bins, interval, kwargs, dtype=np.float64):
+        """
+        Generate surrogates in batches, computed in parallel, and yield the
+        size and the statistics of `_significance_batch` of each batch in
+        order, such that stopping early does not depend on the number of
+        workers.
+        """
+        method, data, params, offsets, twins = self._batch_arguments(
+            surrogate_function, dtype, kwargs)
+        sizes, seeds = self._batch_sizes(n_surrogates, batch_size, seed)
+        ex = executor.get_default()
+        if observed is not None:
+            observed = Shared(observed)
+        for start in range(0, len(sizes), ex.n_workers):
+            batches = range(start, min(start + ex.n_workers, len(sizes)))
+            results = ex.map(_significance_batch, [
+                (method, data, seeds[b], sizes[b], params, offsets, twins,
+                 test_function, observed, n_bins, interval)
+                for b in batches])
+            for b, result in zip(batches, results):
+                yield (sizes[b],) + tuple(result)
@@ -18,4 +18,4 @@ utils
 
 """
 
-__all__ = ['mpi']
+__all__ = ['mpi', 'executor', 'instrument']
@@ -0,0 +1,390 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Module for the parallel execution of independent tasks on interchangeable
+backends.
+
+The computationally heavy measures split their work into tasks and hand them
+to the default executor, which is
+
+  - an `MPIExecutor` on the master when running under ``mpirun`` with slaves
+    (see :mod:`pyunicorn.utils.mpi`), and
+  - a `ThreadExecutor` using all cores otherwise.
+
+Another backend can be chosen for all subsequent computations::
+
+    >>> from pyunicorn.utils import executor
+    >>> executor.set_default(executor.ProcessExecutor(n_workers=4))
+
+Large arrays that are needed by all tasks are wrapped in `Shared`, such that
+they are transferred once per worker as a raw buffer (MPI) or a memory-mapped
+segment (processes) instead of being pickled with every task. Tasks are
+submitted in order of decreasing estimated cost, so that dynamic assignment
+to idle workers balances the load, and per-task timing statistics are kept in
+`Executor.stats`, with the same keys as `pyunicorn.utils.mpi.stats`.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent import futures
+from multiprocessing import get_context, cpu_count
+
+import numpy as np
+
+from . import mpi
+from . import instrument
+
+
+class Shared:
+    """
+    Wraps a read-only array that is passed to many tasks of the same
+    :meth:`Executor.map`, to be transferred only once per worker.
+    """
+
+    def __init__(self, array: np.ndarray):
+        self.array = np.ascontiguousarray(array)
+
+
+def _timed_call(func, args):
+    """
+    Call `func` on `args` and return the result, the worker identifier and
+    the wall time of the call.
+    """
+    t0 = time.time()
+    result = func(*args)
+    return result, (os.getpid(), threading.get_ident()), time.time() - t0
+
+
+class Executor:
+    """
+    Base class of the execution backends.
+
+    Subclasses implement :meth:`_run`, which executes the tasks in the given
+    order and yields their results in any order.
+    """
+
+    def __init__(self, n_workers: int = 1):
+        """
+        :arg int n_workers: The number of workers.
+        """
+        self.n_workers = max(1, int(n_workers))
+        self.stats = []
+        """
+        (list of dictionaries)
+        processing statistics of each task in the order of completion, with
+        the keys of :data:`pyunicorn.utils.mpi.stats` and the task's "cost".
+        """
+        self._start_time = time.time()
+        self._n_processed = {}
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(n_workers={self.n_workers})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Release the workers of this executor.
+        """
+
+    def partition(self, costs, parts_per_worker: int = 4):
+        """
+        Split a sequence of items into contiguous ranges of roughly equal
+        total cost, enough to keep all workers busy.
+
+        **Example:**
+
+        >>> SerialExecutor().partition([1, 1, 1, 1])
+        [(0, 4)]
+        >>> ThreadExecutor(n_workers=2).partition([4, 1, 1, 1, 1],
+        ...                                       parts_per_worker=1)
+        [(0, 1), (1, 5)]
+
+        :type costs: 1D array [item]
+        :arg costs: The estimated cost of each item.
+        :arg int parts_per_worker: The number of ranges per worker.
+        :rtype: list of tuples (int, int)
+        :return: the start and end indices of the ranges.
+        """
+        costs = np.asarray(costs, dtype=float)
+        n = len(costs)
+        parts = min(n, 1 if self.n_workers == 1
+                    else self.n_workers * parts_per_worker)
+        if parts <= 1:
+            return [(0, n)] if n else []
+        #  Cut where the cumulative cost is closest to multiples of the
+        #  average cost per range
+        cum = np.concatenate([[0.], np.cumsum(costs)])
+        targets = cum[-1] * np.arange(1, parts) / parts
+        bounds = np.searchsorted(cum, targets)
+        bounds -= (targets - cum[bounds - 1]) < (cum[bounds] - targets)
+        bounds = np.unique(np.concatenate([[0], bounds, [n]]))
+        return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def map(self, func, tasks, costs=None):
+        """
+        Return the results of calling ``func(*task)`` for each task.
+
+        Arguments of type `Shared` are replaced by their arrays.
+
+        :arg func: A module level function or static method.
+        :type tasks: list of tuples
+        :arg tasks: The positional arguments of each call.
+        :type costs: 1D array [task]
+        :arg costs: The estimated relative cost of each task, used for
+            scheduling. (Default: equal costs)
+        :rtype: list
+        :return: the results in the order of the tasks.
+        """
+        tasks = [tuple(task) for task in tasks]
+        costs = np.ones(len(tasks)) if costs is None else \
+            np.asarray(costs, dtype=float)
+        #  Longest tasks first
+        order = np.argsort(-costs, kind="stable")
+        results = [None] * len(tasks)
+        with instrument.span(f"{type(self).__name__}.map",
+                             function=func.__qualname__, size=len(tasks),
+                             n_workers=self.n_workers):
+            for k, result, worker, this_time in self._run(func, tasks, order,
+                                                          costs):
+                results[k] = result
+                self._record(k, worker, this_time, costs[k])
+        return results
+
+    def _run(self, func, tasks, order, costs):
+        raise NotImplementedError
+
+    def _record(self, k, worker, this_time, cost):
+        self._n_processed[worker] = self._n_processed.get(worker, 0) + 1
+        self.stats.append({"id": k, "rank": worker,
+                           "this_time": this_time,
+                           "time_over_est": this_time / cost if cost else
+                           np.nan,
+                           "n_processed": self._n_processed[worker],
+                           "total_time": time.time() - self._start_time,
+                           "cost": cost})
+
+    def info(self):
+        """
+        Print processing statistics.
+        """
+        call_times = np.array([s["this_time"] for s in self.stats])
+        quotients = np.array([s["time_over_est"] for s in self.stats])
+        per_worker = np.array(list(self._n_processed.values()))
+        print(f"\n{self}: processing statistics\n"
+              "     =====================\n"
+              f"     calls processed:           {len(call_times)}\n"
+              f"     total reported time:       {call_times.sum()}\n"
+              f"     mean time per call:        {call_times.mean()}\n"
+              f"     std.dev. of time per call: {call_times.std()}\n"
+              "     coeff. of var. of actual over estd. time per call: "
+              f"{quotients.std() / quotients.mean()}\n"
+              f"     workers used:              {len(per_worker)}\n"
+              f"     min calls per worker:      {per_worker.min()}\n"
+              f"     max calls per worker:      {per_worker.max()}\n")
+
+
+class SerialExecutor(Executor):
+    """
+    Executes all tasks sequentially in the calling thread.
+    """
+
+    def __init__(self):
+        Executor.__init__(self, n_workers=1)
+
+    def _run(self, func, tasks, order, costs):
+        for k in order:
+            args = [a.array if isinstance(a, Shared) else a
+                    for a in tasks[k]]
+            yield (k,) + _timed_call(func, args)
+
+
+class ThreadExecutor(Executor):
+    """
+    Executes tasks on a pool of threads, sharing all arrays by reference.
+
+    Speeds up compiled kernels that release the GIL.
+    """
+
+    def __init__(self, n_workers: int = None):
+        Executor.__init__(self, n_workers or cpu_count())
+        self._pool = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run(self, func, tasks, order, costs):
+        if self._pool is None:
+            self._pool = futures.ThreadPoolExecutor(self.n_workers)
+        jobs = {}
+        for k in order:
+            args = [a.array if isinstance(a, Shared) else a
+                    for a in tasks[k]]
+            jobs[self._pool.submit(_timed_call, func, args)] = k
+        for job in futures.as_completed(jobs):
+            yield (jobs[job],) + job.result()
+
+
+class _Segment:
+    """
+    Reference to an array stored in a file in shared memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+
+_segments = {}
+"""(dictionary) arrays mapped by this worker process, by file path."""
+
+
+def _segment_call(func, args):
+    """
+    Map the shared segments among `args` into memory, then call `func`.
+    """
+    resolved = []
+    for a in args:
+        if isinstance(a, _Segment):
+            if a.path not in _segments:
+                if len(_segments) > 8:
+                    _segments.clear()
+                #  copy-on-write, since compiled kernels require writable
+                #  buffers
+                _segments[a.path] = np.load(a.path, mmap_mode="c")
+            a = _segments[a.path]
+        resolved.append(a)
+    return _timed_call(func, resolved)
+
+
+class ProcessExecutor(Executor):
+    """
+    Executes tasks on a pool of processes.
+
+    `Shared` arrays are written once to files in shared memory, which each
+    worker maps into its address space without copying.
+    """
+
+    def __init__(self, n_workers: int = None):
+        Executor.__init__(self, n_workers or cpu_count())
+        self._pool = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run(self, func, tasks, order, costs):
+        if self._pool is None:
+            self._pool = futures.ProcessPoolExecutor(
+                self.n_workers, mp_context=get_context("spawn"))
+        tmp = tempfile.mkdtemp(
+            prefix="pyunicorn-", dir="/dev/shm" if os.path.isdir("/dev/shm")
+            else None)
+        try:
+            segments = {}
+            jobs = {}
+            for k in order:
+                args = []
+                for a in tasks[k]:
+                    if isinstance(a, Shared):
+                        if id(a) not in segments:
+                            path = os.path.join(tmp, f"{len(segments)}.npy")
+                            np.save(path, a.array)
+                            segments[id(a)] = _Segment(path)
+                        a = segments[id(a)]
+                    args.append(a)
+                jobs[self._pool.submit(_segment_call, func, args)] = k
+            for job in futures.as_completed(jobs):
+                yield (jobs[job],) + job.result()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+class MPIExecutor(Executor):
+    """
+    Executes tasks on the slaves of :mod:`pyunicorn.utils.mpi`.
+
+    `Shared` arrays are sent once to each slave as raw buffers. Tasks are
+    assigned to the slave with the least estimated total time.
+    """
+
+    def __init__(self):
+        if not (mpi.available and mpi.am_master):
+            raise RuntimeError(
+                "MPIExecutor requires mpi4py and at least one slave, and can "
+                "only be used on the master.")
+        Executor.__init__(self, n_workers=mpi.n_slaves)
+
+    def _run(self, func, tasks, order, costs):
+        token = uuid.uuid4().hex
+        keys = {}
+        try:
+            for k in order:
+                args = []
+                for a in tasks[k]:
+                    if isinstance(a, Shared):
+                        if id(a) not in keys:
+                            keys[id(a)] = f"{token}-{len(keys)}"
+                            mpi.share(keys[id(a)], a.array)
+                        a = mpi.SharedKey(keys[id(a)])
+                    args.append(a)
+                mpi.submit_call(func.__qualname__, tuple(args),
+                                module=func.__module__,
+                                time_est=costs[k] or 1, id=(token, k))
+            for k in order:
+                result = mpi.get_result((token, k))
+                this_stats = mpi.stats[-1]
+                yield k, result, this_stats["rank"], this_stats["this_time"]
+        finally:
+            for key in keys.values():
+                mpi.unshare(key)
+
+
+_default = None
+
+
+def get_default() -> Executor:
+    """
+    Return the executor used by the parallelized measures.
+    """
+    global _default
+    if _default is None:
+        if mpi.available and mpi.am_master:
+            _default = MPIExecutor()
+        else:
+            _default = ThreadExecutor()
+    return _default
+
+
+def set_default(executor: Executor):
+    """
+    Set the executor used by the parallelized measures.
+
+    :arg executor: An `Executor`, or None to restore the automatic choice.
+    """
+    global _default
+    if _default is not None and _default is not executor:
+        _default.close()
+    _default = executor
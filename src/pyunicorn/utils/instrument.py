@@ -0,0 +1,288 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+
+"""
+Module for the structured instrumentation of measure computations.
+
+Methods decorated with `pyunicorn.core.cache.Cached.method`, and the main
+engines decorated with `traced`, emit a pair of events per computation to all
+registered sinks: a "start" event, and an "end" event that carries the wall
+and CPU time, the growth of the peak resident set size, the input size and,
+for cached methods, whether the result came from a cache. Events are plain
+dictionaries, and a sink is any callable accepting one::
+
+    >>> from pyunicorn.utils import instrument
+    >>> with instrument.record() as events:
+    ...     Network.SmallTestNetwork().degree()  # doctest: +SKIP
+    >>> events[-1]["name"], events[-1]["cache"]  # doctest: +SKIP
+    ('Network.degree', 'miss')
+
+Without any registered sink, the instrumentation reduces to a single check per
+call. The progress messages printed via `message` depend on the
+`silence_level` of each object, and can be suppressed globally by setting
+``instrument.verbose = False``.
+"""
+
+import os
+import sys
+import json
+import numbers
+import time
+import logging
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+verbose = True
+"""(bool) whether `message` prints at all."""
+
+_sinks = []
+_current = ContextVar("pyunicorn_span", default=(None, None))
+_ids = itertools.count(1)
+_lock = threading.Lock()
+
+
+def message(obj, text: str, level: int = 1):
+    """
+    Print a progress message, unless `verbose` is False or the
+    `silence_level` of `obj` exceeds `level`.
+    """
+    if verbose and getattr(obj, "silence_level", 0) <= level:
+        print(text)
+
+
+def active() -> bool:
+    """
+    Return whether any sink is registered.
+    """
+    return bool(_sinks)
+
+
+def add_sink(sink):
+    """
+    Register a callable that receives all subsequent events, and return it.
+    """
+    with _lock:
+        _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    """
+    Unregister a sink.
+    """
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def _emit(event):
+    for sink in list(_sinks):
+        sink(event)
+
+
+def _peak_rss():
+    """
+    Return the peak resident set size of this process in bytes, or None.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else 1024 * rss
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Emit a "start" and an "end" event around the enclosed computation.
+
+    Yields the dictionary of attributes that is included in the end event,
+    which the computation may update, e.g., with its input size. Nested spans
+    reference the enclosing one by its "parent" id.
+
+    :arg str name: The name of the computation, e.g., the qualified name of
+        the method.
+    :arg attrs: Further attributes of the events.
+    """
+    if not _sinks:
+        yield attrs
+        return
+    span_id = next(_ids)
+    parent = _current.get()[0]
+    token = _current.set((span_id, attrs))
+    start = {"event": "start", "name": name, "id": span_id,
+             "parent": parent, "pid": os.getpid(),
+             "thread": threading.get_ident(), "time": time.time(), **attrs}
+    _emit(start)
+    rss0, cpu0, t0 = _peak_rss(), time.process_time(), time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+        rss1 = _peak_rss()
+        _current.reset(token)
+        _emit({**start, "event": "end", "time": time.time(),
+               "start_time": start["time"], "wall_time": wall,
+               "cpu_time": cpu, "peak_rss_delta":
+               None if rss0 is None else rss1 - rss0,
+               "error": error, **attrs})
+
+
+def annotate(**attrs):
+    """
+    Add attributes to the end event of the innermost enclosing `span`, if
+    any.
+    """
+    current = _current.get()[1]
+    if current is not None:
+        current.update(attrs)
+
+
+def size_of(obj):
+    """
+    Return the input size of a computation on `obj`: its number of nodes,
+    series or samples `N`, or else the shape of its original data, if
+    available.
+    """
+    n = getattr(obj, "N", None)
+    if n is None and hasattr(obj, "get_N"):
+        n = obj.get_N()
+    if isinstance(n, numbers.Integral):
+        return int(n)
+    data = getattr(obj, "original_data", None)
+    return None if data is None else list(getattr(data, "shape", ()))
+
+
+def traced(f):
+    """
+    Decorate a method, such that each call is wrapped in a `span` named by
+    the qualified name of the method, with the input size `size_of(self)`.
+    """
+    name = f.__qualname__
+
+    @wraps(f)
+    def wrapped(self, *args, **kwargs):
+        if not _sinks:
+            return f(self, *args, **kwargs)
+        with span(name) as attrs:
+            try:
+                return f(self, *args, **kwargs)
+            finally:
+                attrs["size"] = size_of(self)
+    return wrapped
+
+
+class record:
+    """
+    Context manager which collects all events emitted in its scope into a
+    list.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def __enter__(self):
+        add_sink(self.events.append)
+        return self.events
+
+    def __exit__(self, *exc):
+        remove_sink(self.events.append)
+
+
+class JSONLinesSink:
+    """
+    Sink which writes each event as one line of JSON to a file.
+    """
+
+    def __init__(self, file):
+        """
+        :arg file: A path, which is opened for appending, or a text stream.
+        """
+        self._own = isinstance(file, (str, os.PathLike))
+        self.file = open(file, "a", encoding="utf-8") if self._own else file
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+
+    def close(self):
+        if self._own:
+            self.file.close()
+
+
+class LoggingSink:
+    """
+    Sink which forwards events to a `logging.Logger`, with the event
+    dictionary as the record attribute ``pyunicorn_event``.
+    """
+
+    def __init__(self, logger=None, level: int = 10):
+        """
+        :arg logger: A logger. (Default: the "pyunicorn" logger)
+        :arg int level: The logging level. (Default: DEBUG)
+        """
+        self.logger = logging.getLogger("pyunicorn") if logger is None \
+            else logger
+        self.level = level
+
+    def __call__(self, event):
+        if event["event"] == "end":
+            self.logger.log(
+                self.level, "%s took %.3g s (cache: %s)", event["name"],
+                event["wall_time"], event.get("cache"),
+                extra={"pyunicorn_event": event})
+        else:
+            self.logger.log(self.level, "%s started", event["name"],
+                            extra={"pyunicorn_event": event})
+
+
+class SpanSink:
+    """
+    Sink which reports computations as spans to an OpenTelemetry-style
+    tracer, i.e., any object with a method
+    ``start_span(name, start_time=..., attributes=...)`` returning a span
+    with a method ``end(end_time=...)``, where times are in nanoseconds.
+
+    Spans are created at the end events, so that their attributes include
+    the measurements.
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def __call__(self, event):
+        if event["event"] != "end":
+            return
+        attributes = {f"pyunicorn.{k}": v for k, v in event.items()
+                      if k not in ("event", "name") and v is not None}
+        s = self.tracer.start_span(
+            event["name"], start_time=int(event["start_time"] * 1e9),
+            attributes=attributes)
+        s.end(end_time=int(event["time"] * 1e9))
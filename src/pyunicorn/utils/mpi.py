@@ -18,7 +18,8 @@ Module for parallelization using mpi4py.
 Allows for easy parallelization in master/slaves mode with one master
 submitting function or method calls to slaves.
 Uses mpi4py if available, otherwise processes calls sequentially in one
-process.
+process. The parallelized measures of pyunicorn submit their calls through
+`pyunicorn.utils.executor.MPIExecutor`.
 
 Examples:
 =========
@@ -76,6 +77,29 @@ class MPIException(Exception):
         return repr(self.value)
 
 
+class SharedKey:
+    """
+    Placeholder for an array sent to all slaves by `share()`, to be passed as
+    a positional argument to `submit_call()`.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+
+shared = {}
+"""
+(dictionary)
+shared[key] is the array sent by the master with share(key, array).
+"""
+
+
+def _resolve(args):
+    """Replace `SharedKey` arguments by the shared arrays."""
+    return tuple(shared[a.key] if isinstance(a, SharedKey) else a
+                 for a in args)
+
+
 # initialize:
 
 if available:
@@ -272,7 +296,7 @@ if am_master:
                 sys.stderr.write(str(sys.modules[module].__dict__.keys()))
                 raise
             call_time = time.time()
-            results[id] = object_to_call(*args, **kwargs)
+            results[id] = object_to_call(*_resolve(args), **kwargs)
             this_time = time.time() - call_time
             n_processed[0] += 1
             total_time[0] = time.time() - start_time
@@ -410,6 +434,37 @@ if am_master:
                   "     coeff. of var. of actual over estd. time per call: "
                   f"{call_quotients.std()/call_quotients.mean()}\n")
 
+    def share(key, array):
+        """
+        Send a numpy array to all slaves once, as a raw buffer instead of a
+        pickle, such that subsequent calls can refer to it by
+        `SharedKey(key)`.
+
+        Can only be called by the master.
+
+        :type key: object
+        :arg  key: unique key of the array. Must be a possible dictionary key.
+        :arg array: the array to be shared.
+        """
+        array = numpy.ascontiguousarray(array)
+        if available:
+            for slave in range(1, size):
+                comm.send(("share", (key, array.shape, array.dtype.str), {},
+                           "", 0), dest=slave)
+                comm.Send(array, dest=slave)
+        shared[key] = array
+
+    def unshare(key):
+        """
+        Release an array sent by `share()` on all MPI nodes.
+
+        Can only be called by the master.
+        """
+        if available:
+            for slave in range(1, size):
+                comm.send(("unshare", (key,), {}, "", 0), dest=slave)
+        shared.pop(key, None)
+
     def terminate():
         """
         Tell all slaves to terminate.
@@ -475,6 +530,15 @@ else:  # am_slave and available:
                 if _verbose:
                     print("MPI slave", rank, ": terminating...")
                 break
+            if name_to_call == "share":
+                # receive the raw buffer of an array
+                key, shape, dtype = args
+                shared[key] = numpy.empty(shape, dtype=dtype)
+                comm.Recv(shared[key], source=0)
+                continue
+            if name_to_call == "unshare":
+                shared.pop(args[0], None)
+                continue
             if _verbose:
                 print(f"MPI slave {rank}: calling {name_to_call} {args} ...")
             try:
@@ -485,7 +549,7 @@ else:  # am_slave and available:
                 raise
             total_time_est[rank] += time_est
             call_time = time.time()
-            result = object_to_call(*args, **kwargs)
+            result = object_to_call(*_resolve(args), **kwargs)
             this_time = time.time() - call_time
             n_processed[rank] += 1
             stats.append({"id": id, "rank": rank,
@@ -17,6 +17,8 @@ from pathlib import Path
 import requests
 import pytest
 
+from pyunicorn.utils import executor
+
 
 @pytest.fixture(scope="session",
                 params=["supremum", "euclidean", "manhattan"])
@@ -28,6 +30,20 @@ def metric(request) -> str:
     return request.param
 
 
+@pytest.fixture(params=["serial", "process"])
+def default_executor(request) -> executor.Executor:
+    '''
+    A fixture for running a test with a serial and a multi-process default
+    executor of the parallelized computations, restoring the automatic
+    choice afterwards.
+    '''
+    ex = executor.SerialExecutor() if request.param == "serial" \
+        else executor.ProcessExecutor(2)
+    executor.set_default(ex)
+    yield ex
+    executor.set_default(None)
+
+
 @pytest.fixture(scope="session")
 def reanalysis_data() -> Path:
     """
@@ -16,7 +16,7 @@ Simple tests for the ClimateData class.
 """
 import numpy as np
 
-from pyunicorn.core.data import Data
+from pyunicorn.core import Data, GeoGrid
 from pyunicorn.climate.climate_data import ClimateData
 
 # -----------------------------------------------------------------------------
@@ -104,3 +104,59 @@ def test_set_global_window():
     res = data.grid.grid()["lat"]
     exp = np.array([0., 5., 10., 15., 20., 25.], dtype=np.float32)
     assert np.allclose(res, exp, atol=1e-04)
+
+
+def test_anomaly_engine(tmp_path):
+    rng = np.random.default_rng(0)
+    ts = rng.normal(size=(47, 6)).astype(np.float32)
+    grid = Data.SmallTestData().grid
+    grid = GeoGrid(np.arange(47.), grid.lat_sequence(), grid.lon_sequence())
+    data = ClimateData(observable=ts, grid=grid, time_cycle=5,
+                       silence_level=2)
+    exp_mean = np.array([ts[i::5].mean(axis=0, dtype=np.float64)
+                         for i in range(5)])
+    exp = ts - exp_mean[np.arange(47) % 5]
+    assert np.allclose(data.phase_mean(), exp_mean)
+    res = data.anomaly()
+    assert res.dtype == np.float32
+    assert np.allclose(res, exp, atol=1e-6)
+
+    out = np.memmap(tmp_path / "anomaly.f32", mode="w+", dtype=np.float32,
+                    shape=ts.shape)
+    assert data.write_anomaly(out=out) is out
+    assert np.array_equal(out, res)
+    data.write_anomaly(out=data.observable())
+    assert np.array_equal(data.observable(), res)
+
+    res = data.shuffled_anomaly()
+    assert res.dtype == np.float32
+    assert np.allclose(np.sort(res, axis=0), np.sort(exp, axis=0), atol=1e-6)
+
+    #  data which are anomalies already are left unchanged
+    data = ClimateData(observable=ts, grid=grid, time_cycle=5,
+                       anomalies=True, silence_level=2)
+    assert np.array_equal(data.write_anomaly(), ts)
+    assert np.array_equal(data.anomaly(), ts)
+    for axis in [0, 1]:
+        assert np.array_equal(np.concatenate(
+            [v for _, v in data.anomaly_blocks(axis=axis, max_bytes=96)],
+            axis=axis), ts)
+
+
+def test_anomaly_blocks():
+    rng = np.random.default_rng(1)
+    ts = rng.normal(size=(47, 6)).astype(np.float32)
+    grid = Data.SmallTestData().grid
+    grid = GeoGrid(np.arange(47.), grid.lat_sequence(), grid.lon_sequence())
+    data = ClimateData(observable=ts, grid=grid, time_cycle=5,
+                       silence_level=2)
+    selected = np.flatnonzero(np.arange(47) % 5 != 2)
+    for indices in [None, selected]:
+        exp = data.anomaly() if indices is None else data.anomaly()[indices]
+        for axis in [0, 1]:
+            blocks = list(data.anomaly_blocks(
+                axis=axis, selected_indices=indices, max_bytes=96))
+            assert len(blocks) > 1
+            res = np.concatenate([v for _, v in blocks], axis=axis)
+            assert res.dtype == np.float32
+            assert np.allclose(res, exp, atol=1e-6)
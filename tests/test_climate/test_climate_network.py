@@ -14,9 +14,13 @@
 """
 Simple tests for the ClimateNetwork class.
 """
+import pytest
 import numpy as np
 
+from pyunicorn.climate import ClimateData, MutualInfoClimateNetwork
 from pyunicorn.climate.climate_network import ClimateNetwork
+from pyunicorn.core import GeoGrid
+from pyunicorn.core.cache import Cached, DiskCache
 
 
 def test_str(capsys):
@@ -137,3 +141,122 @@ def test_local_correlation_distance_weighted_vulnerability():
         local_correlation_distance_weighted_vulnerability()
     exp = np.array([0.4037, 0.035, -0.1731, -0.081, 0.3121, -0.0533])
     assert np.allclose(res, exp, atol=1e-04)
+
+
+def test_save_hdf5(tmp_path):
+    filename = tmp_path / "net.h5"
+    net = ClimateNetwork.SmallTestNetwork()
+    net.set_link_attribute("similarity", net.similarity_measure())
+    for compression, dtype in [(None, "float32"), ("gzip", "float16")]:
+        net.save_hdf5(filename, compression=compression,
+                      similarity_dtype=dtype)
+        res = ClimateNetwork.LoadHDF5(filename, mmap=compression is None)
+        assert np.array_equal(res.adjacency, net.adjacency)
+        assert res.threshold() == net.threshold()
+        assert res.non_local() == net.non_local()
+        assert np.allclose(res.similarity_measure(),
+                           net.similarity_measure(), atol=1e-3)
+        assert np.allclose(res.link_attribute("similarity"),
+                           net.link_attribute("similarity"))
+        assert np.allclose(res.local_clustering(), net.local_clustering())
+        if dtype == "float32":
+            res.set_threshold(0.7)
+            assert res.n_links == 3
+
+        #  all attributes set by the constructor are restored
+        assert set(vars(res)) == set(vars(net))
+
+    net.save_hdf5(filename, similarity_dtype=None)
+    res = ClimateNetwork.LoadHDF5(filename)
+    assert np.array_equal(res.adjacency, net.adjacency)
+    with pytest.raises(AttributeError):
+        res.similarity_measure()
+
+
+def test_mutual_information_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYUNICORN_CACHE_DIR", str(tmp_path))
+    data = ClimateData.SmallTestData()
+    net = MutualInfoClimateNetwork(data, threshold=.1, winter_only=False,
+                                   silence_level=2)
+    net.set_winter_only(False)
+    net.mutual_information(data.anomaly())
+    assert not list(tmp_path.iterdir())
+
+    Cached.disk_cache = DiskCache()
+    try:
+        net.set_winter_only(False)
+        assert len(list(tmp_path.glob("*.npy"))) == 1
+        mi = net.mutual_information(data.anomaly())
+        assert isinstance(mi, np.memmap)
+    finally:
+        Cached.disk_cache = None
+    assert np.allclose(mi, net.similarity_measure())
+
+
+def _mutual_information(anomaly, n_bins):
+    x = anomaly - anomaly.mean(axis=0)
+    std = x.std(axis=0)
+    x = np.divide(x, std, out=np.zeros_like(x), where=std > 0)
+    edges = np.linspace(x.min(), x.max(), n_bins + 1)
+    N = x.shape[1]
+    mi = np.zeros((N, N))
+    for i in range(N):
+        for j in range(N):
+            if i != j:
+                p = np.histogram2d(x[:, i], x[:, j], [edges, edges])[0]
+                p /= p.sum()
+                pi, pj = p.sum(axis=1), p.sum(axis=0)
+                nz = p > 0
+                mi[i, j] = (p[nz] * np.log(p[nz] / np.outer(pi, pj)[nz])
+                            ).sum()
+    return mi
+
+
+@pytest.mark.parametrize("winter_only", [False, True])
+def test_mutual_information(winter_only, default_executor):
+    rng = np.random.default_rng(6)
+    obs = np.cumsum(rng.normal(size=(120, 7)), axis=0)
+    obs[:, 3] = 1.
+    grid = GeoGrid(np.arange(120.), rng.uniform(-60, 60, 7),
+                   rng.uniform(0, 360, 7))
+    data = ClimateData(obs, grid, time_cycle=12, silence_level=2)
+    anomaly = data.anomaly()
+    if winter_only:
+        anomaly = anomaly[data.indices_selected_months([0, 1, 11])]
+    net = MutualInfoClimateNetwork(
+        data, threshold=.5, winter_only=winter_only, silence_level=2)
+    mi = net.similarity_measure()
+    assert mi.dtype == np.float32
+    assert np.allclose(mi, _mutual_information(anomaly.astype(float), 32),
+                       atol=1e-5)
+    assert len(default_executor.stats) > 0
+    assert np.array_equal(net.mutual_information(anomaly, dump=False), mi)
+    assert np.array_equal(net.mutual_information_adjacency(.5), net.adjacency)
+    with pytest.raises(ValueError):
+        net._cython_calculate_mutual_information(anomaly, n_bins=300)
+
+
+def test_mutual_information_n_bins():
+    data = ClimateData.SmallTestData()
+    net = MutualInfoClimateNetwork(data, threshold=.1, winter_only=False,
+                                   silence_level=2, n_bins=4)
+    exp = _mutual_information(data.anomaly().astype(float), 4)
+    assert np.allclose(net.similarity_measure(), exp, atol=1e-5)
+    assert np.allclose(net.mutual_information(), exp, atol=1e-5)
+    assert np.array_equal(net.mutual_information_adjacency(.1), net.adjacency)
+
+
+@pytest.mark.parametrize("a, d_min", [(20, 0.05), (30, 0.2), (-1, 0.3)])
+def test_non_local_adjacency(a, d_min):
+    rng = np.random.default_rng(0)
+    net = ClimateNetwork.SmallTestNetwork()
+    net.grid = GeoGrid(time_seq=np.arange(2),
+                       lat_seq=rng.uniform(-90, 90, 200),
+                       lon_seq=rng.uniform(0, 360, 200), silence_level=2)
+    S = rng.random((200, 200)).astype("float32")
+    S = (S + S.T) / 2
+
+    res = net._calculate_non_local_adjacency(S, 0.4, a=a, d_min=d_min)
+    weight = 0.5 * (np.tanh(a * (net.grid.angular_distance() - d_min)) + 1)
+    exp = net._calculate_threshold_adjacency(S * weight, 0.4)
+    assert np.array_equal(res, exp)
@@ -0,0 +1,46 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+"""
+Tests for the RainfallClimateNetwork class.
+"""
+import numpy as np
+from scipy import stats
+
+from pyunicorn.climate.rainfall import RainfallClimateNetwork
+
+
+def _masked_spearman(final_mask, anomaly):
+    ranks = stats.rankdata(anomaly, axis=1)
+    m = len(anomaly)
+    rho = np.zeros((m, m))
+    for i in range(m):
+        for j in range(m):
+            w = final_mask[i] | final_mask[j]
+            if w.sum() > 1 and np.ptp(ranks[i, w]) and np.ptp(ranks[j, w]):
+                rho[i, j] = np.corrcoef(ranks[i, w], ranks[j, w])[0, 1]
+    return rho
+
+
+def test_spearman_corr(default_executor):
+    rng = np.random.default_rng(4)
+    anomaly = np.round(rng.normal(size=(7, 50)), 1)
+    final_mask = rng.random((7, 50)) < 0.3
+    final_mask[0] = False
+    final_mask[1, :3] = True
+    final_mask[1, 3:] = False
+    res = RainfallClimateNetwork.spearman_corr(
+        RainfallClimateNetwork, final_mask, anomaly)
+    assert res.dtype == np.float32
+    assert np.allclose(res, _masked_spearman(final_mask, anomaly), atol=1e-6)
+    assert len(default_executor.stats) > 0
@@ -0,0 +1,45 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+"""
+Tests for the SpearmanClimateNetwork class.
+"""
+import numpy as np
+from scipy import stats
+
+from pyunicorn.core import GeoGrid
+from pyunicorn.climate.climate_data import ClimateData
+from pyunicorn.climate.spearman import SpearmanClimateNetwork
+
+
+def test_rank_time_series():
+    anomaly = np.array([[1., 3.], [2., 3.], [2., 1.]])
+    ranks = SpearmanClimateNetwork.rank_time_series(anomaly)
+    assert ranks.dtype == np.float32
+    assert np.array_equal(ranks, [[0., 1.5], [1.5, 1.5], [1.5, 0.]])
+
+
+def test_rank_correlation():
+    rng = np.random.default_rng(3)
+    obs = np.round(np.cumsum(rng.normal(size=(60, 6)), axis=0), 0)
+    grid = ClimateData.SmallTestData().grid
+    grid = GeoGrid(np.arange(60.), grid.lat_sequence(), grid.lon_sequence())
+    data = ClimateData(obs, grid, time_cycle=12, silence_level=2)
+    winter = data.indices_selected_months([0, 1, 11])
+    for winter_only, indices in [(False, slice(None)), (True, winter)]:
+        exp = stats.spearmanr(data.anomaly()[indices]).statistic
+        net = SpearmanClimateNetwork(data, threshold=0.5,
+                                     winter_only=winter_only,
+                                     silence_level=2)
+        assert net.similarity_measure().dtype == np.float32
+        assert np.allclose(net.similarity_measure(), np.abs(exp), atol=1e-6)
@@ -16,8 +16,11 @@ Tests for the TsonisClimateNetwork class.
 """
 import numpy as np
 
+from pyunicorn.core import GeoGrid
 from pyunicorn.climate.climate_data import ClimateData
 from pyunicorn.climate.tsonis import TsonisClimateNetwork
+from pyunicorn.climate.partial_correlation import \
+    PartialCorrelationClimateNetwork
 
 
 def test_str(capsys):
@@ -105,3 +108,25 @@ def test_local_correlation_weighted_vulnerability():
                 local_correlation_weighted_vulnerability()
     exp = np.array([0., 0., 0., 0., 0., 0.])
     assert np.allclose(res, exp, atol=1e-04)
+
+
+def test_correlation_engine():
+    rng = np.random.default_rng(2)
+    obs = np.cumsum(rng.normal(size=(60, 6)), axis=0) + 100
+    grid = ClimateData.SmallTestData().grid
+    grid = GeoGrid(np.arange(60.), grid.lat_sequence(), grid.lon_sequence())
+    data = ClimateData(obs, grid, time_cycle=12, silence_level=2)
+    winter = data.indices_selected_months([0, 1, 11])
+    for winter_only, indices in [(False, slice(None)), (True, winter)]:
+        exp = np.corrcoef(data.anomaly()[indices].T)
+        net = TsonisClimateNetwork(data, threshold=0.5,
+                                   winter_only=winter_only, silence_level=2)
+        assert net.similarity_measure().dtype == np.float32
+        assert np.allclose(net.similarity_measure(), np.abs(exp), atol=1e-6)
+
+        inv = np.linalg.inv(exp)
+        exp = - inv / np.sqrt(np.outer(inv.diagonal(), inv.diagonal()))
+        net = PartialCorrelationClimateNetwork(
+            data, threshold=0.5, winter_only=winter_only, silence_level=2)
+        assert np.allclose(net._data_correlation(
+            None if winter_only is False else winter), exp, atol=1e-6)
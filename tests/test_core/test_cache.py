@@ -22,7 +22,8 @@ from weakref import getweakrefcount
 import pytest
 import numpy as np
 
-from pyunicorn.core.cache import Cached
+from pyunicorn import version
+from pyunicorn.core.cache import Cached, CacheStats, DiskCache
 
 
 def check_wrefc(referent: object, count: int):
@@ -480,3 +481,158 @@ class TestCached:
                 assert Z.counter == 1
                 for m in methods:
                     assert getattr(FooBar, m).cache_info().currsize == 1
+
+
+def test_disk_cache(tmp_path, capfd: pytest.CaptureFixture, monkeypatch):
+    """
+    Persistence of results across instances and cache objects.
+    """
+    class Qux(Cached):
+        silence_level = 1
+
+        def __init__(self, x):
+            self.x = np.asarray(x)
+            self.counter = 0
+
+        def __cache_state__(self):
+            return ()
+
+        def __cache_content__(self):
+            return (self.x,)
+
+        @Cached.method(name="qux", persist=True)
+        def qux(self, a, scale=1.):
+            self.counter += 1
+            return scale * np.outer(self.x, np.arange(a))
+
+        @Cached.method(persist=True)
+        def total(self):
+            self.counter += 1
+            return float(self.x.sum())
+
+    x = np.random.default_rng(0).random(100)
+    Cached.disk_cache = DiskCache(str(tmp_path), max_bytes=20000)
+    try:
+        X = Qux(x)
+        res = X.qux(10, scale=2.)
+        assert X.total() == x.sum()
+        assert X.counter == 2
+
+        # new instance with equal contents, fresh cache object
+        Cached.disk_cache = DiskCache(str(tmp_path), max_bytes=20000)
+        Y = Qux(x.copy())
+        assert np.array_equal(Y.qux(10, scale=2.), res)
+        assert isinstance(Y.qux(10, scale=2.), np.memmap)
+        assert not Y.qux(10, scale=2.).flags.writeable
+        assert Y.total() == x.sum()
+        assert Y.counter == 0
+
+        # different contents or arguments
+        Z = Qux(x + 1)
+        Z.qux(10, scale=2.)
+        Y.qux(10, 2.)
+        Y.qux(11, scale=2.)
+        assert Z.counter == 1 and Y.counter == 2
+        assert capfd.readouterr().out.split("\n")[:-1] == \
+            ["Calculating qux..."] * 4
+
+        # size-bounded eviction of least recently used entries
+        assert Cached.disk_cache.nbytes <= 20000
+        assert len(list(tmp_path.glob("*.npy"))) == 2
+        W = Qux(x)
+        W.qux(11, scale=2.)
+        assert W.counter == 0
+
+        # entries of other releases are ignored
+        monkeypatch.setattr(version, "__version__", "0.0.0")
+        V = Qux(x)
+        V.qux(11, scale=2.)
+        assert V.counter == 1
+        Cached.disk_cache.clear()
+        assert Cached.disk_cache.nbytes == 0
+    finally:
+        Cached.disk_cache = None
+
+
+def test_stats():
+    """
+    Lookup statistics, memory accounting and byte budget.
+    """
+    class Quux(Cached):
+        def __cache_state__(self):
+            return ()
+
+        @Cached.method()
+        def big(self, n):
+            return np.zeros(n)
+
+        @Cached.method()
+        def slow(self, n):
+            for _ in range(100000):
+                pass
+            return np.zeros(n)
+
+    X, Y = Quux(), Quux()
+    for _ in range(3):
+        X.big(1000)
+        X.slow(10)
+    Y.big(2000)
+    report = {r["method"]: r for r in Quux.cache_report()}
+    big, slow = report["test_stats.<locals>.Quux.big"], \
+        report["test_stats.<locals>.Quux.slow"]
+    assert (big["instances"], big["hits"], big["misses"], big["entries"],
+            big["nbytes"]) == (2, 2, 2, 2, 3000 * 8)
+    assert (slow["instances"], slow["hits"], slow["misses"]) == (1, 2, 1)
+    assert slow["time"] > 0.
+    per_instance = Quux.cache_report(per_instance=True)
+    assert len(per_instance) == 3
+    assert per_instance[0]["instance"] == id(Y)
+
+    # byte budget evicts large results which are cheap to recompute first
+    Cached.cache_budget = 20000
+    try:
+        X.slow(1000)
+        assert CacheStats.total_bytes <= 20000
+        report = {r["method"]: r for r in Quux.cache_report()}
+        assert report["test_stats.<locals>.Quux.big"]["nbytes"] <= 8000
+        assert report["test_stats.<locals>.Quux.big"]["hits"] == 2
+        assert report["test_stats.<locals>.Quux.slow"]["entries"] == 2
+        assert Y.__cached_big__.cache_info().currsize == 0
+    finally:
+        Cached.cache_budget = None
+
+    # accounting follows the lifetime of instances and entries
+    del Y
+    assert {r["method"]: r for r in Quux.cache_report()}[
+        "test_stats.<locals>.Quux.big"]["instances"] == 1
+    X.cache_clear()
+    assert all(r["nbytes"] == r["entries"] == 0
+               for r in Quux.cache_report())
+
+
+def test_peek_seed():
+    """
+    Inspecting and inserting results without computing them.
+    """
+    class Corge(Cached):
+        def __init__(self):
+            self.counter = 0
+
+        def __cache_state__(self):
+            return (self.counter,)
+
+        @Cached.method()
+        def corge(self, a):
+            return a
+
+    X = Corge()
+    assert X.cache_peek("corge", 1) is None
+    assert X.corge(1) == 1
+    assert X.cache_peek("corge", 1) == 1
+    X.counter += 1
+    assert X.cache_peek("corge", 1) is None
+    X.cache_seed("corge", 5, 1)
+    X.cache_seed("corge", 6, 1)
+    assert X.corge(1) == 5
+    info = X.__cached_corge__.cache_info()
+    assert (info.hits, info.currsize) == (3, 2)
@@ -15,6 +15,7 @@
 Simple tests for the GeoGrid class.
 """
 import numpy as np
+from matplotlib import path
 
 from pyunicorn.core.geo_grid import GeoGrid
 
@@ -124,3 +125,63 @@ def test_region_indices():
         np.array([0., 0., 0., 11., 11., 11., 11., 0.])).astype(int)
     exp = np.array([0, 1, 1, 0, 0, 0])
     assert np.allclose(res, exp, atol=1e-04)
+
+
+def test_pair_distance():
+    rng = np.random.default_rng(0)
+    grid = GeoGrid(time_seq=np.arange(2),
+                   lat_seq=rng.uniform(-90, 90, 200),
+                   lon_seq=rng.uniform(0, 360, 200), silence_level=2)
+    D = grid.distance()
+    i, j = np.indices(D.shape)
+    assert np.array_equal(grid.pair_distance(i, j), D)
+    assert grid.max_distance() == D.max()
+
+    for radius in [0.1, 0.5, 2.]:
+        res = grid.pairs_within(radius)
+        exp = np.transpose(np.nonzero(np.triu(D <= radius, k=1)))
+        assert np.array_equal(res, exp)
+
+
+def test_spatial_index():
+    rng = np.random.default_rng(1)
+    grid = GeoGrid(time_seq=np.arange(2),
+                   lat_seq=rng.uniform(-90, 90, 500),
+                   lon_seq=rng.uniform(0, 360, 500), silence_level=2)
+    lat, lon = rng.uniform(-90, 90, 50), rng.uniform(0, 360, 50)
+    x = GeoGrid.latlon2cartesian(lat, lon)
+    D = np.arccos(np.clip(
+        np.dot(x.T, grid.latlon2cartesian(grid.lat_sequence(),
+                                          grid.lon_sequence())), -1, 1))
+
+    res = grid.node_number(lat_node=lat, lon_node=lon)
+    assert np.array_equal(res, D.argmin(axis=1))
+    assert grid.node_number(lat[0], lon[0]) == res[0]
+
+    dist, res = grid.nearest_nodes(lat, lon, k=3)
+    assert np.array_equal(res, np.argsort(D, axis=1)[:, :3])
+    assert np.allclose(dist, np.sort(D, axis=1)[:, :3], atol=1e-5)
+
+    res = grid.nodes_within(lat, lon, radius=0.3)
+    for k in range(50):
+        assert np.array_equal(res[k], np.flatnonzero(D[k] <= 0.3))
+
+    assert np.allclose(GeoGrid.cartesian2latlon(x), (lat, lon - 360 *
+                                                     (lon > 180)))
+
+
+def test_region_indices_prefilter():
+    rng = np.random.default_rng(2)
+    grid = GeoGrid(time_seq=np.arange(2),
+                   lat_seq=rng.uniform(-90, 90, 500),
+                   lon_seq=rng.uniform(0, 360, 500), silence_level=2)
+    region = GeoGrid.region("ENSO")
+    res = grid.region_indices(region)
+    assert res.sum() > 0
+    assert np.array_equal(region, GeoGrid.region("ENSO"))
+
+    polygon = region.reshape(-1, 2).copy()
+    polygon[polygon[:, 0] < 0, 0] += 360
+    lat, lon = grid.grid()["lat"], grid.grid()["lon"]
+    exp = path.Path(polygon).contains_points(np.column_stack((lon, lat)))
+    assert np.array_equal(res, exp)
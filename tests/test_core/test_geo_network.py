@@ -286,3 +286,20 @@ def test_local_geographical_clustering():
     res = GeoNetwork.SmallTestNetwork().local_geographical_clustering()
     exp = np.array([0., 0.0998, 0.1489, 0., 0.2842, 0.])
     assert np.allclose(res, exp, atol=1e-04)
+
+
+def test_save_hdf5(tmp_path):
+    net = GeoNetwork.SmallTestNetwork()
+    net.save_hdf5(tmp_path / "net.h5")
+    res = GeoNetwork.LoadHDF5(tmp_path / "net.h5")
+    assert isinstance(res, GeoNetwork)
+    assert np.array_equal(res.adjacency, net.adjacency)
+    assert res.node_weight_type == net.node_weight_type
+    assert np.allclose(res.node_weights, net.node_weights)
+    assert np.array_equal(res.grid.grid()["lat"], net.grid.grid()["lat"])
+    assert np.allclose(res.average_link_distance(),
+                       net.average_link_distance())
+    res = SpatialNetwork.LoadHDF5(tmp_path / "net.h5")
+    assert type(res) is SpatialNetwork
+    assert np.array_equal(res.grid.grid()["space"], net.grid._grid["space"])
+    assert np.array_equal(res.adjacency, net.adjacency)
@@ -93,3 +93,27 @@ def test_euclidean_distance():
                     [22.36, 16.77, 11.18, 5.59, 0., 5.59],
                     [27.95, 22.36, 16.77, 11.18, 5.59, 0.]], dtype=np.float32)
     assert (res == exp).all()
+
+
+def test_pair_distance():
+    grid = Grid.SmallTestGrid()
+    D = grid.distance()
+    i, j = np.indices(D.shape)
+    assert np.array_equal(grid.pair_distance(i, j), D)
+
+    A = np.array([[0, 1, 0, 0, 0, 1], [1, 0, 1, 0, 0, 0],
+                  [0, 1, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0],
+                  [0, 0, 0, 0, 0, 1], [1, 0, 0, 0, 1, 0]])
+    L = grid.link_distance(A)
+    assert L.nnz == A.sum()
+    assert np.array_equal(L.toarray(), A * D)
+
+
+def test_pairs_within():
+    grid = Grid.SmallTestGrid()
+    D = grid.distance()
+    for radius in [0., 6., 12., 30.]:
+        res = grid.pairs_within(radius)
+        exp = np.transpose(np.nonzero(np.triu(D <= radius, k=1)))
+        assert np.array_equal(res, exp)
+    assert grid.max_distance() == D.max()
@@ -574,3 +574,14 @@ def test_nsi_cross_average_path_length():
     res = net.nsi_cross_average_path_length([1, 3, 4, 5], [2])
     exp = 0.376
     assert np.isclose(res, exp, atol=1e-04)
+
+
+def test_save_hdf5(tmp_path):
+    net = InteractingNetworks.SmallTestNetwork()
+    net.save_hdf5(tmp_path / "net.h5")
+    res = InteractingNetworks.LoadHDF5(tmp_path / "net.h5")
+    assert isinstance(res, InteractingNetworks)
+    assert np.array_equal(res.adjacency, net.adjacency)
+    assert np.allclose(res.node_weights, net.node_weights)
+    assert np.allclose(res.cross_degree([0, 3, 5], [1, 2, 4]),
+                       net.cross_degree([0, 3, 5], [1, 2, 4]))
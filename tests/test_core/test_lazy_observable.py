@@ -0,0 +1,181 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Simple tests for the LazyObservable class.
+"""
+
+import pytest
+import numpy as np
+
+from pyunicorn.core import Data, LazyObservable
+from pyunicorn.climate import ClimateData, TsonisClimateNetwork, \
+    SpearmanClimateNetwork, MutualInfoClimateNetwork
+
+Dataset = pytest.importorskip("h5netcdf.legacyapi").Dataset
+
+WINDOW = {"time_min": 3., "time_max": 17., "lat_min": -30.,
+          "lat_max": 40., "lon_min": 20., "lon_max": 100.}
+
+
+@pytest.fixture(name="nc_file", params=["NetCDF", "NetCDF4D", "iNetCDF"])
+def nc_file_fixture(request, tmp_path):
+    """
+    Write a small chunked NetCDF file and return its name and type.
+    """
+    file_name = str(tmp_path / "test.nc")
+    rng = np.random.default_rng(0)
+    lat, lon = np.linspace(-80., 80., 9), np.linspace(0., 340., 18)
+    with Dataset(file_name, "w") as f:
+        f.createDimension("time", 24)
+        f.createVariable("time", "f8", ("time",))[:] = np.arange(24.)
+        if request.param == "iNetCDF":
+            f.createDimension("index", 60)
+            f.createVariable("grid_center_lat", "f4", ("index",))[:] = \
+                rng.uniform(-80., 80., 60)
+            f.createVariable("grid_center_lon", "f4", ("index",))[:] = \
+                rng.uniform(0., 360., 60)
+            dims, chunks = ("time", "index"), (5, 16)
+        else:
+            f.createDimension("lat", len(lat))
+            f.createDimension("lon", len(lon))
+            f.createVariable("lat", "f4", ("lat",))[:] = lat
+            f.createVariable("lon", "f4", ("lon",))[:] = lon
+            dims, chunks = ("time", "lat", "lon"), (5, 2, 6)
+            if request.param == "NetCDF4D":
+                f.createDimension("level", 3)
+                dims, chunks = ("time", "level") + dims[1:], (5, 1, 2, 6)
+        obs = f.createVariable("air", "f8", dims, chunksizes=chunks)
+        obs[:] = rng.normal(size=obs.shape)
+        obs.long_name = "air temperature"
+    return file_name, request.param[:6] if request.param != "iNetCDF" \
+        else request.param
+
+
+@pytest.mark.parametrize("window", [None, WINDOW])
+def test_Load(nc_file, tmp_path, window):
+    file_name, file_type = nc_file
+    kwargs = {"file_name": file_name, "observable_name": "air",
+              "file_type": file_type, "window": window, "vertical_level": 1,
+              "silence_level": 2}
+    eager = Data.Load(**kwargs)
+    for cache_file in [None, str(tmp_path / "air.f32")]:
+        lazy = Data.Load(lazy=True, cache_file=cache_file, **kwargs)
+        assert isinstance(lazy._full_observable, LazyObservable)
+        assert lazy._observable is None
+        for axis in [0, 1]:
+            res = np.concatenate([block for _, block in lazy.observable_blocks(
+                axis=axis, max_bytes=256)], axis=axis)
+            assert np.array_equal(res, eager.observable())
+        assert lazy._observable is None
+        assert lazy.observable().dtype == np.float32
+        assert np.array_equal(lazy.observable(), eager.observable())
+        assert np.array_equal(lazy.grid.grid()["lat"],
+                              eager.grid.grid()["lat"])
+        lazy._full_observable.close()
+
+
+def test_blocks(nc_file):
+    file_name, file_type = nc_file
+    full = np.asarray(Data.Load(file_name, "air", file_type,
+                                silence_level=2).observable())
+    with LazyObservable(file_name, "air", file_type) as obs:
+        assert obs.shape == full.shape
+        assert np.array_equal(obs[:, :], full)
+        time_key, space_key = np.arange(24) % 3 != 1, [0, 7, 8, 40, 41]
+        assert np.array_equal(obs[time_key, space_key],
+                              full[time_key][:, space_key])
+        for axis, chunk in enumerate(obs.chunks):
+            bounds = obs.block_bounds(
+                np.arange(full.shape[axis]), axis, 1, max_bytes=1)
+            assert all(start % chunk == 0 for start, _ in bounds)
+            assert bounds[-1][1] == full.shape[axis]
+        blocks = list(obs.blocks(time_key, space_key, axis=0, max_bytes=1))
+        assert len(blocks) == -(-24 // obs.chunks[0])
+        assert np.array_equal(np.concatenate([b for _, b in blocks]),
+                              full[time_key][:, space_key])
+
+
+def test_ClimateData_lazy(nc_file, tmp_path):
+    file_name, file_type = nc_file
+    kwargs = {"file_name": file_name, "observable_name": "air",
+              "file_type": file_type, "time_cycle": 12, "window": WINDOW,
+              "silence_level": 2}
+    eager = ClimateData.Load(**kwargs)
+    lazy = ClimateData.Load(lazy=True, **kwargs)
+    assert np.allclose(lazy.phase_mean(), eager.phase_mean())
+    out = np.memmap(tmp_path / "anomaly.f32", mode="w+", dtype=np.float32,
+                    shape=eager.observable().shape)
+    lazy.write_anomaly(out=out, max_bytes=256)
+    assert lazy._observable is None
+    assert np.allclose(out, eager.anomaly(), atol=1e-6)
+    assert np.allclose(lazy.anomaly(), eager.anomaly())
+    lazy.set_global_window()
+    eager.set_global_window()
+    assert np.allclose(lazy.anomaly(), eager.anomaly())
+
+
+@pytest.mark.parametrize("winter_only", [False, True])
+def test_correlation_networks_lazy(nc_file, winter_only):
+    file_name, file_type = nc_file
+    kwargs = {"file_name": file_name, "observable_name": "air",
+              "file_type": file_type, "time_cycle": 12, "window": WINDOW,
+              "silence_level": 2}
+    eager = ClimateData.Load(**kwargs)
+    lazy = ClimateData.Load(lazy=True, **kwargs)
+    for Network in [TsonisClimateNetwork, SpearmanClimateNetwork,
+                    MutualInfoClimateNetwork]:
+        nets = [Network(data, threshold=0.5, winter_only=winter_only,
+                        silence_level=2) for data in [eager, lazy]]
+        assert lazy._observable is None
+        assert np.allclose(nets[0].similarity_measure(),
+                           nets[1].similarity_measure(), atol=1e-5)
+
+
+def test_cache_file_atomic(nc_file, tmp_path, monkeypatch):
+    file_name, file_type = nc_file
+    cache_file = tmp_path / "air.f32"
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+    with monkeypatch.context() as m:
+        m.setattr(LazyObservable, "blocks", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            LazyObservable(file_name, "air", file_type,
+                           cache_file=str(cache_file))
+    assert not list(tmp_path.glob("air.f32*"))
+    assert not list(tmp_path.glob(".air.f32*"))
+    with LazyObservable(file_name, "air", file_type,
+                        cache_file=str(cache_file)) as obs:
+        assert np.array_equal(obs[:, :], np.asarray(Data.Load(
+            file_name, "air", file_type, silence_level=2).observable()))
+
+
+@pytest.mark.parametrize("file_type", ["NetCDF", "iNetCDF"])
+def test_unsupported_dimensions(tmp_path, file_type):
+    file_name = str(tmp_path / "test.nc")
+    with Dataset(file_name, "w") as f:
+        for dim, n in [("time", 4), ("a", 2), ("b", 2), ("lat", 3),
+                       ("lon", 3), ("index", 3)]:
+            f.createDimension(dim, n)
+            f.createVariable(dim, "f8", (dim,))[:] = np.arange(n)
+        f.createVariable("grid_center_lat", "f4", ("index",))[:] = 0.
+        f.createVariable("grid_center_lon", "f4", ("index",))[:] = 0.
+        dims = ("time", "a", "b") + (
+            ("lat", "lon") if file_type == "NetCDF" else ("index",))
+        f.createVariable("air", "f8", dims)[:] = 0.
+    for lazy in [False, True]:
+        with pytest.raises(ValueError, match="not supported"):
+            Data.Load(file_name, "air", file_type, lazy=lazy,
+                      silence_level=2)
@@ -25,6 +25,8 @@ import numpy as np
 import scipy.sparse as sp
 
 from pyunicorn import Network
+from pyunicorn.core.network import NetworkError
+from pyunicorn.core.cache import Cached, DiskCache
 from pyunicorn.core.network import r
 
 
@@ -260,6 +262,54 @@ def test_set_adjacency(capsys):
     assert out == out_ref
 
 
+@pytest.mark.parametrize("directed", [False, True])
+def test_add_remove_edges(directed: bool, capsys):
+    rng = np.random.default_rng(7)
+    A = np.triu(rng.random((40, 40)) < .2, 1).astype(int)
+    if not directed:
+        A = A + A.T
+    net = Network(adjacency=A, directed=directed, silence_level=2)
+    net.set_link_attribute("w", rng.random((40, 40)) * A)
+    net.local_clustering()
+
+    for step in range(6):
+        edges = rng.integers(0, 40, (15, 2))
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        if step % 2 == 0:
+            net.add_edges(edges, {"w": np.arange(len(edges))})
+            for i, j in edges:
+                A[i, j] = 1
+                if not directed:
+                    A[j, i] = 1
+        else:
+            net.remove_edges(edges)
+            for i, j in edges:
+                A[i, j] = 0
+                if not directed:
+                    A[j, i] = 0
+        ref = Network(adjacency=A, directed=directed, silence_level=2)
+        assert np.array_equal(net.adjacency, A)
+        assert (net.n_links, net.link_density) == \
+            (ref.n_links, ref.link_density)
+        assert np.array_equal(net.degree(), ref.degree())
+        assert np.array_equal(net.indegree(), ref.indegree())
+        if not directed:
+            assert net.cache_peek("local_clustering") is not None
+            assert np.allclose(net.local_clustering(),
+                               ref.local_clustering())
+        assert net.graph.ecount() == ref.graph.ecount()
+        assert np.array_equal(net.link_attribute("w") != 0,
+                              net.adjacency.astype(bool) & (
+                                  net.link_attribute("w") != 0))
+    net.add_edges([[0, 1]], {"w": [5.]})
+    assert net.link_attribute("w")[0, 1] == 5.
+    with pytest.raises(NetworkError):
+        net.add_edges([[2, 3], [4, 5]])
+    with pytest.raises(NetworkError):
+        net.remove_edges([[2, 2]])
+    capsys.readouterr()
+
+
 def test_set_node_weights():
     net = Network.SmallTestNetwork()
     nw_ref = [1.5, 1.7, 1.9, 2.1, 2.3, 2.5]
@@ -270,6 +320,37 @@ def test_set_node_weights():
     assert np.allclose(net.node_weights, nw_ref)
 
 
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_save_hdf5(tmp_path, compression):
+    filename = tmp_path / "net.h5"
+    for net in [Network.SmallTestNetwork(),
+                Network.SmallDirectedTestNetwork()]:
+        net.save_hdf5(filename, compression=compression)
+        res = Network.LoadHDF5(filename)
+        assert res.directed == net.directed
+        assert (res.sp_A != net.sp_A).nnz == 0
+        assert np.allclose(res.node_weights, net.node_weights)
+        for name in net.graph.es.attributes():
+            assert np.allclose(res.link_attribute(name),
+                               net.link_attribute(name))
+        assert np.allclose(res.nsi_degree(), net.nsi_degree())
+        res = Network.LoadHDF5(filename, link_attributes=False)
+        assert not res.graph.es.attributes()
+
+
+def test_save_hdf5_non_numerical(tmp_path):
+    filename = tmp_path / "net.h5"
+    net = Network.SmallTestNetwork()
+    net.graph.es["label"] = [f"link {i}" for i in range(net.n_links)]
+    net.graph.es["missing"] = [None] * net.n_links
+    with pytest.warns(UserWarning, match="not numerical"):
+        net.save_hdf5(filename)
+    res = Network.LoadHDF5(filename)
+    assert sorted(res.graph.es.attributes()) == ["link_weights"]
+    assert np.allclose(res.link_attribute("link_weights"),
+                       net.link_attribute("link_weights"))
+
+
 def test_ErdosRenyi(capsys):
     print(Network.Model("ErdosRenyi", n_nodes=10, n_links=18))
     out = capsys.readouterr()[0]
@@ -796,6 +877,61 @@ def test_betweenness():
     assert np.allclose(res, exp)
 
 
+def test_betweenness_disk_cache(tmp_path, capsys):
+    Cached.disk_cache = DiskCache(str(tmp_path))
+    try:
+        for _ in range(2):
+            net = Network.SmallTestNetwork()
+            res = [net.betweenness(), net.betweenness("link_weights"),
+                   net.path_lengths()]
+        assert isinstance(res[0], np.memmap)
+        assert np.allclose(res[0], [4.5, 1.5, 0., 1., 3., 0.])
+        assert np.allclose(res[1], [5., 1., 0., 2., 2., 0.])
+        assert capsys.readouterr().out.count("Calculating node betw") == 2
+
+        # invalidation by contents
+        net.set_link_attribute("link_weights", 2 * net.link_attribute(
+            "link_weights"))
+        assert not isinstance(net.betweenness("link_weights"), np.memmap)
+        net.node_weights = np.arange(1, 7)
+        net.nsi_closeness()
+        assert not isinstance(
+            Network.SmallTestNetwork().nsi_closeness(), np.memmap)
+    finally:
+        Cached.disk_cache = None
+
+
+def test_disk_cache_read_only(tmp_path):
+    measures = [
+        ("average_path_length", ("link_weights",)),
+        ("closeness", ("link_weights",)), ("closeness", ()),
+        ("global_efficiency", ("link_weights",)),
+        ("nsi_average_path_length", ()), ("nsi_closeness", ()),
+        ("nsi_global_efficiency", ()), ("betweenness", ()),
+        ("link_betweenness", ()), ("arenas_betweenness", ()),
+        ("newman_betweenness", ())]
+
+    def network():
+        #  disconnected network with an isolated node
+        net = Network(np.pad(Network.SmallTestNetwork().adjacency,
+                             (0, 1)), silence_level=2)
+        net.set_link_attribute("link_weights", net.adjacency * 1.5)
+        return net
+
+    exp = [getattr(network(), m)(*args) for m, args in measures]
+    Cached.disk_cache = DiskCache(str(tmp_path))
+    try:
+        for _ in range(2):
+            net = network()
+            res = [getattr(net, m)(*args) for m, args in measures]
+            for value, e in zip(res, exp):
+                assert np.allclose(value, e, equal_nan=True)
+        assert isinstance(net.path_lengths("link_weights"), np.memmap)
+        assert np.isinf(net.path_lengths("link_weights")[-1, 0])
+    finally:
+        Cached.disk_cache = None
+
+
 def test_interregional_betweenness():
     net = Network.SmallTestNetwork()
     res = net.interregional_betweenness(sources=[2], targets=[3, 5])
@@ -975,6 +1111,21 @@ def test_nsi_newman_betweenness():
     assert np.allclose(res, exp)
 
 
+def test_newman_betweenness_local_solve():
+    rng = np.random.default_rng(42)
+    A = Network.ErdosRenyi(n_nodes=60, link_probability=0.03)
+    net = Network(adjacency=A, node_weights=rng.uniform(.5, 1.5, 60),
+                  silence_level=2)
+    assert len(net.graph.connected_components()) > 1
+    assert np.allclose(net.newman_betweenness(local_solve=True),
+                       net.newman_betweenness())
+    for add_local_ends in [False, True]:
+        assert np.allclose(
+            net.nsi_newman_betweenness(add_local_ends=add_local_ends,
+                                       local_solve=True),
+            net.nsi_newman_betweenness(add_local_ends=add_local_ends))
+
+
 def test_global_efficiency():
     res = Network.SmallTestNetwork().global_efficiency()
     exp = 0.71111111
@@ -0,0 +1,98 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Simple tests for the NullModelEnsemble class.
+"""
+
+import numpy as np
+
+from pyunicorn import Network, SpatialNetwork, GeoNetwork, \
+    InteractingNetworks
+from pyunicorn.core import NullModelEnsemble
+
+
+RECORDED = []
+
+
+def n_triangles(net):
+    RECORDED.append(len(net.graph.cliques(3, 3)))
+    return RECORDED[-1]
+
+
+def test_rewire():
+    net = Network(Network.ErdosRenyi(n_nodes=40, link_probability=.15,
+                                     silence_level=2), silence_level=2)
+    kwargs = {"model": "randomly_rewire",
+              "measures": ["degree", "local_clustering", n_triangles],
+              "model_kwargs": {"iterations": 100}, "seed": 3,
+              "silence_level": 2}
+    serial = NullModelEnsemble(net, n_workers=1, **kwargs).run(12)
+    parallel = NullModelEnsemble(net, n_workers=2, **kwargs).run(12)
+    extended = NullModelEnsemble(net, n_workers=1, **kwargs).run(5).run(7)
+    for ens in [parallel, extended]:
+        assert ens.n == 12
+        for name in serial.mean:
+            assert np.allclose(ens.mean[name], serial.mean[name])
+            assert np.allclose(ens.std()[name], serial.std()[name])
+            assert np.array_equal(ens.p_values()[name],
+                                  serial.p_values()[name])
+
+    # streaming statistics agree with the recorded realisations
+    RECORDED.clear()
+    ens = NullModelEnsemble(net, n_workers=1, **kwargs).run(12)
+    assert RECORDED[0] == ens.observed["n_triangles"]
+    assert np.isclose(ens.mean["n_triangles"], np.mean(RECORDED[1:]))
+    assert np.isclose(ens.std()["n_triangles"], np.std(RECORDED[1:], ddof=1))
+    assert ens.p_values("greater")["n_triangles"] == \
+        (1 + sum(r >= RECORDED[0] for r in RECORDED[1:])) / 13
+    assert np.array_equal(serial.mean["degree"], net.degree())
+    assert np.isnan(serial.z_scores()["degree"]).all()
+    assert np.all(serial.p_values()["degree"] == 1.)
+    z = (serial.observed["n_triangles"] - serial.mean["n_triangles"]) \
+        / serial.std()["n_triangles"]
+    assert serial.z_scores()["n_triangles"] == z
+    p = serial.p_values("greater")["local_clustering"]
+    assert ((p > 0) & (p <= 1)).all()
+
+
+def test_geomodel_cross_links():
+    net = SpatialNetwork.SmallTestNetwork()
+    ens = NullModelEnsemble(
+        net, "randomly_rewire_geomodel_I",
+        ["degree", "average_link_distance"], seed=0, n_workers=1,
+        model_kwargs={"distance_matrix": net.grid.distance(),
+                      "iterations": 5, "inaccuracy": 100},
+        silence_level=2).run(4)
+    assert np.array_equal(ens.mean["degree"], net.degree())
+
+    net = InteractingNetworks.SmallTestNetwork()
+    nodes1, nodes2 = [0, 3, 5], [1, 2, 4]
+    ens = NullModelEnsemble(
+        net, "RandomlyRewireCrossLinks", ["degree"], seed=0, n_workers=1,
+        model_kwargs={"node_list1": nodes1, "node_list2": nodes2,
+                      "swaps": 10.}, silence_level=2).run(4)
+    assert np.array_equal(ens.mean["degree"], net.degree())
+
+
+def test_geonetwork():
+    net = GeoNetwork.SmallTestNetwork()
+    kwargs = {"model": "randomly_rewire", "measures": ["degree",
+              "average_link_distance"], "seed": 1, "silence_level": 2,
+              "model_kwargs": {"iterations": 5}}
+    serial = NullModelEnsemble(net, n_workers=1, **kwargs).run(4)
+    parallel = NullModelEnsemble(net, n_workers=2, **kwargs).run(4)
+    assert np.array_equal(serial.mean["degree"], net.degree())
+    assert np.allclose(parallel.mean["average_link_distance"],
+                       serial.mean["average_link_distance"])
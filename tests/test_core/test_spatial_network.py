@@ -14,8 +14,10 @@
 """
 Simple tests for the SpatialNetwork class.
 """
+import pytest
 import numpy as np
 
+from pyunicorn.core import Grid, GeoGrid
 from pyunicorn.core.geo_network import SpatialNetwork
 
 
@@ -28,6 +30,54 @@ def test_randomly_rewire_geomodel_I():
     assert (res == exp).all()
 
 
+@pytest.mark.filterwarnings("ignore:Only")
+@pytest.mark.parametrize("model", ["I", "II", "III"])
+@pytest.mark.parametrize("grid_class", [Grid, GeoGrid])
+def test_randomly_rewire_geomodel_sparse(model, grid_class):
+    rng = np.random.default_rng(0)
+    if grid_class is Grid:
+        grid = Grid(np.arange(1), rng.uniform(0, 10, (2, 200)),
+                    silence_level=2)
+    else:
+        grid = GeoGrid(np.arange(1), rng.uniform(-60, 60, 200),
+                       rng.uniform(0, 360, 200), silence_level=2)
+    D = grid.distance()
+    #  Thinned out short links, leaving room for length preserving swaps
+    R = np.triu(rng.random(D.shape) < .3, 1)
+    A = (D < np.quantile(D, .1)) & (R | R.T)
+    net = SpatialNetwork(grid, adjacency=A.astype(np.int8), silence_level=2)
+    eps = D[A].std()
+
+    nets = []
+    for distance_matrix in [None, D]:
+        rewired = SpatialNetwork(grid, adjacency=net.sp_A, silence_level=2)
+        np.random.seed(1)
+        getattr(rewired, f"randomly_rewire_geomodel_{model}")(
+            distance_matrix=distance_matrix, iterations=10, inaccuracy=eps,
+            max_attempts=10**6)
+        nets.append(rewired)
+    rewired = nets[0]
+    assert np.array_equal(nets[0].adjacency, nets[1].adjacency)
+    assert rewired.n_links == net.n_links
+    assert np.array_equal(rewired.degree(), net.degree())
+    assert (rewired.adjacency != net.adjacency).any()
+    lengths = np.sort(D[rewired.adjacency.astype(bool)])
+    assert np.abs(lengths - np.sort(D[A])).max() < 10 * eps
+    if model == "III":
+        def degree_pairs(n):
+            k = n.degree()
+            return sorted(map(tuple, np.sort(
+                k[np.array(n.graph.get_edgelist())], axis=1)))
+        assert degree_pairs(rewired) == degree_pairs(net)
+
+    #  Impossible rewirings give up after a bounded number of attempts
+    rewired = SpatialNetwork(grid, adjacency=net.sp_A, silence_level=2)
+    with pytest.warns(UserWarning, match="Only 0 of 10"):
+        getattr(rewired, f"randomly_rewire_geomodel_{model}")(
+            distance_matrix=None, iterations=10, inaccuracy=0.)
+    assert np.array_equal(rewired.adjacency, net.adjacency)
+
+
 def test_set_random_links_by_distance():
     net = SpatialNetwork.SmallTestNetwork()
     while net.n_links != 5:
@@ -105,3 +155,36 @@ def test_local_distance_weighted_vulnerability():
     exp = np.array([0.03233506, 0.31442454, 0.20580213, 0.02843829,
                     -0.02929477, -0.2883446])
     assert np.allclose(res, exp, atol=1e-04)
+
+
+@pytest.mark.parametrize("grid_class", [Grid, GeoGrid])
+def test_link_distance_sparse(grid_class):
+    rng = np.random.default_rng(1)
+    if grid_class is Grid:
+        grid = Grid(time_seq=np.arange(2), space_seq=rng.random((2, 50)),
+                    silence_level=2)
+    else:
+        grid = GeoGrid(time_seq=np.arange(2),
+                       lat_seq=rng.uniform(-90, 90, 50),
+                       lon_seq=rng.uniform(0, 360, 50), silence_level=2)
+    A = np.triu(rng.random((50, 50)) < 0.1, k=1)
+    A = (A | A.T).astype(int)
+    A[7] = A[:, 7] = 0
+    net = SpatialNetwork(grid, adjacency=A)
+    D = grid.distance()
+
+    degree = A.sum(axis=1)
+    exp = np.zeros(50)
+    exp[degree != 0] = (A * D).sum(axis=1)[degree != 0] / degree[degree != 0]
+    assert np.allclose(net.average_link_distance(), exp)
+    assert np.allclose(net.average_link_distance(geometry_corrected=True),
+                       exp / D.mean(axis=1))
+    assert np.allclose(net.max_link_distance(), (A * D).max(axis=1))
+
+    grid_type = "euclidean" if grid_class is Grid else "spherical"
+    dist = net.link_distance_distribution(n_bins=5, grid_type=grid_type)[0]
+    exp = np.histogram(D[A == 1], bins=5, range=(0, D.max()))[0]
+    assert np.allclose(dist, exp / exp.sum())
+
+    assert np.array_equal(net.distance(), D)
+    assert np.allclose(net.link_attribute("distance"), A * D)
@@ -17,6 +17,7 @@ Tests for the EventSeries class.
 """
 import numpy as np
 import pytest
+from pyunicorn.core import Data
 from pyunicorn.eventseries import EventSeries
 
 
@@ -580,8 +581,8 @@ def test_significance():
 
 
 # ==========================================================================
-# Additional tests covering the optimized kernels, new getters, fallback
-# paths, optional joblib parallelization, NaN handling, and input validation.
+# Additional tests covering the compiled kernels, new getters, NaN handling,
+# and input validation.
 # These tests are intentionally small and deterministic (fixed RNG seeds)
 # so they remain stable and fast in CI.
 # ==========================================================================
@@ -594,6 +595,35 @@ def _make_binary_matrix(T, N, p=0.2, seed=0):
     return (rng.random((T, N)) < p).astype(int)
 
 
+def _es_pairwise(esob):
+    """Reference: directed ES matrix from the pairwise public API."""
+    eventmatrix, ts = esob.get_event_matrix(), esob.get_timestamps()
+    N = eventmatrix.shape[1]
+    ref = np.zeros((N, N))
+    for i in range(N):
+        for j in range(i + 1, N):
+            ref[i, j], ref[j, i] = \
+                EventSeries.event_synchronization(
+                    eventmatrix[:, i], eventmatrix[:, j], ts1=ts, ts2=ts,
+                    taumax=esob.get_taumax(), lag=esob.get_lag())
+    return ref
+
+
+def _eca_pairwise(esob, window_type):
+    """Reference: directed ECA matrix from the pairwise coincidence rates."""
+    # pylint: disable=protected-access
+    eventmatrix, ts = esob.get_event_matrix(), esob.get_timestamps()
+    N = eventmatrix.shape[1]
+    ref = np.zeros((N, N))
+    for i in range(N):
+        for j in range(i + 1, N):
+            ref[i, j], ref[j, i] = \
+                esob._eca_coincidence_rate(
+                    eventmatrix[:, i], eventmatrix[:, j],
+                    window_type=window_type, ts1=ts, ts2=ts)
+    return ref
+
+
 def test_getters():
     """Cover the public getter methods and the __str__ representation."""
     data = _make_binary_matrix(120, 4, seed=1)
@@ -610,10 +640,9 @@ def test_getters():
     assert "EventSeries" in s and "4 variables" in s and "120 timesteps" in s
 
 
-def test_es_sparse_with_nonzero_lag():
-    """Finite taumax with nonzero lag routes through the sparse
-    binary-search kernel (`_compute_es_matrix_sparse_lag`).
-    Verify matrix-level result matches the pairwise reference."""
+def test_es_nonzero_lag():
+    """Finite taumax with nonzero lag: verify the matrix-level result
+    of the compiled kernel matches the pairwise reference."""
     eventmatrix = _make_binary_matrix(200, 3, p=0.2, seed=2)
     taumax = 4
     lag = 1.5
@@ -634,10 +663,9 @@ def test_es_sparse_with_nonzero_lag():
     assert np.allclose(fast, ref, atol=1e-04)
 
 
-def test_es_pairwise_fallback():
-    """taumax=inf combined with lag != 0 should route through
-    `_ndim_event_synchronization_pairwise`. We assert agreement with
-    the pairwise public API on the same inputs."""
+def test_es_unbounded_nonzero_lag():
+    """taumax=inf combined with lag != 0: assert agreement of the
+    compiled kernel with the pairwise public API on the same inputs."""
     eventmatrix = _make_binary_matrix(200, 3, p=0.2, seed=3)
     lag = 0.75
     esob = EventSeries(eventmatrix, taumax=np.inf, lag=lag)
@@ -655,13 +683,13 @@ def test_es_pairwise_fallback():
     assert np.allclose(fast, ref, atol=1e-04)
 
 
-def test_eca_vectorized_nonzero_lag():
-    """Integer lag != 0 with uniform integer timestamps triggers the
-    vectorized cumsum + BLAS kernel. Compare against the pairwise
-    reference implementation for each of the three window_types."""
+def test_eca_nonzero_lag():
+    """Integer lag != 0 with uniform integer timestamps. Compare against
+    the pairwise reference implementation for each of the three
+    window_types."""
     eventmatrix = _make_binary_matrix(120, 3, p=0.25, seed=4)
     taumax = 3
-    lag = 2  # integer so the vectorized path is used
+    lag = 2
 
     for window_type in ['advanced', 'retarded', 'symmetric']:
         esob = EventSeries(eventmatrix, taumax=taumax, lag=lag)
@@ -688,12 +716,11 @@ def test_eca_vectorized_nonzero_lag():
                     else:  # 'retarded'
                         ref[i, j], ref[j, i] = t, t2
         assert np.allclose(fast, ref, atol=1e-04), \
-            f"vectorized ECA mismatch for window_type={window_type}"
+            f"compiled ECA mismatch for window_type={window_type}"
 
 
 def test_eca_pairwise_symmetric_nonuniform():
-    """Non-uniform timestamps force the pairwise ECA fallback
-    (`_compute_eca_pairwise`). Verify against the reference symmetric
+    """Non-uniform timestamps: verify against the reference symmetric
     implementation."""
     eventmatrix = _make_binary_matrix(60, 3, p=0.3, seed=5)
     rng = np.random.default_rng(6)
@@ -718,27 +745,64 @@ def test_eca_pairwise_symmetric_nonuniform():
     assert np.allclose(fast, ref, atol=1e-04)
 
 
-def test_joblib_parallel_equivalence():
-    """If joblib is available, n_jobs>1 must produce bit-for-bit identical
-    matrices to n_jobs=1 for both the blocked-dense and sparse kernels."""
-    # pylint: disable=protected-access
-    pytest.importorskip("joblib")
-    eventmatrix = _make_binary_matrix(150, 4, p=0.2, seed=7)
-
-    # Blocked dense kernel path (taumax=inf, lag=0)
-    es_block = EventSeries(eventmatrix, taumax=np.inf, lag=0.0)
-    node_data = es_block._precompute_es_node_data()
-    serial = es_block._compute_es_matrix_blocked(node_data, n_jobs=1)
-    parallel = es_block._compute_es_matrix_blocked(node_data, n_jobs=2)
-    assert np.allclose(serial, parallel, atol=1e-10)
-
-    # Sparse kernel path (finite taumax)
-    es_sparse = EventSeries(eventmatrix, taumax=5, lag=1.0)
-    node_data_s = es_sparse._precompute_es_node_data()
-    serial_s = es_sparse._compute_es_matrix_sparse_lag(node_data_s, n_jobs=1)
-    parallel_s = es_sparse._compute_es_matrix_sparse_lag(node_data_s,
-                                                         n_jobs=2)
-    assert np.allclose(serial_s, parallel_s, atol=1e-10)
+@pytest.mark.parametrize("timestamps", [None, "uniform", "random"])
+@pytest.mark.parametrize("taumax", [0, 1.5, 4, np.inf])
+@pytest.mark.parametrize("lag", [0.0, 1.0, -0.5])
+def test_compiled_kernels(timestamps, taumax, lag):
+    """The compiled ES and ECA kernels agree with the pairwise reference
+    implementations for all configurations."""
+    T, N = 90, 6
+    eventmatrix = _make_binary_matrix(T, N, p=0.25, seed=10)
+    ts = {None: None, "uniform": np.arange(T) * 0.5,
+          "random": np.sort(np.random.default_rng(11).uniform(0, 45, T))
+          }[timestamps]
+    esob = EventSeries(eventmatrix, timestamps=ts, taumax=taumax, lag=lag)
+
+    fast = esob.event_series_analysis(method='ES')
+    assert fast.dtype == np.float32
+    ref = _es_pairwise(esob)
+    assert np.allclose(fast, np.nan_to_num(ref), atol=1e-6)
+
+    if np.isfinite(taumax):
+        for window_type in ['advanced', 'retarded', 'symmetric']:
+            fast = esob.event_series_analysis(method='ECA',
+                                              window_type=window_type)
+            ref = _eca_pairwise(esob, window_type)
+            finite = np.isfinite(ref)
+            assert np.allclose(fast[finite], ref[finite], atol=1e-6)
+
+
+def test_compiled_kernels_executor(default_executor):
+    """The row blocks are evaluated on the default executor."""
+    eventmatrix = _make_binary_matrix(200, 9, p=0.2, seed=12)
+    esob = EventSeries(eventmatrix, taumax=3, lag=0.5)
+    assert np.allclose(esob.event_series_analysis(method='ES'),
+                       _es_pairwise(esob), atol=1e-6)
+    assert np.allclose(esob.event_series_analysis(method='ECA',
+                                                  window_type='advanced'),
+                       _eca_pairwise(esob, 'advanced'), atol=1e-6)
+    assert len(default_executor.stats) > 0
+
+
+def test_data_input():
+    """A Data object is read in spatial blocks and yields the same event
+    matrix as its observable."""
+    data = Data.SmallTestData()
+    kwargs = {"threshold_method": 'quantile',
+              "threshold_values": [0.2, 0.4, 0.5, 0.6, 0.8, 0.7],
+              "threshold_types": 'above'}
+    esob = EventSeries(data, taumax=2, **kwargs)
+    ref = EventSeries(data.observable(), taumax=2, **kwargs)
+    assert np.array_equal(esob.get_event_matrix(), ref.get_event_matrix())
+    assert np.array_equal(esob.event_series_analysis(method='ECA'),
+                          ref.event_series_analysis(method='ECA'))
+
+    binary = Data(observable=ref.get_event_matrix(), grid=data.grid,
+                  silence_level=2)
+    assert np.array_equal(EventSeries(binary).get_event_matrix(),
+                          ref.get_event_matrix())
+    with pytest.raises(IOError):
+        EventSeries(data)
 
 
 def test_nan_handling_quantile():
@@ -767,8 +831,7 @@ def test_nan_handling_quantile():
 
 def test_edge_cases_few_events():
     """Nodes with 0, 1, 2 events are handled without crashing: they
-    should produce zero scores (no inner events → _precompute_es_node_data
-    returns empty arrays)."""
+    should produce zero scores (no inner events)."""
     T, N = 50, 4
     eventmatrix = np.zeros((T, N), dtype=int)
     # Column 0: 0 events. Column 1: 1 event. Column 2: 2 events.
@@ -777,7 +840,7 @@ def test_edge_cases_few_events():
     eventmatrix[[5, 30], 2] = 1
     eventmatrix[[3, 11, 19, 27, 35], 3] = 1
 
-    # Finite taumax → sparse kernel must accept empty/tiny event arrays
+    # Finite taumax → the kernel must accept empty/tiny event arrays
     esob = EventSeries(eventmatrix, taumax=3, lag=0.0)
     out = esob.event_series_analysis(method='ES', symmetrization='directed')
     assert out.shape == (N, N)
@@ -787,8 +850,7 @@ def test_edge_cases_few_events():
     # 1-event node also produces zeros (no inner events)
     assert np.all(out[1, :] == 0) and np.all(out[:, 1] == 0)
 
-    # Blocked-dense kernel path (taumax=inf, lag=0) exercises the
-    # empty-inner-events branch of _compute_es_block
+    # Infinite taumax
     esob_inf = EventSeries(eventmatrix, taumax=np.inf, lag=0.0)
     out_inf = esob_inf.event_series_analysis(method='ES',
                                              symmetrization='directed')
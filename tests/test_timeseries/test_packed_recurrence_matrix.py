@@ -0,0 +1,157 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Simple tests for the PackedRecurrenceMatrix class.
+"""
+
+import pytest
+import numpy as np
+
+from pyunicorn.core._ext.types import NODE, LAG
+from pyunicorn.timeseries import PackedRecurrenceMatrix, RecurrencePlot, \
+    JointRecurrencePlot, JointRecurrenceNetwork, CrossRecurrencePlot
+from pyunicorn.timeseries._ext.numerics import _diagline_dist, \
+    _vertline_dist, _white_vertline_dist
+from pyunicorn.funcnet import CouplingAnalysis
+
+
+@pytest.mark.parametrize("n", [1, 5, 63, 64, 65, 130])
+@pytest.mark.parametrize("p", [0., .3, .9, 1.])
+def test_from_dense(n: int, p: float):
+    R = (np.random.default_rng(n).random((n, n)) < p).astype(LAG)
+    packed = PackedRecurrenceMatrix.from_dense(R)
+    assert packed.shape == R.shape
+    assert packed.nbytes == 8 * n * ((n + 63) // 64)
+    assert np.array_equal(packed.to_dense(), R)
+    assert np.array_equal(np.asarray(packed), R)
+    assert packed.sum() == R.sum()
+    assert packed == PackedRecurrenceMatrix.from_dense(R.astype(bool))
+    for kernel, method in [(_diagline_dist, packed.diagline_dist),
+                           (_vertline_dist, packed.vertline_dist),
+                           (_white_vertline_dist, packed.white_vertline_dist)]:
+        exp = np.zeros(n, dtype=NODE)
+        kernel(n, exp, R)
+        assert np.array_equal(method(), exp)
+
+
+def test_and():
+    rng = np.random.default_rng(42)
+    R_x, R_y = (rng.random((2, 70, 100)) < .5).astype(LAG)
+    packed = PackedRecurrenceMatrix.from_dense(R_x) & \
+        PackedRecurrenceMatrix.from_dense(R_y)
+    assert np.array_equal(packed.to_dense(), R_x * R_y)
+    assert packed.recurrence_rate() == (R_x * R_y).mean()
+    assert np.array_equal(packed.to_sparse().toarray(), R_x * R_y)
+
+
+def test_from_joint_embedding(metric: str):
+    x, y = np.random.default_rng(0).random((2, 150, 2))
+    packed = PackedRecurrenceMatrix.from_joint_embedding(
+        x, y, threshold=(.3, .4), metric=(metric, "supremum"))
+    exp = PackedRecurrenceMatrix.from_embedding(
+        x, threshold=.3, metric=metric) & \
+        PackedRecurrenceMatrix.from_embedding(y, threshold=.4)
+    assert packed == exp
+
+
+@pytest.mark.parametrize("n_time", [30, 3000])
+def test_threshold_from_recurrence_rate_sampled(metric: str, n_time: int):
+    x = np.random.default_rng(1).random((n_time, 2), dtype=np.float32)
+    rp = RecurrencePlot(x[:30], metric=metric, threshold=.1, silence_level=2)
+    threshold = RecurrencePlot.threshold_from_recurrence_rate_sampled(
+        x, .05, metric=metric, n_samples=10000)
+    if n_time == 30:
+        assert threshold == rp.threshold_from_recurrence_rate(
+            rp.distance_matrix(metric), .05)
+    else:
+        rate = PackedRecurrenceMatrix.from_embedding(
+            x, threshold=threshold, metric=metric).recurrence_rate()
+        assert rate == pytest.approx(.05, abs=.01)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"threshold": .4}, {"threshold_std": .5}, {"recurrence_rate": .1},
+    {"local_recurrence_rate": .1}, {"threshold": .4, "dim": 3, "tau": 2}])
+def test_RP(metric: str, kwargs: dict):
+    x = CouplingAnalysis.test_data()[:150, 0]
+    dense = RecurrencePlot(x, metric=metric, silence_level=2, **kwargs)
+    packed = RecurrencePlot(
+        x, metric=metric, silence_level=2, packed=True, **kwargs)
+    assert isinstance(packed.R, PackedRecurrenceMatrix)
+    assert np.array_equal(packed.R.to_dense(), dense.R)
+    assert packed.recurrence_rate() == dense.recurrence_rate()
+    assert packed.recurrence_probability(2) == \
+        dense.recurrence_probability(2)
+    for measure in ["diagline", "vertline", "white_vertline"]:
+        assert np.array_equal(getattr(packed, f"{measure}_dist")(),
+                              getattr(dense, f"{measure}_dist")())
+    assert packed.rqa_summary() == dense.rqa_summary()
+
+
+@pytest.mark.parametrize("lag", [0, 3, -2])
+@pytest.mark.parametrize("kwargs", [
+    {"threshold": (.3, .2)}, {"recurrence_rate": (.1, .2)}])
+def test_JRP(metric: str, lag: int, kwargs: dict):
+    x = CouplingAnalysis.test_data()[:100, :2]
+    args = (x[:, 0], x[:, 1])
+    dense = JointRecurrencePlot(*args, metric=(metric, metric), lag=lag,
+                                silence_level=2, **kwargs)
+    packed = JointRecurrencePlot(*args, metric=(metric, metric), lag=lag,
+                                 silence_level=2, packed=True, **kwargs)
+    assert isinstance(packed.JR, PackedRecurrenceMatrix)
+    assert np.array_equal(packed.JR.to_dense(), dense.JR)
+    assert packed.N == dense.N
+    if lag == 0:
+        assert packed.rqa_summary() == dense.rqa_summary()
+
+
+@pytest.mark.parametrize("lag", [0, 2])
+def test_JRN(lag: int):
+    x = CouplingAnalysis.test_data()[:100, :2]
+    args = (x[:, 0], x[:, 1])
+    kwargs = {"threshold": (.3, .2), "lag": lag, "silence_level": 2}
+    dense = JointRecurrenceNetwork(*args, **kwargs)
+    packed = JointRecurrenceNetwork(*args, packed=True, **kwargs)
+    assert np.array_equal(packed.adjacency, dense.adjacency)
+    assert packed.n_links == dense.n_links
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"threshold": .3}, {"recurrence_rate": .1}])
+def test_CRP(metric: str, kwargs: dict):
+    x = CouplingAnalysis.test_data()[:, :2]
+    args = (x[:90, 0], x[10:, 1])
+    dense = CrossRecurrencePlot(*args, metric=metric, silence_level=2,
+                                **kwargs)
+    packed = CrossRecurrencePlot(*args, metric=metric, silence_level=2,
+                                 packed=True, **kwargs)
+    assert isinstance(packed.CR, PackedRecurrenceMatrix)
+    assert np.array_equal(packed.CR.to_dense(), dense.CR)
+    assert (packed.N, packed.M) == (dense.N, dense.M)
+    assert packed.cross_recurrence_rate() == dense.cross_recurrence_rate()
+    assert packed.balance() == dense.balance()
+
+
+def test_exceptions():
+    x = CouplingAnalysis.test_data()[:20, 0]
+    with pytest.raises(NotImplementedError):
+        RecurrencePlot(x, threshold=.1, sparse_rqa=True, packed=True)
+    with pytest.raises(NotImplementedError):
+        RecurrencePlot(x, threshold=.1, missing_values=True, packed=True)
+    packed = PackedRecurrenceMatrix.from_dense(np.ones((3, 4), dtype=LAG))
+    with pytest.raises(AssertionError):
+        packed.diagline_dist()
+    with pytest.raises(AssertionError):
+        _ = packed & PackedRecurrenceMatrix.from_dense(np.ones((4, 3)))
@@ -281,3 +281,100 @@ def test_line_dist_entropy(measure: str, exp: float, small_RP_basic):
         return
     res = getattr(small_RP_basic, f"{measure}_entropy")()
     assert np.isclose(res, exp, atol=1e-04)
+
+
+# test windowed RQA
+
+@pytest.mark.parametrize("window, step", [(4, 1), (5, 2), (3, 4), (10, 1)])
+def test_windowed_rqa_summary(small_RP, window: int, step: int):
+    res = small_RP.windowed_rqa_summary(window, step)
+    starts = np.arange(0, small_RP.N - window + 1, step)
+    assert np.array_equal(res["start"], starts)
+    for row in res:
+        s = row["start"]
+        sub = RecurrencePlot(small_RP.embedding[s:s+window], threshold=1.)
+        sub.R = small_RP.R[s:s+window, s:s+window].copy()
+        exp = sub.rqa_summary()
+        exp.update(ENTR=sub.diag_entropy(), TT=sub.trapping_time())
+        assert all(np.isclose(row[m], val) for m, val in exp.items())
+
+
+def test_windowed_rqa_summary_sequential(small_RP_basic):
+    res = small_RP_basic.windowed_rqa_summary(6, 1)
+    x = Data.SmallTestData().observable()
+    for row in res:
+        s = row["start"]
+        exp = RecurrencePlot(x[s:s+6], threshold=.8).rqa_summary()
+        assert all(np.isclose(row[m], val) for m, val in exp.items())
+
+
+def test_windowed_rqa_summary_parallel():
+    x = np.sin(np.linspace(0, 10 * np.pi, 200))
+    RP = RecurrencePlot(x, threshold=.2, silence_level=2)
+    res = RP.windowed_rqa_summary(50, 3)
+    assert np.array_equal(res, RP.windowed_rqa_summary(50, 3, parallelize=True))
+
+
+# test batched RQA
+
+@pytest.mark.parametrize("kwargs", [
+    {"threshold": .8}, {"threshold_std": .5}, {"recurrence_rate": .3},
+    {"threshold": .8, "dim": 2, "tau": 2}])
+def test_batch_rqa_summary(metric: str, kwargs: dict):
+    x = Data.SmallTestData().observable()
+    batch = [x[:, :2], x[:-2, 1:3], x[3:, 4:]]
+    if "dim" in kwargs:
+        batch = [b[:, 0] for b in batch]
+    res = RecurrencePlot.batch_rqa_summary(batch, metric=metric, **kwargs)
+    assert res.shape == (len(batch),)
+    for row, b in zip(res, batch):
+        RP = RecurrencePlot(b, metric=metric, **kwargs)
+        exp = RP.rqa_summary()
+        exp.update(ENTR=RP.diag_entropy(), TT=RP.trapping_time())
+        assert row["N"] == RP.N
+        assert all(np.isclose(row[m], val) for m, val in exp.items())
+
+
+def test_batch_rqa_summary_parallel():
+    x = np.random.default_rng(0).standard_normal((6, 30, 2))
+    res = RecurrencePlot.batch_rqa_summary(x, recurrence_rate=.1)
+    assert np.array_equal(res, RecurrencePlot.batch_rqa_summary(
+        x, recurrence_rate=.1, parallelize=True))
+
+
+# test twin surrogates
+
+def brute_force_twins(R, min_dist):
+    """Twins from pairwise comparisons of all rows of `R`."""
+    R = np.asarray(R)
+    return [[k for k in range(len(R)) if abs(j - k) > min_dist
+             and R[j].sum() > 1 and np.array_equal(R[j], R[k])]
+            for j in range(len(R))]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"threshold": .3}, {"threshold": .3, "packed": True},
+    {"threshold": .3, "sparse_rqa": True}, {"recurrence_rate": .05}])
+def test_twins(kwargs: dict):
+    x = np.round(np.random.default_rng(0).standard_normal(300).cumsum()
+                 * .1 / .2) * .2
+    RP = RecurrencePlot(x, dim=3, tau=2, silence_level=2, **kwargs)
+    dense = RP if not RP.sparse_rqa else RecurrencePlot(
+        x, dim=3, tau=2, threshold=.3, silence_level=2)
+    exp = brute_force_twins(dense.recurrence_matrix(), 7)
+    assert sum(map(len, exp)) > 0
+    assert RP.twins(7) == exp
+
+
+def test_twin_surrogates():
+    x = np.sin(np.linspace(0, 40 * np.pi, 400))
+    RP = RecurrencePlot(x, dim=2, tau=5, threshold=.1, silence_level=2)
+    res = RP.twin_surrogates(5, seed=0)
+    assert res.shape == (5,) + RP.embedding.shape
+    assert np.array_equal(res, RP.twin_surrogates(5, seed=0))
+    #  surrogates consist of states of the original trajectory
+    states = {tuple(s) for s in RP.embedding}
+    assert all(tuple(s) in states for s in res.reshape(-1, 2))
+    assert RP.twin_surrogates(0).shape == (0,) + RP.embedding.shape
+    with pytest.raises(ValueError):
+        RP.twin_surrogates(-1)
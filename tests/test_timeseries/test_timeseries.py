@@ -23,6 +23,7 @@ from numpy.testing import assert_array_almost_equal
 from pyunicorn.timeseries import RecurrencePlot, CrossRecurrencePlot, \
     RecurrenceNetwork, JointRecurrenceNetwork, InterSystemRecurrenceNetwork, \
     Surrogates, VisibilityGraph
+from pyunicorn.utils import executor
 from pyunicorn.core.data import Data
 from pyunicorn.core._ext.types import DFIELD
 
@@ -164,6 +165,25 @@ def testInterSystemRecurrenceNetwork(thresh, rr, metric: str):
     assert A1.dtype == np.int16
 
 
+@pytest.mark.parametrize("kwds", [
+    {"threshold": (.2, .3, .25)}, {"recurrence_rate": (.05, .1, .07)},
+    {"threshold": (.2, .3, .25), "dim": 3, "tau": (1, 2)}], ids=str)
+def testInterSystemRecurrenceNetworkSparse(kwds, metric: str):
+    rng = np.random.default_rng(0)
+    x, y = rng.random(120), rng.random(100)
+    dense = InterSystemRecurrenceNetwork(
+        x, y, metric=metric, silence_level=2, **kwds)
+    sparse = InterSystemRecurrenceNetwork(
+        x, y, metric=metric, silence_level=2, sparse=True, **kwds)
+    assert sparse.rp_x is None and sparse.crp_xy is None
+    assert np.array_equal(sparse.adjacency, dense.adjacency)
+    assert np.array_equal(sparse.inter_system_recurrence_matrix(),
+                          dense.inter_system_recurrence_matrix())
+    assert sparse.internal_recurrence_rates() == \
+        dense.internal_recurrence_rates()
+    assert sparse.cross_recurrence_rate() == dense.cross_recurrence_rate()
+
+
 # -----------------------------------------------------------------------------
 # surrogates
 # -----------------------------------------------------------------------------
@@ -236,6 +256,20 @@ def testTwinSurrogates():
     assert (corrcoef >= -1.0).all() and (corrcoef <= 1.0).all()
 
 
+def testTwins():
+    walks = np.random.default_rng(0).standard_normal((3, 300)).cumsum(axis=1)
+    ts = Surrogates(np.round(walks * .1 / .2) * .2, silence_level=2)
+    ts.embedding = ts.embed_time_series_array(ts.original_data, 3, 2)
+    twins = ts.twins(.3, min_dist=7)
+    assert len(twins) == ts.N
+    assert sum(len(t) for twins_i in twins for t in twins_i) > 0
+    for i, twins_i in enumerate(twins):
+        R = Surrogates.recurrence_plot(ts.embedding[i], .3)
+        assert twins_i == [
+            [k for k in range(len(R)) if abs(j - k) > 7 and R[j].sum() > 1
+             and np.array_equal(R[j], R[k])] for j in range(len(R))]
+
+
 def testAAFTSurrogates():
     ts = Surrogates.SmallTestData()
     # also covers Surrogates.AAFT_surrogates(), which is used as starting point
@@ -248,6 +282,58 @@ def testAAFTSurrogates():
                        np.abs(np.fft.fft(surr_s, axis=1))[0, 1:10])
 
 
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def testSurrogateBatches(dtype, tmp_path):
+    ts = Surrogates.SmallTestData()
+    data = ts.original_data
+    kwargs = {"batch_size": 4, "seed": 0, "dtype": dtype}
+    batches = list(ts.surrogate_batches(
+        "refined_AAFT_surrogates", 10, n_iterations=3, **kwargs))
+    assert [b.shape for b in batches] == [(4, 6, 200), (4, 6, 200),
+                                          (2, 6, 200)]
+    ensemble = ts.surrogate_ensemble(
+        Surrogates.refined_AAFT_surrogates, 10, n_iterations=3,
+        path=str(tmp_path / "surrogates.npy"), **kwargs)
+    assert isinstance(ensemble, np.memmap) and ensemble.dtype == dtype
+    assert np.array_equal(ensemble, np.concatenate(batches))
+    # conserved amplitude distributions
+    assert np.allclose(np.sort(ensemble, axis=-1),
+                       np.sort(data, axis=-1).astype(dtype))
+    # conserved power spectrum
+    spectrum = ts.surrogate_ensemble(
+        "refined_AAFT_surrogates", 3, n_iterations=3,
+        output="true_spectrum", **kwargs)
+    assert np.allclose(np.abs(np.fft.rfft(data, axis=1))[:, 1:10],
+                       np.abs(np.fft.rfft(spectrum, axis=-1))[:, :, 1:10],
+                       rtol=1e-3)
+    for method in ["white_noise_surrogates", "AAFT_surrogates"]:
+        ensemble = ts.surrogate_ensemble(method, 5, **kwargs)
+        assert np.allclose(np.sort(ensemble, axis=-1),
+                           np.sort(data, axis=-1).astype(dtype))
+        assert not np.allclose(ensemble[0], ensemble[1])
+    ensemble = ts.surrogate_ensemble("correlated_noise_surrogates", 5,
+                                     **kwargs)
+    assert np.allclose(np.abs(np.fft.rfft(data, axis=1))[:, 1:10],
+                       np.abs(np.fft.rfft(ensemble, axis=-1))[:, :, 1:10],
+                       rtol=1e-3)
+
+
+def testTwinSurrogateBatches():
+    tdata = create_test_data()
+    ts = Surrogates(tdata)
+    ensemble = ts.surrogate_ensemble(
+        "twin_surrogates", 6, batch_size=4, seed=0,
+        dimension=3, delay=2, threshold=0.2)
+    n_time = tdata.shape[1] - 4
+    assert ensemble.shape == (6, ts.N, n_time)
+    # twin surrogates consist of values of the original time series
+    for i in range(ts.N):
+        assert np.isin(ensemble[:, i], tdata[i, :n_time]).all()
+    assert np.array_equal(ensemble, ts.surrogate_ensemble(
+        "twin_surrogates", 6, batch_size=4, seed=0,
+        dimension=3, delay=2, threshold=0.2))
+
+
 def testPearsonCorrelation():
     tdata = create_test_data()
     n_index, n_times = tdata.shape
@@ -290,6 +376,59 @@ def testThresholdSignificance():
     assert np.isclose(density_estimate.sum(), 1) and len(lbb) == nbins
 
 
+def testThresholdSignificanceBatches():
+    nbins = 10
+    kwargs = {"realizations": 20, "interval": [0, 2], "n_bins": nbins,
+              "batch_size": 8, "seed": 3}
+    density_estimate, lbb = Surrogates.SmallTestData(
+        ).test_threshold_significance(Surrogates.white_noise_surrogates,
+                                      Surrogates.test_mutual_information,
+                                      **kwargs)
+    assert np.isclose(density_estimate.sum(), 1) and len(lbb) == nbins
+    assert np.allclose(lbb, np.linspace(0, 2, nbins + 1)[:-1])
+    with executor.SerialExecutor() as ex:
+        executor.set_default(ex)
+        try:
+            serial, _ = Surrogates.SmallTestData(
+                ).test_threshold_significance(
+                    Surrogates.white_noise_surrogates,
+                    Surrogates.test_mutual_information, **kwargs)
+        finally:
+            executor.set_default(None)
+    assert np.allclose(density_estimate, serial)
+
+
+@pytest.mark.parametrize("test_function", [
+    Surrogates.test_pearson_correlation, Surrogates.test_mutual_information])
+def testSignificanceTest(test_function):
+    ts = Surrogates.SmallTestData()
+    p, n = ts.significance_test("AAFT_surrogates", test_function,
+                                max_surrogates=500, batch_size=16, seed=0)
+    assert p.shape == (ts.N, ts.N) and 0 < n <= 500
+    assert ((p > 0) & (p <= 1)).all()
+    #  p-values are multiples of 1 / (n + 1) and reproducible
+    assert np.allclose(p * (n + 1), np.round(p * (n + 1)))
+    p2, n2 = Surrogates.SmallTestData().significance_test(
+        Surrogates.AAFT_surrogates, test_function, max_surrogates=500,
+        batch_size=16, seed=0)
+    assert n2 == n and np.allclose(p2, p)
+
+
+def testSignificanceTestEarlyStopping():
+    ts = Surrogates.SmallTestData()
+    #  Perfectly periodic series are decided after few surrogates ...
+    _, n = ts.significance_test("correlated_noise_surrogates",
+                                Surrogates.test_pearson_correlation,
+                                max_surrogates=5000, batch_size=32, seed=1)
+    assert n < 5000
+    #  ... but not at a significance level close to their p-values
+    p, n = ts.significance_test("correlated_noise_surrogates",
+                                Surrogates.test_pearson_correlation,
+                                max_surrogates=64, alpha=0.2, batch_size=32,
+                                seed=1)
+    assert n == 64 and p.shape == (ts.N, ts.N)
+
+
 # -----------------------------------------------------------------------------
 # visibility_graph
 # -----------------------------------------------------------------------------
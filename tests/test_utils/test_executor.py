@@ -0,0 +1,72 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Simple tests for the execution backends.
+"""
+
+import pytest
+import numpy as np
+
+from pyunicorn import Network
+from pyunicorn.utils import executor
+from pyunicorn.utils.executor import Shared, SerialExecutor, \
+    ThreadExecutor, ProcessExecutor
+
+
+def test_partition():
+    costs = np.array([5, 1, 1, 1, 1, 1, 4, 1, 1])
+    assert SerialExecutor().partition(costs) == [(0, 9)]
+    ranges = ThreadExecutor(n_workers=2).partition(costs, parts_per_worker=2)
+    assert ranges == [(0, 1), (1, 4), (4, 7), (7, 9)]
+    assert ThreadExecutor(n_workers=8).partition([1, 1]) == [(0, 1), (1, 2)]
+
+
+@pytest.mark.parametrize("backend", [SerialExecutor, ThreadExecutor,
+                                     ProcessExecutor])
+def test_map(backend):
+    rng = np.random.default_rng(0)
+    M = Shared(rng.random((40, 30)))
+    vectors = [rng.random(30) for _ in range(7)]
+    costs = np.arange(7)
+    with (backend() if backend is SerialExecutor else backend(2)) as ex:
+        res = ex.map(np.dot, [(M, v) for v in vectors], costs=costs)
+        assert all(np.allclose(r, np.dot(M.array, v))
+                   for r, v in zip(res, vectors))
+        assert sorted(s["id"] for s in ex.stats) == list(range(7))
+        assert all(s["cost"] == costs[s["id"]] for s in ex.stats)
+        assert set(ex.stats[0]) >= {"rank", "this_time", "time_over_est",
+                                    "n_processed", "total_time"}
+        if backend is SerialExecutor:
+            #  longest tasks first
+            assert [s["id"] for s in ex.stats] == list(range(6, -1, -1))
+
+
+def test_random_walk_betweenness():
+    rng = np.random.default_rng(1)
+    A = np.triu(rng.random((60, 60)) < 0.08, k=1)
+    A = (A | A.T).astype(int)
+    res = {}
+    try:
+        for ex in [SerialExecutor(), ThreadExecutor(3)]:
+            executor.set_default(ex)
+            net = Network(adjacency=A, silence_level=2)
+            res[ex.__class__] = [net.newman_betweenness(),
+                                 net.nsi_newman_betweenness(),
+                                 net.nsi_arenas_betweenness()]
+            assert len(ex.stats) > 0
+    finally:
+        executor.set_default(None)
+    for exp, r in zip(res[SerialExecutor], res[ThreadExecutor]):
+        assert np.allclose(r, exp)
@@ -0,0 +1,132 @@
+# This file is part of pyunicorn.
+# Copyright (C) 2008--2026 Jonathan F. Donges and pyunicorn authors
+# URL: <https://www.pik-potsdam.de/members/donges/software-2/software>
+# License: BSD (3-clause)
+#
+# Please acknowledge and cite the use of this software and its authors
+# when results are used in publications or published elsewhere.
+#
+# You can use the following reference:
+# J.F. Donges, J. Heitzig, B. Beronov, M. Wiedermann, J. Runge, Q.-Y. Feng,
+# L. Tupikina, V. Stolbova, R.V. Donner, N. Marwan, H.A. Dijkstra,
+# and J. Kurths, "Unified functional network and nonlinear time series analysis
+# for complex systems science: The pyunicorn package"
+
+"""
+Simple tests for the instrumentation events.
+"""
+
+import io
+import json
+
+import numpy as np
+
+from pyunicorn import Network
+from pyunicorn.core.cache import Cached, DiskCache
+from pyunicorn.utils import instrument
+from pyunicorn.utils.executor import SerialExecutor
+
+
+def test_cached_events():
+    net = Network.SmallTestNetwork()
+    with instrument.record() as events:
+        net.betweenness()
+        net.betweenness()
+    assert not instrument.active()
+    ends = [e for e in events if e["event"] == "end"]
+    assert [e["cache"] for e in ends] == ["miss", "hit"]
+    for e in ends:
+        assert e["name"] == "Network.betweenness"
+        assert e["label"] == "node betweenness"
+        assert e["size"] == 6
+        assert e["wall_time"] >= 0 and e["cpu_time"] >= 0
+        assert e["error"] is None
+    assert len(events) == 4 and events[0]["event"] == "start"
+
+
+def test_disk_cache_events(tmp_path):
+    net = Network.SmallTestNetwork()
+    Cached.disk_cache = DiskCache(str(tmp_path))
+    try:
+        net.newman_betweenness()
+        net.newman_betweenness.cache_clear()
+        with instrument.record() as events:
+            net.newman_betweenness()
+    finally:
+        Cached.disk_cache = None
+    assert events[-1]["cache"] == "disk"
+
+
+def test_nested_spans():
+    net = Network.SmallTestNetwork()
+    with instrument.record() as events:
+        with instrument.span("outer", size=3) as attrs:
+            net.nsi_newman_betweenness()
+            attrs["extra"] = 1
+    ids = {e["name"]: e["id"] for e in events}
+    by_name = {e["name"]: e for e in events if e["event"] == "end"}
+    assert by_name["outer"]["parent"] is None
+    assert by_name["outer"]["extra"] == 1
+    assert by_name["Network.nsi_newman_betweenness"]["parent"] == \
+        ids["outer"]
+    assert by_name["Network.nsi_degree"]["parent"] == \
+        ids["Network.nsi_newman_betweenness"]
+
+
+def test_errors():
+    with instrument.record() as events:
+        try:
+            with instrument.span("failing"):
+                raise ValueError
+        except ValueError:
+            pass
+    assert events[-1]["error"] == "ValueError"
+
+
+def test_executor_events():
+    with instrument.record() as events:
+        SerialExecutor().map(np.add, [(1, 2), (3, 4)])
+    assert events[-1]["name"] == "SerialExecutor.map"
+    assert events[-1]["size"] == 2
+
+
+def test_sinks():
+    stream = io.StringIO()
+
+    class Tracer:
+        spans = []
+
+        def start_span(self, name, start_time, attributes):
+            self.spans.append([name, start_time, attributes])
+            return self
+
+        def end(self, end_time):
+            self.spans[-1].append(end_time)
+
+    net = Network.SmallTestNetwork()
+    sinks = [instrument.JSONLinesSink(stream),
+             instrument.SpanSink(Tracer())]
+    for sink in sinks:
+        instrument.add_sink(sink)
+    try:
+        net.betweenness()
+    finally:
+        for sink in sinks:
+            instrument.remove_sink(sink)
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert events[-1]["name"] == "Network.betweenness"
+    name, start, attributes, end = Tracer.spans[-1]
+    assert name == "Network.betweenness" and start <= end
+    assert attributes["pyunicorn.cache"] == "miss"
+
+
+def test_verbose(capsys):
+    net = Network.SmallTestNetwork()
+    instrument.verbose = False
+    try:
+        net.betweenness()
+    finally:
+        instrument.verbose = True
+    assert capsys.readouterr().out == ""
+    net.closeness()
+    assert "Calculating" in capsys.readouterr().out